@@ -0,0 +1,52 @@
+"""Compare per-cell JSON parsing of csv vector columns with the NumPy fast path.
+
+Usage: python bench_vector_parse.py [rows] [dim]
+"""
+import os, sys, csv, io, random, time, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.split(os.path.realpath(__file__))[0], "..", ".."))
+from milvus_cli.Fs import iterCsvBatches
+from milvus_cli.Converter import column_converter
+
+rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+dim = int(sys.argv[2]) if len(sys.argv) > 2 else 768
+
+buf = io.StringIO()
+writer = csv.writer(buf)
+writer.writerow(["id", "vector"])
+for idx in range(rows):
+    writer.writerow([idx, [round(random.random(), 6) for _ in range(dim)]])
+lines = buf.getvalue().encode("utf-8").splitlines(keepends=True)
+total = sum(len(line) for line in lines)
+converters = [
+    column_converter({"type": 5}),
+    column_converter({"type": 101, "params": {"dim": dim}}),
+]
+
+
+def run(converters=None):
+    start = time.perf_counter()
+    for _batch in iterCsvBatches(iter(lines), total, batchSize=1000, converters=converters):
+        pass
+    return time.perf_counter() - start
+
+
+def batch_memory(converters=None):
+    """Peak bytes allocated while holding one parsed batch."""
+    tracemalloc.start()
+    batch = next(iterCsvBatches(iter(lines), total, batchSize=1000, converters=converters))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del batch
+    return peak
+
+
+json_seconds = run()
+fast_seconds = run(converters)
+json_peak = batch_memory()
+fast_peak = batch_memory(converters)
+print(f"{rows} rows x {dim} dim ({total / 1e6:.1f} MB)")
+print(f"json.loads per cell: {json_seconds:.2f}s ({rows / json_seconds:.0f} rows/s)")
+print(f"typed converters:    {fast_seconds:.2f}s ({rows / fast_seconds:.0f} rows/s)")
+print(f"speedup:             {json_seconds / fast_seconds:.1f}x")
+print(f"peak memory per 1000-row batch: {json_peak / 1e6:.1f} MB -> {fast_peak / 1e6:.1f} MB")
@@ -3,8 +3,12 @@ from __future__ import annotations
 from pymilvus import MilvusClient
 try:
     from .BaseClient import BaseMilvusClient
+    from .Converter import schema_cache
+    from .QueryCache import query_cache
 except ImportError:
     from BaseClient import BaseMilvusClient
+    from Converter import schema_cache
+    from QueryCache import query_cache
 
 
 class MilvusClientAlias(BaseMilvusClient):
@@ -37,6 +41,8 @@ class MilvusClientAlias(BaseMilvusClient):
                 collection_name=collectionName,
                 alias=aliasName
             )
+            schema_cache.invalidate(aliasName)
+            query_cache.invalidate(aliasName)
             
             return f"Create alias {aliasName} successfully!"
             
@@ -94,6 +100,8 @@ class MilvusClientAlias(BaseMilvusClient):
             
             # Drop alias using MilvusClient API
             client.drop_alias(alias=aliasName)
+            schema_cache.invalidate(aliasName)
+            query_cache.invalidate(aliasName)
             
             return f"Drop alias {aliasName} successfully!"
             
@@ -119,6 +127,8 @@ class MilvusClientAlias(BaseMilvusClient):
                 alias=aliasName,
                 collection_name=collectionName
             )
+            schema_cache.invalidate(aliasName)
+            query_cache.invalidate(aliasName)
             
             return f"Alter alias {aliasName} successfully!"
             
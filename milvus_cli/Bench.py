@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import Callable
+
+from tabulate import tabulate
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram in the style of HdrHistogram.
+
+    Values are counted in ``unit`` seconds (microseconds by default) in
+    buckets whose width grows with the value, so every recorded value is
+    known to ``significant_digits`` decimal digits whatever its magnitude,
+    with a fixed memory cost. Min, max and mean are kept exactly.
+    """
+
+    def __init__(self, significant_digits: int = 3, unit: float = 1e-6) -> None:
+        if not 1 <= significant_digits <= 5:
+            raise ParameterException("Significant digits should be between 1 and 5.")
+        self.unit = unit
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.counts = {}
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value: int) -> int:
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return (shift + 1) * self.half_count + (value >> shift) - self.half_count
+
+    def _highest_equivalent(self, index: int) -> int:
+        """Largest value counted in a bucket."""
+        if index < self.sub_bucket_count:
+            return index
+        shift = index // self.half_count - 1
+        sub_bucket = index - shift * self.half_count
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(int(round(seconds / self.unit)), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.total += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add the counts of a histogram with the same precision and unit."""
+        if (other.sub_bucket_bits, other.unit) != (self.sub_bucket_bits, self.unit):
+            raise ValueError("Histograms have different precision or unit.")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.total += other.total
+        self.sum += other.sum
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> float:
+        """Value in seconds below which ``percent`` of the recorded values fall."""
+        if not self.total:
+            return 0.0
+        # Rounded first so float error in e.g. 99.9% of 1000 does not skip a value
+        target = max(math.ceil(round(percent / 100 * self.total, 9)), 1)
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._highest_equivalent(index), self.max) * self.unit
+        return self.max * self.unit
+
+    def summary(self) -> dict:
+        """Min, mean, percentiles and max in milliseconds."""
+        ms = self.unit * 1000
+        result = {
+            "min_ms": round((self.min or 0) * ms, 3),
+            "mean_ms": round(self.sum / self.total * ms, 3) if self.total else 0.0,
+        }
+        for percent in PERCENTILES:
+            key = f"p{percent:g}".replace(".", "")
+            result[f"{key}_ms"] = round(self.percentile(percent) * 1000, 3)
+        result["max_ms"] = round((self.max or 0) * ms, 3)
+        return result
+
+
+class SearchBench:
+    """
+    Replay query vectors against a search function from several threads.
+
+    Each request takes the next ``nq`` vectors of ``queries``, wrapping around
+    at the end. ``concurrency`` threads send requests back to back (closed
+    loop) or, with ``qps``, on a fixed schedule of ``qps`` requests per second
+    shared by all threads (open loop). Scheduled latencies are measured from
+    the time a request was due rather than when it was sent, so a server that
+    falls behind is not hidden by the coordinated omission of the requests it
+    delayed. A run stops after ``duration`` seconds or ``count`` requests,
+    whichever comes first, and may start with ``warmup`` seconds whose
+    requests are not measured.
+    """
+
+    def __init__(
+        self,
+        search: Callable,
+        queries,
+        nq: int = 1,
+        concurrency: int = 1,
+        qps: float | None = None,
+        significant_digits: int = 3,
+    ) -> None:
+        if not len(queries):
+            raise ParameterException("No query vectors to replay.")
+        if not nq or nq < 1:
+            raise ParameterException("nq should be a positive integer.")
+        if not concurrency or concurrency < 1:
+            raise ParameterException("Concurrency should be a positive integer.")
+        if qps is not None and qps <= 0:
+            raise ParameterException("QPS should be positive.")
+        self.search = search
+        self.queries = queries
+        self.nq = nq
+        self.concurrency = concurrency
+        self.qps = qps
+        self.significant_digits = significant_digits
+
+    def _batch(self, seq: int):
+        start = (seq * self.nq) % len(self.queries)
+        batch = self.queries[start:start + self.nq]
+        if len(batch) < self.nq:
+            batch = list(batch) + list(self.queries[: self.nq - len(batch)])
+        return batch
+
+    def _phase(self, duration: float | None, count: int | None, measure: bool) -> dict:
+        lock = threading.Lock()
+        issued = 0
+        errors = []
+        histograms = []
+        start = time.perf_counter()
+        deadline = start + duration if duration else None
+
+        def worker():
+            nonlocal issued
+            histogram = LatencyHistogram(self.significant_digits)
+            histograms.append(histogram)
+            while True:
+                with lock:
+                    seq = issued
+                    if count is not None and seq >= count:
+                        return
+                    issued += 1
+                due = start + seq / self.qps if self.qps else None
+                if due is not None:
+                    delay = due - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+                if deadline and time.perf_counter() >= deadline:
+                    return
+                sent = time.perf_counter()
+                try:
+                    self.search(self._batch(seq))
+                except Exception as e:
+                    with lock:
+                        errors.append(e)
+                    continue
+                if measure:
+                    histogram.record(time.perf_counter() - (due or sent))
+
+        threads = [
+            threading.Thread(target=worker, name=f"milvus_cli_bench_{idx}", daemon=True)
+            for idx in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        histogram = LatencyHistogram(self.significant_digits)
+        for part in histograms:
+            histogram.merge(part)
+        return {"histogram": histogram, "errors": errors, "seconds": elapsed}
+
+    def run(
+        self,
+        duration: float | None = None,
+        count: int | None = None,
+        warmup: float = 0.0,
+    ) -> dict:
+        """
+        Warm up, then send requests until ``duration`` or ``count`` is reached.
+
+        Returns:
+            dict: settings, request/query counts, throughput and latency summary
+        """
+        if not duration and not count:
+            raise ParameterException("Set a duration or a number of requests.")
+        if warmup and warmup > 0:
+            self._phase(warmup, None, measure=False)
+        phase = self._phase(duration, count, measure=True)
+        histogram, seconds = phase["histogram"], phase["seconds"]
+        requests = histogram.total
+        report = {
+            "concurrency": self.concurrency,
+            "target_qps": self.qps,
+            "nq": self.nq,
+            "warmup_seconds": warmup or 0,
+            "seconds": round(seconds, 3),
+            "requests": requests,
+            "queries": requests * self.nq,
+            "errors": len(phase["errors"]),
+            "qps": round(requests / seconds, 2) if seconds > 0 else 0.0,
+            "vectors_per_sec": round(requests * self.nq / seconds, 2) if seconds > 0 else 0.0,
+            "latency": histogram.summary(),
+        }
+        if phase["errors"]:
+            report["first_error"] = str(phase["errors"][0])
+        return report
+
+
+def format_bench_report(report: dict) -> str:
+    """Bench report as two tables, throughput then latency."""
+    throughput = [
+        [key, report[key]]
+        for key in (
+            "concurrency",
+            "target_qps",
+            "nq",
+            "warmup_seconds",
+            "seconds",
+            "requests",
+            "errors",
+            "qps",
+            "vectors_per_sec",
+        )
+    ]
+    if report.get("first_error"):
+        throughput.append(["first_error", report["first_error"]])
+    latency = [[key.replace("_ms", ""), value] for key, value in report["latency"].items()]
+    return "\n".join(
+        [
+            tabulate(throughput, headers=["Metric", "Value"], tablefmt="grid"),
+            tabulate(latency, headers=["Latency", "ms"], tablefmt="grid"),
+        ]
+    )
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+
+def write_json_atomic(path: str, data: dict) -> None:
+    """Write JSON to a temporary file in the same directory, then rename it over path."""
+    dirname = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".milvus_cli_", suffix=".tmp", dir=dirname)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class Checkpoint:
+    """
+    On-disk progress of a resumable operation, saved as JSON after every step.
+
+    Subclasses build the initial ``state`` and record their steps in
+    ``commit``; ``KEYS`` names the state entries a saved checkpoint must
+    match to be resumed by this operation.
+    """
+
+    VERSION = 1
+    KEYS: tuple = ()
+
+    def __init__(self, path: str, state: dict) -> None:
+        self.path = path
+        self.state = {"version": self.VERSION, **state, "completed": False}
+
+    def _check(self, saved: dict) -> None:
+        """Reject a saved state that cannot be resumed, beyond the KEYS match."""
+
+    def load(self) -> dict:
+        """
+        Load the saved progress if a checkpoint exists
+
+        Returns:
+            dict: Saved state, or a fresh state when there is no checkpoint
+
+        Raises:
+            ParameterException: The checkpoint is unreadable or was written
+                for another operation
+        """
+        if not os.path.exists(self.path):
+            return self.state
+        try:
+            with open(self.path, "r") as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ParameterException(f"Cannot read checkpoint {self.path}: {e}")
+        if saved.get("version") != self.VERSION:
+            raise ParameterException(
+                f"Checkpoint {self.path} has unsupported version {saved.get('version')}."
+            )
+        self._check(saved)
+        for key in self.KEYS:
+            if saved.get(key) != self.state[key]:
+                raise ParameterException(
+                    f"Checkpoint {self.path} was written for {key} "
+                    f"'{saved.get(key)}', not '{self.state[key]}'."
+                )
+        self.state = saved
+        return self.state
+
+    def complete(self) -> None:
+        """Mark the operation as finished."""
+        self.state["completed"] = True
+        self._save()
+
+    def _save(self) -> None:
+        self.state["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        write_json_atomic(self.path, self.state)
+
+
+class IngestCheckpoint(Checkpoint):
+    """
+    On-disk progress of a file ingest, so an interrupted run can be resumed.
+
+    The checkpoint records the row and byte offset reached by the last batch
+    the server acknowledged together with every batch before it, plus the
+    absolute path, size and mtime of the source so neither another file nor
+    a modified one is ever resumed.
+    """
+
+    KEYS = ("source", "collection", "partition", "action")
+
+    def __init__(
+        self,
+        source: str,
+        collectionName: str,
+        partitionName: str | None = None,
+        action: str = "insert",
+        path: str | None = None,
+    ) -> None:
+        try:
+            stat = os.stat(source)
+        except OSError as e:
+            raise ParameterException(f"Cannot checkpoint {source}: {e}")
+        self.source = os.path.abspath(source)
+        super().__init__(path or f"{source}.checkpoint.json", {
+            "source": self.source,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "collection": collectionName,
+            "partition": partitionName,
+            "action": action,
+            "rows": 0,
+            "offset": 0,
+            "line": 0,
+            "batches": 0,
+        })
+
+    def _check(self, saved: dict) -> None:
+        if (saved.get("size"), saved.get("mtime_ns")) != (
+            self.state["size"],
+            self.state["mtime_ns"],
+        ):
+            raise ParameterException(
+                f"Source file {self.source} changed since checkpoint {self.path} was written. "
+                "Delete the checkpoint to start over."
+            )
+
+    def commit(self, batch: dict) -> None:
+        """Record a batch acknowledged after all the batches before it."""
+        self.state["rows"] = batch["row_offset"]
+        self.state["offset"] = batch["offset"]
+        # Source line reached, for line-based formats with blank lines
+        self.state["line"] = batch.get("line", batch["row_offset"])
+        self.state["batches"] += 1
+        self._save()
+
+
+class ExportCheckpoint(Checkpoint):
+    """
+    On-disk progress of a collection export, so an interrupted run can be resumed.
+
+    The checkpoint records the rows written, the last primary key written
+    (query_iterator returns entities in primary key order) and the size of
+    the output at that point, for the export with the same collection,
+    filter, fields and format.
+    """
+
+    KEYS = ("output", "collection", "expr", "output_fields", "format")
+
+    def __init__(
+        self,
+        output: str,
+        collectionName: str,
+        expr: str | None,
+        outputFields: list | None,
+        fmt: str,
+        path: str | None = None,
+    ) -> None:
+        super().__init__(path or f"{output}.checkpoint.json", {
+            "output": os.path.abspath(output),
+            "collection": collectionName,
+            "expr": expr or "",
+            "output_fields": outputFields,
+            "format": fmt,
+            "rows": 0,
+            "last_pk": None,
+            "offset": 0,
+        })
+
+    def commit(self, rows: int, last_pk, offset: int) -> None:
+        """Record a batch written to the output after all the batches before it."""
+        self.state["rows"] = rows
+        self.state["last_pk"] = last_pk
+        self.state["offset"] = offset
+        self._save()
+
+
+class DeleteCheckpoint(Checkpoint):
+    """
+    On-disk progress of a chunked delete by expression, so it can be resumed.
+
+    Matching primary keys are enumerated in ascending order and deleted in
+    chunks; the checkpoint records the last primary key of the chunks
+    deleted together with every chunk before it, and the IDs sent so far.
+    """
+
+    KEYS = ("collection", "expr", "partition")
+
+    def __init__(
+        self,
+        collectionName: str,
+        expr: str,
+        partitionName: str | None = None,
+        path: str | None = None,
+    ) -> None:
+        super().__init__(path or f"{collectionName}.delete.checkpoint.json", {
+            "collection": collectionName,
+            "expr": expr,
+            "partition": partitionName,
+            "ids": 0,
+            "last_pk": None,
+            "batches": 0,
+        })
+
+    def commit(self, ids: list) -> None:
+        """Record a chunk of IDs deleted after all the chunks before it."""
+        self.state["ids"] += len(ids)
+        self.state["last_pk"] = ids[-1]
+        self.state["batches"] += 1
+        self._save()
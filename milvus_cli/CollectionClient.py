@@ -6,10 +6,14 @@ from pymilvus import MilvusClient, DataType
 from tabulate import tabulate
 try:
     from .BaseClient import BaseMilvusClient
+    from .Converter import schema_cache
+    from .QueryCache import query_cache
     from .Types import DataTypeByNum
     from .utils import safe_int
 except ImportError:
     from BaseClient import BaseMilvusClient
+    from Converter import schema_cache
+    from QueryCache import query_cache
     from Types import DataTypeByNum
     from utils import safe_int
 
@@ -141,6 +145,8 @@ class MilvusClientCollection(BaseMilvusClient):
                 shards_num=shardsNum,
                 consistency_level=consistencyLevel
             )
+            schema_cache.invalidate(collectionName)
+            query_cache.invalidate(collectionName)
             
             # Return Collection details
             return self.get_collection_details(collectionName=collectionName)
@@ -174,6 +180,8 @@ class MilvusClientCollection(BaseMilvusClient):
         try:
             client = self._get_client()
             client.drop_collection(collection_name=collectionName)
+            schema_cache.invalidate(collectionName)
+            query_cache.invalidate(collectionName)
             return f"Drop collection {collectionName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Delete collection error: {e}") from e
@@ -245,6 +253,10 @@ class MilvusClientCollection(BaseMilvusClient):
                 old_name=collectionName,
                 new_name=newName
             )
+            schema_cache.invalidate(collectionName)
+            query_cache.invalidate(collectionName)
+            schema_cache.invalidate(newName)
+            query_cache.invalidate(newName)
             return f"Rename collection {collectionName} to {newName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Rename collection error: {e}") from e
@@ -639,6 +651,8 @@ Fields(* is the primary field):{field_details}"""
                 field_name=fieldName,
                 field_params=field_params
             )
+            schema_cache.invalidate(collectionName)
+            query_cache.invalidate(collectionName)
             return f"Alter field {fieldName} in collection {collectionName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Alter collection field error: {e}") from e
@@ -657,6 +671,7 @@ Fields(* is the primary field):{field_details}"""
         try:
             client = self._get_client()
             client.truncate_collection(collection_name=collectionName, timeout=timeout)
+            query_cache.invalidate(collectionName)
             return f"Truncate collection {collectionName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Truncate collection error: {e}") from e
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from json import loads
+from typing import Callable
+
+import numpy as np
+
+try:
+    from .Types import DataTypeByNum
+except ImportError:
+    from Types import DataTypeByNum
+
+_BOOLS = {"true": True, "false": False}
+
+
+def _with_fallback(parse: Callable[[str], object], dtype=None) -> Callable[[list], list]:
+    """
+    Convert a column with ``parse``, or JSON-decode it if any cell does not fit.
+
+    With a ``dtype`` the parsed column is packed into a NumPy array of it.
+    """
+
+    def convert(cells):
+        try:
+            values = [parse(cell) for cell in cells]
+            return np.array(values, dtype=dtype) if dtype else values
+        except (ValueError, TypeError, KeyError, OverflowError):
+            return [loads(cell) for cell in cells]
+
+    return convert
+
+
+def _parse_bool(cell: str) -> bool:
+    return _BOOLS[cell.strip()]
+
+
+def _parse_string(cell: str) -> str:
+    # JSON-quoted text without escapes or inner quotes is taken as is.
+    body = cell[1:-1]
+    if len(cell) < 2 or cell[0] != '"' or cell[-1] != '"' or "\\" in body or '"' in body:
+        raise ValueError(cell)
+    return body
+
+
+def parse_float_vectors(cells: list, dim: int | None = None) -> np.ndarray:
+    """
+    Parse JSON array cells like "[0.1, 0.2]" into one contiguous float32 array
+
+    The cell bodies are handed to NumPy's C text parser in a single call, so
+    no Python float or list is created per element.
+
+    Returns:
+        np.ndarray: Array of shape (len(cells), dim)
+
+    Raises:
+        ValueError: A cell is not a flat array of ``dim`` numbers, or when
+            ``dim`` is None, the cells do not all have the same length
+    """
+    bodies = []
+    for cell in cells:
+        cell = cell.strip()
+        if not (cell.startswith("[") and cell.endswith("]")):
+            raise ValueError(f"Not a vector: {cell[:32]}")
+        bodies.append(cell[1:-1])
+    vectors = np.loadtxt(
+        bodies, dtype=np.float32, delimiter=",", comments=None, ndmin=2
+    )
+    # Blank cells are skipped by loadtxt, so check the row count as well.
+    if vectors.shape[0] != len(cells) or (dim and vectors.shape[1] != dim):
+        raise ValueError(f"Expected {len(cells)} vectors of dim {dim}.")
+    return vectors
+
+
+def _float_vector_converter(dim: int) -> Callable[[list], list]:
+    def convert(cells):
+        try:
+            return parse_float_vectors(cells, dim)
+        except ValueError:
+            return [loads(cell) for cell in cells]
+
+    return convert
+
+
+_SCALAR_PARSERS = {
+    "BOOL": _parse_bool,
+    "INT8": int,
+    "INT16": int,
+    "INT32": int,
+    "INT64": int,
+    "FLOAT": float,
+    "DOUBLE": float,
+    "VARCHAR": _parse_string,
+    "STRING": _parse_string,
+}
+
+# Numeric columns are held in NumPy arrays of the field's width.
+_NUMPY_DTYPES = {
+    "BOOL": np.bool_,
+    "INT8": np.int8,
+    "INT16": np.int16,
+    "INT32": np.int32,
+    "INT64": np.int64,
+    "FLOAT": np.float32,
+    "DOUBLE": np.float64,
+}
+
+
+def field_type_name(field: dict) -> str:
+    """Name of a field's data type, e.g. ``FLOAT_VECTOR``, from describe_collection output."""
+    dtype = field.get("type")
+    name = getattr(dtype, "name", None)
+    if name:
+        return name
+    try:
+        return DataTypeByNum.get(int(dtype), "UNKNOWN")
+    except (TypeError, ValueError):
+        return "UNKNOWN"
+
+
+def column_converter(field: dict) -> Callable[[list], list] | None:
+    """
+    Converter for a column of raw csv cells of the given field
+
+    Returns:
+        Callable taking the list of raw cells and returning the column values
+        (a NumPy array for numeric and float vector fields), or None when the
+        cells should be JSON-decoded one by one
+    """
+    type_name = field_type_name(field)
+    if type_name == "FLOAT_VECTOR":
+        dim = field_dim(field)
+        return _float_vector_converter(dim) if dim else None
+    parse = _SCALAR_PARSERS.get(type_name)
+    return _with_fallback(parse, _NUMPY_DTYPES.get(type_name)) if parse else None
+
+
+def field_dim(field: dict) -> int | None:
+    """Vector dimension of a field, or None if it has no valid ``dim`` param."""
+    dim = (field.get("params") or {}).get("dim")
+    try:
+        return int(dim) if dim else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _row_values(column) -> list:
+    """Per-row values of a column; NumPy vectors become float32 row views."""
+    if isinstance(column, np.ndarray):
+        return column.tolist() if column.ndim == 1 else list(column)
+    return column
+
+
+class ColumnBatch:
+    """
+    A batch of entities held column by column.
+
+    Numeric and vector columns stay NumPy arrays, so a batch costs a few
+    bytes per value instead of a dict plus boxed values per entity. Rows are
+    only built by ``to_rows`` when the transport asks for them.
+    """
+
+    __slots__ = ("names", "columns")
+
+    def __init__(self, names: list, columns: list) -> None:
+        self.names = list(names)
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return min((len(c) for c in self.columns), default=0)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns of the batch."""
+        return sum(c.nbytes for c in self.columns if isinstance(c, np.ndarray))
+
+    def to_rows(self) -> list[dict]:
+        """Row dicts pairing the columns with their names, as MilvusClient expects."""
+        columns = [_row_values(c) for c in self.columns]
+        return [dict(zip(self.names, values)) for values in zip(*columns)]
+
+
+class CompiledSchema:
+    """
+    Everything insert/upsert needs from a collection schema, computed once.
+
+    Holds the input fields (auto_id fields excluded) in schema order, their
+    csv column converters and vector dims, and the primary field name and
+    type, so converting a batch needs no describe_collection call and no
+    per-field lookups. ``version`` is the schema version and update time
+    the collection was described with.
+    """
+
+    def __init__(self, collection_info: dict) -> None:
+        self.fields = [
+            f for f in collection_info.get("fields", []) if not f.get("auto_id", False)
+        ]
+        self.field_names = [f.get("name", "") for f in self.fields]
+        # The collection an alias resolves to
+        self.collection_name = collection_info.get("collection_name")
+        primary = next(
+            (f for f in collection_info.get("fields", []) if f.get("is_primary")), {}
+        )
+        self.primary_field = primary.get("name")
+        self.primary_type = field_type_name(primary) if primary else None
+        self.converters = [column_converter(f) for f in self.fields]
+        self.dims = {
+            f.get("name", ""): field_dim(f)
+            for f in self.fields
+            if field_type_name(f).endswith("_VECTOR")
+        }
+        self.version = (
+            collection_info.get("schema_version"),
+            collection_info.get("update_timestamp"),
+        )
+
+    def matches(self, collection_info: dict) -> bool:
+        """Whether a newer description of the collection has the same version."""
+        version = (
+            collection_info.get("schema_version"),
+            collection_info.get("update_timestamp"),
+        )
+        return version == self.version and version != (None, None)
+
+    def batch(self, columns: list, names: list | None = None) -> ColumnBatch:
+        """Pair column-major data with field names, in schema order by default."""
+        return ColumnBatch(names or self.field_names, columns)
+
+
+class SchemaCache:
+    """
+    Compiled schemas per client and collection.
+
+    Entries are dropped when the CLI changes a schema, an alias or the current
+    database, and after a failed insert/upsert. Changes made by other clients
+    are caught by ``revalidate``, which batch runs ask for when they start.
+    Clients are held weakly, so reconnecting starts from an empty cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._entries = weakref.WeakKeyDictionary()
+
+    def get(self, client, collectionName: str, revalidate: bool = False) -> CompiledSchema:
+        """
+        The compiled schema of a collection, described on first use.
+
+        With ``revalidate`` a cached schema is described again and recompiled
+        unless its version is unchanged; without a version from the server it
+        is always recompiled.
+        """
+        with self._lock:
+            schema = self._entries.get(client, {}).get(collectionName)
+        if schema is not None and not revalidate:
+            return schema
+        info = client.describe_collection(collection_name=collectionName)
+        if schema is None or not schema.matches(info):
+            schema = CompiledSchema(info)
+            with self._lock:
+                self._entries.setdefault(client, {})[collectionName] = schema
+        return schema
+
+    def peek(self, client, collectionName: str) -> CompiledSchema | None:
+        """The compiled schema if already cached, without describing the collection."""
+        with self._lock:
+            return self._entries.get(client, {}).get(collectionName)
+
+    def invalidate(self, collectionName: str | None = None) -> None:
+        """Forget one collection, or every collection when no name is given."""
+        with self._lock:
+            for schemas in self._entries.values():
+                if collectionName is None:
+                    schemas.clear()
+                else:
+                    schemas.pop(collectionName, None)
+
+
+schema_cache = SchemaCache()
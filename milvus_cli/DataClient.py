@@ -1,47 +1,162 @@
 from __future__ import annotations
 
-from tabulate import tabulate
 try:
     from .BaseClient import BaseMilvusClient
+    from .Converter import ColumnBatch, schema_cache
+    from .Export import middle_key, range_filter
+    from .Pipeline import BatchPipeline, RateLimiter, retry_call
+    from .Profiler import profile_stage
+    from .QueryCache import ANY_COLLECTION, query_cache
+    from .Render import HitTable
+    from .Types import ParameterException
     from .utils import safe_int
 except ImportError:
     from BaseClient import BaseMilvusClient
+    from Converter import ColumnBatch, schema_cache
+    from Export import middle_key, range_filter
+    from Pipeline import BatchPipeline, RateLimiter, retry_call
+    from Profiler import profile_stage
+    from QueryCache import ANY_COLLECTION, query_cache
+    from Render import HitTable
+    from Types import ParameterException
     from utils import safe_int
 
 
+BULK_INSERT_FINAL_STATES = ("Completed", "Failed", "Failed and cleaned")
+# Default maxQueryResultWindow: the most entities one query may return
+QUERY_RESULT_WINDOW = 16384
+
+
+def bulk_insert_finished(state) -> bool:
+    """Whether a bulk insert task state is final, completed or failed."""
+    return getattr(state, "state_name", None) in BULK_INSERT_FINAL_STATES
+
+
+def _clean_output_fields(output_fields) -> list:
+    """Output fields as typed by the user, ["*"] if none are given."""
+    # Strip brackets, quotes, and whitespace in case the user entered them
+    cleaned = [str(field).strip().strip("[]'\"") for field in output_fields or []]
+    return [field for field in cleaned if field] or ["*"]
+
+
+def search_hits(results, query_offset: int = 0, rank_offset: int = 0):
+    """
+    Flatten search results into one dict per hit, tagged with its query.
+
+    Yields:
+        Dicts with the ``query`` index (offset by ``query_offset``), the
+        hit's ``rank`` within its query (offset by ``rank_offset``, for
+        later pages of an iterator), ``id``, ``distance`` and the output
+        fields
+    """
+    for idx, hits in enumerate(results):
+        for rank, hit in enumerate(hits, rank_offset):
+            entity = hit.get("entity")
+            if entity is None:
+                entity = {k: v for k, v in hit.items() if k not in ("id", "distance")}
+            yield {
+                "query": query_offset + idx,
+                "rank": rank,
+                "id": hit.get("id"),
+                "distance": hit.get("distance"),
+                **entity,
+            }
+
+
 class MilvusClientData(BaseMilvusClient):
     """Data operations based on MilvusClient API."""
 
-    def _normalize_data(self, client, collectionName: str, data) -> list[dict]:
+    def _input_fields(self, client, collectionName: str, revalidate: bool = False) -> list[dict]:
+        """Fields user data is expected to provide, in schema order."""
+        # auto_id fields are excluded — user data won't contain them
+        return schema_cache.get(client, collectionName, revalidate).fields
+
+    def input_fields(self, collectionName: str) -> list[dict]:
+        """
+        Fields user data is expected to provide, as used by the file readers
+
+        Batch runs start here, so the cached schema is checked against the
+        server in case another client changed the collection.
+
+        Args:
+            collectionName: Collection name
+
+        Returns:
+            List of field dicts from describe_collection, without auto_id fields
+        """
+        try:
+            client = self._get_client()
+            return self._input_fields(client, collectionName, revalidate=True)
+        except Exception as e:
+            raise RuntimeError(f"Describe collection error: {e}") from e
+
+    def _normalize_data(self, client, collectionName: str, data, field_names=None) -> list[dict]:
         """Normalize input data to list of dicts, handling auto_id fields."""
         if isinstance(data, dict):
             return [data]
+        if isinstance(data, ColumnBatch):
+            return data.to_rows()
         if isinstance(data, list) and data and isinstance(data[0], list):
-            collection_info = client.describe_collection(collection_name=collectionName)
-            fields = collection_info.get("fields", [])
-            # Exclude auto_id fields — user data won't contain them
-            field_names = [
-                f.get("name", "") for f in fields
-                if not f.get("auto_id", False)
-            ]
-            num_entities = len(data[0])
-            formatted = []
-            for i in range(num_entities):
-                entity = {}
-                for j, name in enumerate(field_names):
-                    if j < len(data):
-                        entity[name] = data[j][i]
-                formatted.append(entity)
-            return formatted
+            return schema_cache.get(client, collectionName).batch(
+                data, field_names
+            ).to_rows()
         return data
 
+    def _resolved_name(self, client, collectionName: str) -> str:
+        """The collection an alias points to, or the name itself."""
+        try:
+            return schema_cache.get(client, collectionName).collection_name or collectionName
+        except Exception:
+            return collectionName
+
+    def _cached(self, client, key, collectionName, fetch):
+        """Rows of ``key`` from the query cache, or from ``fetch()`` then cached."""
+        rows = query_cache.get(key)
+        if rows is None:
+            rows = fetch()
+            self._store(client, key, collectionName, rows)
+        return rows
+
+    def _store(self, client, key, collectionName, rows):
+        """
+        Cache ``rows`` under ``key``, dropped by writes to the collection.
+
+        Only an already compiled schema tells which collection an alias
+        points to; without one the entry goes with a write to any collection
+        rather than costing a describe_collection per miss. Nothing is cached
+        while a bulk insert into the collection (or any, when the alias
+        target is unknown) may still be adding rows.
+        """
+        schema = schema_cache.peek(client, collectionName)
+        target = schema.collection_name if schema is not None else None
+        names = {collectionName, target} if target else None
+        try:
+            for task_id in query_cache.holding(names):
+                # Releases the task once it has finished
+                self.get_bulk_insert_state(task_id)
+        except RuntimeError:
+            return
+        if query_cache.holding(names):
+            return
+        query_cache.put(key, rows, (target or ANY_COLLECTION,))
+
+    def _invalidate_results(self, collectionName: str) -> None:
+        """Drop the cached results of a collection written through the CLI."""
+        if not query_cache.enabled:
+            return
+        query_cache.invalidate(collectionName)
+        try:
+            query_cache.invalidate(self._resolved_name(self._get_client(), collectionName))
+        except ConnectionError:
+            pass
+
     def insert(self, collectionName, data, partitionName=None, timeout=None):
         """
         Insert data into collection
         
         Args:
             collectionName: Collection name
-            data: Data to insert (list of dicts or list of lists)
+            data: Data to insert (list of dicts, list of lists or a ColumnBatch)
             partitionName: Partition name
             timeout: Timeout value
             
@@ -59,12 +174,35 @@ class MilvusClientData(BaseMilvusClient):
                 partition_name=partitionName,
                 timeout=timeout
             )
-            
+            self._invalidate_results(collectionName)
+
             return result
             
         except Exception as e:
+            # The schema may have changed under us; recompile it next time
+            schema_cache.invalidate(collectionName)
             raise RuntimeError(f"Insert data error: {e}") from e
 
+    def _query_request(self, collectionName, queryParameters):
+        """Keyword arguments of client.query for query parameters, but the timeout."""
+        request = {
+            "collection_name": collectionName,
+            "filter": queryParameters.get("expr"),
+            "output_fields": _clean_output_fields(queryParameters.get("output_fields")),
+            "partition_names": queryParameters.get("partition_names"),
+        }
+        for option in ("consistency_level", "limit"):
+            if queryParameters.get(option):
+                request[option] = queryParameters[option]
+        return request
+
+    def _query_key(self, client, request):
+        return query_cache.key(
+            client, "query", request["collection_name"], request["filter"],
+            request["output_fields"], request["partition_names"],
+            request.get("consistency_level"), request.get("limit"),
+        )
+
     def query(self, collectionName, queryParameters):
         """
         Query data from collection
@@ -78,39 +216,74 @@ class MilvusClientData(BaseMilvusClient):
         """
         try:
             client = self._get_client()
+            request = self._query_request(collectionName, queryParameters)
+
+            def fetch():
+                return client.query(timeout=queryParameters.get("timeout"), **request)
+
+            if not query_cache.enabled:
+                return fetch()
+            return self._cached(client, self._query_key(client, request), collectionName, fetch)
             
-            # Extract parameters
-            expr = queryParameters.get("expr")
-            output_fields = queryParameters.get("output_fields")
-            partition_names = queryParameters.get("partition_names")
-            timeout = queryParameters.get("timeout")
-
-            # Handle output_fields - use default if None or empty
-            if not output_fields:
-                output_fields = ["*"]
-            else:
-                # Clean up field names in case user entered brackets/quotes
-                cleaned_fields = []
-                for field in output_fields:
-                    # Strip brackets, quotes, and whitespace
-                    field = str(field).strip().strip("[]'\"")
-                    if field:
-                        cleaned_fields.append(field)
-                output_fields = cleaned_fields if cleaned_fields else ["*"]
-
-            # Perform query
-            result = client.query(
-                collection_name=collectionName,
-                filter=expr,
-                output_fields=output_fields,
-                partition_names=partition_names,
-                timeout=timeout
+        except Exception as e:
+            raise RuntimeError(f"Query data error: {e}") from e
+
+    def query_stream(self, collectionName, queryParameters, pageSize=1000, window=QUERY_RESULT_WINDOW):
+        """
+        Query data from collection, paging by primary key past the result window
+
+        Results already in the query cache are returned as they are.
+        Otherwise a count(*) pre-check sizes the result first: results that
+        fit in the server's result window come back from a single query;
+        larger ones are read page by page with query_iterator, which walks
+        the primary key instead of an offset, so they are never held at
+        once. Aggregates and queries with a limit always run as one query.
+
+        Args:
+            collectionName: Collection name
+            queryParameters: Query parameters dict, as for query
+            pageSize: Entities per page when paging
+            window: Most entities fetched with a single query
+
+        Returns:
+            (number of matching entities, iterator of result pages) pair
+        """
+        request = self._query_request(collectionName, queryParameters)
+        if request.get("limit") or any("(" in field for field in request["output_fields"]):
+            # query_iterator rejects aggregates such as count(*)
+            rows = self.query(collectionName, queryParameters)
+            return len(rows), iter([rows])
+        try:
+            client = self._get_client()
+            key = self._query_key(client, request) if query_cache.enabled else None
+            rows = query_cache.get(key) if key else None
+        except Exception as e:
+            raise RuntimeError(f"Query data error: {e}") from e
+        if rows is not None:
+            return len(rows), iter([rows])
+        total = self.count_entities(
+            collectionName,
+            request["filter"],
+            partition_names=request["partition_names"],
+            consistency_level=request.get("consistency_level"),
+        )
+        if total > window:
+            return total, self.query_pages(
+                collectionName,
+                request["filter"],
+                outputFields=request["output_fields"],
+                batchSize=pageSize,
+                partitionNames=request["partition_names"],
+                timeout=queryParameters.get("timeout"),
+                consistencyLevel=request.get("consistency_level"),
             )
-            
-            return result
-            
+        try:
+            rows = client.query(timeout=queryParameters.get("timeout"), **request)
         except Exception as e:
             raise RuntimeError(f"Query data error: {e}") from e
+        if key:
+            self._store(client, key, collectionName, rows)
+        return total, iter([rows])
 
     def delete_entities(self, expr, collectionName, partition_name=None):
         """
@@ -132,7 +305,8 @@ class MilvusClientData(BaseMilvusClient):
                 filter=expr,
                 partition_name=partition_name
             )
-            
+            self._invalidate_results(collectionName)
+
             return result
             
         except Exception as e:
@@ -161,18 +335,7 @@ class MilvusClientData(BaseMilvusClient):
             output_fields = searchParameters.get("output_fields")
             round_decimal = searchParameters.get("round_decimal", 4)
 
-            # Handle output_fields - use default if None or empty
-            if not output_fields:
-                output_fields = ["*"]
-            else:
-                # Clean up field names in case user entered brackets/quotes
-                cleaned_fields = []
-                for field in output_fields:
-                    # Strip brackets, quotes, and whitespace
-                    field = str(field).strip().strip("[]'\"")
-                    if field:
-                        cleaned_fields.append(field)
-                output_fields = cleaned_fields if cleaned_fields else ["*"]
+            output_fields = _clean_output_fields(output_fields)
             
             # Perform search
             result = client.search(
@@ -187,53 +350,358 @@ class MilvusClientData(BaseMilvusClient):
             if not prettierFormat:
                 return result
                 
-            # Format results as table
-            if result and len(result) > 0:
-                hits = result[0]  # Only support search by single vector
-                
-                # Build table rows
-                table_rows = []
-                for hit in hits:
-                    # Handle MilvusClient result format
-                    if isinstance(hit, dict):
-                        entity_id = hit.get("id", "N/A")
-                        distance = hit.get("distance", "N/A")
-                        entity_data = {k: v for k, v in hit.items() if k not in ["id", "distance"]}
-                        entity_str = str(entity_data) if entity_data else "{}"
-                    else:
-                        # Handle old format for backward compatibility
-                        entity_str = str(getattr(hit, "entity", {}))
-                        if hasattr(hit, 'id'):
-                            entity_id = hit.id
-                        elif hasattr(hit, 'get') and 'id' in hit:
-                            entity_id = hit['id']
-                        else:
-                            entity_id = "N/A"
-                        
-                        if hasattr(hit, 'distance'):
-                            distance = hit.distance
-                        elif hasattr(hit, 'get') and 'distance' in hit:
-                            distance = hit['distance']
-                        else:
-                            distance = "N/A"
-                    
-                    # Round distance if it's a number
-                    if isinstance(distance, (int, float)):
-                        distance = round(distance, round_decimal)
-                    
-                    table_rows.append([entity_id, distance, entity_str])
-                
-                return tabulate(
-                    table_rows,
-                    headers=["ID", "Distance", "Entity"],
-                    tablefmt="grid",
-                )
-            else:
-                return tabulate([], headers=["ID", "Distance", "Entity"], tablefmt="grid")
-                
+            # Only the hits of the first query vector are shown
+            return HitTable(result[0] if result else [], round_decimal).render()
+
+        except Exception as e:
+            raise RuntimeError(f"Search data error: {e}") from e
+
+    def _search_request(self, collectionName, searchParameters) -> dict:
+        """MilvusClient.search keyword arguments, without data, from search parameters."""
+        output_fields = searchParameters.get("output_fields")
+        return {
+            "collection_name": collectionName,
+            "anns_field": searchParameters.get("anns_field"),
+            "search_params": searchParameters.get("param", {}),
+            "limit": searchParameters.get("limit", 10),
+            "output_fields": _clean_output_fields(output_fields) if output_fields else None,
+            "filter": searchParameters.get("expr") or "",
+            "partition_names": searchParameters.get("partition_names"),
+            "timeout": searchParameters.get("timeout"),
+        }
+
+    def search_vectors(self, collectionName, searchParameters, vectors):
+        """
+        Search several query vectors in one request, returning the raw results
+
+        Args:
+            collectionName: Collection name
+            searchParameters: Search parameters dict, as for search; its
+                ``data`` is replaced by ``vectors``
+            vectors: Query vectors, e.g. a 2-D float32 array
+
+        Returns:
+            One list of hits per query vector
+        """
+        try:
+            client = self._get_client()
+            return client.search(
+                data=list(vectors),
+                **self._search_request(collectionName, searchParameters),
+            )
         except Exception as e:
             raise RuntimeError(f"Search data error: {e}") from e
 
+    def search_batches(self, collectionName, searchParameters, batches):
+        """
+        Search batches of query vectors, one request per batch
+
+        Args:
+            collectionName: Collection name
+            searchParameters: Search parameters dict, as for search; its
+                ``data`` is ignored
+            batches: Iterable of (index of the first query, vectors) pairs,
+                e.g. from Fs.readVectorsInBatches
+
+        Yields:
+            (index of the first query, search results) pairs, in input order
+        """
+        client = self._get_client()
+        request = self._search_request(collectionName, searchParameters)
+        for offset, vectors in batches:
+            try:
+                results = client.search(data=list(vectors), **request)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Search data error at query {offset}: {e}"
+                ) from e
+            yield offset, results
+
+    def _run_query_batches(self, action, call, batches, workers, on_results):
+        """Send ``call(*batch)`` for every (key, ...) batch through a pipeline."""
+
+        def send(item):
+            try:
+                item.append(call(*item[1:]))
+            except Exception as e:
+                raise RuntimeError(f"{action} error at batch {item[0]}: {e}") from e
+            return len(item[-1])
+
+        def commit(item):
+            if on_results:
+                on_results(item[0], item[-1])
+
+        pipeline = BatchPipeline(send, workers=workers, on_commit=commit)
+        stats = pipeline.run(list(batch) for batch in batches)
+        return {
+            "queries": stats["rows"],
+            "batches": stats["batches"],
+            "seconds": stats["seconds"],
+            "queries_per_sec": stats["rows_per_sec"],
+        }
+
+    def hybrid_search_batches(
+        self, collectionName, batches, ranker, limit, output_fields=None, workers=1,
+        on_results=None,
+    ):
+        """
+        Run hybrid searches of batches of queries, several batches at a time
+
+        Args:
+            collectionName: Collection name
+            batches: Iterable of (key, list of AnnSearchRequest) pairs, each
+                request holding the vectors of every query of the batch
+            ranker: Reranker object (WeightedRanker or RRFRanker)
+            limit: Hits per query after reranking
+            output_fields: Fields to return
+            workers: Batches searched concurrently
+            on_results: Called with the key and the results (one list of
+                hits per query) of each batch, in input order
+
+        Returns:
+            Dict with the queries and batches searched, seconds and queries/s
+        """
+        client = self._get_client()
+        return self._run_query_batches(
+            "Hybrid search",
+            lambda requests: client.hybrid_search(
+                collection_name=collectionName,
+                reqs=requests,
+                ranker=ranker,
+                limit=limit,
+                output_fields=output_fields,
+            ),
+            batches,
+            workers,
+            on_results,
+        )
+
+    def search_request_batches(self, collectionName, batches, workers=1, on_results=None):
+        """
+        Run searches of batches of query vectors, each batch with its own
+        search parameters, several batches at a time
+
+        Args:
+            collectionName: Collection name
+            batches: Iterable of (key, search parameters, vectors) triples;
+                the parameters are as for search, without ``data``
+            workers: Batches searched concurrently
+            on_results: Called with the key and the results (one list of
+                hits per query) of each batch, in input order
+
+        Returns:
+            Dict with the queries and batches searched, seconds and queries/s
+        """
+        client = self._get_client()
+        return self._run_query_batches(
+            "Search data",
+            lambda searchParameters, vectors: client.search(
+                data=list(vectors), **self._search_request(collectionName, searchParameters)
+            ),
+            batches,
+            workers,
+            on_results,
+        )
+
+    def primary_key(self, collectionName):
+        """
+        Name and type name (e.g. ``INT64``, ``VARCHAR``) of the primary field
+
+        Args:
+            collectionName: Collection name
+
+        Returns:
+            (field name, type name) pair
+        """
+        try:
+            client = self._get_client()
+            schema = schema_cache.get(client, collectionName)
+            return schema.primary_field, schema.primary_type
+        except Exception as e:
+            raise RuntimeError(f"Describe collection error: {e}") from e
+
+    def query_pages(
+        self, collectionName, expr="", outputFields=None, batchSize=1000, limit=None,
+        partitionNames=None, timeout=None, consistencyLevel=None,
+    ):
+        """
+        Stream entities page by page with query_iterator, without holding them
+
+        Args:
+            collectionName: Collection name
+            expr: Optional filter expression
+            outputFields: Fields to return, e.g. ["*"]
+            batchSize: Entities per page
+            limit: Optional maximum number of entities
+            partitionNames: Optional partitions to read
+            timeout: Optional timeout of every page request
+            consistencyLevel: Optional consistency level, the collection's by default
+
+        Yields:
+            Lists of entity dicts, in primary key order
+        """
+        options = {"consistency_level": consistencyLevel} if consistencyLevel else {}
+        try:
+            client = self._get_client()
+            iterator = client.query_iterator(
+                collection_name=collectionName,
+                batch_size=batchSize,
+                limit=limit if limit else -1,
+                filter=expr or "",
+                output_fields=outputFields,
+                partition_names=partitionNames,
+                timeout=timeout,
+                **options,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Query iterator error: {e}") from e
+        try:
+            while True:
+                try:
+                    page = iterator.next()
+                except Exception as e:
+                    raise RuntimeError(f"Query iterator error: {e}") from e
+                if not page:
+                    return
+                yield page
+        finally:
+            iterator.close()
+
+    def search_pages(self, collectionName, searchParameters, vector, batchSize=1000, limit=None):
+        """
+        Stream the neighbours of one query vector page by page with search_iterator
+
+        Args:
+            collectionName: Collection name
+            searchParameters: Search parameters dict, as for search; its
+                ``data`` and ``limit`` are ignored, and its ``param`` (metric
+                type and index params) is passed on as is
+            vector: Query vector
+            batchSize: Hits per page
+            limit: Optional maximum number of hits
+
+        Yields:
+            Lists of hits, nearest first
+        """
+        request = self._search_request(collectionName, searchParameters)
+        try:
+            client = self._get_client()
+            iterator = client.search_iterator(
+                collection_name=collectionName,
+                data=[list(vector)],
+                anns_field=request["anns_field"],
+                search_params=request["search_params"],
+                batch_size=batchSize,
+                limit=limit if limit else -1,
+                filter=request["filter"] or None,
+                output_fields=request["output_fields"],
+                partition_names=request["partition_names"],
+                timeout=request["timeout"],
+            )
+        except Exception as e:
+            raise RuntimeError(f"Search iterator error: {e}") from e
+        try:
+            while True:
+                try:
+                    page = iterator.next()
+                except Exception as e:
+                    raise RuntimeError(f"Search iterator error: {e}") from e
+                if not page:
+                    return
+                yield page
+        finally:
+            iterator.close()
+
+    def split_primary_keys(self, collectionName, expr="", parts=2, window=QUERY_RESULT_WINDOW):
+        """
+        Primary keys splitting the keys matching ``expr`` into ranges of about equal size
+
+        The boundary of range j is the key ranked j * count / ``parts`` in key
+        order. The key space is bisected with count(*) queries until at most
+        ``window`` keys are left below the boundary, which is then read with
+        one offset query, so the cost depends on the key width rather than
+        on the number of entities, and skewed keys split as evenly as dense
+        ones.
+
+        Args:
+            collectionName: Collection name
+            expr: Optional filter expression
+            parts: Number of ranges
+            window: Largest offset a query may skip
+
+        Returns:
+            Up to ``parts - 1`` distinct primary keys, in ascending order
+        """
+        primaryField, primaryType = self.primary_key(collectionName)
+        total = self.count_entities(collectionName, expr)
+        boundaries = []
+        # ``low`` bounds the keys from below, ``below`` of them at or under it
+        low, below = None, 0
+        for part in range(1, parts):
+            rank = part * total // parts
+            if rank <= below:
+                continue
+            high = None
+            while rank - below > window:
+                middle = middle_key(primaryType, low, high)
+                if middle in (low, high):
+                    break
+                count = self.count_entities(
+                    collectionName, range_filter(expr, primaryField, primaryType, high=middle)
+                )
+                if count < rank:
+                    low, below = middle, count
+                else:
+                    high = middle
+            low = self._key_after(
+                collectionName, range_filter(expr, primaryField, primaryType, low=low),
+                primaryField, rank - below - 1,
+            )
+            below = rank
+            boundaries.append(low)
+        return boundaries
+
+    def _key_after(self, collectionName, expr, primaryField, offset):
+        """The primary key ``offset`` places after the first one matching ``expr``."""
+        try:
+            rows = self._get_client().query(
+                collection_name=collectionName,
+                filter=expr,
+                output_fields=[primaryField],
+                offset=offset,
+                limit=1,
+            )
+        except Exception as e:
+            raise RuntimeError(f"Query data error: {e}") from e
+        if not rows:
+            raise RuntimeError(f"Query data error: no key at offset {offset} of {expr}")
+        return rows[0][primaryField]
+
+    def iter_vectors(self, collectionName, annsField, batchSize=1000, expr="", limit=None):
+        """
+        Stream the primary keys and vectors of a collection with query_iterator
+
+        Args:
+            collectionName: Collection name
+            annsField: Float vector field to read
+            batchSize: Entities per iterator page
+            expr: Optional filter expression
+            limit: Optional maximum number of entities
+
+        Yields:
+            (list of primary keys, float32 array of shape (rows, dim)) pairs
+        """
+        import numpy as np
+
+        primaryField, _ = self.primary_key(collectionName)
+        for page in self.query_pages(
+            collectionName, expr, [primaryField, annsField], batchSize, limit
+        ):
+            yield (
+                [row[primaryField] for row in page],
+                np.asarray([row[annsField] for row in page], dtype=np.float32),
+            )
+
     def get_entity_count(self, collectionName: str, partitionName: str | None = None) -> int:
         """Get entity count in collection or partition."""
         try:
@@ -273,12 +741,130 @@ class MilvusClientData(BaseMilvusClient):
                 partition_name=partitionName,
                 timeout=timeout
             )
-            
+            self._invalidate_results(collectionName)
+
             return result
 
         except Exception as e:
+            # The schema may have changed under us; recompile it next time
+            schema_cache.invalidate(collectionName)
             raise RuntimeError(f"Upsert data error: {e}") from e
 
+    def insert_batches(
+        self,
+        collectionName,
+        batches,
+        partitionName=None,
+        timeout=None,
+        upsert=False,
+        workers=1,
+        max_in_flight=None,
+        on_commit=None,
+        profiler=None,
+        dry_run=False,
+    ):
+        """
+        Insert (or upsert) a stream of column-major batches
+
+        Batches are parsed on the calling thread and carried as ColumnBatch
+        columns while up to ``workers`` threads send insert/upsert RPCs; at
+        most ``max_in_flight`` batches (default: twice the workers) are held
+        in memory at once. A batch is only turned into the row dicts
+        MilvusClient expects by the worker sending it. With more
+        than one worker batches may be applied out of order, but
+        ``on_commit`` is always called in input order, once a batch and all
+        the batches before it were acknowledged.
+
+        Args:
+            collectionName: Collection name
+            batches: Iterable of batches as produced by Fs.readFileInBatches;
+                a batch's ``fields`` names its data columns, which otherwise
+                follow the input fields in schema order
+            partitionName: Partition name
+            timeout: Timeout value for each RPC
+            upsert: Upsert instead of insert
+            workers: Number of concurrent RPC workers
+            max_in_flight: Maximum number of batches queued or being sent
+            on_commit: Called with the batch metadata (rows, offset,
+                row_offset) of each committed batch
+            profiler: Optional Profiler.StageProfiler timing the read,
+                parse, convert and send stages
+            dry_run: Convert every batch but skip the RPC, counting its rows
+                as if they had been sent
+
+        Returns:
+            Dict with the total row count, number of batches, seconds and rows/s
+        """
+        action = "upsert" if upsert else "insert"
+        count_key = f"{action}_count"
+        pipeline = None
+        try:
+            client = self._get_client()
+            send_rpc = client.upsert if upsert else client.insert
+
+            def send(item):
+                # Build the rows just before the RPC and release them as soon
+                # as they are sent; only the batch metadata waits for earlier
+                # batches to be committed.
+                with profile_stage(profiler, "convert"):
+                    data = item.pop("data").to_rows()
+                if profiler:
+                    profiler.count("convert", len(data), item.get("bytes", 0))
+                if dry_run:
+                    return len(data)
+                with profile_stage(profiler, "send"):
+                    count = send_rpc(
+                        collection_name=collectionName,
+                        data=data,
+                        partition_name=partitionName,
+                        timeout=timeout
+                    ).get(count_key, 0)
+                if profiler:
+                    profiler.count("send", count, item.get("bytes", 0))
+                return count
+
+            pipeline = BatchPipeline(
+                send,
+                workers=workers,
+                max_in_flight=max_in_flight,
+                on_commit=on_commit,
+            )
+            schema = schema_cache.get(client, collectionName)
+            if profiler:
+                batches = profiler.read_batches(batches)
+            converted = (
+                {
+                    **{
+                        k: v for k, v in batch.items()
+                        if k not in ("columns", "fields", "data")
+                    },
+                    "data": schema.batch(batch["data"], batch.get("fields")),
+                }
+                for batch in batches
+            )
+            try:
+                stats = pipeline.run(converted)
+            finally:
+                if profiler:
+                    profiler.finish()
+                # Batches sent before a failure are applied as well
+                if not dry_run:
+                    self._invalidate_results(collectionName)
+        except ParameterException:
+            raise
+        except Exception as e:
+            schema_cache.invalidate(collectionName)
+            done = pipeline.rows if pipeline else 0
+            raise RuntimeError(
+                f"{action.capitalize()} data error after {done} rows: {e}"
+            ) from e
+        return {
+            count_key: stats["rows"],
+            "batches": stats["batches"],
+            "seconds": stats["seconds"],
+            "rows_per_sec": stats["rows_per_sec"],
+        }
+
     def get_by_ids(self, collectionName, ids, output_fields=None):
         """
         Get entities by IDs
@@ -293,12 +879,17 @@ class MilvusClientData(BaseMilvusClient):
         """
         try:
             client = self._get_client()
-            result = client.get(
-                collection_name=collectionName,
-                ids=ids,
-                output_fields=output_fields
-            )
-            return result
+            def fetch():
+                return client.get(
+                    collection_name=collectionName,
+                    ids=ids,
+                    output_fields=output_fields
+                )
+
+            if not query_cache.enabled:
+                return fetch()
+            key = query_cache.key(client, "get", collectionName, ids, output_fields)
+            return self._cached(client, key, collectionName, fetch)
         except Exception as e:
             raise RuntimeError(f"Get by IDs error: {e}") from e
 
@@ -321,10 +912,208 @@ class MilvusClientData(BaseMilvusClient):
                 ids=ids,
                 partition_name=partition_name
             )
+            self._invalidate_results(collectionName)
             return result
         except Exception as e:
             raise RuntimeError(f"Delete by IDs error: {e}") from e
 
+    def _run_id_chunks(self, action, chunks, call, workers, retries, on_commit):
+        """Send ``call(ids)`` for every chunk of IDs through a pipeline, retrying failed chunks."""
+
+        def send(item):
+            item["result"] = retry_call(lambda: call(item["ids"]), retries)
+            return len(item["ids"])
+
+        pipeline = BatchPipeline(send, workers=workers, on_commit=on_commit)
+        try:
+            stats = pipeline.run({"offset": offset, "ids": ids} for offset, ids in chunks)
+        except ParameterException:
+            raise
+        except Exception as e:
+            raise RuntimeError(f"{action} error after {pipeline.rows} IDs: {e}") from e
+        return {
+            "ids": stats["rows"],
+            "chunks": stats["batches"],
+            "seconds": stats["seconds"],
+            "ids_per_sec": stats["rows_per_sec"],
+        }
+
+    def get_id_chunks(
+        self, collectionName, chunks, output_fields=None, workers=4, retries=3, on_rows=None
+    ):
+        """
+        Get entities by chunks of IDs, several chunks at a time
+
+        Args:
+            collectionName: Collection name
+            chunks: Iterable of (index of the first ID, list of IDs) pairs,
+                e.g. from Fs.readIdsInBatches
+            output_fields: Fields to return
+            workers: Chunks requested concurrently
+            retries: Retries of a failed chunk before giving up
+            on_rows: Called with the entities found for each chunk, in input
+                order, so they can be written out and released
+
+        Returns:
+            Dict with the IDs requested, entities found, chunks, seconds and IDs/s
+        """
+        client = self._get_client()
+        found = 0
+
+        def commit(item):
+            nonlocal found
+            rows = item.pop("result")
+            found += len(rows)
+            if on_rows:
+                on_rows(rows)
+
+        stats = self._run_id_chunks(
+            "Get by IDs",
+            chunks,
+            lambda ids: client.get(
+                collection_name=collectionName, ids=ids, output_fields=output_fields
+            ),
+            workers,
+            retries,
+            commit,
+        )
+        return {**stats, "found": found}
+
+    def delete_id_chunks(
+        self, collectionName, chunks, partition_name=None, workers=4, retries=3, on_commit=None
+    ):
+        """
+        Delete entities by chunks of IDs, several chunks at a time
+
+        A retried chunk may delete some of its IDs twice, which is harmless.
+
+        Args:
+            collectionName: Collection name
+            chunks: Iterable of (index of the first ID, list of IDs) pairs,
+                e.g. from Fs.readIdsInBatches
+            partition_name: Partition name
+            workers: Chunks deleted concurrently
+            retries: Retries of a failed chunk before giving up
+            on_commit: Called with the IDs of each chunk, in input order,
+                once it and every chunk before it were deleted
+
+        Returns:
+            Dict with the IDs sent, delete count, chunks, seconds and IDs/s
+        """
+        client = self._get_client()
+        deleted = 0
+
+        def commit(item):
+            nonlocal deleted
+            result = item.pop("result")
+            deleted += (result or {}).get("delete_count", 0)
+            if on_commit:
+                on_commit(item["ids"])
+
+        try:
+            stats = self._run_id_chunks(
+                "Delete by IDs",
+                chunks,
+                lambda ids: client.delete(
+                    collection_name=collectionName, ids=ids, partition_name=partition_name
+                ),
+                workers,
+                retries,
+                commit,
+            )
+        finally:
+            self._invalidate_results(collectionName)
+        return {**stats, "delete_count": deleted}
+
+    def count_entities(
+        self, collectionName, expr="", partition_name=None, partition_names=None,
+        consistency_level=None,
+    ):
+        """
+        Number of entities matching an expression, counted by the server
+
+        Args:
+            collectionName: Collection name
+            expr: Optional filter expression
+            partition_name: Optional partition to count in
+            partition_names: Optional partitions to count in, instead
+            consistency_level: Optional consistency level, the collection's by default
+
+        Returns:
+            int: Matching entities
+        """
+        try:
+            client = self._get_client()
+            result = client.query(
+                collection_name=collectionName,
+                filter=expr or "",
+                output_fields=["count(*)"],
+                partition_names=partition_names or ([partition_name] if partition_name else None),
+                **({"consistency_level": consistency_level} if consistency_level else {}),
+            )
+            return safe_int(result[0].get("count(*)", 0)) if result else 0
+        except Exception as e:
+            raise RuntimeError(f"Count entities error: {e}") from e
+
+    def delete_matching(
+        self,
+        collectionName,
+        expr,
+        partition_name=None,
+        batchSize=1000,
+        workers=1,
+        retries=3,
+        rate=None,
+        start_after=None,
+        on_commit=None,
+    ):
+        """
+        Delete the entities matching an expression in chunks of primary keys
+
+        Instead of one server-side delete of everything the filter matches,
+        the matching primary keys are enumerated with query_iterator, in
+        ascending order, and deleted ``batchSize`` at a time. This bounds
+        the work of each request and lets the pace be limited so searches
+        on the same cluster are not starved.
+
+        Args:
+            collectionName: Collection name
+            expr: Filter expression selecting the entities
+            partition_name: Partition name
+            batchSize: Primary keys per delete request
+            workers: Chunks deleted concurrently
+            retries: Retries of a failed chunk before giving up
+            rate: Optional maximum IDs deleted per second
+            start_after: Skip primary keys up to this one, to resume
+            on_commit: Called with the IDs of each chunk, in primary key
+                order, once it and every chunk before it were deleted
+
+        Returns:
+            Dict with the IDs sent, delete count, chunks, seconds and IDs/s
+        """
+        primaryField, primaryType = self.primary_key(collectionName)
+        queryExpr = range_filter(expr, primaryField, primaryType, low=start_after)
+        limiter = RateLimiter(rate) if rate else None
+
+        def chunks():
+            offset = 0
+            for page in self.query_pages(
+                collectionName,
+                queryExpr,
+                [primaryField],
+                batchSize,
+                partitionNames=[partition_name] if partition_name else None,
+            ):
+                ids = [row[primaryField] for row in page]
+                if limiter:
+                    limiter.acquire(len(ids))
+                yield offset, ids
+                offset += len(ids)
+
+        return self.delete_id_chunks(
+            collectionName, chunks(), partition_name, workers, retries, on_commit
+        )
+
     def bulk_insert(self, collectionName, files, partition_name=None):
         """
         Bulk insert data from files
@@ -344,6 +1133,11 @@ class MilvusClientData(BaseMilvusClient):
                 partition_name=partition_name,
                 files=files
             )
+            self._invalidate_results(collectionName)
+            if query_cache.enabled:
+                query_cache.hold(
+                    task_id, {collectionName, self._resolved_name(client, collectionName)}
+                )
             return task_id
         except Exception as e:
             raise RuntimeError(f"Bulk insert error: {e}") from e
@@ -361,10 +1155,59 @@ class MilvusClientData(BaseMilvusClient):
         try:
             client = self._get_client()
             state = client.get_bulk_insert_state(task_id)
+            if bulk_insert_finished(state):
+                query_cache.release(task_id)
             return state
         except Exception as e:
             raise RuntimeError(f"Get bulk insert state error: {e}") from e
 
+    def wait_bulk_insert_tasks(
+        self, task_ids, interval=2.0, workers=8, timeout=None, on_progress=None
+    ):
+        """
+        Poll bulk insert tasks concurrently until every one has finished
+
+        Args:
+            task_ids: Task IDs to wait for
+            interval: Seconds between polling rounds
+            workers: Maximum number of concurrent state requests
+            timeout: Give up after this many seconds, None waits forever
+            on_progress: Called with the dict of latest states by task ID
+                after each polling round
+
+        Returns:
+            Dict of final task states by task ID
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        import time
+
+        states = {}
+        pending = list(task_ids)
+        deadline = time.monotonic() + timeout if timeout else None
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(workers, len(pending))),
+            thread_name_prefix="milvus_cli_poll",
+        ) as pool:
+            while pending:
+                for task_id, state in zip(
+                    pending, pool.map(self.get_bulk_insert_state, pending)
+                ):
+                    states[task_id] = state
+                    # The imported rows only become visible once a task is done
+                    if bulk_insert_finished(state) and getattr(state, "collection_name", None):
+                        self._invalidate_results(state.collection_name)
+                pending = [t for t in pending if not bulk_insert_finished(states[t])]
+                if on_progress:
+                    on_progress(states)
+                if not pending:
+                    break
+                if deadline and time.monotonic() >= deadline:
+                    raise RuntimeError(
+                        f"Timed out waiting for bulk insert tasks {pending}"
+                    )
+                time.sleep(interval)
+        return states
+
     def list_bulk_insert_tasks(self, limit=None, collectionName=None):
         """
         List bulk insert tasks
@@ -386,7 +1229,9 @@ class MilvusClientData(BaseMilvusClient):
         except Exception as e:
             raise RuntimeError(f"List bulk insert tasks error: {e}") from e
 
-    def hybrid_search(self, collectionName, requests, rerank, limit, output_fields=None):
+    def hybrid_search(
+        self, collectionName, requests, rerank, limit, output_fields=None, prettierFormat=True
+    ):
         """
         Perform hybrid search (multi-vector search) with reranking.
 
@@ -396,25 +1241,15 @@ class MilvusClientData(BaseMilvusClient):
             rerank: Reranker object (WeightedRanker or RRFRanker)
             limit: Maximum number of results to return
             output_fields: List of fields to return
+            prettierFormat: Whether to format output as table
 
         Returns:
-            Formatted search results
+            Search results (formatted table if prettierFormat=True)
         """
         try:
             client = self._get_client()
 
-            # Handle output_fields - use default if None or empty
-            if not output_fields:
-                output_fields = ["*"]
-            else:
-                # Clean up field names in case user entered brackets/quotes
-                cleaned_fields = []
-                for field in output_fields:
-                    # Strip brackets, quotes, and whitespace
-                    field = str(field).strip().strip("[]'\"")
-                    if field:
-                        cleaned_fields.append(field)
-                output_fields = cleaned_fields if cleaned_fields else ["*"]
+            output_fields = _clean_output_fields(output_fields)
 
             # Perform hybrid search using MilvusClient API
             results = client.hybrid_search(
@@ -425,29 +1260,9 @@ class MilvusClientData(BaseMilvusClient):
                 output_fields=output_fields
             )
 
-            # Format results as table
-            if results and len(results) > 0:
-                table_rows = []
-                for hit in results[0]:
-                    if isinstance(hit, dict):
-                        entity_id = hit.get("id", "N/A")
-                        distance = hit.get("distance", "N/A")
-                        fields = {k: v for k, v in hit.items() if k not in ["id", "distance"]}
-                    else:
-                        entity_id = hit.id if hasattr(hit, 'id') else "N/A"
-                        distance = hit.distance if hasattr(hit, 'distance') else "N/A"
-                        fields = hit.fields if hasattr(hit, 'fields') else {}
-                    if isinstance(distance, (int, float)):
-                        distance = round(distance, 4)
-                    table_rows.append([entity_id, distance, str(fields)])
-
-                return tabulate(
-                    table_rows,
-                    headers=["ID", "Distance", "Fields"],
-                    tablefmt="grid",
-                )
-            else:
-                return tabulate([], headers=["ID", "Distance", "Fields"], tablefmt="grid")
+            if not prettierFormat:
+                return results
+            return HitTable(results[0] if results else []).render()
 
         except Exception as e:
             raise RuntimeError(f"Hybrid search error: {e}") from e
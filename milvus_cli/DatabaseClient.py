@@ -2,8 +2,12 @@ from __future__ import annotations
 
 try:
     from .BaseClient import BaseMilvusClient
+    from .Converter import schema_cache
+    from .QueryCache import query_cache
 except ImportError:
     from BaseClient import BaseMilvusClient
+    from Converter import schema_cache
+    from QueryCache import query_cache
 
 
 class MilvusClientDatabase(BaseMilvusClient):
@@ -60,6 +64,8 @@ class MilvusClientDatabase(BaseMilvusClient):
                 return f"Drop database {dbName} successfully!"
             
             client.drop_database(db_name=dbName)
+            schema_cache.invalidate()
+            query_cache.invalidate()
             return f"Drop database {dbName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Drop database error: {e}") from e
@@ -77,6 +83,9 @@ class MilvusClientDatabase(BaseMilvusClient):
         try:
             client = self._get_client()
             client.using_database(db_name=dbName)
+            # Cached schemas belong to the previous database
+            schema_cache.invalidate()
+            query_cache.invalidate()
             return f"Using database {dbName} successfully!"
         except Exception as e:
             raise RuntimeError(f"Using database error: {e}") from e
@@ -0,0 +1,566 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+try:
+    from .Checkpoint import ExportCheckpoint, write_json_atomic
+    from .Types import ParameterException
+except ImportError:
+    from Checkpoint import ExportCheckpoint, write_json_atomic
+    from Types import ParameterException
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet")
+_EXTENSIONS = {".jsonl": "jsonl", ".json": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".parquet": "parquet"}
+# Bytes buffered before a text export touches the disk
+WRITE_BUFFER = 1 << 20
+
+
+def export_format(path: str | None, fmt: str | None = None) -> str:
+    """Output format given explicitly or by the file extension, JSON Lines for stdout."""
+    if fmt:
+        if fmt not in EXPORT_FORMATS:
+            raise ParameterException(f"Export format should be one of {EXPORT_FORMATS}.")
+        return fmt
+    if not path or path == "-":
+        return "jsonl"
+    ext = os.path.splitext(path.lower())[1]
+    if ext not in _EXTENSIONS:
+        raise ParameterException(
+            f"Cannot tell the format of {path}, use a .jsonl, .csv or .parquet file or pass --format."
+        )
+    return _EXTENSIONS[ext]
+
+
+def _pk_literal(type_name: str, value) -> str:
+    if type_name == "VARCHAR":
+        return json.dumps(str(value), ensure_ascii=False)
+    return str(int(value))
+
+
+# VARCHAR keys compare by code point; surrogates cannot appear in them
+_CODE_POINTS = 0x110000 - 0x800
+_INT64_MIN, _INT64_MAX = -(2**63), 2**63 - 1
+
+
+def _text_value(text: str) -> Fraction:
+    """``text`` as a fraction of [0, 1), in code point order."""
+    digits = [ord(c) - 0x800 if ord(c) >= 0xE000 else ord(c) for c in text]
+    value = 0
+    for digit in digits:
+        value = value * _CODE_POINTS + digit
+    return Fraction(value, _CODE_POINTS ** len(digits))
+
+
+def _text_of(value: Fraction) -> str:
+    chars = []
+    while value:
+        value *= _CODE_POINTS
+        digit = value.numerator // value.denominator
+        value -= digit
+        chars.append(chr(digit + 0x800 if digit >= 0xD800 else digit))
+    return "".join(chars)
+
+
+def middle_key(type_name: str, low=None, high=None):
+    """
+    A primary key about halfway between ``low`` and ``high``; None leaves an end open.
+
+    INT64 keys are halved as integers, VARCHAR keys as fractions of [0, 1)
+    whose digits are their code points, which keeps their order.
+    """
+    if type_name == "VARCHAR":
+        low = _text_value(low) if low is not None else Fraction(0)
+        high = _text_value(high) if high is not None else Fraction(1)
+        return _text_of((low + high) / 2)
+    low = _INT64_MIN - 1 if low is None else int(low)
+    high = _INT64_MAX if high is None else int(high)
+    return (low + high) // 2
+
+
+def range_filter(expr: str | None, field: str, type_name: str, low=None, high=None) -> str:
+    """``expr`` narrowed to primary keys in ``(low, high]``; None leaves an end open."""
+    bounds = []
+    if low is not None:
+        bounds.append(f"{field} > {_pk_literal(type_name, low)}")
+    if high is not None:
+        bounds.append(f"{field} <= {_pk_literal(type_name, high)}")
+    if not bounds:
+        return expr or ""
+    cursor = " and ".join(bounds)
+    return f"({expr}) and {cursor}" if expr else cursor
+
+
+def resume_filter(expr: str | None, field: str, type_name: str, last_pk) -> str:
+    """``expr`` narrowed to primary keys after ``last_pk``, as query_iterator returns them in order."""
+    return range_filter(expr, field, type_name, low=last_pk)
+
+
+def _plain(value):
+    """JSON-friendly form of values pymilvus returns (NumPy, bytes)."""
+    tolist = getattr(value, "tolist", None)
+    if tolist:
+        return tolist()
+    if isinstance(value, (bytes, bytearray)):
+        return list(value)
+    return str(value)
+
+
+class ExportWriter:
+    """
+    Append batches of entity dicts to a JSON Lines, csv or Parquet file.
+
+    Text formats are written through a large buffer and flushed at the end
+    of every batch, so ``tell`` is a consistent offset to resume from: a
+    resumed export truncates the file back to it and appends. Csv columns
+    come from the first batch (or the header of the file being resumed).
+    Parquet writes one row group per batch with the schema of the first
+    batch; as a Parquet file cannot be appended to, resuming copies the row
+    groups of the previous, cleanly closed, file into a new one. A resumed
+    file must still hold ``resume_offset`` bytes, or for Parquet exactly
+    ``resume_rows`` rows when given.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fmt: str,
+        resume_offset: int | None = None,
+        resume_rows: int | None = None,
+    ) -> None:
+        if fmt not in EXPORT_FORMATS:
+            raise ParameterException(f"Export format should be one of {EXPORT_FORMATS}.")
+        if path == "-" and (fmt == "parquet" or resume_offset is not None):
+            raise ParameterException("Parquet and resumed exports need an output file.")
+        self.path = path
+        self.fmt = fmt
+        self.rows = 0
+        self._columns = None
+        self._writer = None
+        self._tmp_path = None
+        if fmt == "parquet":
+            self._open_parquet(resume_offset is not None, resume_rows)
+        elif path == "-":
+            import click
+
+            self._file = click.get_binary_stream("stdout")
+        elif resume_offset is not None:
+            size = os.path.getsize(path) if os.path.exists(path) else None
+            if size is None or size < resume_offset:
+                self._cannot_resume(
+                    f"it holds {size} bytes, not the {resume_offset} exported"
+                    if size is not None else "it is missing"
+                )
+            self._file = open(path, "r+b", buffering=WRITE_BUFFER)
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+            if fmt == "csv" and resume_offset:
+                with open(path, newline="", encoding="utf-8") as f:
+                    self._columns = next(csv.reader(f), None)
+        else:
+            self._file = open(path, "wb", buffering=WRITE_BUFFER)
+
+    def _cannot_resume(self, reason: str) -> None:
+        raise ParameterException(
+            f"Cannot resume {self.path}, {reason}. Drop --resume to export it again."
+        )
+
+    def _open_parquet(self, resume: bool, resume_rows: int | None = None) -> None:
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ParameterException(
+                "Exporting to Parquet requires pyarrow, install it with `pip install pyarrow`."
+            )
+        if not resume:
+            return
+        if not os.path.exists(self.path):
+            self._cannot_resume("it is missing")
+        try:
+            previous = pq.ParquetFile(self.path)
+        except Exception as e:
+            raise ParameterException(
+                f"Cannot resume {self.path}, it was not closed cleanly ({e}). "
+                "Delete it and its checkpoint to start over."
+            )
+        if resume_rows is not None and previous.metadata.num_rows != resume_rows:
+            self._cannot_resume(
+                f"it holds {previous.metadata.num_rows} rows, not the {resume_rows} exported"
+            )
+        fd, self._tmp_path = tempfile.mkstemp(
+            prefix=".milvus_cli_", suffix=".parquet", dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        os.close(fd)
+        self._writer = pq.ParquetWriter(self._tmp_path, previous.schema_arrow)
+        for index in range(previous.num_row_groups):
+            self._writer.write_table(previous.read_row_group(index))
+
+    def write(self, rows: list) -> None:
+        """Append one batch and make it durable up to ``tell``."""
+        if not rows:
+            return
+        if self.fmt == "parquet":
+            self._write_parquet(rows)
+        else:
+            if self.fmt == "jsonl":
+                text = "".join(
+                    json.dumps(row, default=_plain, ensure_ascii=False) + "\n" for row in rows
+                )
+            else:
+                text = self._csv_text(rows)
+            self._file.write(text.encode("utf-8"))
+            self._file.flush()
+        self.rows += len(rows)
+
+    def _csv_text(self, rows: list) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self._columns is None:
+            self._columns = list(rows[0])
+            writer.writerow(self._columns)
+        for row in rows:
+            writer.writerow(
+                [
+                    json.dumps(value, default=_plain)
+                    if isinstance(value, (dict, list)) or hasattr(value, "tolist")
+                    else value
+                    for value in (row.get(column) for column in self._columns)
+                ]
+            )
+        return buffer.getvalue()
+
+    def _write_parquet(self, rows: list) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [
+            {
+                key: json.dumps(value, default=_plain) if isinstance(value, dict)
+                else value.tolist() if hasattr(value, "tolist")
+                else value
+                for key, value in row.items()
+            }
+            for row in rows
+        ]
+        try:
+            if self._writer is None:
+                table = pa.Table.from_pylist(rows)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pylist(rows, schema=self._writer.schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            raise ParameterException(f"Batch does not fit the Parquet schema: {e}")
+        self._writer.write_table(table)
+
+    def tell(self) -> int:
+        """Bytes written so far by a text export, 0 for Parquet."""
+        if self.fmt == "parquet" or self.path == "-":
+            return 0
+        return self._file.tell()
+
+    def close(self) -> None:
+        if self.fmt == "parquet":
+            if self._writer is not None:
+                self._writer.close()
+            if self._tmp_path:
+                os.replace(self._tmp_path, self.path)
+                self._tmp_path = None
+        elif self.path == "-":
+            self._file.flush()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_range(
+    data,
+    collectionName: str,
+    out: str | None,
+    fmt: str,
+    expr: str = "",
+    outputFields: list | None = None,
+    batchSize: int = 1000,
+    limit: int | None = None,
+    resume: bool = False,
+    on_rows=None,
+) -> dict:
+    """
+    Stream the entities matching ``expr`` into ``out`` (or stdout) page by page.
+
+    Unless writing to stdout, progress is checkpointed after every page to
+    ``<out>.checkpoint.json`` and ``resume`` continues after the last
+    primary key written. The primary key is always exported, being the
+    resume cursor. ``on_rows(count, resumed)`` is called for every page
+    written, and once with ``resumed`` set for the rows already exported
+    when resuming.
+
+    Returns:
+        dict: ``rows`` in the output, ``exported`` by this run, and
+        ``skipped`` when a finished export was found
+    """
+    toStdout = out in (None, "-")
+    if resume and toStdout:
+        raise ParameterException("Resuming an export needs an output file.")
+    primaryField, primaryType = data.primary_key(collectionName)
+    if outputFields and "*" not in outputFields and primaryField not in outputFields:
+        outputFields = [primaryField] + list(outputFields)
+    outputFields = outputFields or ["*"]
+
+    checkpoint = None
+    state = {"rows": 0, "last_pk": None, "offset": 0, "completed": False}
+    if not toStdout:
+        checkpoint = ExportCheckpoint(out, collectionName, expr, outputFields, fmt)
+        if resume:
+            state = checkpoint.load()
+    rows = state["rows"]
+    if on_rows and rows:
+        on_rows(rows, True)
+    if state["completed"] or (limit and rows >= limit):
+        return {"rows": rows, "exported": 0, "skipped": True}
+    resuming = bool(resume and rows)
+    queryExpr = resume_filter(expr, primaryField, primaryType, state["last_pk"]) if resuming else expr
+    exported = 0
+    with ExportWriter(
+        out or "-",
+        fmt,
+        state["offset"] if resuming else None,
+        rows if resuming else None,
+    ) as writer:
+        for page in data.query_pages(
+            collectionName, queryExpr, outputFields, batchSize, limit - rows if limit else None
+        ):
+            writer.write(page)
+            rows += len(page)
+            exported += len(page)
+            if checkpoint:
+                checkpoint.commit(rows, page[-1][primaryField], writer.tell())
+            if on_rows:
+                on_rows(len(page), False)
+    if checkpoint:
+        checkpoint.complete()
+    return {"rows": rows, "exported": exported, "skipped": False}
+
+
+def export_search(
+    data,
+    collectionName: str,
+    searchParameters: dict,
+    vectors,
+    out: str | None,
+    fmt: str,
+    batchSize: int = 1000,
+    limit: int | None = None,
+    on_rows=None,
+) -> int:
+    """
+    Stream the neighbours of each query vector into ``out`` (or stdout) page by page.
+
+    Every hit is one row tagged with its ``query`` index and ``rank``,
+    followed by ``id``, ``distance`` and the output fields, so memory holds
+    one page of hits however many neighbours are pulled. ``on_rows(count)``
+    is called for every page written.
+
+    Returns:
+        int: Hits written
+    """
+    try:
+        from .DataClient import search_hits
+    except ImportError:
+        from DataClient import search_hits
+
+    rows = 0
+    with ExportWriter(out or "-", fmt) as writer:
+        for query, vector in enumerate(vectors):
+            rank = 0
+            for page in data.search_pages(collectionName, searchParameters, vector, batchSize, limit):
+                writer.write(list(search_hits([page], query, rank)))
+                rank += len(page)
+                if on_rows:
+                    on_rows(len(page))
+            rows += rank
+    return rows
+
+
+def pk_ranges(boundaries: list) -> list:
+    """Disjoint ``(low, high]`` ranges covering every key, open at both ends."""
+    edges = [None] + list(boundaries) + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def manifest_path(out: str) -> str:
+    root, _ext = os.path.splitext(out)
+    return f"{root}.manifest.json"
+
+
+def shard_path(out: str, index: int) -> str:
+    root, ext = os.path.splitext(out)
+    return f"{root}.part-{index:05d}{ext}"
+
+
+def _load_manifest(path: str) -> dict | None:
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        raise ParameterException(f"Cannot read manifest {path}: {e}")
+
+
+def export_parallel(
+    data,
+    collectionName: str,
+    out: str,
+    fmt: str,
+    expr: str = "",
+    outputFields: list | None = None,
+    batchSize: int = 1000,
+    parallel: int = 4,
+    resume: bool = False,
+    on_rows=None,
+) -> dict:
+    """
+    Export disjoint primary-key ranges concurrently, one shard file each.
+
+    The range boundaries are the primary keys at every ``1 / parallel``
+    quantile of the matching keys (see split_primary_keys), so ranges hold
+    about the same number of entities. Each range runs its own
+    query_iterator on a worker thread, into its own resumable shard, and
+    the ranges are recorded in ``<out root>.manifest.json`` in key order,
+    so the shards read in manifest order form the whole export. Resuming
+    reuses the ranges of the manifest.
+
+    Returns:
+        dict: The manifest
+    """
+    if out in (None, "-"):
+        raise ParameterException("A parallel export writes shards and needs an output file.")
+    if parallel < 1:
+        raise ParameterException("Parallelism should be a positive integer.")
+    primaryField, primaryType = data.primary_key(collectionName)
+    path = manifest_path(out)
+    manifest = _load_manifest(path) if resume else None
+    if manifest is not None:
+        for key, value in (
+            ("collection", collectionName),
+            ("expr", expr or ""),
+            ("output_fields", outputFields),
+            ("format", fmt),
+        ):
+            if manifest.get(key) != value:
+                raise ParameterException(
+                    f"Manifest {path} was written for {key} '{manifest.get(key)}', not '{value}'."
+                )
+    else:
+        boundaries = []
+        if parallel > 1:
+            boundaries = data.split_primary_keys(collectionName, expr, parallel)
+        manifest = {
+            "version": 1,
+            "collection": collectionName,
+            "expr": expr or "",
+            "output_fields": outputFields,
+            "format": fmt,
+            "primary_field": primaryField,
+            "shards": [
+                {"path": os.path.basename(shard_path(out, index)), "low": low, "high": high, "rows": 0, "completed": False}
+                for index, (low, high) in enumerate(pk_ranges(boundaries))
+            ],
+            "rows": 0,
+            "completed": False,
+        }
+    directory = os.path.dirname(os.path.abspath(out))
+    lock = threading.Lock()
+
+    def save():
+        manifest["rows"] = sum(shard["rows"] for shard in manifest["shards"])
+        manifest["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+        write_json_atomic(path, manifest)
+
+    with lock:
+        save()
+
+    def run(shard):
+        result = export_range(
+            data,
+            collectionName,
+            os.path.join(directory, shard["path"]),
+            fmt,
+            range_filter(expr, primaryField, primaryType, shard["low"], shard["high"]),
+            outputFields,
+            batchSize,
+            resume=resume,
+            on_rows=on_rows,
+        )
+        with lock:
+            shard["rows"] = result["rows"]
+            shard["completed"] = True
+            save()
+        return result
+
+    with ThreadPoolExecutor(
+        max_workers=min(parallel, len(manifest["shards"])), thread_name_prefix="milvus_cli_export"
+    ) as pool:
+        # Surface the first failure once every range has stopped
+        for future in [pool.submit(run, shard) for shard in manifest["shards"]]:
+            future.result()
+    with lock:
+        manifest["completed"] = True
+        save()
+    return manifest
+
+
+def merge_shards(manifest: dict, directory: str, out: str) -> int:
+    """Concatenate the shards of a finished parallel export into ``out``, in key order."""
+    fmt = manifest["format"]
+    paths = [os.path.join(directory, shard["path"]) for shard in manifest["shards"]]
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        rows = 0
+        writer = None
+        try:
+            for path in paths:
+                if not os.path.exists(path):
+                    continue
+                shard = pq.ParquetFile(path)
+                for index in range(shard.num_row_groups):
+                    table = shard.read_row_group(index)
+                    if writer is None:
+                        writer = pq.ParquetWriter(out, table.schema)
+                    elif table.schema != writer.schema:
+                        table = table.cast(writer.schema)
+                    writer.write_table(table)
+                    rows += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        return rows
+    with open(out, "wb", buffering=WRITE_BUFFER) as target:
+        header = None
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as source:
+                if fmt == "csv":
+                    first = source.readline()
+                    if header is None:
+                        header = first
+                        target.write(first)
+                    elif first != header:
+                        raise ParameterException(f"Shard {path} has different csv columns.")
+                shutil.copyfileobj(source, target, WRITE_BUFFER)
+    return sum(shard["rows"] for shard in manifest["shards"])
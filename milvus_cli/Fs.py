@@ -1,93 +1,1047 @@
 try:
     from .Types import ParameterException
+    from .Converter import column_converter, field_type_name, parse_float_vectors
+    from .Profiler import profile_stage
 except ImportError:
     from Types import ParameterException
+    from Converter import column_converter, field_type_name, parse_float_vectors
+    from Profiler import profile_stage
 import os
 
 
-def readCsvFile(path="", withCol=True):
-    import re
+def isUrl(path=""):
+    """Whether path is an http(s) URL; any other path is a local file."""
+    from urllib.parse import urlparse
 
-    pattern = re.compile(".+\..+\/.*")
-    isUrl = pattern.match(path)
-    if isUrl:
-        return readCsvFileFromUrl(path, withCol)
-    return readCsvFileFromLocal(path, withCol)
+    return urlparse(path).scheme.lower() in ("http", "https")
 
 
-def readCsvFileFromLocal(path="", withCol=True):
-    from csv import reader
-    from json import JSONDecodeError
-    import click
+SOURCE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".npy": "npy",
+    ".npz": "npz",
+}
 
-    click.echo("Reading file from local path.")
+
+def sourceFormat(path=""):
+    """Format of a source file from its extension, or None if unsupported."""
+    return SOURCE_FORMATS.get(os.path.splitext(path.lower())[1])
+
+
+def checkBatchParams(batchSize=10000, batchBytes=None):
+    if not batchSize or batchSize <= 0:
+        raise ParameterException("Batch size should be a positive integer.")
+    if batchBytes is not None and batchBytes <= 0:
+        raise ParameterException("Batch bytes should be a positive integer.")
+
+
+def readFileInBatches(
+    path="",
+    fields=None,
+    batchSize=10000,
+    batchBytes=None,
+    startOffset=0,
+    startRow=0,
+    profiler=None,
+    startLine=None,
+):
+    """
+    Stream a csv, Parquet, JSON-Lines or NPY/NPZ file as column-major batches.
+
+    ``fields`` are the collection fields the data should provide, as returned
+    by describe_collection. Csv columns map to them by position and are parsed
+    by field type. The other formats map columns to fields by name and only
+    read the columns matching a field; batches then also carry the ``fields``
+    their ``data`` columns belong to. Their ``offset`` counts rows, except
+    for JSON-Lines which, like csv, counts bytes. Every batch also reports
+    the source ``bytes`` it was read from. JSON-Lines batches carry the
+    ``line`` number reached as well, and ``startLine`` (``startRow`` by
+    default) continues the line numbers of a resumed read. With a
+    Profiler.StageProfiler, turning raw source data into column values is
+    timed as the ``parse`` stage.
+    """
+    checkBatchParams(batchSize, batchBytes)
+    fields = fields or []
+    fmt = sourceFormat(path)
+    if fmt == "csv" or (isUrl(path) and fmt is None):
+        converters = [column_converter(f) for f in fields] if fields else None
+        return readCsvFileInBatches(
+            path,
+            batchSize=batchSize,
+            batchBytes=batchBytes,
+            startOffset=startOffset,
+            startRow=startRow,
+            converters=converters,
+            profiler=profiler,
+        )
+    if isUrl(path):
+        raise ParameterException("Only csv files can be read from a URL.")
+    if fmt == "jsonl":
+        return readJsonlInBatches(
+            path, fields, batchSize, batchBytes, startOffset, startRow, profiler, startLine
+        )
+    if fmt == "parquet":
+        return readParquetInBatches(path, fields, batchSize, startRow, profiler)
+    if fmt in ("npy", "npz"):
+        return readNumpyInBatches(path, fields, batchSize, startRow, profiler)
+    raise ParameterException(
+        "Unsupported file type, expected .csv, .parquet, .jsonl, .npy or .npz"
+    )
+
+
+def readCsvFileInBatches(
+    path="",
+    withCol=True,
+    batchSize=10000,
+    batchBytes=None,
+    startOffset=0,
+    startRow=0,
+    converters=None,
+    profiler=None,
+):
+    """
+    Stream a csv file (local or remote) as column-major batches.
+
+    Rows are parsed lazily and grouped into batches of at most ``batchSize``
+    rows, or fewer once ``batchBytes`` bytes of source text have been read, so
+    memory stays bounded whatever the file size. Progress is shown in bytes.
+    A local file can be resumed from a row boundary: the header is read, then
+    reading seeks to ``startOffset``, which counts as ``startRow`` data rows.
+    ``converters`` optionally holds, per csv column, a callable turning the
+    raw cells of a batch into column values (see Converter.column_converter);
+    columns without one are JSON-decoded cell by cell.
+
+    Returns:
+        Generator of dicts with the csv ``columns``, the column-major ``data``
+        of the batch, its number of ``rows`` and source ``bytes``, and the
+        byte ``offset`` and data ``row_offset`` reached in the source once
+        the batch was read.
+    """
+    checkBatchParams(batchSize, batchBytes)
+    if isUrl(path):
+        if startOffset:
+            raise ParameterException("Resuming is only supported for local files.")
+        lines, totalBytes = openCsvLinesFromUrl(path)
+    else:
+        lines, totalBytes = openCsvLinesFromLocal(path)
+    return iterCsvBatches(
+        lines,
+        totalBytes,
+        withCol,
+        batchSize,
+        batchBytes,
+        startOffset,
+        startRow,
+        converters,
+        profiler,
+    )
+
+
+def openCsvLinesFromLocal(path=""):
     if not path or not path[-4:] == ".csv":
         raise ParameterException("Path is empty or target file is not .csv")
-    fileSize = os.stat(path).st_size
-    if fileSize >= 512000000:
-        raise ParameterException(
-            "File is too large! Only allow csv files less than 512MB."
-        )
+    return openLocalFile(path, "csv")
+
+
+def openLocalFile(path="", kind="csv"):
+    import click
+
+    click.echo("Reading file from local path.")
     try:
-        result = {"columns": [], "data": []}
-        with click.open_file(path, "r") as csv_file:
-            click.echo(f"Opening csv file({fileSize} bytes)...")
-            csv_reader = reader(csv_file, delimiter=",")
-            handleCsvFile(result, csv_reader, withCol)
+        fileSize = os.stat(path).st_size
     except FileNotFoundError as fe:
         raise ParameterException(f"FileNotFoundError {str(fe)}")
-    except UnicodeDecodeError as ue:
-        raise ParameterException(f"UnicodeDecodeError {str(ue)}")
-    except JSONDecodeError as je:
-        raise ParameterException(f"JSONDecodeError {str(je)}")
-    else:
-        return result
+    click.echo(f"Opening {kind} file({fileSize} bytes)...")
+    return open(path, "rb"), fileSize
+
+
+def openCsvLinesFromUrl(url=""):
+    import click
+
+    click.echo("Reading file from remote URL.")
+    lines = HttpLines(url)
+    size = f"{lines.totalBytes} bytes" if lines.totalBytes else "unknown size"
+    gzipped = ", gzip" if lines.gzipped else ""
+    click.echo(f"Streaming csv file({size}{gzipped})...")
+    echoUndetectedTruncation(lines)
+    return lines, lines.totalBytes
 
 
-def readCsvFileFromUrl(url="", withCol=True):
-    import requests
+def echoUndetectedTruncation(lines):
+    import click
+
+    if not lines.detectsTruncation:
+        click.echo(
+            "Warning: the server sent neither a Content-Length nor gzip content, "
+            "so a download cut short cannot be told from the end of the file."
+        )
+
+
+class _RemoteFileChanged(ParameterException):
+    """The remote file changed between two requests of one download."""
+
+
+class HttpLines:
+    """
+    Lines of a remote file, streamed while they are parsed.
+
+    A background thread downloads chunks of ``chunkSize`` bytes into a queue
+    holding at most ``prefetch`` of them, so the download overlaps parsing
+    and memory stays bounded. Gzip content (Content-Encoding, a gzip content
+    type or a .gz path) is decompressed on the fly. When the connection drops
+    the download resumes from the last byte received with an HTTP Range
+    request, guarded by If-Range so a changed file is never spliced; failed
+    reconnects count against the same ``retries``. A stream ending early is
+    caught by the Content-Length or, for gzip, by the missing gzip trailer;
+    ``detectsTruncation`` is False when neither is available.
+    ``progress()`` is the number of raw bytes received, out of ``totalBytes``.
+    """
+
+    def __init__(
+        self, url="", chunkSize=1 << 20, prefetch=4, retries=3, session=None
+    ):
+        import queue
+        import threading
+
+        self.url = url
+        self.chunkSize = chunkSize
+        self.retries = retries
+        self.session = session
+        self.position = 0
+        self.validator = None
+        self._stop = threading.Event()
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._response = self._request()
+        headers = self._response.headers
+        length = headers.get("Content-Length")
+        self.totalBytes = int(length) if length and length.isdigit() else 0
+        self.validator = headers.get("ETag") or headers.get("Last-Modified")
+        contentType = headers.get("Content-Type", "").split(";")[0].strip()
+        self.gzipped = (
+            headers.get("Content-Encoding", "").lower() in ("gzip", "x-gzip")
+            or contentType in ("application/gzip", "application/x-gzip")
+            or url.split("?")[0].lower().endswith(".gz")
+        )
+        self.detectsTruncation = bool(self.totalBytes) or self.gzipped
+        self._thread = threading.Thread(
+            target=self._download, name="milvus_cli_download", daemon=True
+        )
+        self._thread.start()
+
+    def _request(self):
+        import requests
+
+        session = self.session or requests
+        headers = {"Accept-Encoding": "gzip"}
+        if self.position:
+            headers["Range"] = f"bytes={self.position}-"
+            if self.validator:
+                headers["If-Range"] = self.validator
+        try:
+            response = session.get(self.url, headers=headers, stream=True, timeout=60)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            raise ParameterException(f"Download error {str(e)}")
+        if self.position and response.status_code != 206:
+            if self.validator:
+                response.close()
+                raise _RemoteFileChanged(
+                    f"Remote file {self.url} changed while it was downloaded."
+                )
+            # The server ignores Range: re-read and drop what we already have.
+            skip = self.position
+            while skip:
+                data = response.raw.read(min(skip, self.chunkSize), decode_content=False)
+                if not data:
+                    break
+                skip -= len(data)
+        return response
+
+    def _download(self):
+        import time
+        import zlib
+
+        decoder = zlib.decompressobj(16 + zlib.MAX_WBITS) if self.gzipped else None
+        attempts = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    if self._response is None:
+                        self._response = self._request()
+                    data = self._response.raw.read(self.chunkSize, decode_content=False)
+                    if not data and self.position < self.totalBytes:
+                        raise ConnectionError("Connection closed before the end of file")
+                    if not data and decoder and not decoder.eof:
+                        raise ConnectionError("Connection closed before the end of the gzip stream")
+                except _RemoteFileChanged:
+                    raise
+                except Exception as e:
+                    if self._response is not None:
+                        self._response.close()
+                        self._response = None
+                    attempts += 1
+                    if self._stop.is_set():
+                        break
+                    if attempts > self.retries:
+                        raise ParameterException(
+                            f"Download of {self.url} failed after {self.position} bytes: {e}"
+                        )
+                    time.sleep(0.5 * attempts)
+                    continue
+                if not data:
+                    if decoder:
+                        self._put(decoder.flush())
+                    break
+                self.position += len(data)
+                self._put(decoder.decompress(data) if decoder else data)
+            self._put(None)
+        except Exception as e:
+            self._put(e)
+        finally:
+            if self._response is not None:
+                self._response.close()
+
+    def _put(self, item):
+        import queue
+
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _chunks(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def __iter__(self):
+        pending = b""
+        for chunk in self._chunks():
+            if not chunk:
+                continue
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                yield line + b"\n"
+        if pending:
+            yield pending
+
+    def progress(self):
+        return self.position
+
+    def close(self):
+        self._stop.set()
+        # Unblock a pending read so the download thread can exit.
+        response = self._response
+        if response is not None:
+            response.close()
+        self._thread.join()
+
+
+class CountingLines:
+    """Decode binary lines for the csv reader while counting bytes consumed."""
+
+    def __init__(self, lines):
+        self._lines = iter(lines)
+        self.bytesRead = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        line = next(self._lines)
+        if self.bytesRead == 0 and line.startswith(b"\xef\xbb\xbf"):
+            self.bytesRead += 3
+            line = line[3:]
+        self.bytesRead += len(line)
+        return line.decode("utf-8")
+
+
+def iterCsvBatches(
+    lines,
+    totalBytes,
+    withCol=True,
+    batchSize=10000,
+    batchBytes=None,
+    startOffset=0,
+    startRow=0,
+    converters=None,
+    profiler=None,
+):
     from csv import reader
     from json import JSONDecodeError
     import click
 
-    click.echo("Reading file from remote URL.")
+    counter = CountingLines(lines)
+    csv_reader = reader(counter, delimiter=",")
+    columns = []
+    line_count = 0
+    rowOffset = startRow
     try:
-        result = {"columns": [], "data": []}
-        with requests.Session() as s:
-            download = s.get(url)
-            decoded_content = download.content.decode("utf-8")
-            csv_reader = reader(decoded_content.splitlines(), delimiter=",")
-            handleCsvFile(result, csv_reader, withCol)
-    except FileNotFoundError as fe:
-        raise ParameterException(f"FileNotFoundError {str(fe)}")
+        if withCol:
+            columns = next(csv_reader, [])
+            line_count += 1
+            click.echo(f"""Column names are {columns}""")
+        if startOffset:
+            if not hasattr(lines, "seek"):
+                raise ParameterException("Resuming is only supported for local files.")
+            if startOffset < counter.bytesRead or startOffset > totalBytes:
+                raise ParameterException(
+                    f"Resume offset {startOffset} is outside the csv data."
+                )
+            lines.seek(startOffset)
+            counter.bytesRead = startOffset
+            click.echo(f"Resuming after row {startRow} (byte {startOffset}).")
+        with click.progressbar(
+            length=totalBytes, label="Reading csv rows...", show_percent=True
+        ) as bar:
+            # Remote files report the bytes downloaded, which differ from the
+            # bytes parsed when the download is compressed.
+            position = getattr(lines, "progress", lambda: counter.bytesRead)
+            reported = 0
+            data, rows, batchStart = [], 0, counter.bytesRead
+            for row in csv_reader:
+                if converters:
+                    appendRowCells(row, data)
+                else:
+                    formatRowForData(row, data)
+                rows += 1
+                line_count += 1
+                if rows >= batchSize or (
+                    batchBytes and counter.bytesRead - batchStart >= batchBytes
+                ):
+                    bar.update(position() - reported)
+                    reported = position()
+                    rowOffset += rows
+                    with profile_stage(profiler, "parse"):
+                        data = convertColumns(data, converters)
+                    yield {
+                        "columns": columns,
+                        "data": data,
+                        "rows": rows,
+                        "bytes": counter.bytesRead - batchStart,
+                        "offset": counter.bytesRead,
+                        "row_offset": rowOffset,
+                    }
+                    data, rows, batchStart = [], 0, counter.bytesRead
+            bar.update(position() - reported)
+            if rows:
+                rowOffset += rows
+                with profile_stage(profiler, "parse"):
+                    data = convertColumns(data, converters)
+                yield {
+                    "columns": columns,
+                    "data": data,
+                    "rows": rows,
+                    "bytes": counter.bytesRead - batchStart,
+                    "offset": counter.bytesRead,
+                    "row_offset": rowOffset,
+                }
     except UnicodeDecodeError as ue:
         raise ParameterException(f"UnicodeDecodeError {str(ue)}")
     except JSONDecodeError as je:
         raise ParameterException(f"JSONDecodeError {str(je)}")
-    else:
-        return result
+    finally:
+        if hasattr(lines, "close"):
+            lines.close()
+    click.echo(f"Processed {line_count} lines.")
 
 
-def handleCsvFile(result, csv_reader, withCol):
+def projectFields(available, fields):
+    """Names of the input fields present in a source, in schema order."""
     import click
 
-    # For progressbar, transform it to list.
-    rows = list(csv_reader)
-    line_count = 0
-    with click.progressbar(rows, label="Reading csv rows...", show_percent=True) as bar:
-        # for row in csv_reader:
-        for row in bar:
-            if withCol and line_count == 0:
-                result["columns"] = row
-                line_count += 1
-            else:
-                formatRowForData(row, result["data"])
-                line_count += 1
-    click.echo(f"""Column names are {result['columns']}""")
-    click.echo(f"Processed {line_count} lines.")
+    names = [f.get("name", "") for f in fields if f.get("name", "") in available]
+    if not names:
+        raise ParameterException(
+            f"No column matches a collection field, file has {list(available)}"
+        )
+    missing = [f.get("name", "") for f in fields if f.get("name", "") not in names]
+    click.echo(f"Reading fields {names}")
+    if missing:
+        click.echo(f"Fields not in the file: {missing}")
+    return names
+
+
+def readJsonlInBatches(
+    path="",
+    fields=None,
+    batchSize=10000,
+    batchBytes=None,
+    startOffset=0,
+    startRow=0,
+    profiler=None,
+    startLine=None,
+):
+    """Stream a JSON-Lines file, one entity object per line, keeping only field keys."""
+    lines, totalBytes = openLocalFile(path, "jsonl")
+    return iterJsonlBatches(
+        lines,
+        totalBytes,
+        fields or [],
+        batchSize,
+        batchBytes,
+        startOffset,
+        startRow,
+        profiler,
+        startLine,
+    )
+
+
+def iterJsonlBatches(
+    lines,
+    totalBytes,
+    fields,
+    batchSize=10000,
+    batchBytes=None,
+    startOffset=0,
+    startRow=0,
+    profiler=None,
+    startLine=None,
+):
+    """
+    Batches of the entities of JSON-Lines ``lines``, one column per input field.
+
+    Every input field is read, whichever keys the first line has: a key
+    missing from a line is None, unless the field is neither nullable nor
+    has a default value, which is reported with its line number. Keys of no
+    input field are dropped and listed once the file is read.
+    """
+    import click
+
+    names = [f.get("name", "") for f in fields]
+    if not names:
+        raise ParameterException("No collection fields to read the JSON Lines into.")
+    required = {
+        f.get("name", "") for f in fields
+        if not f.get("nullable") and f.get("default_value") is None
+    }
+    known = set(names)
+    dropped = set()
+    rowOffset = startRow
+    bytesRead = 0
+
+    def parse(pending):
+        # Lines are collected raw and decoded a batch at a time.
+        with profile_stage(profiler, "parse"):
+            entities = decodeJsonlLines(pending)
+            for lineNumber, entity in entities:
+                keys = entity.keys()
+                if not required <= keys:
+                    raise ParameterException(
+                        f"No value for {sorted(required - keys)} at line {lineNumber}."
+                    )
+                dropped.update(keys - known)
+            return [[entity.get(name) for _, entity in entities] for name in names]
+
+    try:
+        if startOffset:
+            if startOffset > totalBytes:
+                raise ParameterException(
+                    f"Resume offset {startOffset} is outside the jsonl data."
+                )
+            lines.seek(startOffset)
+            bytesRead = startOffset
+            click.echo(f"Resuming after row {startRow} (byte {startOffset}).")
+        click.echo(f"Reading fields {names}")
+        lineNumber = startRow if startLine is None else startLine
+        with click.progressbar(
+            length=totalBytes, label="Reading jsonl rows...", show_percent=True
+        ) as bar:
+            reported = 0
+            pending, batchStart = [], bytesRead
+            for lineNumber, line in enumerate(lines, lineNumber + 1):
+                bytesRead += len(line)
+                if not line.strip():
+                    continue
+                pending.append((lineNumber, line))
+                if len(pending) >= batchSize or (
+                    batchBytes and bytesRead - batchStart >= batchBytes
+                ):
+                    bar.update(bytesRead - reported)
+                    reported = bytesRead
+                    rowOffset += len(pending)
+                    data = parse(pending)
+                    yield {
+                        "columns": names,
+                        "fields": names,
+                        "data": data,
+                        "rows": len(pending),
+                        "bytes": bytesRead - batchStart,
+                        "offset": bytesRead,
+                        "row_offset": rowOffset,
+                        "line": lineNumber,
+                    }
+                    pending, batchStart = [], bytesRead
+            bar.update(bytesRead - reported)
+            if pending:
+                rowOffset += len(pending)
+                data = parse(pending)
+                yield {
+                    "columns": names,
+                    "fields": names,
+                    "data": data,
+                    "rows": len(pending),
+                    "bytes": bytesRead - batchStart,
+                    "offset": bytesRead,
+                    "row_offset": rowOffset,
+                    "line": lineNumber,
+                }
+    finally:
+        lines.close()
+    click.echo(f"Processed {rowOffset - startRow} lines.")
+    if dropped:
+        click.echo(f"Keys of no collection field were dropped: {sorted(dropped)}")
+
+
+def decodeJsonlLines(pending):
+    """Decode (line number, raw line) pairs into (line number, entity) pairs."""
+    from json import loads, JSONDecodeError
+
+    entities = []
+    for lineNumber, line in pending:
+        try:
+            entity = loads(line)
+        except (JSONDecodeError, UnicodeDecodeError) as e:
+            raise ParameterException(f"Invalid JSON at line {lineNumber}: {e}")
+        if not isinstance(entity, dict):
+            raise ParameterException(f"Line {lineNumber} is not a JSON object.")
+        entities.append((lineNumber, entity))
+    return entities
+
+
+def readParquetInBatches(
+    path="", fields=None, batchSize=10000, startRow=0, profiler=None
+):
+    """
+    Stream a Parquet file by record batches, reading only the field columns.
+
+    Whole row groups before ``startRow`` are skipped without being read.
+    """
+    import click
+
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ParameterException(
+            "Reading Parquet files requires pyarrow, install it with `pip install pyarrow`."
+        )
+    click.echo("Reading file from local path.")
+    try:
+        parquet = pq.ParquetFile(path)
+    except FileNotFoundError as fe:
+        raise ParameterException(f"FileNotFoundError {str(fe)}")
+    except Exception as e:
+        raise ParameterException(f"Cannot read Parquet file {path}: {e}")
+    fields = fields or []
+    names = projectFields(parquet.schema_arrow.names, fields)
+    byName = {f.get("name", ""): f for f in fields}
+    metadata = parquet.metadata
+    click.echo(f"Opening parquet file({metadata.num_rows} rows)...")
+    rowGroups, skip = [], startRow
+    for idx in range(metadata.num_row_groups):
+        groupRows = metadata.row_group(idx).num_rows
+        if not rowGroups and skip >= groupRows:
+            skip -= groupRows
+            continue
+        rowGroups.append(idx)
+
+    def chunks():
+        nonlocal skip
+        try:
+            for batch in parquet.iter_batches(
+                batch_size=batchSize, row_groups=rowGroups, columns=names
+            ):
+                if skip:
+                    if skip >= batch.num_rows:
+                        skip -= batch.num_rows
+                        continue
+                    batch, skip = batch.slice(skip), 0
+                with profile_stage(profiler, "parse"):
+                    data = [
+                        arrowColumn(batch.column(idx), byName[name])
+                        for idx, name in enumerate(names)
+                    ]
+                yield batch.num_rows, batch.nbytes, data
+        finally:
+            parquet.close()
+
+    return iterRowChunks(chunks(), names, metadata.num_rows, startRow, "parquet")
+
+
+def arrowColumn(column, field):
+    """
+    Column values of an Arrow array.
+
+    Dense float vectors become a (rows, dim) float32 array and numeric columns
+    without nulls a NumPy array; other columns become Python lists.
+    """
+    import numpy as np
+    import pyarrow as pa
+
+    rows = len(column)
+    if column.null_count == 0 and (
+        pa.types.is_integer(column.type)
+        or pa.types.is_floating(column.type)
+        or pa.types.is_boolean(column.type)
+    ):
+        return column.to_numpy(zero_copy_only=False)
+    if (
+        field_type_name(field) == "FLOAT_VECTOR"
+        and rows
+        and column.null_count == 0
+        and (pa.types.is_list(column.type) or pa.types.is_fixed_size_list(column.type)
+             or pa.types.is_large_list(column.type))
+    ):
+        values = column.flatten()
+        dim = len(values) // rows
+        uniform = pa.types.is_fixed_size_list(column.type) or bool(
+            np.all(np.diff(np.asarray(column.offsets)) == dim)
+        )
+        if uniform and values.null_count == 0 and dim * rows == len(values):
+            return np.asarray(
+                values.to_numpy(zero_copy_only=False), dtype=np.float32
+            ).reshape(rows, dim)
+    return column.to_pylist()
+
+
+def readNumpyInBatches(
+    path="", fields=None, batchSize=10000, startRow=0, profiler=None
+):
+    """
+    Stream a .npy or .npz file in row slices.
+
+    A .npy file holds the vectors of the collection's only float vector field
+    and is memory-mapped, so batches are views of the file and vectors never
+    become Python floats. A .npz file holds one array per field, named after
+    it; zip members cannot be mapped, so each projected array is loaded once.
+    """
+    import numpy as np
+    import click
+
+    click.echo("Reading file from local path.")
+    fields = fields or []
+    byName = {f.get("name", ""): f for f in fields}
+    try:
+        if path.lower().endswith(".npy"):
+            vectorFields = [
+                name for name, f in byName.items()
+                if field_type_name(f) == "FLOAT_VECTOR"
+            ]
+            if len(vectorFields) != 1:
+                raise ParameterException(
+                    ".npy files need a collection with exactly one float vector "
+                    "field, use .npz with one array per field instead."
+                )
+            arrays = {vectorFields[0]: np.load(path, mmap_mode="r")}
+            names = vectorFields
+            click.echo(f"Reading fields {names}")
+        else:
+            archive = np.load(path)
+            names = projectFields(archive.files, fields)
+            arrays = {name: archive[name] for name in names}
+            archive.close()
+    except FileNotFoundError as fe:
+        raise ParameterException(f"FileNotFoundError {str(fe)}")
+    except (OSError, ValueError) as e:
+        raise ParameterException(f"Cannot read numpy file {path}: {e}")
+    lengths = {name: len(arr) for name, arr in arrays.items()}
+    if len(set(lengths.values())) != 1:
+        raise ParameterException(f"Arrays have different lengths: {lengths}")
+    total = lengths[names[0]]
+    click.echo(f"Opening numpy file({total} rows)...")
+
+    def chunks():
+        for start in range(startRow, total, batchSize):
+            end = min(start + batchSize, total)
+            chunk = [arrays[name][start:end] for name in names]
+            with profile_stage(profiler, "parse"):
+                data = [
+                    numpyColumn(column, byName[name])
+                    for column, name in zip(chunk, names)
+                ]
+            yield end - start, sum(column.nbytes for column in chunk), data
+
+    return iterRowChunks(chunks(), names, total, startRow, "numpy")
+
+
+def numpyColumn(chunk, field):
+    """Column values of a numpy slice; numeric columns and float vectors stay arrays."""
+    import numpy as np
+
+    typeName = field_type_name(field)
+    if chunk.ndim == 2 and typeName == "FLOAT_VECTOR":
+        return np.asarray(chunk, dtype=np.float32)
+    if chunk.ndim == 2 and typeName == "BINARY_VECTOR":
+        return [row.tobytes() for row in np.asarray(chunk, dtype=np.uint8)]
+    if chunk.ndim == 1 and chunk.dtype.kind in "biuf":
+        return chunk
+    return chunk.tolist()
+
+
+def iterRowChunks(chunks, names, totalRows, startRow=0, kind=""):
+    """Turn (rows, bytes, columns) chunks of a row-addressed source into batches."""
+    import click
+
+    rowOffset = startRow
+    if startRow:
+        click.echo(f"Resuming after row {startRow}.")
+    with click.progressbar(
+        length=totalRows, label=f"Reading {kind} rows...", show_percent=True
+    ) as bar:
+        bar.update(startRow)
+        for rows, nbytes, data in chunks:
+            rowOffset += rows
+            bar.update(rows)
+            yield {
+                "columns": names,
+                "fields": names,
+                "data": data,
+                "rows": rows,
+                "bytes": nbytes,
+                "offset": rowOffset,
+                "row_offset": rowOffset,
+            }
+    click.echo(f"Processed {rowOffset - startRow} rows.")
+
+
+VECTOR_FILE_FORMATS = (".npy", ".csv", ".jsonl", ".ndjson")
+
+
+def readVectorsInBatches(path="", batchSize=1000, field=None):
+    """
+    Stream query vectors from a .npy, .csv or .jsonl file in batches.
+
+    A .npy file holds a 2-D array and is memory-mapped. A csv row is either
+    one JSON array cell or one number per column; a header row is skipped.
+    A JSON-Lines line is an array, or an object holding the vector under
+    ``field`` (or as its only array value).
+
+    Returns:
+        Generator of (index of the first query, float32 array of shape
+        (rows, dim)) pairs
+    """
+    import click
+
+    checkBatchParams(batchSize)
+    ext = os.path.splitext(path.lower())[1]
+    if ext not in VECTOR_FILE_FORMATS:
+        raise ParameterException(
+            f"Unsupported vectors file {path}, expected {', '.join(VECTOR_FILE_FORMATS)}"
+        )
+    if not os.path.isfile(path):
+        raise ParameterException(f"FileNotFoundError {path}")
+    click.echo(f"Reading query vectors from {path}", err=True)
+    if ext == ".npy":
+        return iterNpyVectors(path, batchSize)
+    if ext == ".csv":
+        return iterCsvVectors(path, batchSize)
+    return iterJsonlVectors(path, batchSize, field)
+
+
+def iterNpyVectors(path, batchSize):
+    import numpy as np
+
+    try:
+        vectors = np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        raise ParameterException(f"Cannot read numpy file {path}: {e}")
+    if vectors.ndim != 2:
+        raise ParameterException(f"Expected a 2-D array of vectors, got shape {vectors.shape}")
+    for start in range(0, len(vectors), batchSize):
+        yield start, np.asarray(vectors[start:start + batchSize], dtype=np.float32)
 
 
-# For readCsvFile formatting data.
+def isNumericCell(cell):
+    """Whether a csv cell holds a number, or a bracketed list starting with one."""
+    try:
+        float(cell.strip().strip("[]").split(",")[0])
+        return True
+    except ValueError:
+        return False
+
+
+def iterCsvVectors(path, batchSize):
+    from csv import reader
+    import numpy as np
+
+    def toVectors(rows, first):
+        try:
+            if all(len(row) == 1 for row in rows):
+                return parse_float_vectors([row[0] for row in rows])
+            return np.array(rows, dtype=np.float32)
+        except ValueError as e:
+            raise ParameterException(f"Invalid vectors in rows {first}-{first + len(rows) - 1}: {e}")
+
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows, start, first = [], 0, True
+        for row in reader(f):
+            if not row:
+                continue
+            if first:
+                first = False
+                if not any(isNumericCell(cell) for cell in row):
+                    # No numbers at all, so a header; a malformed vector is reported
+                    continue
+            rows.append(row)
+            if len(rows) >= batchSize:
+                yield start, toVectors(rows, start)
+                start += len(rows)
+                rows = []
+        if rows:
+            yield start, toVectors(rows, start)
+
+
+def iterJsonlVectors(path, batchSize, field=None):
+    from json import loads, JSONDecodeError
+    import numpy as np
+
+    def vectorOf(value, lineNumber):
+        if isinstance(value, dict):
+            if field and field in value:
+                return value[field]
+            arrays = [v for v in value.values() if isinstance(v, list)]
+            if len(arrays) != 1:
+                raise ParameterException(f"No vector found at line {lineNumber}.")
+            return arrays[0]
+        return value
+
+    def toVectors(vectors, first):
+        try:
+            return np.array(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        except ValueError as e:
+            raise ParameterException(f"Invalid vectors from query {first}: {e}")
+
+    with open(path, "rb") as f:
+        vectors, start = [], 0
+        for lineNumber, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                vectors.append(vectorOf(loads(line), lineNumber))
+            except (JSONDecodeError, UnicodeDecodeError) as e:
+                raise ParameterException(f"Invalid JSON at line {lineNumber}: {e}")
+            if len(vectors) >= batchSize:
+                yield start, toVectors(vectors, start)
+                start += len(vectors)
+                vectors = []
+        if vectors:
+            yield start, toVectors(vectors, start)
+
+
+def readIdsInBatches(path="", varchar=False, maxIds=10000, maxBytes=4 * 1024 * 1024, field=None):
+    """
+    Stream primary keys from a text, .npy or Parquet file in bounded chunks.
+
+    A text file (any extension other than .npy and .parquet) holds one ID
+    per line; blank lines and lines starting with # are skipped. A .npy
+    file holds a 1-D array and is memory-mapped. A Parquet file is read
+    column ``field``, or its only column, one record batch at a time.
+
+    Chunks hold at most ``maxIds`` IDs and about ``maxBytes`` of them as
+    written in a request, which keeps each request below the gRPC
+    message limit however long the keys are.
+
+    Returns:
+        Generator of (index of the first ID, list of IDs) pairs; IDs are
+        ints, or strings when ``varchar``
+    """
+    checkBatchParams(maxIds, maxBytes)
+    if not os.path.isfile(path):
+        raise ParameterException(f"FileNotFoundError {path}")
+    ext = os.path.splitext(path.lower())[1]
+    if ext == ".npy":
+        values = iterNpyIds(path)
+    elif ext == ".parquet":
+        values = iterParquetIds(path, field)
+    else:
+        values = iterTextIds(path)
+    return chunkIds(values, varchar, maxIds, maxBytes)
+
+
+def integerId(value):
+    """An integer primary key; floats with a fraction and bools are rejected, not truncated."""
+    if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(value)
+    return int(value)
+
+
+def chunkIds(values, varchar, maxIds, maxBytes):
+    start, chunk, size = 0, [], 0
+    for value in values:
+        try:
+            value = str(value) if varchar else integerId(value)
+        except (TypeError, ValueError, OverflowError):
+            raise ParameterException(f"Invalid integer ID {value!r} at position {start + len(chunk)}.")
+        # Quotes and a separator around each key in the request
+        cost = len(value.encode("utf-8")) + 4 if varchar else 21
+        if chunk and (len(chunk) >= maxIds or size + cost > maxBytes):
+            yield start, chunk
+            start += len(chunk)
+            chunk, size = [], 0
+        chunk.append(value)
+        size += cost
+    if chunk:
+        yield start, chunk
+
+
+def iterTextIds(path):
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+
+
+def iterNpyIds(path):
+    import numpy as np
+
+    try:
+        ids = np.load(path, mmap_mode="r")
+    except (OSError, ValueError) as e:
+        raise ParameterException(f"Cannot read numpy file {path}: {e}")
+    if ids.ndim != 1:
+        raise ParameterException(f"Expected a 1-D array of IDs, got shape {ids.shape}")
+    for start in range(0, len(ids), 65536):
+        yield from ids[start:start + 65536].tolist()
+
+
+def iterParquetIds(path, field=None):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ParameterException(
+            "Reading Parquet files requires pyarrow, install it with `pip install pyarrow`."
+        )
+    try:
+        parquet = pq.ParquetFile(path)
+    except Exception as e:
+        raise ParameterException(f"Cannot read Parquet file {path}: {e}")
+    names = parquet.schema_arrow.names
+    if field not in names:
+        if len(names) != 1:
+            raise ParameterException(
+                f"No column {field} in {path}, and it has several columns: {names}"
+            )
+        field = names[0]
+    try:
+        for batch in parquet.iter_batches(batch_size=65536, columns=[field]):
+            yield from batch.column(0).to_pylist()
+    finally:
+        parquet.close()
+
+
+# For iterCsvBatches formatting data.
 def formatRowForData(row=[], data=[]):
     from json import loads
 
@@ -100,6 +1054,28 @@ def formatRowForData(row=[], data=[]):
         data[idx].append(formattedVal)
 
 
+def appendRowCells(row=[], data=[]):
+    """Collect the raw cells of a row column-major, to be converted per batch."""
+    if not data:
+        for _in in range(len(row)):
+            data.append([])
+    for idx, val in enumerate(row):
+        data[idx].append(val)
+
+
+def convertColumns(data, converters=None):
+    """Convert raw cell columns with per-column converters, JSON-decoding the rest."""
+    if not converters:
+        return data
+    from json import loads
+
+    result = []
+    for idx, cells in enumerate(data):
+        convert = converters[idx] if idx < len(converters) else None
+        result.append(convert(cells) if convert else [loads(val) for val in cells])
+    return result
+
+
 def writeCsvFile(path, rows, headers=[]):
     if not path:
         raise ParameterException(f"Path should not be empty")
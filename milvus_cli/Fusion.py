@@ -0,0 +1,384 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    from .Hybrid import iter_hybrid_queries
+    from .Types import ParameterException
+except ImportError:
+    from Hybrid import iter_hybrid_queries
+    from Types import ParameterException
+
+FUSIONS = ("rrf", "weighted", "combmnz")
+# Metrics where a larger distance is a better match
+_LARGER_IS_BETTER = ("IP", "COSINE", "BM25")
+
+
+def normalize_scores(distances: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Distances mapped to (0, 1), larger being better, as Milvus'
+    WeightedRanker does with ``norm_score``: COSINE linearly and the
+    others through arctan, flipped for distances where smaller is better.
+    """
+    distances = np.asarray(distances, dtype=np.float64)
+    metric = (metric or "").upper()
+    if metric == "COSINE":
+        return (1.0 + distances) * 0.5
+    if metric in _LARGER_IS_BETTER:
+        return 0.5 + np.arctan(distances) / np.pi
+    return 1.0 - 2.0 * np.arctan(distances) / np.pi
+
+
+def parse_fusion(text: str, requests: int) -> dict:
+    """
+    Fusion setting from its short form: ``rrf``, ``rrf:60``,
+    ``weighted:0.7,0.3`` or ``combmnz:0.7,0.3`` (weights default to 1 each).
+    """
+    kind, _, args = str(text).strip().partition(":")
+    kind = kind.strip().lower()
+    if kind not in FUSIONS:
+        raise ParameterException(f"Unknown fusion {kind!r}, expected one of {FUSIONS}.")
+    if kind == "rrf":
+        try:
+            k = int(args) if args.strip() else 60
+        except ValueError:
+            raise ParameterException(f"Invalid RRF k in {text!r}.")
+        if k < 1:
+            raise ParameterException("RRF k should be a positive integer.")
+        return {"type": kind, "k": k}
+    try:
+        weights = [float(w) for w in args.split(",")] if args.strip() else [1.0] * requests
+    except ValueError:
+        raise ParameterException(f"Invalid weights in {text!r}.")
+    if len(weights) != requests:
+        raise ParameterException(
+            f"Fusion {text!r} needs {requests} weights, one per request."
+        )
+    return {"type": kind, "weights": weights}
+
+
+def fusion_label(fusion: dict) -> str:
+    """Short form of a fusion setting, as parse_fusion reads it."""
+    if fusion["type"] == "rrf":
+        return f"rrf:{fusion['k']}"
+    return f"{fusion['type']}:" + ",".join(f"{w:g}" for w in fusion["weights"])
+
+
+def fusion_grid(requests: int, rrf_ks=(10, 20, 40, 60, 100), weight_step: float = 0.1) -> list:
+    """
+    Fusion settings to sweep: RRF with each k, and weighted sums with every
+    weighting of the requests in steps of ``weight_step`` summing to 1.
+    """
+    if not 0 < weight_step <= 1:
+        raise ParameterException("Weight step should be in (0, 1].")
+    steps = int(round(1 / weight_step))
+    settings = [{"type": "rrf", "k": int(k)} for k in rrf_ks]
+
+    def splits(parts, total):
+        if parts == 1:
+            yield (total,)
+            return
+        for first in range(total, -1, -1):
+            for rest in splits(parts - 1, total - first):
+                yield (first,) + rest
+
+    for split in splits(requests, steps):
+        settings.append({"type": "weighted", "weights": [round(n / steps, 6) for n in split]})
+    return settings
+
+
+class CandidateSet:
+    """
+    Candidates of the component ANN searches of many queries, fused locally.
+
+    The hits of every request are held as flat arrays (query, request,
+    rank, distance and an index into the distinct primary keys), so a
+    fusion is a handful of vectorized NumPy passes over all queries at
+    once: per-candidate contributions are summed per (query, key) with
+    ``bincount`` and the top ``k`` of each query taken after one sort.
+    Trying another fusion setting costs no RPC.
+    """
+
+    def __init__(self, query_ids: list, fields: list, metrics: list) -> None:
+        if len(fields) != len(metrics):
+            raise ParameterException("Every request needs its metric type.")
+        self.query_ids = list(query_ids)
+        self.fields = list(fields)
+        self.metrics = list(metrics)
+        self._parts = []
+        self._arrays = None
+
+    def add(self, request: int, query_offset: int, results) -> None:
+        """Add the hits of one request for the queries from ``query_offset`` on."""
+        queries, ranks, ids, distances = [], [], [], []
+        for index, hits in enumerate(results):
+            for rank, hit in enumerate(hits):
+                queries.append(query_offset + index)
+                ranks.append(rank)
+                ids.append(hit.get("id"))
+                distances.append(hit.get("distance"))
+        self._parts.append((request, queries, ranks, ids, distances))
+        self._arrays = None
+
+    def _build(self) -> dict:
+        if self._arrays is not None:
+            return self._arrays
+        request = np.fromiter((p[0] for p in self._parts for _ in p[1]), dtype=np.int64)
+        query = np.fromiter((q for p in self._parts for q in p[1]), dtype=np.int64)
+        rank = np.fromiter((r for p in self._parts for r in p[2]), dtype=np.int64)
+        distance = np.fromiter((d for p in self._parts for d in p[4]), dtype=np.float64)
+        ids = [i for p in self._parts for i in p[3]]
+        keys = np.asarray(ids) if ids else np.empty(0, dtype=np.int64)
+        if keys.dtype == object:
+            keys = keys.astype(str)
+        keys, key_index = np.unique(keys, return_inverse=True)
+        self._arrays = self._index({
+            "query": query,
+            "request": request,
+            "rank": rank,
+            "distance": distance,
+            "keys": keys,
+            "key_index": key_index.ravel(),
+        })
+        return self._arrays
+
+    def _index(self, a: dict) -> dict:
+        """Add normalized distances and the (query, key) slot of every candidate."""
+        a["normalized"] = np.empty(len(a["distance"]))
+        for index, metric in enumerate(self.metrics):
+            mask = a["request"] == index
+            a["normalized"][mask] = normalize_scores(a["distance"][mask], metric)
+        # Every fusion sums contributions over the same (query, key) slots
+        keys = max(len(a["keys"]), 1)
+        slot, inverse = np.unique(a["query"] * keys + a["key_index"], return_inverse=True)
+        a["slot_query"] = slot // keys
+        a["slot_key"] = slot % keys
+        a["inverse"] = inverse.ravel()
+        return a
+
+    def __len__(self) -> int:
+        return len(self._build()["query"])
+
+    def _top(self, fusion: dict, k: int) -> tuple:
+        """Slots of the top ``k`` of every query, grouped by query and best first, and their scores."""
+        a = self._build()
+        if fusion["type"] == "rrf":
+            contribution = 1.0 / (fusion["k"] + a["rank"] + 1)
+        else:
+            weights = np.asarray(fusion["weights"], dtype=np.float64)
+            if len(weights) != len(self.fields):
+                raise ParameterException(f"Fusion needs {len(self.fields)} weights.")
+            contribution = weights[a["request"]] * a["normalized"]
+        slots = len(a["slot_query"])
+        scores = np.bincount(a["inverse"], weights=contribution, minlength=slots)
+        if fusion["type"] == "combmnz":
+            scores = scores * np.bincount(a["inverse"], minlength=slots)
+        order = np.lexsort((-scores, a["slot_query"]))
+        query = a["slot_query"][order]
+        starts = np.searchsorted(query, np.arange(len(self.query_ids) + 1))
+        position = np.arange(len(order)) - starts[query]
+        keep = position < k
+        return order[keep], query[keep], position[keep], scores
+
+    def fuse(self, fusion: dict, k: int = 10) -> list:
+        """
+        Top ``k`` fused hits of every query, in query order.
+
+        RRF scores a candidate ``sum(1 / (k + rank))`` over the requests it
+        was found by (ranks from 1), weighted sums ``sum(w * normalized
+        distance)``, and CombMNZ the weighted sum times the number of
+        requests that found it.
+
+        Returns:
+            One list of ``{"id", "distance"}`` hits per query, the fused
+            score as the distance, best first
+        """
+        a = self._build()
+        order, query, _, scores = self._top(fusion, k)
+        ids = a["keys"][a["slot_key"][order]].tolist()
+        fused = scores[order].tolist()
+        bounds = np.searchsorted(query, np.arange(len(self.query_ids) + 1)).tolist()
+        return [
+            [{"id": ids[i], "distance": fused[i]} for i in range(bounds[q], bounds[q + 1])]
+            for q in range(len(self.query_ids))
+        ]
+
+    def evaluate(self, fusions: list, qrels: dict, k: int = 10) -> list:
+        """
+        nDCG@k, MRR@k and recall@k of every fusion setting against
+        relevance judgments, averaged over the judged queries.
+
+        ``qrels`` maps query ids to ``{primary key: grade}``, both as
+        strings; grades above 0 are relevant and are the nDCG gains.
+        Gains are looked up once per (query, key), so each setting costs
+        one fusion and a few ``bincount`` calls.
+
+        Returns:
+            One dict per setting with its ``label``, ``ndcg``, ``mrr``,
+            ``recall`` and the ``ms`` it took
+        """
+        a = self._build()
+        queries = len(self.query_ids)
+        judgments = [qrels.get(str(q)) or {} for q in self.query_ids]
+        judged = np.array([bool(j) for j in judgments])
+        if not judged.any():
+            raise ParameterException("No query of the candidates has relevance judgments.")
+        keys = a["keys"].astype(str)
+        gains = np.array([
+            judgments[q].get(keys[key], 0.0)
+            for q, key in zip(a["slot_query"].tolist(), a["slot_key"].tolist())
+        ], dtype=np.float64)
+        discounts = 1.0 / np.log2(np.arange(k) + 2.0)
+        ideal = np.zeros(queries)
+        relevant = np.zeros(queries)
+        for q, grades in enumerate(judgments):
+            best = sorted((g for g in grades.values() if g > 0), reverse=True)
+            ideal[q] = float(np.dot(best[:k], discounts[: min(k, len(best))]))
+            relevant[q] = len(best)
+        judged &= relevant > 0
+        rows = []
+        for fusion in fusions:
+            start = time.perf_counter()
+            order, query, position, _ = self._top(fusion, k)
+            gain = gains[order]
+            found = gain > 0
+            dcg = np.bincount(query, weights=gain * discounts[position], minlength=queries)
+            first = np.full(queries, np.inf)
+            np.minimum.at(first, query[found], position[found])
+            hits = np.bincount(query[found], minlength=queries)
+            ndcg = dcg[judged] / ideal[judged]
+            mrr = 1.0 / (first[judged] + 1.0)
+            recall = hits[judged] / relevant[judged]
+            rows.append({
+                "label": fusion_label(fusion),
+                "ndcg": round(float(ndcg.mean()), 4),
+                "mrr": round(float(mrr.mean()), 4),
+                "recall": round(float(recall.mean()), 4),
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+            })
+        return rows
+
+    def compare(self, fusions: list, k: int = 10) -> list:
+        """
+        Fuse with every setting and measure how far each strays from the
+        first: the mean share of the first setting's top ``k`` it returns.
+
+        Returns:
+            One dict per setting with its ``label``, ``hits``, ``overlap``
+            with the first setting and the ``ms`` the fusion took
+        """
+        rows = []
+        baseline = None
+        for fusion in fusions:
+            start = time.perf_counter()
+            hits = self.fuse(fusion, k)
+            elapsed = (time.perf_counter() - start) * 1000
+            found = [[hit["id"] for hit in query] for query in hits]
+            if baseline is None:
+                baseline = found
+            overlap = [
+                len(set(a) & set(b)) / len(a) if a else 1.0 for a, b in zip(baseline, found)
+            ]
+            rows.append({
+                "label": fusion_label(fusion),
+                "hits": hits,
+                "overlap": round(float(np.mean(overlap)), 4) if overlap else 1.0,
+                "ms": round(elapsed, 2),
+            })
+        return rows
+
+    def save(self, path: str) -> str:
+        """Write the candidates to a .npz file; string keys are stored as text."""
+        a = self._build()
+        query_ids = np.asarray([str(q) for q in self.query_ids])
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".milvus_cli_", suffix=".npz", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(
+                    f,
+                    query_ids=query_ids,
+                    query_id_ints=np.asarray([isinstance(q, int) for q in self.query_ids]),
+                    fields=np.asarray(self.fields),
+                    metrics=np.asarray(self.metrics),
+                    query=a["query"],
+                    request=a["request"],
+                    rank=a["rank"],
+                    distance=a["distance"],
+                    keys=a["keys"],
+                    key_index=a["key_index"],
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    @classmethod
+    def load(cls, path: str) -> "CandidateSet":
+        """Candidates saved by ``save``."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                query_ids = [
+                    int(q) if is_int else str(q)
+                    for q, is_int in zip(data["query_ids"].tolist(), data["query_id_ints"].tolist())
+                ]
+                candidates = cls(query_ids, data["fields"].tolist(), data["metrics"].tolist())
+                a = {
+                    name: data[name]
+                    for name in ("query", "request", "rank", "distance", "keys", "key_index")
+                }
+        except (OSError, KeyError, ValueError) as e:
+            raise ParameterException(f"Cannot read candidates {path}: {e}")
+        candidates._arrays = candidates._index(a)
+        return candidates
+
+
+def collect_candidates(
+    data, collectionName: str, spec: dict, queriesPath: str, nqBatch: int = 100,
+    workers: int = 1,
+) -> tuple:
+    """
+    Run the component ANN searches of a hybrid search spec for every query
+    of a file, each request and batch of queries as its own search, up to
+    ``workers`` at a time.
+
+    Every request's ``param`` must name its ``metric_type``, which the
+    fusions normalize distances by.
+
+    Returns:
+        (CandidateSet, search stats) pair
+    """
+    requests = spec["requests"]
+    metrics = [request["param"].get("metric_type") for request in requests]
+    if not all(metrics):
+        raise ParameterException("Every request needs a metric_type to fuse its distances.")
+    fields = list(dict.fromkeys(request["field"] for request in requests))
+    candidates = CandidateSet([], [request["field"] for request in requests], metrics)
+
+    def batches():
+        for offset, ids, vectors in iter_hybrid_queries(queriesPath, fields, nqBatch):
+            candidates.query_ids.extend(ids)
+            for index, request in enumerate(requests):
+                searchParameters = {
+                    "anns_field": request["field"],
+                    "param": request["param"],
+                    "limit": request["limit"],
+                    "expr": request["expr"],
+                }
+                yield (index, offset), searchParameters, vectors[request["field"]]
+
+    stats = data.search_request_batches(
+        collectionName,
+        batches(),
+        workers=workers,
+        on_results=lambda key, results: candidates.add(key[0], key[1], results),
+    )
+    return candidates, stats
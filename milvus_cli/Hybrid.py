@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import os
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+RANKERS = ("weighted", "rrf")
+_SPEC_KEYS = {"collection", "requests", "ranker", "limit", "output_fields"}
+_REQUEST_KEYS = {"field", "param", "limit", "expr"}
+
+
+def _positive_int(value, what: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ParameterException(f"{what} should be a positive integer, got {value!r}.")
+    return value
+
+
+def check_ranker(ranker, requests: int) -> dict:
+    """
+    Normalized ranker of a spec: ``{"type": "weighted", "weights": [...]}``
+    with one weight per request, or ``{"type": "rrf", "k": 60}``.
+    """
+    if not isinstance(ranker, dict) or ranker.get("type", "").lower() not in RANKERS:
+        raise ParameterException(f"Ranker should be an object with a type in {RANKERS}.")
+    kind = ranker["type"].lower()
+    if kind == "weighted":
+        weights = ranker.get("weights")
+        if not isinstance(weights, list) or len(weights) != requests:
+            raise ParameterException(
+                f"Weighted ranker needs a list of {requests} weights, one per request."
+            )
+        try:
+            return {"type": kind, "weights": [float(w) for w in weights]}
+        except (TypeError, ValueError):
+            raise ParameterException(f"Invalid weights {weights}.")
+    k = ranker.get("k", 60)
+    return {"type": kind, "k": _positive_int(k, "RRF k")}
+
+
+def load_hybrid_spec(path: str) -> dict:
+    """
+    Read a hybrid search spec: the ANN request templates and the ranker.
+
+    A spec is a JSON object like::
+
+        {
+          "collection": "docs",
+          "requests": [
+            {"field": "dense", "param": {"metric_type": "COSINE", "params": {"ef": 64}},
+             "limit": 50, "expr": "lang == 'en'"},
+            {"field": "sparse", "param": {"metric_type": "IP"}, "limit": 50}
+          ],
+          "ranker": {"type": "weighted", "weights": [0.7, 0.3]},
+          "limit": 10,
+          "output_fields": ["title"]
+        }
+
+    Only ``requests`` and ``ranker`` are required. A request's ``limit``
+    defaults to the spec ``limit`` (10), and the ranker may also be
+    ``{"type": "rrf", "k": 60}``.
+
+    Returns:
+        dict: The spec with every default filled in
+    """
+    if not os.path.isfile(path):
+        raise ParameterException(f"FileNotFoundError {path}")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ParameterException(f"Cannot read hybrid search spec {path}: {e}")
+    if not isinstance(spec, dict):
+        raise ParameterException("A hybrid search spec should be a JSON object.")
+    unknown = set(spec) - _SPEC_KEYS
+    if unknown:
+        raise ParameterException(f"Unknown keys in hybrid search spec: {sorted(unknown)}.")
+    limit = _positive_int(spec.get("limit", 10), "Limit")
+    requests = spec.get("requests")
+    if not isinstance(requests, list) or not requests:
+        raise ParameterException("A hybrid search spec needs a non-empty list of requests.")
+    checked = []
+    for index, request in enumerate(requests):
+        if not isinstance(request, dict) or not request.get("field"):
+            raise ParameterException(f"Request {index} should be an object with a field.")
+        unknown = set(request) - _REQUEST_KEYS
+        if unknown:
+            raise ParameterException(f"Unknown keys in request {index}: {sorted(unknown)}.")
+        param = request.get("param") or {}
+        if not isinstance(param, dict):
+            raise ParameterException(f"The param of request {index} should be an object.")
+        checked.append({
+            "field": request["field"],
+            "param": param,
+            "limit": _positive_int(request.get("limit", limit), f"Limit of request {index}"),
+            "expr": request.get("expr") or None,
+        })
+    outputFields = spec.get("output_fields") or None
+    if outputFields is not None and not isinstance(outputFields, list):
+        raise ParameterException("Output fields should be a list of field names.")
+    return {
+        "collection": spec.get("collection"),
+        "requests": checked,
+        "ranker": check_ranker(spec.get("ranker"), len(checked)),
+        "limit": limit,
+        "output_fields": outputFields,
+    }
+
+
+def hybrid_ranker(ranker: dict):
+    """pymilvus ranker of a normalized spec ranker."""
+    from pymilvus import RRFRanker, WeightedRanker
+
+    if ranker["type"] == "weighted":
+        return WeightedRanker(*ranker["weights"])
+    return RRFRanker(k=ranker["k"])
+
+
+def ann_requests(spec: dict, vectors: dict) -> list:
+    """
+    One AnnSearchRequest per spec request, searching the batch of query
+    vectors given for its field in ``vectors``.
+    """
+    from pymilvus import AnnSearchRequest
+
+    return [
+        AnnSearchRequest(
+            data=vectors[request["field"]],
+            anns_field=request["field"],
+            param=request["param"],
+            limit=request["limit"],
+            expr=request["expr"],
+        )
+        for request in spec["requests"]
+    ]
+
+
+def _query_vector(value, field: str, lineNumber: int):
+    if isinstance(value, dict):
+        # Sparse vector; JSON object keys are always strings
+        try:
+            return {int(k): float(v) for k, v in value.items()}
+        except (TypeError, ValueError):
+            raise ParameterException(f"Invalid sparse vector {field} at line {lineNumber}.")
+    if isinstance(value, list) and value:
+        return value
+    raise ParameterException(f"Invalid vector {field} at line {lineNumber}.")
+
+
+def iter_hybrid_queries(path: str, fields: list, batch_size: int = 100):
+    """
+    Stream multi-vector queries from a JSON Lines file in batches.
+
+    Each line is an object holding a vector for every field in ``fields``
+    (a list for dense vectors, an ``{index: value}`` object for sparse
+    ones) and optionally the query's ``id``; queries without one are
+    numbered by their position in the file.
+
+    Yields:
+        (index of the first query, query ids, ``{field: list of vectors}``)
+        triples
+    """
+    _positive_int(batch_size, "Batch size")
+    if not os.path.isfile(path):
+        raise ParameterException(f"FileNotFoundError {path}")
+
+    def batch(rows):
+        return {field: [row[field] for row in rows] for field in fields}
+
+    with open(path, "rb") as f:
+        start, ids, rows = 0, [], []
+        for lineNumber, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                query = json.loads(line)
+            except (ValueError, UnicodeDecodeError) as e:
+                raise ParameterException(f"Invalid JSON at line {lineNumber}: {e}")
+            if not isinstance(query, dict):
+                raise ParameterException(f"Expected a JSON object at line {lineNumber}.")
+            missing = [field for field in fields if field not in query]
+            if missing:
+                raise ParameterException(f"No vector for {missing} at line {lineNumber}.")
+            ids.append(query.get("id", start + len(ids)))
+            rows.append({field: _query_vector(query[field], field, lineNumber) for field in fields})
+            if len(rows) >= batch_size:
+                yield start, ids, batch(rows)
+                start += len(rows)
+                ids, rows = [], []
+        if rows:
+            yield start, ids, batch(rows)
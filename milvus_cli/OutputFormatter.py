@@ -57,6 +57,46 @@ class OutputFormatter:
         else:  # table
             return self._format_table(data, headers, tablefmt)
 
+    def format_pages(self, pages, tablefmt="grid"):
+        """
+        Format pages of dicts one at a time, for results too large to hold.
+
+        JSON output is a single array and CSV output has a single header, as
+        format_output would give for all pages at once; a table is drawn per
+        page.
+
+        Args:
+            pages: Iterable of lists of dicts
+            tablefmt: Table format for tabulate (default: grid)
+
+        Yields:
+            Formatted chunks, each ending with a newline
+        """
+        first = True
+        for page in pages:
+            if not page:
+                continue
+            if self._format == "json":
+                items = [
+                    "  " + json.dumps(row, indent=2, default=str, ensure_ascii=False).replace("\n", "\n  ")
+                    for row in page
+                ]
+                yield ("[\n" if first else ",\n") + ",\n".join(items)
+            elif self._format == "csv":
+                output = io.StringIO()
+                writer = csv.DictWriter(output, fieldnames=list(page[0].keys()))
+                if first:
+                    writer.writeheader()
+                writer.writerows(page)
+                yield output.getvalue().replace("\r\n", "\n")
+            else:
+                yield self._format_table(page, tablefmt=tablefmt) + "\n"
+            first = False
+        if first:
+            yield "No data to display.\n"
+        elif self._format == "json":
+            yield "\n]\n"
+
     def _format_json(self, data):
         """Format data as JSON."""
         return json.dumps(data, indent=2, default=str, ensure_ascii=False)
@@ -3,8 +3,10 @@ from __future__ import annotations
 from pymilvus import MilvusClient
 try:
     from .BaseClient import BaseMilvusClient
+    from .QueryCache import query_cache
 except ImportError:
     from BaseClient import BaseMilvusClient
+    from QueryCache import query_cache
 
 
 class MilvusClientPartition(BaseMilvusClient):
@@ -88,6 +90,7 @@ class MilvusClientPartition(BaseMilvusClient):
                 collection_name=collectionName,
                 partition_name=partitionName
             )
+            query_cache.invalidate(collectionName)
             
             # Return updated partition list
             return self.list_partition_names(collectionName)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+
+def retry_call(
+    call: Callable[[], Any],
+    retries: int = 3,
+    backoff: float = 0.5,
+    on_retry: Callable[[int, Exception], None] | None = None,
+) -> Any:
+    """
+    Run ``call``, running it again up to ``retries`` times if it raises.
+
+    Waits ``backoff`` seconds before the first retry, doubling each time.
+    Parameter errors are raised at once, as a retry cannot fix them.
+    """
+    attempt = 0
+    while True:
+        try:
+            return call()
+        except ParameterException:
+            raise
+        except Exception as e:
+            if attempt >= retries:
+                raise
+            attempt += 1
+            if on_retry:
+                on_retry(attempt, e)
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+
+class RateLimiter:
+    """
+    Pace work to at most ``rate`` units (e.g. rows) per second.
+
+    ``acquire(units)`` blocks until the units may be spent. The first call
+    never waits; each later one waits until the units granted before it
+    have been paid for at ``rate``, so short bursts are not allowed to
+    build up credit. Safe to share between threads.
+    """
+
+    def __init__(self, rate: float) -> None:
+        if not rate or rate <= 0:
+            raise ParameterException("Rate should be a positive number.")
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self, units: int = 1) -> float:
+        """Wait for ``units`` and return the seconds waited."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(self._next, now)
+            self._next = start + units / self.rate
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class BatchPipeline:
+    """
+    Overlap batch preparation with concurrent sends.
+
+    The calling thread pulls batches from the input iterable, so reading,
+    parsing and converting happen there, while up to ``workers`` threads run
+    ``send`` on earlier batches. Once ``max_in_flight`` batches are queued or
+    being sent the caller blocks, so at most one more batch is held while it
+    is prepared. This bounds memory and makes a slow server push back on the
+    reader.
+
+    When ``on_commit`` is given it is called with each batch, in input order,
+    once that batch and every batch before it have been sent successfully,
+    so it always sees a contiguous committed prefix of the input.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[Any], int],
+        workers: int = 1,
+        max_in_flight: int | None = None,
+        on_commit: Callable[[Any], None] | None = None,
+    ) -> None:
+        if not workers or workers < 1:
+            raise ParameterException("Workers should be a positive integer.")
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ParameterException("Max in-flight batches should be a positive integer.")
+        self.send = send
+        self.workers = workers
+        self.max_in_flight = max_in_flight or workers * 2
+        self.on_commit = on_commit
+        self.rows = 0
+        self.batches = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def run(self, batches: Iterable[Any]) -> dict:
+        """
+        Send every batch and wait for all of them to be acknowledged.
+
+        Args:
+            batches: Iterable of batches, consumed lazily
+
+        Returns:
+            dict: rows and batches acknowledged, elapsed seconds and rows/s
+
+        Raises:
+            The first error raised by ``send``; no new batches are submitted
+            after it, but batches already in flight are allowed to finish.
+        """
+        slots = threading.BoundedSemaphore(self.max_in_flight)
+        lock = threading.Lock()
+        errors = []
+        # Batches sent but waiting for an earlier batch before being committed
+        acked = {}
+        next_commit = 0
+
+        def task(seq, batch):
+            nonlocal next_commit
+            try:
+                rows = self.send(batch)
+                with lock:
+                    self.rows += rows
+                    self.batches += 1
+                    if self.on_commit:
+                        acked[seq] = batch
+                        while next_commit in acked:
+                            self.on_commit(acked.pop(next_commit))
+                            next_commit += 1
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+            finally:
+                slots.release()
+
+        start = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="milvus_cli_send"
+            ) as pool:
+                for seq, batch in enumerate(batches):
+                    slots.acquire()
+                    if errors:
+                        slots.release()
+                        break
+                    pool.submit(task, seq, batch)
+        finally:
+            self.elapsed = time.perf_counter() - start
+        if errors:
+            raise errors[0]
+        return self.stats()
+
+    def stats(self) -> dict:
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "seconds": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
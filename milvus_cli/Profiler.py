@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from tabulate import tabulate
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes, or its peak where unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _empty_stats() -> dict:
+    return {"wall": 0.0, "cpu": 0.0, "rows": 0, "bytes": 0, "calls": 0, "rss": 0}
+
+
+def profile_stage(profiler: "StageProfiler | None", name: str):
+    """``profiler.stage(name)``, or a no-op context when not profiling."""
+    return profiler.stage(name) if profiler else nullcontext()
+
+
+class StageProfiler:
+    """
+    Per-stage wall time, CPU time, throughput and RSS of a file ingest.
+
+    Stages may nest on a thread, e.g. parsing inside reading: a stage is only
+    charged the time not spent in its nested stages, so the stage times add
+    up to the time actually spent. CPU time is the CPU of the thread running
+    the stage. Stages run by several worker threads at once add up their
+    time, which may then exceed the elapsed time of the run. RSS is sampled
+    when a stage ends and the highest sample is kept.
+    """
+
+    STAGES = ("read", "parse", "convert", "send")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self.stats = {name: _empty_stats() for name in self.STAGES}
+        self.start = time.perf_counter()
+        self.elapsed = 0.0
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a stage; stages nested inside it on this thread are not charged to it."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        # Time spent in nested stages, charged to them instead of this one
+        frame = [0.0, 0.0]
+        stack.append(frame)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            stack.pop()
+            if stack:
+                stack[-1][0] += wall
+                stack[-1][1] += cpu
+            rss = current_rss()
+            with self._lock:
+                stats = self.stats.setdefault(name, _empty_stats())
+                stats["wall"] += wall - frame[0]
+                stats["cpu"] += cpu - frame[1]
+                stats["calls"] += 1
+                stats["rss"] = max(stats["rss"], rss)
+
+    def count(self, name: str, rows: int = 0, nbytes: int = 0) -> None:
+        """Record rows and bytes handled by a stage."""
+        with self._lock:
+            stats = self.stats.setdefault(name, _empty_stats())
+            stats["rows"] += rows
+            stats["bytes"] += nbytes
+
+    def read_batches(self, batches):
+        """
+        Time pulling each batch out of a file reader as the read stage.
+
+        Parsing done by the reader is timed as its own nested stage; both
+        stages are credited with the rows and source bytes of each batch.
+        """
+        batches = iter(batches)
+        while True:
+            with self.stage("read"):
+                batch = next(batches, None)
+            if batch is None:
+                return
+            for name in ("read", "parse"):
+                self.count(name, batch.get("rows", 0), batch.get("bytes", 0))
+            yield batch
+
+    def finish(self) -> None:
+        self.elapsed = time.perf_counter() - self.start
+
+    def report(self) -> dict:
+        """Stage report as a JSON-serialisable dict."""
+        stages = {}
+        for name, stats in self.stats.items():
+            wall = stats["wall"]
+            stages[name] = {
+                "wall_seconds": round(wall, 6),
+                "cpu_seconds": round(stats["cpu"], 6),
+                "calls": stats["calls"],
+                "rows": stats["rows"],
+                "bytes": stats["bytes"],
+                "rows_per_sec": round(stats["rows"] / wall, 1) if wall > 0 else 0.0,
+                "bytes_per_sec": round(stats["bytes"] / wall, 1) if wall > 0 else 0.0,
+                "peak_rss_bytes": stats["rss"],
+            }
+        return {
+            "wall_seconds": round(self.elapsed, 6),
+            "peak_rss_bytes": max((s["rss"] for s in self.stats.values()), default=0),
+            "stages": stages,
+        }
+
+    def format(self) -> str:
+        """Stage report as a table."""
+        report = self.report()
+        rows = [
+            [
+                name,
+                f"{s['wall_seconds']:.3f}",
+                f"{s['cpu_seconds']:.3f}",
+                s["rows"],
+                f"{s['rows_per_sec']:.0f}",
+                f"{s['bytes_per_sec'] / 1e6:.2f}",
+                f"{s['peak_rss_bytes'] / 1e6:.1f}",
+            ]
+            for name, s in report["stages"].items()
+        ]
+        table = tabulate(
+            rows,
+            headers=["Stage", "Wall (s)", "CPU (s)", "Rows", "Rows/s", "MB/s", "Peak RSS (MB)"],
+            tablefmt="grid",
+        )
+        return (
+            f"{table}\nTotal wall time: {report['wall_seconds']:.3f}s, "
+            f"peak RSS: {report['peak_rss_bytes'] / 1e6:.1f} MB"
+        )
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import itertools
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+# Collection names never hold "*", so it can stand for every collection
+ANY_COLLECTION = "*"
+
+
+def estimate_size(value) -> int:
+    """Approximate bytes held by a query result: rows of dicts, lists and scalars."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + 112
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k) + estimate_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _copy_rows(rows) -> list:
+    # Callers may reformat the rows they get, so never hand out cached dicts
+    return [dict(row) if isinstance(row, dict) else row for row in rows]
+
+
+def _frozen(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(v) for v in value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("rows", "size", "expires", "names")
+
+    def __init__(self, rows, size, expires, names):
+        self.rows = rows
+        self.size = size
+        self.expires = expires
+        self.names = names
+
+
+class QueryCache:
+    """
+    Opt-in LRU cache of query and get results.
+
+    Entries are keyed on the client, collection, expression (or ids),
+    output fields, partitions and consistency level, and expire after
+    ``ttl`` seconds. The least recently used entries are evicted once the
+    results held exceed ``max_bytes``. Writes issued through the CLI drop
+    the entries of their collection, by the name used and the name it
+    resolves to when it is an alias; writes by other clients are only
+    caught by the TTL. A collection held by a bulk insert started through
+    the CLI is not cached until the task is released, as its rows appear
+    while the import runs. Clients are held weakly, so reconnecting starts
+    from an empty cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0) -> None:
+        self.enabled = False
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._clients = weakref.WeakKeyDictionary()
+        # Tokens are never reused, unlike the id() of a dead client
+        self._tokens = itertools.count()
+        self._bytes = 0
+        # Collection names held by each unfinished bulk insert task
+        self._imports = {}
+        self.reset_stats()
+
+    def configure(self, enabled=None, max_bytes=None, ttl=None) -> None:
+        if max_bytes is not None and max_bytes <= 0:
+            raise ParameterException("Cache size should be positive.")
+        if ttl is not None and ttl <= 0:
+            raise ParameterException("Cache TTL should be positive.")
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if ttl is not None:
+                self.ttl = ttl
+            if not self.enabled:
+                self._clear()
+            self._evict()
+
+    def reset_stats(self) -> None:
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "invalidations": 0}
+        self.collection_stats = {}
+
+    def key(self, client, kind: str, collectionName: str, *parts) -> tuple:
+        """Cache key of a request; ``parts`` are its filter, fields, partitions, ..."""
+        with self._lock:
+            token = self._clients.get(client)
+            if token is None:
+                token = self._clients[client] = next(self._tokens)
+        return (token, kind, collectionName) + tuple(_frozen(p) for p in parts)
+
+    def _count(self, collectionName: str, stat: str) -> None:
+        self.stats[stat] += 1
+        counts = self.collection_stats.setdefault(collectionName, {"hits": 0, "misses": 0})
+        counts[stat] += 1
+
+    def get(self, key: tuple):
+        """Copy of the cached rows for ``key``, or None."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.monotonic():
+                self._drop(key)
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self._count(key[2], "misses")
+                return None
+            self._entries.move_to_end(key)
+            self._count(key[2], "hits")
+            return _copy_rows(entry.rows)
+
+    def put(self, key: tuple, rows, names=()) -> None:
+        """
+        Cache ``rows`` under ``key``; ``names`` are other names of the
+        collection (e.g. the one an alias points to) that invalidate it, or
+        ``ANY_COLLECTION`` when a write to any collection should.
+        """
+        if not self.enabled:
+            return
+        rows = _copy_rows(rows)
+        size = estimate_size(rows)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(
+                rows, size, time.monotonic() + self.ttl, {key[2], *names}
+            )
+            self._bytes += size
+            self._evict()
+
+    def hold(self, task_id, names) -> None:
+        """Cache no results of the collection ``names`` until ``task_id`` is released."""
+        with self._lock:
+            self._imports[task_id] = set(names)
+
+    def release(self, task_id) -> None:
+        """End a hold once its task finished, dropping the results cached before."""
+        with self._lock:
+            names = self._imports.pop(task_id, ())
+        for name in names:
+            self.invalidate(name)
+
+    def holding(self, names=None) -> list:
+        """Tasks holding any of ``names``, or any collection when None."""
+        with self._lock:
+            return [
+                task_id for task_id, held in self._imports.items()
+                if names is None or held & set(names)
+            ]
+
+    def invalidate(self, collectionName: str | None = None) -> None:
+        """Forget the results of one collection, or of every collection when no name is given."""
+        with self._lock:
+            if collectionName is None:
+                self._clear()
+                return
+            for key in [
+                k for k, e in self._entries.items()
+                if collectionName in e.names or ANY_COLLECTION in e.names
+            ]:
+                self._drop(key)
+                self.stats["invalidations"] += 1
+
+    def _drop(self, key) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def _clear(self) -> None:
+        self.stats["invalidations"] += len(self._entries)
+        self._entries.clear()
+        self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            self._drop(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def summary(self) -> dict:
+        """Settings, totals and per-collection entries, bytes and hit rates."""
+        with self._lock:
+            collections = {}
+            for key, entry in self._entries.items():
+                held = collections.setdefault(key[2], {"entries": 0, "bytes": 0})
+                held["entries"] += 1
+                held["bytes"] += entry.size
+            rows = []
+            for name in sorted(set(collections) | set(self.collection_stats)):
+                counts = self.collection_stats.get(name, {"hits": 0, "misses": 0})
+                held = collections.get(name, {"entries": 0, "bytes": 0})
+                lookups = counts["hits"] + counts["misses"]
+                rows.append({
+                    "collection": name,
+                    **held,
+                    **counts,
+                    "hit_rate": counts["hits"] / lookups if lookups else 0.0,
+                })
+            lookups = self.stats["hits"] + self.stats["misses"]
+            return {
+                "enabled": self.enabled,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                **self.stats,
+                "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+                "collections": rows,
+            }
+
+
+query_cache = QueryCache()
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+# Metrics the exact search supports, all on float vectors
+EXACT_METRICS = ("L2", "IP", "COSINE")
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _id_array(ids) -> np.ndarray:
+    """Primary keys as an object array, so int and string keys gather alike."""
+    array = np.empty(len(ids), dtype=object)
+    array[:] = list(ids)
+    return array
+
+
+class ExactTopK:
+    """
+    Exact top-k neighbours of query vectors over base vectors added in blocks.
+
+    Each block is scored against ``query_block`` queries at a time with one
+    matrix product, and only the running top ``k`` per query is kept, so
+    memory stays at ``query_block`` x ``base_block`` scores however large the
+    collection is. L2 distances are squared, as Milvus reports them.
+    """
+
+    def __init__(
+        self,
+        queries,
+        k: int,
+        metric: str = "L2",
+        query_block: int = 1024,
+        base_block: int = 8192,
+    ) -> None:
+        metric = (metric or "").upper()
+        if metric not in EXACT_METRICS:
+            raise ParameterException(
+                f"Exact search supports metrics {EXACT_METRICS}, not {metric or 'none'}."
+            )
+        if not k or k < 1:
+            raise ParameterException("k should be a positive integer.")
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim != 2 or not len(queries):
+            raise ParameterException("Queries should be a non-empty 2-D array.")
+        self.metric = metric
+        self.k = k
+        self.query_block = query_block
+        self.base_block = base_block
+        self.queries = _unit_rows(queries) if metric == "COSINE" else queries
+        self.query_norms = np.einsum("ij,ij->i", self.queries, self.queries)
+        # Running best per query: a key to minimise and the matching ids
+        self.keys = np.empty((len(queries), 0), dtype=np.float32)
+        self.ids = np.empty((len(queries), 0), dtype=object)
+        self.seen = 0
+
+    def add(self, ids, vectors) -> None:
+        """Score a block of base vectors and their primary keys."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(vectors):
+            return
+        if vectors.shape[1] != self.queries.shape[1]:
+            raise ParameterException(
+                f"Base vectors have dim {vectors.shape[1]}, queries have dim {self.queries.shape[1]}."
+            )
+        ids = _id_array(ids)
+        for start in range(0, len(vectors), self.base_block):
+            self._add_block(ids[start:start + self.base_block], vectors[start:start + self.base_block])
+
+    def _add_block(self, ids: np.ndarray, vectors: np.ndarray) -> None:
+        if self.metric == "COSINE":
+            vectors = _unit_rows(vectors)
+        base_norms = np.einsum("ij,ij->i", vectors, vectors)
+        take = min(self.k, len(vectors))
+        keys, found = [], []
+        for start in range(0, len(self.queries), self.query_block):
+            stop = start + self.query_block
+            scores = self.queries[start:stop] @ vectors.T
+            if self.metric == "L2":
+                scores = base_norms[None, :] - 2 * scores
+            else:
+                scores = -scores
+            top = np.argpartition(scores, take - 1, axis=1)[:, :take]
+            keys.append(np.take_along_axis(scores, top, axis=1))
+            found.append(ids[top])
+        keys = np.concatenate([self.keys, np.concatenate(keys)], axis=1)
+        found = np.concatenate([self.ids, np.concatenate(found)], axis=1)
+        order = np.argsort(keys, axis=1, kind="stable")[:, : self.k]
+        self.keys = np.take_along_axis(keys, order, axis=1)
+        self.ids = np.take_along_axis(found, order, axis=1)
+        self.seen += len(vectors)
+
+    def result(self) -> tuple[list, np.ndarray]:
+        """Top-k ids per query, best first, and their distances as Milvus reports them."""
+        if self.metric == "L2":
+            distances = np.maximum(self.keys + self.query_norms[:, None], 0)
+        else:
+            distances = -self.keys
+        return self.ids.tolist(), distances
+
+
+def sample_vectors(batches, n: int, seed: int = 0) -> tuple[list, np.ndarray]:
+    """
+    Uniform sample of ``n`` vectors from (ids, vectors) batches in one pass.
+
+    Every vector gets a random key and the ``n`` smallest keys are kept, so
+    the sample is uniform whatever the number of vectors and depends only on
+    the seed and the order the batches come in.
+    """
+    if not n or n < 1:
+        raise ParameterException("Sample size should be a positive integer.")
+    rng = np.random.default_rng(seed)
+    keys = np.empty(0)
+    ids = np.empty(0, dtype=object)
+    vectors = None
+    for batchIds, batchVectors in batches:
+        batchVectors = np.asarray(batchVectors, dtype=np.float32)
+        keys = np.concatenate([keys, rng.random(len(batchVectors))])
+        ids = np.concatenate([ids, _id_array(batchIds)])
+        vectors = batchVectors if vectors is None else np.concatenate([vectors, batchVectors])
+        if len(keys) > n:
+            keep = np.argpartition(keys, n - 1)[:n]
+            keys, ids, vectors = keys[keep], ids[keep], vectors[keep]
+    if vectors is None:
+        raise ParameterException("No vectors to sample from.")
+    order = np.argsort(keys)
+    return ids[order].tolist(), vectors[order]
+
+
+def recall_at_k(truth: list, found: list, k: int) -> list:
+    """Per query, the share of its exact top-k ids that a search returned."""
+    values = []
+    for exact, hits in zip(truth, found):
+        exact = exact[:k]
+        if not exact:
+            values.append(1.0)
+            continue
+        values.append(len(set(exact) & set(hits[:k])) / len(exact))
+    return values
+
+
+def recall_summary(values: list) -> dict:
+    """Mean, min, low percentiles and max of per-query recall."""
+    if not values:
+        return {"queries": 0}
+    array = np.asarray(values)
+    return {
+        "queries": len(values),
+        "mean": round(float(array.mean()), 4),
+        "min": round(float(array.min()), 4),
+        "p5": round(float(np.percentile(array, 5)), 4),
+        "p50": round(float(np.percentile(array, 50)), 4),
+        "max": round(float(array.max()), 4),
+        "perfect": int((array == 1.0).sum()),
+    }
+
+
+def read_qrels(path: str) -> dict:
+    """
+    Relevance judgments as ``{query id: {primary key: grade}}``, ids as strings.
+
+    Reads TREC qrels (``query 0 key grade`` or ``query key [grade]`` per
+    line), a JSON object mapping query ids to a list of relevant keys or a
+    ``{key: grade}`` object, or JSON Lines of ``{"id": ..., "relevant":
+    ...}`` with the same list or object. Keys listed without a grade are
+    given grade 1.
+    """
+    if not os.path.isfile(path):
+        raise ParameterException(f"FileNotFoundError {path}")
+
+    def grades(relevant, where):
+        if isinstance(relevant, dict):
+            try:
+                return {str(key): float(grade) for key, grade in relevant.items()}
+            except (TypeError, ValueError):
+                raise ParameterException(f"Invalid grades {where} in {path}.")
+        if isinstance(relevant, list):
+            return {str(key): 1.0 for key in relevant}
+        raise ParameterException(f"Expected a list or an object of relevant keys {where} in {path}.")
+
+    qrels = {}
+    ext = os.path.splitext(path.lower())[1]
+    with open(path, "r", encoding="utf-8") as f:
+        if ext == ".json":
+            try:
+                data = json.load(f)
+            except ValueError as e:
+                raise ParameterException(f"Invalid JSON in {path}: {e}")
+            if not isinstance(data, dict):
+                raise ParameterException(f"Expected a JSON object of query ids in {path}.")
+            return {
+                str(query): grades(relevant, f"for query {query}")
+                for query, relevant in data.items()
+            }
+        for lineNumber, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if ext in (".jsonl", ".ndjson"):
+                try:
+                    row = json.loads(line)
+                    query, relevant = row["id"], row["relevant"]
+                except (ValueError, KeyError, TypeError):
+                    raise ParameterException(
+                        f"Expected an object with id and relevant at line {lineNumber} of {path}."
+                    )
+                qrels.setdefault(str(query), {}).update(grades(relevant, f"at line {lineNumber}"))
+                continue
+            parts = line.split()
+            if len(parts) == 4:
+                query, key, grade = parts[0], parts[2], parts[3]
+            elif len(parts) in (2, 3):
+                query, key, grade = parts[0], parts[1], parts[2] if len(parts) == 3 else 1
+            else:
+                raise ParameterException(f"Cannot read qrels line {lineNumber} of {path}.")
+            try:
+                qrels.setdefault(query, {})[key] = float(grade)
+            except ValueError:
+                raise ParameterException(f"Invalid grade at line {lineNumber} of {path}.")
+    return qrels
+
+
+def sample_hash(vectors=None, **params) -> str:
+    """Short digest of query vectors and the settings their ground truth depends on."""
+    digest = hashlib.sha1()
+    if vectors is not None:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        digest.update(str(vectors.shape).encode())
+        digest.update(vectors.tobytes())
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir() -> str:
+    return os.environ.get("MILVUS_CLI_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".milvus_cli_cache"
+    )
+
+
+def _safe_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))
+
+
+class GroundTruthCache:
+    """
+    Query samples and exact neighbours stored as .npz files.
+
+    Entries live under ``<root>/recall/<collection>/<field>-<key>.npz`` and
+    record the entity count they were computed at, so an entry is ignored
+    once the collection has grown or shrunk. Keys are never unpickled:
+    integer keys are stored as int64 and any others as strings.
+    """
+
+    def __init__(self, root: str | None = None) -> None:
+        self.root = root or default_cache_dir()
+
+    def path(self, collectionName: str, field: str, key: str) -> str:
+        return os.path.join(
+            self.root, "recall", _safe_name(collectionName), f"{_safe_name(field)}-{key}.npz"
+        )
+
+    def load(self, collectionName: str, field: str, key: str, entities: int | None = None):
+        """Cached ``(ids, values)``, or None when missing, stale or unreadable."""
+        path = self.path(collectionName, field, key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if entities is not None and int(data["entities"]) != entities:
+                    return None
+                return data["ids"].tolist(), data["values"]
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, collectionName: str, field: str, key: str, ids: list, values, entities: int = 0) -> str:
+        path = self.path(collectionName, field, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        ids = np.asarray(ids)
+        if ids.dtype == object:
+            ids = ids.astype(str)
+        fd, tmp_path = tempfile.mkstemp(prefix=".milvus_cli_", suffix=".npz", dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, ids=ids, values=np.asarray(values), entities=np.int64(entities))
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
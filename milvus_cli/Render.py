@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import json
+
+import numpy as np
+from tabulate import tabulate
+
+# Numeric lists at least this long are shown as vectors when the schema is unknown
+VECTOR_MIN_DIM = 16
+
+
+def abbreviate_vector(value) -> str:
+    """One-line summary of a vector, e.g. ``[dim=768, ‖v‖=1.02]``."""
+    if isinstance(value, (list, tuple)) and len(value) == 1 and isinstance(value[0], bytes):
+        value = value[0]
+    if isinstance(value, (bytes, bytearray)):
+        return f"[binary, dim={len(value) * 8}]"
+    if isinstance(value, dict):
+        return f"[sparse, nnz={len(value)}]"
+    try:
+        vector = np.asarray(value, dtype=np.float32).ravel()
+    except (TypeError, ValueError):
+        return str(value)
+    return f"[dim={vector.size}, ‖v‖={np.linalg.norm(vector):.4g}]"
+
+
+def _looks_like_vector(value) -> bool:
+    if isinstance(value, np.ndarray):
+        return value.ndim == 1 and value.size >= VECTOR_MIN_DIM
+    if isinstance(value, (bytes, bytearray)):
+        return True
+    if isinstance(value, (list, tuple)) and len(value) >= VECTOR_MIN_DIM:
+        return all(isinstance(v, (int, float)) for v in value[:VECTOR_MIN_DIM])
+    return False
+
+
+def _hit_parts(hit):
+    """``(id, distance, fields)`` of a MilvusClient hit, a plain dict or an ORM hit."""
+    if isinstance(hit, dict):
+        # MilvusClient hits name the id after the primary field
+        hit_id = getattr(hit, "id", None) if hasattr(type(hit), "id") else None
+        if hit_id is None:
+            hit_id = hit.get("id")
+        entity = dict.get(hit, "entity")
+        if entity is None:
+            entity = {k: v for k, v in hit.items() if k not in ("id", "distance")}
+        return hit_id, dict.get(hit, "distance"), entity
+    return (
+        getattr(hit, "id", None),
+        getattr(hit, "distance", None),
+        getattr(hit, "fields", None) or getattr(hit, "entity", None) or {},
+    )
+
+
+class HitTable:
+    """
+    Search hits held column by column and rendered a page at a time.
+
+    Building the table only moves references into one list per field; no
+    cell is formatted until the rows holding it are rendered. Vector fields
+    (``vector_fields``, or numeric lists of at least ``VECTOR_MIN_DIM``
+    values when it is None) are shown abbreviated as their dimension and
+    norm, and other cells are cut at ``max_width`` characters.
+    """
+
+    def __init__(self, hits, round_decimal: int = 4, vector_fields=None, max_width: int = 60) -> None:
+        self.round_decimal = round_decimal
+        self.max_width = max_width
+        self.ids = []
+        self.distances = []
+        self.columns = {}
+        for index, hit in enumerate(hits):
+            hit_id, distance, fields = _hit_parts(hit)
+            self.ids.append(hit_id)
+            self.distances.append(distance)
+            for name, value in fields.items():
+                column = self.columns.get(name)
+                if column is None:
+                    column = self.columns[name] = [None] * index
+                column.append(value)
+            for column in self.columns.values():
+                if len(column) <= index:
+                    column.append(None)
+        if vector_fields is None:
+            vector_fields = [
+                name
+                for name, column in self.columns.items()
+                if _looks_like_vector(next((v for v in column if v is not None), None))
+            ]
+        self.vector_fields = set(vector_fields)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def headers(self) -> list:
+        return ["ID", "Distance", *self.columns]
+
+    def _cell(self, name, value) -> str:
+        if value is None:
+            return ""
+        if name in self.vector_fields:
+            return abbreviate_vector(value)
+        if isinstance(value, (dict, list)):
+            text = json.dumps(value, default=str, ensure_ascii=False)
+        else:
+            text = str(value)
+        if len(text) > self.max_width:
+            text = text[: self.max_width - 1] + "…"
+        return text
+
+    def rows(self, start: int = 0, stop: int | None = None) -> list:
+        """Formatted cells of the hits in ``[start, stop)``."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        rows = []
+        for index in range(start, stop):
+            distance = self.distances[index]
+            # A negative round_decimal means no rounding, as for search
+            if isinstance(distance, float) and self.round_decimal >= 0:
+                distance = round(distance, self.round_decimal)
+            rows.append(
+                [self.ids[index], distance]
+                + [self._cell(name, column[index]) for name, column in self.columns.items()]
+            )
+        return rows
+
+    def render(self, start: int = 0, stop: int | None = None, tablefmt: str = "grid") -> str:
+        # Cells are already formatted; skip tabulate's per-cell number parsing
+        return tabulate(
+            self.rows(start, stop), headers=self.headers, tablefmt=tablefmt, disable_numparse=True
+        )
+
+    def pages(self, page_size: int = 50, tablefmt: str = "grid"):
+        """
+        Rendered tables of ``page_size`` hits each, built only when the
+        consumer (e.g. a pager) asks for the next one.
+        """
+        for start in range(0, max(len(self), 1), page_size):
+            stop = min(start + page_size, len(self))
+            yield f"Hits {start + 1}-{stop} of {len(self)}\n" if len(self) > page_size else ""
+            yield self.render(start, stop, tablefmt) + "\n"
@@ -0,0 +1,346 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+
+try:
+    from .Converter import ColumnBatch, field_type_name
+    from .Fs import sourceFormat
+    from .Types import ParameterException
+except ImportError:
+    from Converter import ColumnBatch, field_type_name
+    from Fs import sourceFormat
+    from Types import ParameterException
+
+SHARD_FORMATS = ("json", "parquet")
+# Milvus rejects import files larger than this
+MAX_SHARD_BYTES = 16 << 30
+
+
+def local_sources(path: str) -> list[str]:
+    """A supported data file, or every supported file under a directory, sorted."""
+    if os.path.isfile(path):
+        if not sourceFormat(path):
+            raise ParameterException(
+                f"Unsupported file type {path}, expected .csv, .parquet, .jsonl, .npy or .npz"
+            )
+        return [path]
+    if not os.path.isdir(path):
+        raise ParameterException(f"No such file or directory: {path}")
+    sources = sorted(
+        os.path.join(dirpath, name)
+        for dirpath, _dirs, names in os.walk(path)
+        for name in names
+        if sourceFormat(name)
+    )
+    if not sources:
+        raise ParameterException(f"No .csv, .parquet, .jsonl, .npy or .npz file in {path}")
+    return sources
+
+
+def staging_prefix(collectionName: str) -> str:
+    """Unique object prefix for the shards of one staging run."""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return f"milvus_cli_staging/{collectionName}/{stamp}-{uuid.uuid4().hex[:8]}"
+
+
+class LocalStorage:
+    """
+    Shards written straight under a local directory.
+
+    The directory is the root Milvus resolves import paths against, e.g. the
+    local storage path of a standalone Milvus or the bucket directory of a
+    filesystem-backed MinIO, so shards are submitted by their relative path.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+
+    def open(self, key: str) -> str:
+        """Local path to write the shard ``key`` to."""
+        path = os.path.join(self.root, *key.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def commit(self, key: str, path: str) -> str:
+        """Publish a written shard and return the path to submit to Milvus."""
+        return key
+
+    def close(self) -> None:
+        """Release what the storage holds once every shard is committed."""
+
+
+class S3Storage:
+    """
+    Shards uploaded to an S3 or MinIO bucket, given as ``s3://bucket/prefix``.
+
+    Shards are written to a temporary file and uploaded once complete, then
+    submitted by their object key. Credentials are read by boto3 from the
+    usual AWS environment variables or config files.
+    """
+
+    def __init__(self, url: str, endpoint: str | None = None) -> None:
+        try:
+            import boto3
+        except ImportError:
+            raise ParameterException(
+                "Staging to S3 or MinIO requires boto3, install it with `pip install boto3`."
+            )
+        location = url.split("://", 1)[1]
+        self.bucket, _, prefix = location.partition("/")
+        if not self.bucket:
+            raise ParameterException(f"No bucket in storage root {url}")
+        self.prefix = prefix.strip("/")
+        self.client = boto3.client("s3", endpoint_url=endpoint)
+        self.tmpdir = tempfile.mkdtemp(prefix="milvus_cli_staging_")
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def open(self, key: str) -> str:
+        return os.path.join(self.tmpdir, key.replace("/", "_"))
+
+    def commit(self, key: str, path: str) -> str:
+        objectKey = self._object_key(key)
+        try:
+            self.client.upload_file(path, self.bucket, objectKey)
+        except Exception as e:
+            raise ParameterException(f"Upload of {objectKey} failed: {e}")
+        finally:
+            os.unlink(path)
+        return objectKey
+
+    def close(self) -> None:
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+
+def open_storage(root: str | None, endpoint: str | None = None):
+    """Storage for a root given as a local directory or an s3:// or minio:// URL."""
+    if not root:
+        raise ParameterException(
+            "A storage root is needed, pass --storage-root or set MILVUS_CLI_STORAGE_ROOT."
+        )
+    if root.startswith(("s3://", "minio://")):
+        return S3Storage(root, endpoint)
+    if not os.path.isdir(root):
+        raise ParameterException(f"Storage root {root} is not a directory.")
+    return LocalStorage(root)
+
+
+def _json_default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (bytes, bytearray)):
+        # Binary vectors are imported as lists of uint8
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+# Arrow types of Milvus fields in Parquet import files, by pyarrow factory name
+_ARROW_SCALARS = {
+    "BOOL": "bool_",
+    "INT8": "int8",
+    "INT16": "int16",
+    "INT32": "int32",
+    "INT64": "int64",
+    "FLOAT": "float32",
+    "DOUBLE": "float64",
+    "VARCHAR": "string",
+    "STRING": "string",
+    "JSON": "string",
+    "SPARSE_FLOAT_VECTOR": "string",
+}
+_ARROW_VECTOR_ELEMENTS = {
+    "FLOAT_VECTOR": "float32",
+    "FLOAT16_VECTOR": "float32",
+    "BFLOAT16_VECTOR": "float32",
+    "BINARY_VECTOR": "uint8",
+    "INT8_VECTOR": "int8",
+}
+# Fields imported from Parquet as JSON text
+_JSON_TEXT_TYPES = ("JSON", "SPARSE_FLOAT_VECTOR")
+
+
+def _arrow_type(field: dict):
+    """Arrow type of a field in a Parquet shard, or None to infer it from the data."""
+    import pyarrow as pa
+
+    type_name = field_type_name(field)
+    if type_name == "ARRAY":
+        element = _arrow_type({"type": field.get("element_type")})
+        return pa.list_(element) if element is not None else None
+    if type_name in _ARROW_VECTOR_ELEMENTS:
+        return pa.list_(getattr(pa, _ARROW_VECTOR_ELEMENTS[type_name])())
+    factory = _ARROW_SCALARS.get(type_name)
+    return getattr(pa, factory)() if factory else None
+
+
+def _arrow_column(column, field: dict | None = None):
+    import pyarrow as pa
+
+    arrow_type = _arrow_type(field) if field else None
+    if isinstance(column, np.ndarray) and column.ndim == 2:
+        rows, dim = column.shape
+        offsets = np.arange(rows + 1, dtype=np.int32) * dim
+        array = pa.ListArray.from_arrays(pa.array(offsets), pa.array(column.reshape(-1)))
+        return array.cast(arrow_type) if arrow_type is not None else array
+    if isinstance(column, np.ndarray):
+        return pa.array(column, type=arrow_type)
+    as_text = field is not None and field_type_name(field) in _JSON_TEXT_TYPES
+    return pa.array(
+        [
+            json.dumps(value, default=_json_default)
+            if (as_text and value is not None) or isinstance(value, dict)
+            else value.tolist() if isinstance(value, np.ndarray)
+            else list(value) if isinstance(value, (bytes, bytearray))
+            else value
+            for value in column
+        ],
+        type=arrow_type,
+    )
+
+
+_JSON_HEAD = b'{"rows": [\n'
+_JSON_TAIL = b"\n]}\n"
+
+
+class ShardWriter:
+    """
+    Split column batches into bulk insert files of about ``shard_bytes`` each.
+
+    JSON shards hold ``{"rows": [...]}`` in UTF-8 and are cut before the row
+    that would take them past the size, so only a single row larger than
+    the size makes a larger shard; Parquet shards (which need pyarrow) are
+    cut at the first batch whose uncompressed size takes them past it, and
+    their columns get the Arrow types of the collection ``fields`` so every
+    batch is written alike. Every closed shard is handed to the storage and
+    listed in ``shards`` as ``(path, rows)``; the storage is closed with the
+    writer.
+    """
+
+    def __init__(
+        self,
+        storage,
+        prefix: str,
+        fmt: str = "json",
+        shard_bytes: int = 512 << 20,
+        fields: list | None = None,
+    ) -> None:
+        if fmt not in SHARD_FORMATS:
+            raise ParameterException(f"Shard format should be one of {SHARD_FORMATS}.")
+        if not shard_bytes or shard_bytes <= 0 or shard_bytes > MAX_SHARD_BYTES:
+            raise ParameterException(
+                f"Shard size should be positive and at most {MAX_SHARD_BYTES >> 30} GB."
+            )
+        if fmt == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ParameterException(
+                    "Writing Parquet shards requires pyarrow, install it with `pip install pyarrow`."
+                )
+        self.storage = storage
+        self.prefix = prefix
+        self.fmt = fmt
+        self.shard_bytes = shard_bytes
+        self.fields = {f.get("name", ""): f for f in fields or []}
+        self.shards = []
+        self._file = None
+        self._key = None
+        self._path = None
+        self._rows = 0
+        self._bytes = 0
+
+    def _open(self) -> None:
+        self._key = f"{self.prefix}/shard-{len(self.shards):05d}.{self.fmt}"
+        self._path = self.storage.open(self._key)
+        self._rows = self._bytes = 0
+        if self.fmt == "json":
+            self._file = open(self._path, "wb")
+            self._file.write(_JSON_HEAD)
+            self._bytes = len(_JSON_HEAD) + len(_JSON_TAIL)
+
+    def _close(self) -> None:
+        if self._path is None:
+            return
+        if self.fmt == "json":
+            self._file.write(_JSON_TAIL)
+            self._file.close()
+        elif self._file is not None:
+            self._file.close()
+        self._file = None
+        path = self.storage.commit(self._key, self._path)
+        self.shards.append((path, self._rows))
+        self._path = None
+
+    def write(self, batch: ColumnBatch) -> None:
+        if self.fmt == "json":
+            self._write_json(batch)
+        else:
+            self._write_parquet(batch)
+
+    def _write_json(self, batch: ColumnBatch) -> None:
+        for row in batch.to_rows():
+            data = json.dumps(row, default=_json_default, ensure_ascii=False).encode("utf-8")
+            if self._rows and self._bytes + len(data) + 2 > self.shard_bytes:
+                self._close()
+            if self._path is None:
+                self._open()
+            elif self._rows:
+                self._file.write(b",\n")
+                self._bytes += 2
+            self._file.write(data)
+            self._rows += 1
+            self._bytes += len(data)
+
+    def _write_parquet(self, batch: ColumnBatch) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = {}
+        for name, column in zip(batch.names, batch.columns):
+            try:
+                columns[name] = _arrow_column(column, self.fields.get(name))
+            except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as e:
+                raise ParameterException(f"Column {name} does not match its field type: {e}")
+        table = pa.table(columns)
+        if self._path is None:
+            self._open()
+        if self._file is None:
+            self._file = pq.ParquetWriter(self._path, table.schema)
+        elif table.schema != self._file.schema:
+            try:
+                table = table.cast(self._file.schema)
+            except (pa.ArrowInvalid, ValueError) as e:
+                raise ParameterException(f"Batch does not match the shard schema: {e}")
+        self._file.write_table(table)
+        self._rows += table.num_rows
+        self._bytes += table.nbytes
+        if self._bytes >= self.shard_bytes:
+            self._close()
+
+    def close(self) -> list:
+        """Close the last shard and return every ``(path, rows)`` written."""
+        try:
+            self._close()
+        finally:
+            self.storage.close()
+        return self.shards
+
+    def abort(self) -> None:
+        """Drop the shard being written, e.g. after a read error."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._path is not None and os.path.exists(self._path):
+            os.unlink(self._path)
+        self._path = None
+        self.storage.close()
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Callable
+
+try:
+    from .Types import ParameterException
+except ImportError:
+    from Types import ParameterException
+
+# Search parameters that trade latency for recall as they grow, with the
+# range they are tuned over; None stands for the limit k or the index nlist
+TUNABLE_RANGES = {
+    "nprobe": (1, None),
+    "ef": (None, 4096),
+    "search_list": (None, 4096),
+    "reorder_k": (None, 4096),
+    "search_length": (1, 1024),
+    "search_k": (None, 65536),
+    "level": (1, 10),
+}
+
+
+def _index_param(indexDetails: dict, name: str):
+    params = indexDetails.get("params") or {}
+    if isinstance(params, str):
+        try:
+            params = json.loads(params)
+        except ValueError:
+            params = {}
+    return indexDetails.get(name, params.get(name))
+
+
+def tuning_space(indexDetails: dict, search_parameters: list, limit: int) -> dict:
+    """
+    ``{name: (low, high)}`` for the tunable search parameters of an index.
+
+    nprobe is bounded by the index nlist, and parameters that Milvus
+    requires to be at least the limit (ef, search_list, ...) start there.
+    """
+    try:
+        nlist = int(_index_param(indexDetails, "nlist") or 0) or 65536
+    except (TypeError, ValueError):
+        nlist = 65536
+    space = {}
+    for name in search_parameters:
+        if name not in TUNABLE_RANGES:
+            continue
+        low, high = TUNABLE_RANGES[name]
+        low = limit if low is None else low
+        high = nlist if high is None else high
+        space[name] = (low, max(low, high))
+    return space
+
+
+def pareto_frontier(trials: list, latency: str = "mean_ms") -> list:
+    """Trials no other trial beats on both recall and latency, fastest first."""
+    frontier = []
+    for trial in sorted(trials, key=lambda t: (t[latency], -t["recall"])):
+        if not frontier or trial["recall"] > frontier[-1]["recall"]:
+            frontier.append(trial)
+    return frontier
+
+
+def cheapest(trials: list, target_recall: float, latency: str = "mean_ms"):
+    """Fastest trial meeting the recall target, or None."""
+    passing = [t for t in trials if t["recall"] >= target_recall]
+    return min(passing, key=lambda t: (t[latency], -t["recall"])) if passing else None
+
+
+class SearchTuner:
+    """
+    Adaptive sweep of search parameters instead of a full grid.
+
+    Each parameter is tuned in turn with the others held at their current
+    value. Its value doubles from the low end of its range until the recall
+    target is met, then the last step is bisected down to within
+    ``tolerance`` of the smallest passing value. Without a target the
+    doubling runs until recall stops improving, which maps the frontier in
+    a logarithmic number of trials. ``evaluate`` takes a params dict and
+    returns a trial dict with at least ``recall`` and the latency key;
+    repeated settings are not evaluated again.
+    """
+
+    def __init__(
+        self,
+        evaluate: Callable[[dict], dict],
+        space: dict,
+        target_recall: float | None = None,
+        fixed: dict | None = None,
+        tolerance: float = 0.05,
+        max_trials: int = 50,
+        plateau: float = 0.001,
+    ) -> None:
+        if not space:
+            raise ParameterException("The index has no tunable search parameters.")
+        if target_recall is not None and not 0 < target_recall <= 1:
+            raise ParameterException("Target recall should be in (0, 1].")
+        self.evaluate = evaluate
+        self.space = space
+        self.target_recall = target_recall
+        self.tolerance = tolerance
+        self.max_trials = max_trials
+        self.plateau = plateau
+        self.current = dict(fixed or {})
+        for name, (low, high) in space.items():
+            self.current[name] = min(max(int(self.current.get(name, low)), low), high)
+        self.trials = []
+        self._seen = {}
+
+    def _trial(self, name: str, value: int) -> dict | None:
+        params = {**self.current, name: value}
+        key = tuple(sorted(params.items()))
+        if key not in self._seen:
+            if len(self.trials) >= self.max_trials:
+                return None
+            trial = dict(self.evaluate(params))
+            trial["params"] = params
+            self.trials.append(trial)
+            self._seen[key] = trial
+        return self._seen[key]
+
+    def _passes(self, trial: dict) -> bool:
+        return self.target_recall is not None and trial["recall"] >= self.target_recall
+
+    def _tune(self, name: str) -> None:
+        low, high = self.space[name]
+        value, failed, best = low, None, None
+        while True:
+            trial = self._trial(name, value)
+            if trial is None:
+                return
+            if self._passes(trial):
+                break
+            if self.target_recall is None and best is not None:
+                if trial["recall"] - best["recall"] < self.plateau:
+                    self.current[name] = best["params"][name]
+                    return
+            if best is None or trial["recall"] > best["recall"]:
+                best = trial
+            if trial["recall"] >= 1.0:
+                break
+            failed = value
+            if value >= high:
+                # No value in range meets the target; keep the best seen
+                self.current[name] = best["params"][name]
+                return
+            value = min(value * 2, high)
+        passed = value
+        if failed is not None and self.target_recall is not None:
+            while passed - failed > max(1, int(failed * self.tolerance)):
+                middle = (failed + passed) // 2
+                trial = self._trial(name, middle)
+                if trial is None:
+                    break
+                if self._passes(trial):
+                    passed = middle
+                else:
+                    failed = middle
+        self.current[name] = passed
+
+    def run(self) -> list:
+        """Tune every parameter and return all trials in the order they ran."""
+        for name in self.space:
+            self._tune(name)
+        return self.trials
+
+
+class SavedSearchParams:
+    """
+    Search params chosen by ``tune search --save``, per server, database,
+    collection and field, stored in ~/.milvus_cli_search_params.json.
+    """
+
+    DEFAULT_PATH = Path.home() / ".milvus_cli_search_params.json"
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else self.DEFAULT_PATH
+
+    @staticmethod
+    def key(uri, database, collectionName, field):
+        return f"{uri}/{database or 'default'}/{collectionName}/{field}"
+
+    def _load(self):
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return {}
+
+    def get(self, uri, database, collectionName, field):
+        """Saved ``{name: value}`` params, or None."""
+        return self._load().get(self.key(uri, database, collectionName, field))
+
+    def save(self, uri, database, collectionName, field, params):
+        entries = self._load()
+        entries[self.key(uri, database, collectionName, field)] = params
+        with open(self.path, "w") as f:
+            json.dump(entries, f, indent=2)
+
+    def remove(self, uri, database, collectionName, field):
+        entries = self._load()
+        if entries.pop(self.key(uri, database, collectionName, field), None) is not None:
+            with open(self.path, "w") as f:
+                json.dump(entries, f, indent=2)
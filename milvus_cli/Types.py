@@ -145,6 +145,17 @@ DupSearchParams = reduce(
 SearchParams = list(dict.fromkeys(DupSearchParams))
 SearchParams.append("group_by_field")
 
+# Values used for an index's search parameters when none are given
+SearchParamDefaults = {
+    "nprobe": "10",
+    "ef": "64",
+    "search_list": "20",
+    "reorder_k": "10",
+    "search_length": "10",
+    "search_k": "100",
+    "drop_ratio_search": "0.2",
+}
+
 MetricTypes = [
     "L2",
     "IP",
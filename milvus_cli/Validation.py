@@ -8,7 +8,7 @@ try:
         MetricTypes,
         Operators,
     )
-    from .Fs import readCsvFile
+    from .Fs import readCsvFileInBatches
 except ImportError:
     from Types import ParameterException
     from Types import (
@@ -19,7 +19,7 @@ except ImportError:
         MetricTypes,
         Operators,
     )
-    from Fs import readCsvFile
+    from Fs import readCsvFileInBatches
 
 
 def validateParamsByCustomFunc(customFunc, errMsg, *params):
@@ -130,8 +130,11 @@ def validateSearchParams(
     # Validate data
     try:
         if ".csv" in data:
-            csvData = readCsvFile(data, withCol=False)
-            result["data"] = csvData["data"][0]
+            result["data"] = [
+                vector
+                for batch in readCsvFileInBatches(data, withCol=False)
+                for vector in batch["data"][0]
+            ]
         else:
             result["data"] = data
     except Exception as e:
@@ -0,0 +1,240 @@
+from .helper_client_cli import cli
+
+import click
+import json
+
+from ..Bench import SearchBench, format_bench_report
+from ..Checkpoint import write_json_atomic
+from ..Converter import field_dim, field_type_name
+from ..Fs import readVectorsInBatches
+from ..Types import ParameterException
+from ..Validation import validateSearchParams
+from .data_client_cli import indexSearchParams
+
+
+def loadQueryVectors(obj, collectionName, annsField, vectorsFile, randomQueries):
+    """Query vectors from a file, or random vectors of the field's dimension."""
+    import numpy as np
+
+    field = next(
+        (f for f in obj.data.input_fields(collectionName) if f.get("name") == annsField),
+        None,
+    )
+    if field is None:
+        raise ParameterException(
+            f"Field {annsField} not found in collection {collectionName}."
+        )
+    if field_type_name(field) != "FLOAT_VECTOR":
+        raise ParameterException(f"Field {annsField} is not a float vector field.")
+    dim = field_dim(field)
+    if vectorsFile:
+        batches = [vectors for _, vectors in readVectorsInBatches(vectorsFile, 10000, annsField)]
+        if not batches:
+            raise ParameterException(f"No query vectors in {vectorsFile}.")
+        queries = np.concatenate(batches)
+    else:
+        rng = np.random.default_rng(0)
+        queries = rng.random((randomQueries, dim), dtype=np.float32)
+    if dim and queries.shape[1] != dim:
+        raise ParameterException(
+            f"Query vectors have dim {queries.shape[1]}, field {annsField} has dim {dim}."
+        )
+    return queries
+
+
+def searchParametersFor(obj, collectionName, annsField, limit, params, expr):
+    """Search parameters for a field, defaulting to its index's search params."""
+    metricType, defaultParams, hasIndex = indexSearchParams(obj, collectionName, annsField)
+    return validateSearchParams(
+        data=[],
+        annsField=annsField,
+        metricType=metricType,
+        params=params or defaultParams,
+        limit=limit,
+        expr=expr,
+        outputFields="",
+        roundDecimal=-1,
+        hasIndex=hasIndex,
+        guarantee_timestamp=0,
+        partitionNames="",
+    )
+
+
+@cli.group("bench", no_args_is_help=False)
+@click.pass_obj
+def bench(obj):
+    """Measure serving performance."""
+    pass
+
+
+@bench.command("search")
+@click.option("-c", "--collection-name", "collectionName", help="Collection name.", required=True)
+@click.option("-f", "--field", "annsField", help="Vector field to search.", required=True)
+@click.option(
+    "--vectors-file",
+    "vectorsFile",
+    default=None,
+    help="[Optional] - Query vectors to replay (.npy, .csv or .jsonl), default is random vectors.",
+)
+@click.option(
+    "--random",
+    "randomQueries",
+    default=1000,
+    type=int,
+    help="[Optional] - Number of random query vectors without --vectors-file, default is 1000.",
+)
+@click.option("--nq", "nq", default=1, type=int, help="[Optional] - Query vectors per request, default is 1.")
+@click.option("-l", "--limit", "limit", default=10, type=int, help="[Optional] - Top K, default is 10.")
+@click.option(
+    "--params",
+    "params",
+    default=None,
+    help="[Optional] - Search params, e.g. 'ef:128', default is the index defaults.",
+)
+@click.option("--expr", "expr", default="", help="[Optional] - Filter expression.")
+@click.option(
+    "--concurrency",
+    "concurrency",
+    default=1,
+    type=int,
+    help="[Optional] - Concurrent requests, default is 1.",
+)
+@click.option(
+    "--qps",
+    "qps",
+    default=None,
+    type=float,
+    help="[Optional] - Target requests per second across all threads, default is as fast as possible.",
+)
+@click.option(
+    "--duration",
+    "duration",
+    default=None,
+    type=float,
+    help="[Optional] - Seconds to run, default is 30 unless --count is set.",
+)
+@click.option("--count", "count", default=None, type=int, help="[Optional] - Number of requests to send.")
+@click.option(
+    "--warmup",
+    "warmup",
+    default=0.0,
+    type=float,
+    help="[Optional] - Seconds of unmeasured requests before the run.",
+)
+@click.option(
+    "--format",
+    "outputFormat",
+    default="table",
+    type=click.Choice(["table", "json"]),
+    help="[Optional] - Report format, default is table.",
+)
+@click.option(
+    "--output",
+    "output",
+    default=None,
+    help="[Optional] - Also write the JSON report to this file.",
+)
+@click.pass_obj
+def bench_search(
+    obj,
+    collectionName,
+    annsField,
+    vectorsFile,
+    randomQueries,
+    nq,
+    limit,
+    params,
+    expr,
+    concurrency,
+    qps,
+    duration,
+    count,
+    warmup,
+    outputFormat,
+    output,
+):
+    """
+    Replay query vectors against a collection and report throughput and latency.
+
+    USAGE:
+        milvus_cli > bench search -c <collection> -f <field> [options]
+
+    OPTIONS:
+        -c, --collection-name    Target collection (required)
+        -f, --field              Vector field to search (required)
+        --vectors-file           Query vectors (.npy, .csv, .jsonl), default random
+        --random                 Random query vectors without a file (default: 1000)
+        --nq                     Query vectors per request (default: 1)
+        -l, --limit              Top K (default: 10)
+        --params                 Search params, default is the index defaults
+        --expr                   Filter expression
+        --concurrency            Concurrent requests (default: 1)
+        --qps                    Target requests/s, default unthrottled
+        --duration               Seconds to run (default: 30)
+        --count                  Requests to send
+        --warmup                 Unmeasured seconds before the run
+        --format                 table or json (default: table)
+        --output                 Also write the JSON report to a file
+
+    LATENCY:
+        Latencies go into an HDR-style log-linear histogram (3 significant
+        digits) and are reported as min, mean, p50, p90, p99, p99.9 and max.
+        With --qps requests follow a fixed schedule and latency is measured
+        from the time each request was due, so queueing is not hidden.
+
+    EXAMPLES:
+        # 8 concurrent clients for 60 seconds after a 10 second warm-up
+        milvus_cli > bench search -c products -f embedding --concurrency 8 --duration 60 --warmup 10
+
+        # 200 requests/s from a query file, JSON report
+        milvus_cli > bench search -c products -f embedding --vectors-file q.npy --qps 200 --format json
+
+    SEE ALSO:
+        search
+    """
+    try:
+        if not duration and not count:
+            duration = 30.0
+        queries = loadQueryVectors(
+            obj, collectionName, annsField, vectorsFile, randomQueries
+        )
+        searchParameters = searchParametersFor(
+            obj,
+            collectionName,
+            annsField,
+            limit,
+            [p.strip() for p in params.split(",")] if params else None,
+            expr,
+        )
+        runner = SearchBench(
+            lambda vectors: obj.data.search_vectors(
+                collectionName, searchParameters, vectors
+            ),
+            queries,
+            nq=nq,
+            concurrency=concurrency,
+            qps=qps,
+        )
+        click.echo(
+            f"Replaying {len(queries)} query vectors with {searchParameters['param']}...",
+            err=True,
+        )
+        report = runner.run(duration=duration, count=count, warmup=warmup)
+        report.update(
+            {
+                "collection": collectionName,
+                "field": annsField,
+                "limit": limit,
+                "search_params": searchParameters["param"],
+            }
+        )
+    except Exception as e:
+        click.echo("Error!\n{}".format(str(e)), err=True)
+        return
+    if outputFormat == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo(format_bench_report(report))
+    if output:
+        write_json_atomic(output, report)
+        click.echo(f"Report written to {output}", err=True)
@@ -956,22 +956,193 @@ def show_flush_state(obj, collectionName):
     except Exception as e:
         click.echo(message=e, err=True)
 
+def exportQuery(
+    obj, collectionName, expr, outputFields, batchSize, limit, out, fmt, resume,
+    parallel=1, merge=False,
+):
+    """
+    Stream query_iterator pages into a file (or stdout) without prompts.
+
+    Memory holds one page per stream. With ``parallel`` above 1 the
+    collection is split into primary-key ranges exported concurrently to
+    shard files listed in a manifest, optionally merged into ``out``.
+    """
+    import os
+    import threading
+    import time
+
+    from ..Export import export_format, export_parallel, export_range, manifest_path, merge_shards
+    from ..Types import ParameterException
+
+    fmt = export_format(out, fmt)
+    if parallel > 1 and limit:
+        raise ParameterException("--limit cannot be combined with --parallel.")
+    if merge and parallel <= 1:
+        raise ParameterException("--merge only applies to a --parallel export.")
+    total = obj.data.get_entity_count(collectionName)
+    if limit:
+        total = min(total, limit)
+    lock = threading.Lock()
+    counts = {"rows": 0, "resumed": 0}
+    start = time.perf_counter()
+
+    def showRate(_):
+        elapsed = time.perf_counter() - start
+        exported = counts["rows"] - counts["resumed"]
+        return f"{exported / elapsed:,.0f} rows/s" if elapsed > 0 and exported else ""
+
+    with click.progressbar(
+        length=total,
+        label=f"Exporting {collectionName}",
+        show_pos=True,
+        item_show_func=showRate,
+        file=click.get_text_stream("stderr"),
+    ) as bar:
+
+        def onRows(count, resumed):
+            with lock:
+                counts["rows"] += count
+                if resumed:
+                    counts["resumed"] += count
+                bar.update(count, count)
+
+        if parallel > 1:
+            manifest = export_parallel(
+                obj.data, collectionName, out, fmt, expr, outputFields, batchSize,
+                parallel, resume, onRows,
+            )
+            rows = manifest["rows"]
+        else:
+            result = export_range(
+                obj.data, collectionName, out, fmt, expr, outputFields, batchSize,
+                limit or None, resume, onRows,
+            )
+            rows = result["rows"]
+            if result["skipped"]:
+                click.echo(f"\nExport to {out} already finished ({rows} rows).", err=True)
+                return
+    elapsed = time.perf_counter() - start
+    exported = counts["rows"] - counts["resumed"]
+    rate = exported / elapsed if elapsed > 0 else 0.0
+    target = out or "stdout"
+    if parallel > 1:
+        target = f"{len(manifest['shards'])} shards listed in {manifest_path(out)}"
+    click.echo(
+        f"Exported {exported} rows ({rows} in total) to {target} "
+        f"in {elapsed:.1f}s, {rate:,.0f} rows/s.",
+        err=True,
+    )
+    if merge:
+        merged = merge_shards(manifest, os.path.dirname(os.path.abspath(out)), out)
+        click.echo(f"Merged {merged} rows into {out}.", err=True)
+
+
 @cli.command("query_iterator")
+@click.option(
+    "-c",
+    "--collection-name",
+    "collectionName",
+    default=None,
+    help="[Optional] - Collection to export; prompts for everything when omitted.",
+)
+@click.option("-e", "--expr", "expr", default="", help="[Optional] - Filter expression.")
+@click.option(
+    "--output-fields",
+    "outputFields",
+    default="",
+    help="[Optional] - Comma separated fields to export, default is all fields.",
+)
+@click.option(
+    "--batch-size", "batchSize", default=1000, type=int, help="[Optional] - Entities per page, default is 1000."
+)
+@click.option(
+    "--limit", "limit", default=0, type=int, help="[Optional] - Most entities to export, default is no limit."
+)
+@click.option(
+    "--out",
+    "out",
+    default=None,
+    help="[Optional] - Output file (.jsonl, .csv or .parquet), default is JSON Lines on stdout.",
+)
+@click.option(
+    "--format",
+    "fmt",
+    default=None,
+    type=click.Choice(["jsonl", "csv", "parquet"]),
+    help="[Optional] - Output format, default is taken from the --out extension.",
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    default=False,
+    help="[Optional] - Continue after the last primary key written to --out.",
+)
+@click.option(
+    "--parallel",
+    "parallel",
+    default=1,
+    type=int,
+    help="[Optional] - Primary-key ranges to export concurrently into shards, default is 1.",
+)
+@click.option(
+    "--merge",
+    "merge",
+    is_flag=True,
+    default=False,
+    help="[Optional] - Concatenate the shards of a parallel export into --out.",
+)
 @click.pass_obj
-def query_iterator(obj):
+def query_iterator(
+    obj, collectionName, expr, outputFields, batchSize, limit, out, fmt, resume, parallel, merge
+):
     """
     Query entities with iterator for large result sets.
 
     USAGE:
         milvus_cli > query_iterator
+        milvus_cli > query_iterator -c <collection> [-e <expr>] [--out <file>] [options]
 
-    INTERACTIVE PROMPTS:
+    INTERACTIVE PROMPTS (without -c):
         Collection name      Target collection
         Filter expression    Query condition
         Output fields        Fields to return
         Batch size           Number of results per batch (default: 1000)
         Limit                Maximum total results (optional)
 
+    OPTIONS (export without prompts):
+        -c, --collection-name    Collection to export
+        -e, --expr               Filter expression
+        --output-fields          Comma separated fields, default all
+        --batch-size             Entities per page (default: 1000)
+        --limit                  Most entities to export
+        --out                    .jsonl, .csv or .parquet file, default stdout
+        --format                 jsonl, csv or parquet, default from --out
+        --resume                 Continue an interrupted export to --out
+        --parallel               Primary-key ranges exported concurrently (default: 1)
+        --merge                  Concatenate parallel shards into --out
+
+    EXPORT:
+        Pages are appended to the output as they arrive, so memory stays
+        constant however large the collection. Progress, throughput and an
+        ETA based on the collection row count are shown on stderr. After
+        every page the rows written and the last primary key are saved to
+        <out>.checkpoint.json; --resume continues after that key. The
+        primary key is always exported as it is the resume cursor. A
+        Parquet file can only be resumed after a clean stop (e.g. Ctrl+C
+        or a lost connection), as its footer is written on close.
+
+    PARALLEL EXPORT:
+        With --parallel N, the primary keys are split into N disjoint
+        ranges holding about the same number of entities, found by
+        bisecting the key space with count(*) queries. Each range is
+        exported by its own query_iterator on a worker thread into
+        <out>.part-NNNNN.<ext>.
+        <out>.manifest.json lists the shards in key order with their ranges
+        and row counts; read in that order they are the whole export, and
+        --merge concatenates them into --out. Each shard resumes on its own
+        with --resume, reusing the ranges in the manifest.
+
     EXAMPLES:
         milvus_cli > query_iterator
 
@@ -980,9 +1151,37 @@ def query_iterator(obj):
         Output fields: id, name, price
         Batch size: 500
 
+        # Export a whole collection to Parquet
+        milvus_cli > query_iterator -c products --out products.parquet --batch-size 5000
+
+        # Continue an interrupted export
+        milvus_cli > query_iterator -c products -e "price > 100" --out cheap.jsonl --resume
+
+        # 8 concurrent ranges, merged into one file at the end
+        milvus_cli > query_iterator -c products --out products.parquet --parallel 8 --merge
+
     SEE ALSO:
         query, search_iterator
     """
+    output_fields_list = None
+    if outputFields:
+        fields = [f.strip().strip("'\"") for f in outputFields.split(",")]
+        output_fields_list = [f for f in fields if f] or None
+    if collectionName:
+        try:
+            exportQuery(
+                obj, collectionName, expr, output_fields_list, batchSize, limit, out, fmt, resume,
+                parallel, merge,
+            )
+        except KeyboardInterrupt:
+            click.echo(
+                "\nInterrupted, run again with --resume to continue." if out not in (None, "-")
+                else "\nInterrupted.",
+                err=True,
+            )
+        except Exception as e:
+            click.echo(f"Error: {str(e)}", err=True)
+        return
     try:
         collectionName = click.prompt(
             "Collection name", type=click.Choice(obj.collection.list_collections())
@@ -1032,15 +1231,136 @@ def query_iterator(obj):
     except Exception as e:
         click.echo(f"Error: {str(e)}", err=True)
 
+def exportSearch(
+    obj, collectionName, annsField, vectorJson, vectorsFile, limit, batchSize, params, expr,
+    outputFields, out, fmt,
+):
+    """Stream search_iterator hits of one or more query vectors into a file (or stdout)."""
+    import json
+    import time
+
+    import numpy as np
+
+    from ..Export import export_format, export_search
+    from ..Types import ParameterException
+    from .bench_client_cli import loadQueryVectors, searchParametersFor
+
+    if bool(vectorJson) == bool(vectorsFile):
+        raise ParameterException("Give exactly one of --vector and --vectors-file.")
+    fmt = export_format(out, fmt)
+    if vectorJson:
+        try:
+            vectors = np.asarray([json.loads(vectorJson)], dtype=np.float32)
+        except ValueError as e:
+            raise ParameterException(f"--vector should be a JSON array of numbers: {e}")
+    else:
+        vectors = loadQueryVectors(obj, collectionName, annsField, vectorsFile, 0)
+    searchParameters = searchParametersFor(
+        obj, collectionName, annsField, max(limit, 1), params, expr
+    )
+    searchParameters["output_fields"] = outputFields
+    start = time.perf_counter()
+    with click.progressbar(
+        length=len(vectors) * limit if limit else 0,
+        label=f"Searching {collectionName}",
+        show_pos=True,
+        file=click.get_text_stream("stderr"),
+    ) as bar:
+        rows = export_search(
+            obj.data, collectionName, searchParameters, vectors, out, fmt,
+            batchSize, limit or None, bar.update,
+        )
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    click.echo(
+        f"Exported {rows} hits of {len(vectors)} queries to {out or 'stdout'} "
+        f"in {elapsed:.1f}s, {rate:,.0f} hits/s.",
+        err=True,
+    )
+
+
 @cli.command("search_iterator")
+@click.option("-c", "--collection-name", "collectionName", default=None, help="Collection name; skips the prompts.")
+@click.option("-f", "--field", "annsField", default=None, help="Vector field to search.")
+@click.option(
+    "-v",
+    "--vector",
+    "vectorJson",
+    default=None,
+    help="Query vector as JSON array, e.g. '[0.1,0.2,0.3,0.4]'.",
+)
+@click.option(
+    "--vectors-file",
+    "vectorsFile",
+    default=None,
+    help="Query vectors (.npy, .csv or .jsonl), searched one after another.",
+)
+@click.option(
+    "-l",
+    "--limit",
+    "limit",
+    default=1000,
+    type=int,
+    help="[Optional] - Neighbours per query vector, 0 for all, default is 1000.",
+)
+@click.option(
+    "-b", "--batch-size", "batchSize", default=1000, type=int, help="[Optional] - Hits per page, default is 1000."
+)
+@click.option(
+    "--params",
+    "params",
+    default=None,
+    help="[Optional] - Search params, e.g. 'ef:128', default is the index defaults.",
+)
+@click.option("-e", "--expr", "expr", default="", help="[Optional] - Filter expression.")
+@click.option(
+    "--output-fields",
+    "outputFields",
+    default=None,
+    help="[Optional] - Comma separated fields to return with each hit.",
+)
+@click.option("--out", "out", default=None, help="[Optional] - Output file, default is stdout.")
+@click.option(
+    "--format",
+    "fmt",
+    default=None,
+    type=click.Choice(["jsonl", "csv", "parquet"]),
+    help="[Optional] - Output format, default is taken from the --out extension.",
+)
 @click.pass_obj
-def search_iterator(obj):
+def search_iterator(
+    obj, collectionName, annsField, vectorJson, vectorsFile, limit, batchSize, params, expr,
+    outputFields, out, fmt,
+):
     """
     Search with iterator for large result sets.
 
     USAGE:
         milvus_cli > search_iterator
 
+        milvus_cli > search_iterator -c <collection> -f <field> (-v <vector> | --vectors-file <file>)
+                       [-l <limit>] [--out <file>] [OPTIONS]
+
+    OPTIONS:
+        -c, --collection-name    Collection name; skips the prompts
+        -f, --field              Vector field to search
+        -v, --vector             Query vector as a JSON array
+        --vectors-file           Query vectors (.npy, .csv or .jsonl)
+        -l, --limit              Neighbours per query, 0 for all (default: 1000)
+        -b, --batch-size         Hits per page (default: 1000)
+        --params                 Search params (default: the index's, or tuned ones)
+        -e, --expr               Filter expression
+        --output-fields          Comma separated fields to return
+        --out                    .jsonl, .csv or .parquet file, default stdout
+        --format                 jsonl, csv or parquet, default from --out
+
+    EXPORT:
+        Hits are written page by page as they arrive, one row per hit with
+        its query index, rank, id, distance and output fields, so large
+        candidate sets (e.g. for offline re-ranking) do not build up in
+        memory. The search uses the index's search params, or the ones
+        saved by `tune search --save`, unless --params is given.
+
     INTERACTIVE PROMPTS:
         Collection name      Target collection
         Vector field         Field containing vectors
@@ -1059,12 +1379,37 @@ def search_iterator(obj):
         Batch size: 100
         Limit: 1000
 
+        # 200k neighbours of one vector for re-ranking
+        milvus_cli > search_iterator -c products -f embedding -v '[0.1, 0.2, 0.3, 0.4]' -l 200000 --out hits.parquet
+
+        # 5000 neighbours of every vector of a file
+        milvus_cli > search_iterator -c products -f embedding --vectors-file queries.npy -l 5000 --out hits.jsonl
+
     SEE ALSO:
         search, query_iterator
     """
+    if collectionName:
+        try:
+            if not annsField:
+                raise click.UsageError("Give the vector field with -f.")
+            output_fields_list = None
+            if outputFields:
+                fields = [f.strip().strip("'\"") for f in outputFields.split(",")]
+                output_fields_list = [f for f in fields if f] or None
+            exportSearch(
+                obj, collectionName, annsField, vectorJson, vectorsFile, limit, batchSize, params,
+                expr, output_fields_list, out, fmt,
+            )
+        except KeyboardInterrupt:
+            click.echo("\nInterrupted.", err=True)
+        except Exception as e:
+            click.echo(f"Error: {str(e)}", err=True)
+        return
     try:
         import json
 
+        from .bench_client_cli import searchParametersFor
+
         collectionName = click.prompt(
             "Collection name", type=click.Choice(obj.collection.list_collections())
         )
@@ -1080,13 +1425,8 @@ def search_iterator(obj):
         batchSize = click.prompt("Batch size", default=100, type=int)
         limit = click.prompt("Limit", default=1000, type=int)
 
-        # Get index info for metric type
-        indexes = obj.index.list_indexes(collectionName, onlyData=True)
-        metric_type = "L2"
-        for index in indexes:
-            if index.get("field_name") == annsField:
-                metric_type = index.get("metric_type", "L2")
-                break
+        # Metric type and search params of the index, or the tuned ones
+        searchParams = searchParametersFor(obj, collectionName, annsField, limit, None, "")["param"]
 
         expr = click.prompt("Filter expression (optional)", default="")
 
@@ -1106,7 +1446,7 @@ def search_iterator(obj):
             collection_name=collectionName,
             data=data,
             anns_field=annsField,
-            search_params={"metric_type": metric_type},
+            search_params=searchParams,
             batch_size=batchSize,
             limit=limit,
             filter=expr if expr else None,
@@ -3,13 +3,94 @@ from .helper_client_cli import delete, insert, cli, show, getList
 import click
 
 from ..Validation import validateQueryParams, validateSearchParams
-from ..Types import ParameterException, IndexTypesMap, DataTypeByNum
-from ..Fs import readCsvFile
+from ..Types import (
+    ParameterException,
+    IndexTypesMap,
+    DataTypeByNum,
+    SearchParamDefaults,
+)
+from ..Fs import readFileInBatches, isUrl, readVectorsInBatches
+from ..DataClient import QUERY_RESULT_WINDOW, search_hits
+from ..Export import EXPORT_FORMATS, ExportWriter, export_format
+from ..Checkpoint import DeleteCheckpoint, IngestCheckpoint, write_json_atomic
+from ..Profiler import StageProfiler
+from ..Staging import (
+    ShardWriter,
+    local_sources,
+    open_storage,
+    staging_prefix,
+)
+from ..Converter import ColumnBatch
+from ..Tuner import SavedSearchParams
+import os
 import json
 import ast
 from tabulate import tabulate
 from pymilvus import DataType
 
+def deleteChunked(
+    obj, collectionName, partitionName, expr, batchSize, workers, rate, retries, resume,
+    checkpointPath,
+):
+    """Delete the entities matching expr in chunks of primary keys, showing progress and ETA."""
+    checkpoint = None
+    startAfter = None
+    done = 0
+    if resume:
+        checkpoint = DeleteCheckpoint(collectionName, expr, partitionName, checkpointPath)
+        state = checkpoint.load()
+        if state["completed"]:
+            click.echo(
+                f"Nothing to resume, the delete was already finished ({state['ids']} IDs). "
+                f"Delete {checkpoint.path} to run it again."
+            )
+            return
+        startAfter, done = state["last_pk"], state["ids"]
+        click.echo(f"Checkpoint file: {checkpoint.path}")
+    # Deleted entities no longer match, so this counts what is left
+    total = obj.data.count_entities(collectionName, expr, partitionName)
+    try:
+        with click.progressbar(
+            length=max(total, 1),
+            label=f"Deleting from {collectionName}",
+            show_pos=True,
+            file=click.get_text_stream("stderr"),
+        ) as bar:
+
+            def onCommit(ids):
+                if checkpoint:
+                    checkpoint.commit(ids)
+                bar.update(len(ids))
+
+            stats = obj.data.delete_matching(
+                collectionName,
+                expr,
+                partitionName,
+                batchSize=batchSize,
+                workers=workers,
+                retries=retries,
+                rate=rate,
+                start_after=startAfter,
+                on_commit=onCommit,
+            )
+    except Exception:
+        if checkpoint:
+            click.echo(
+                f"Progress saved after {checkpoint.state['ids']} IDs, "
+                "rerun with --resume to continue.",
+                err=True,
+            )
+        raise
+    if checkpoint:
+        checkpoint.complete()
+    click.echo(
+        f"Sent {stats['ids']} IDs in {stats['chunks']} chunks"
+        f"{f' ({done} before resuming)' if done else ''}, "
+        f"{stats['delete_count']} deleted, {stats['seconds']}s, "
+        f"{stats['ids_per_sec']:,.0f} IDs/s."
+    )
+
+
 @delete.command("entities")
 @click.option("-c", "--collection-name", "collectionName", help="Collection name.")
 @click.option(
@@ -32,6 +113,52 @@ from pymilvus import DataType
     is_flag=True,
     help="Skip confirmation prompt (use with -e for scripting/CI).",
 )
+@click.option(
+    "--chunked",
+    "chunked",
+    is_flag=True,
+    help="[Optional] - Delete the matching primary keys in chunks instead of one filter delete.",
+)
+@click.option(
+    "--batch-size",
+    "batchSize",
+    default=1000,
+    type=int,
+    help="[Optional] - Primary keys per delete request with --chunked, default is 1000.",
+)
+@click.option(
+    "--workers",
+    "workers",
+    default=1,
+    type=int,
+    help="[Optional] - Concurrent delete requests with --chunked, default is 1.",
+)
+@click.option(
+    "--rate",
+    "rate",
+    default=None,
+    type=float,
+    help="[Optional] - Most entities deleted per second with --chunked, default is unlimited.",
+)
+@click.option(
+    "--retries",
+    "retries",
+    default=3,
+    type=int,
+    help="[Optional] - Retries of a failed chunk, default is 3.",
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="[Optional] - Record progress in a checkpoint file and continue a previous --chunked run.",
+)
+@click.option(
+    "--checkpoint",
+    "checkpointPath",
+    default=None,
+    help="[Optional] - Checkpoint file used with --resume, default is <collection>.delete.checkpoint.json.",
+)
 @click.pass_obj
 def delete_entities(
     obj,
@@ -39,6 +166,13 @@ def delete_entities(
     partitionName,
     expr_opt,
     yes,
+    chunked,
+    batchSize,
+    workers,
+    rate,
+    retries,
+    resume,
+    checkpointPath,
 ):
     """
     Delete entities using filter expression.
@@ -49,12 +183,25 @@ def delete_entities(
     OPTIONS:
         -c, --collection-name    Target collection (required)
         -p, --partition          Limit deletion to partition (optional)
+        --chunked                Delete matching primary keys in chunks
+        --batch-size             Primary keys per delete request (default: 1000)
+        --workers                Concurrent delete requests (default: 1)
+        --rate                   Most entities deleted per second
+        --resume                 Checkpoint progress and continue a previous run
+        --checkpoint             Checkpoint file (default: <collection>.delete.checkpoint.json)
 
     INTERACTIVE PROMPTS:
         Expression    Filter to select entities for deletion
                      Example: "id in [1, 2, 3]"
                      Example: "category == 'obsolete'"
 
+    CHUNKED DELETE:
+        A broad filter is otherwise one large delete on the server. With
+        --chunked the matching primary keys are read with a query iterator
+        and deleted --batch-size at a time, paced by --rate, showing the
+        count and ETA. With --resume an interrupted run continues after the
+        last chunk it deleted.
+
     WARNING:
         This action is irreversible! Deleted entities cannot be recovered.
 
@@ -66,6 +213,9 @@ def delete_entities(
         # Non-interactive (CI/scripts)
         milvus_cli > delete entities -c products -e 'id == 100' --yes
 
+        # Purge a large range gently, resumably
+        milvus_cli > delete entities -c products -e 'ts < 1700000000' --chunked --rate 20000 --resume --yes
+
     SEE ALSO:
         delete ids, query
     """
@@ -81,9 +231,39 @@ def delete_entities(
         )
         if not click.confirm("Do you want to continue?"):
             return
+    if resume and not chunked:
+        click.echo("Error!\n--resume needs --chunked.", err=True)
+        return
+    if chunked:
+        try:
+            deleteChunked(
+                obj, collectionName, partitionName, expr, batchSize, workers, rate, retries,
+                resume, checkpointPath,
+            )
+        except Exception as e:
+            click.echo("Error!\n{}".format(str(e)), err=True)
+        return
     result = obj.data.delete_entities(expr, collectionName, partitionName)
     click.echo(result)
 
+def echoQueryResults(obj, collectionName, queryParameters, pageSize):
+    """Print query results, streamed a page at a time past the result window."""
+    total, pages = obj.data.query_stream(collectionName, queryParameters, pageSize=pageSize)
+    if total <= QUERY_RESULT_WINDOW:
+        results = next(pages)
+        if results:
+            click.echo(obj.formatter.format_output(results))
+        else:
+            click.echo("No results found.")
+        return
+    click.echo(
+        f"{total} entities match, more than one query returns; "
+        f"reading them in pages of {pageSize} by primary key.",
+        err=True,
+    )
+    click.echo_via_pager(obj.formatter.format_pages(pages))
+
+
 @cli.command("query")
 @click.option(
     "-c",
@@ -99,8 +279,16 @@ def delete_entities(
     default=None,
     help="Query filter expression (e.g. 'id > 0').",
 )
+@click.option(
+    "--page-size",
+    "pageSize",
+    default=1000,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Entities per page when the result is too large for one query.",
+)
 @click.pass_obj
-def query(obj, collectionName_opt, expr_opt):
+def query(obj, collectionName_opt, expr_opt, pageSize):
     """
     Query entities with filter expressions.
 
@@ -136,6 +324,8 @@ def query(obj, collectionName_opt, expr_opt):
     OUTPUT:
         Results displayed in current format (table/json/csv).
         Use 'set output json' for JSON output.
+        Results larger than the server's result window (16384) are read
+        in --page-size pages by primary key and streamed, one table per page.
 
     SEE ALSO:
         search, get, set output
@@ -155,11 +345,7 @@ def query(obj, collectionName_opt, expr_opt):
         except ParameterException as pe:
             click.echo("Error!\n{}".format(str(pe)))
             return
-        results = obj.data.query(collectionName, queryParameters)
-        if results:
-            click.echo(obj.formatter.format_output(results))
-        else:
-            click.echo("No results found.")
+        echoQueryResults(obj, collectionName, queryParameters, pageSize)
         return
 
     collectionName = click.prompt(
@@ -198,11 +384,108 @@ def query(obj, collectionName_opt, expr_opt):
     except ParameterException as pe:
         click.echo("Error!\n{}".format(str(pe)))
     else:
-        results = obj.data.query(collectionName, queryParameters)
-        if results:
-            click.echo(obj.formatter.format_output(results))
-        else:
-            click.echo("No results found.")
+        echoQueryResults(obj, collectionName, queryParameters, pageSize)
+
+
+def ingest_file(
+    obj,
+    path,
+    collectionName,
+    partitionName,
+    timeout,
+    batchSize,
+    batchBytes,
+    workers,
+    maxInFlight,
+    resume,
+    checkpointPath,
+    profile=False,
+    dryRun=False,
+    profileJson=None,
+    upsert=False,
+):
+    """
+    Stream a data file into a collection, optionally resuming from a checkpoint.
+
+    With profile, dryRun or profileJson set, the read, parse, convert and send
+    stages are timed and reported; a dry run skips the RPCs.
+    """
+    path = path.replace('"', "").replace("'", "")
+    action = "upsert" if upsert else "insert"
+    checkpoint = None
+    startOffset = startRow = 0
+    startLine = None
+    if dryRun and resume:
+        raise ParameterException("--resume cannot be used with --dry-run.")
+    profiler = StageProfiler() if profile or dryRun or profileJson else None
+    if resume:
+        if isUrl(path):
+            raise ParameterException("--resume only supports local files.")
+        checkpoint = IngestCheckpoint(
+            path, collectionName, partitionName, action, checkpointPath
+        )
+        state = checkpoint.load()
+        if state["completed"]:
+            click.echo(
+                f"Nothing to resume, {path} was already fully {action}ed "
+                f"({state['rows']} rows). Delete {checkpoint.path} to {action} it again."
+            )
+            return None
+        startOffset, startRow = state["offset"], state["rows"]
+        startLine = state.get("line", startRow)
+        click.echo(f"Checkpoint file: {checkpoint.path}")
+    batches = readFileInBatches(
+        path,
+        obj.data.input_fields(collectionName),
+        batchSize=batchSize,
+        batchBytes=batchBytes,
+        startOffset=startOffset,
+        startRow=startRow,
+        profiler=profiler,
+        startLine=startLine,
+    )
+    try:
+        result = obj.data.insert_batches(
+            collectionName,
+            batches,
+            partitionName,
+            timeout,
+            upsert=upsert,
+            workers=workers,
+            max_in_flight=maxInFlight,
+            on_commit=checkpoint.commit if checkpoint else None,
+            profiler=profiler,
+            dry_run=dryRun,
+        )
+    except Exception:
+        if checkpoint:
+            click.echo(
+                f"Progress saved after row {checkpoint.state['rows']}, "
+                "rerun with --resume to continue.",
+                err=True,
+            )
+        raise
+    if checkpoint:
+        checkpoint.complete()
+    if profiler:
+        click.echo(f"\nStage profile{' (dry run, nothing was sent)' if dryRun else ''}:")
+        click.echo(profiler.format())
+        if profileJson:
+            report = profiler.report()
+            report.update(
+                {
+                    "source": path,
+                    "collection": collectionName,
+                    "action": action,
+                    "dry_run": dryRun,
+                    "workers": workers,
+                    "batch_size": batchSize,
+                    "result": result,
+                }
+            )
+            write_json_atomic(profileJson, report)
+            click.echo(f"Stage profile written to {profileJson}")
+    return result
 
 @insert.command("file")
 @click.option(
@@ -226,22 +509,105 @@ def query(obj, collectionName_opt, expr_opt):
     default=None,
     type=float,
 )
+@click.option(
+    "--batch-size",
+    "batchSize",
+    help="[Optional] - Maximum number of rows sent in each request, default is 10000.",
+    default=10000,
+    type=int,
+)
+@click.option(
+    "--batch-bytes",
+    "batchBytes",
+    help="[Optional] - Also send a batch once this many bytes of the source file have been read.",
+    default=None,
+    type=int,
+)
+@click.option(
+    "--workers",
+    "workers",
+    help="[Optional] - Number of concurrent insert requests, default is 1.",
+    default=1,
+    type=int,
+)
+@click.option(
+    "--max-in-flight",
+    "maxInFlight",
+    help="[Optional] - Maximum number of batches read ahead of the server, default is twice the workers.",
+    default=None,
+    type=int,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="[Optional] - Record progress in a checkpoint file and skip rows already committed by a previous run.",
+)
+@click.option(
+    "--checkpoint",
+    "checkpointPath",
+    help="[Optional] - Checkpoint file used with --resume, default is <path>.checkpoint.json.",
+    default=None,
+)
+@click.option(
+    "--profile",
+    "profile",
+    is_flag=True,
+    help="[Optional] - Report wall time, CPU time, rows/s, bytes/s and peak RSS of the read, parse, convert and send stages.",
+)
+@click.option(
+    "--dry-run",
+    "dryRun",
+    is_flag=True,
+    help="[Optional] - Read and convert the whole file but skip the requests, then report the stage profile.",
+)
+@click.option(
+    "--profile-json",
+    "profileJson",
+    help="[Optional] - Also write the stage profile as JSON to this file.",
+    default=None,
+)
 @click.argument("path")
 @click.pass_obj
-def insert_data(obj, collectionName, partitionName, timeout, path):
+def insert_data(
+    obj,
+    collectionName,
+    partitionName,
+    timeout,
+    batchSize,
+    batchBytes,
+    workers,
+    maxInFlight,
+    resume,
+    checkpointPath,
+    profile,
+    dryRun,
+    profileJson,
+    path,
+):
     """
-    Import data from CSV file into a collection.
+    Import data from a CSV, Parquet, JSON-Lines or NPY/NPZ file into a collection.
 
     USAGE:
         milvus_cli > insert file -c <collection> [options] <path>
 
     ARGUMENTS:
-        path    Path to CSV file (local path or URL)
+        path    Path to a .csv (local path or URL), .parquet, .jsonl,
+                .npy or .npz file
 
     OPTIONS:
         -c, --collection-name    Target collection (required)
         -p, --partition          Target partition (default: _default)
         -t, --timeout            Request timeout in seconds
+        --batch-size             Max rows per insert request (default: 10000)
+        --batch-bytes            Also flush a batch after this many source bytes
+        --workers                Concurrent insert requests (default: 1)
+        --max-in-flight          Batches read ahead of the server (default: 2x workers)
+        --resume                 Checkpoint progress and skip committed rows
+        --checkpoint             Checkpoint file (default: <path>.checkpoint.json)
+        --profile                Report time, throughput and RSS per stage
+        --dry-run                Read and convert the file without inserting it
+        --profile-json           Also write the stage profile as JSON
 
     CSV FORMAT:
         - First row must be headers matching field names
@@ -249,6 +615,13 @@ def insert_data(obj, collectionName, partitionName, timeout, path):
           Example: "[1.0, 2.0, 3.0]"
         - JSON fields: valid JSON strings
 
+    OTHER FORMATS:
+        - Parquet, JSON-Lines and NPZ columns/keys/arrays are matched to
+          fields by name; other columns are not read
+        - A .npy file holds the vectors of the only float vector field and
+          is memory-mapped
+        - Parquet files need pyarrow (pip install pyarrow)
+
     EXAMPLES:
         # Insert from local file
         milvus_cli > insert file -c products ./data/products.csv
@@ -259,6 +632,40 @@ def insert_data(obj, collectionName, partitionName, timeout, path):
         # Insert to specific partition
         milvus_cli > insert file -c products -p 2024_data ./products.csv
 
+        # Stream a large file in batches of 50000 rows
+        milvus_cli > insert file -c products --batch-size 50000 ./big.csv
+
+        # Keep 4 insert requests in flight while the file is parsed
+        milvus_cli > insert file -c products --workers 4 ./big.csv
+
+        # Resume a run that stopped partway through
+        milvus_cli > insert file -c products --resume ./big.csv
+
+        # Find out whether reading, parsing or the server is the bottleneck
+        milvus_cli > insert file -c products --profile ./big.csv
+        milvus_cli > insert file -c products --dry-run --profile-json p.json ./big.csv
+
+        # Insert embeddings from Parquet or a NumPy dump
+        milvus_cli > insert file -c products ./embeddings.parquet
+        milvus_cli > insert file -c products ./embeddings.npy
+
+    NOTES:
+        - The file is streamed, so memory use is bounded by the batch size
+          times the number of batches in flight
+        - Only the total inserted count and rows/s are printed, not the
+          primary keys
+        - With --resume, a rerun seeks past the rows committed by the last
+          run; a checkpoint whose source file changed size or mtime is
+          rejected. Resuming is only supported for local files
+        - Cells are parsed by field type: float vectors go straight into
+          float32 arrays, cells that do not fit the type are JSON-decoded
+        - URL sources are streamed while they are parsed; gzip files are
+          decompressed and a dropped connection resumes where it stopped
+        - The profile splits the run into read (reading source rows), parse
+          (typing cells into columns), convert (building the entities) and
+          send (the insert requests); with several workers the convert and
+          send times add up across workers
+
     ERRORS:
         - Schema mismatch: CSV headers must match collection field names
         - Dimension error: Vector dimensions must match schema
@@ -268,14 +675,28 @@ def insert_data(obj, collectionName, partitionName, timeout, path):
         insert row, upsert file, create collection
     """
     try:
-        result = readCsvFile(path.replace('"', "").replace("'", ""))
-        data = result["data"]
-        result = obj.data.insert(collectionName, data, partitionName, timeout)
+        result = ingest_file(
+            obj,
+            path,
+            collectionName,
+            partitionName,
+            timeout,
+            batchSize,
+            batchBytes,
+            workers,
+            maxInFlight,
+            resume,
+            checkpointPath,
+            profile,
+            dryRun,
+            profileJson,
+        )
     except Exception as e:
         click.echo("Error!\n{}".format(str(e)))
     else:
-        click.echo(f"\nInserted successfully.\n")
-        click.echo(result)
+        if result:
+            click.echo("\nDry run finished.\n" if dryRun else f"\nInserted successfully.\n")
+            click.echo(result)
 
 @insert.command("row")
 @click.pass_obj
@@ -381,25 +802,123 @@ def upsert(obj):
     default=None,
     type=float,
 )
+@click.option(
+    "--batch-size",
+    "batchSize",
+    help="[Optional] - Maximum number of rows sent in each request, default is 10000.",
+    default=10000,
+    type=int,
+)
+@click.option(
+    "--batch-bytes",
+    "batchBytes",
+    help="[Optional] - Also send a batch once this many bytes of the source file have been read.",
+    default=None,
+    type=int,
+)
+@click.option(
+    "--workers",
+    "workers",
+    help="[Optional] - Number of concurrent insert requests, default is 1.",
+    default=1,
+    type=int,
+)
+@click.option(
+    "--max-in-flight",
+    "maxInFlight",
+    help="[Optional] - Maximum number of batches read ahead of the server, default is twice the workers.",
+    default=None,
+    type=int,
+)
+@click.option(
+    "--resume",
+    "resume",
+    is_flag=True,
+    help="[Optional] - Record progress in a checkpoint file and skip rows already committed by a previous run.",
+)
+@click.option(
+    "--checkpoint",
+    "checkpointPath",
+    help="[Optional] - Checkpoint file used with --resume, default is <path>.checkpoint.json.",
+    default=None,
+)
+@click.option(
+    "--profile",
+    "profile",
+    is_flag=True,
+    help="[Optional] - Report wall time, CPU time, rows/s, bytes/s and peak RSS of the read, parse, convert and send stages.",
+)
+@click.option(
+    "--dry-run",
+    "dryRun",
+    is_flag=True,
+    help="[Optional] - Read and convert the whole file but skip the requests, then report the stage profile.",
+)
+@click.option(
+    "--profile-json",
+    "profileJson",
+    help="[Optional] - Also write the stage profile as JSON to this file.",
+    default=None,
+)
 @click.argument("path")
 @click.pass_obj
-def upsert_data(obj, collectionName, partitionName, timeout, path):
+def upsert_data(
+    obj,
+    collectionName,
+    partitionName,
+    timeout,
+    batchSize,
+    batchBytes,
+    workers,
+    maxInFlight,
+    resume,
+    checkpointPath,
+    profile,
+    dryRun,
+    profileJson,
+    path,
+):
     """
-    Upsert data from csv file(local or remote) with headers.
+    Upsert data from csv file(local or remote) with headers, or from a
+    local Parquet, JSON-Lines or NPY/NPZ file.
+
+    The file is streamed and upserted in batches of --batch-size rows,
+    with up to --workers requests in flight. Use a single worker when the
+    same primary key appears in more than one batch, so batches are applied
+    in file order. --resume records progress in a checkpoint file so an
+    interrupted run can continue where it stopped. --profile and --dry-run
+    report where the time goes, see `insert file --help`.
 
     Example:
 
         milvus_cli > upsert file -c car 'data.csv'
+
+        milvus_cli > upsert file -c car --batch-size 50000 --workers 4 'big.csv'
     """
     try:
-        result = readCsvFile(path.replace('"', "").replace("'", ""))
-        data = result["data"]
-        result = obj.data.upsert(collectionName, data, partitionName, timeout)
+        result = ingest_file(
+            obj,
+            path,
+            collectionName,
+            partitionName,
+            timeout,
+            batchSize,
+            batchBytes,
+            workers,
+            maxInFlight,
+            resume,
+            checkpointPath,
+            profile,
+            dryRun,
+            profileJson,
+            upsert=True,
+        )
     except Exception as e:
         click.echo("Error!\n{}".format(str(e)))
     else:
-        click.echo(f"\nUpserted successfully.\n")
-        click.echo(result)
+        if result:
+            click.echo("\nDry run finished.\n" if dryRun else f"\nUpserted successfully.\n")
+            click.echo(result)
 
 @upsert.command("row")
 @click.pass_obj
@@ -477,12 +996,102 @@ def upsert_row(obj):
         click.echo(f"\nUpserted successfully.\n")
         click.echo(result)
 
+def idChunks(obj, collectionName, idsFile, chunkSize):
+    """Chunks of the primary keys listed in a file, typed after the collection's primary field."""
+    from ..Fs import readIdsInBatches
+
+    primaryField, primaryType = obj.data.primary_key(collectionName)
+    return readIdsInBatches(
+        idsFile, varchar=primaryType == "VARCHAR", maxIds=chunkSize, field=primaryField
+    )
+
+
+def getIdsFile(obj, collectionName, idsFile, outputFields, out, fmt, chunkSize, workers, retries):
+    """Get the entities of every ID in a file, streaming them to a file or stdout."""
+    fmt = export_format(out, fmt)
+    with ExportWriter(out or "-", fmt) as writer:
+        stats = obj.data.get_id_chunks(
+            collectionName,
+            idChunks(obj, collectionName, idsFile, chunkSize),
+            outputFields,
+            workers=workers,
+            retries=retries,
+            on_rows=writer.write,
+        )
+    click.echo(
+        f"Found {stats['found']} of {stats['ids']} IDs in {stats['chunks']} chunks, "
+        f"{stats['seconds']}s, {stats['ids_per_sec']:,.0f} IDs/s.",
+        err=True,
+    )
+
+
 @cli.command("get")
+@click.option(
+    "-c",
+    "--collection-name",
+    "collectionName",
+    default=None,
+    help="Collection name (with --ids-file skips prompts).",
+)
+@click.option(
+    "--ids-file",
+    "idsFile",
+    default=None,
+    help="IDs to get: one per line, or a 1-D .npy array or a .parquet column.",
+)
+@click.option(
+    "--output-fields",
+    "outputFields",
+    default=None,
+    help="[Optional] - Comma separated fields to return, default is all.",
+)
+@click.option("--out", "out", default=None, help="[Optional] - Output file, default is stdout.")
+@click.option(
+    "--format",
+    "fmt",
+    default=None,
+    type=click.Choice(EXPORT_FORMATS),
+    help="[Optional] - Output format, default is taken from the --out extension.",
+)
+@click.option(
+    "--chunk-size",
+    "chunkSize",
+    default=5000,
+    type=int,
+    help="[Optional] - Most IDs per request, default is 5000.",
+)
+@click.option(
+    "--workers",
+    "workers",
+    default=4,
+    type=int,
+    help="[Optional] - Concurrent requests, default is 4.",
+)
+@click.option(
+    "--retries",
+    "retries",
+    default=3,
+    type=int,
+    help="[Optional] - Retries of a failed chunk, default is 3.",
+)
 @click.pass_obj
-def get_by_ids(obj):
+def get_by_ids(obj, collectionName, idsFile, outputFields, out, fmt, chunkSize, workers, retries):
     """
     Get entities by IDs.
 
+    USAGE:
+        milvus_cli > get
+
+        milvus_cli > get -c <collection> --ids-file <file> [--out <file>] [OPTIONS]
+
+    IDS FILE:
+        A text file with one ID per line (# comments allowed), a 1-D .npy
+        array, or a .parquet file read from the primary field's column (or
+        its only column). IDs are sent in chunks of at most --chunk-size
+        IDs and a few MB, --workers chunks at a time; a failed chunk is
+        retried with backoff. Entities are written to --out as each chunk
+        completes, in file order, so millions of IDs never sit in memory.
+
     Example:
 
         milvus_cli > get
@@ -492,7 +1101,25 @@ def get_by_ids(obj):
         The IDs (e.g. [1,2,3]): [1,2,3]
 
         Fields to return(split by "," if multiple) []: id, color, brand
+
+        milvus_cli > get -c car --ids-file reconcile.txt --output-fields color,brand --out cars.jsonl
     """
+    if idsFile:
+        if not collectionName:
+            click.echo("Error!\n--ids-file needs a collection name (-c).", err=True)
+            return
+        output_fields_list = None
+        if outputFields:
+            fields = [f.strip().strip("[]'\"") for f in outputFields.split(",")]
+            output_fields_list = [f for f in fields if f] or None
+        try:
+            getIdsFile(
+                obj, collectionName, idsFile, output_fields_list, out, fmt, chunkSize, workers,
+                retries,
+            )
+        except Exception as e:
+            click.echo("Error!\n{}".format(str(e)), err=True)
+        return
     collectionName = click.prompt(
         "Collection name", type=click.Choice(obj.collection.list_collections())
     )
@@ -531,19 +1158,100 @@ def get_by_ids(obj):
     help="[Optional] - Name of partition.",
     default=None,
 )
+@click.option(
+    "--ids-file",
+    "idsFile",
+    default=None,
+    help="[Optional] - IDs to delete: one per line, or a 1-D .npy array or a .parquet column.",
+)
+@click.option(
+    "--chunk-size",
+    "chunkSize",
+    default=10000,
+    type=int,
+    help="[Optional] - Most IDs per delete request, default is 10000.",
+)
+@click.option(
+    "--workers",
+    "workers",
+    default=4,
+    type=int,
+    help="[Optional] - Concurrent requests, default is 4.",
+)
+@click.option(
+    "--retries",
+    "retries",
+    default=3,
+    type=int,
+    help="[Optional] - Retries of a failed chunk, default is 3.",
+)
+@click.option(
+    "--yes",
+    "-y",
+    "yes",
+    is_flag=True,
+    default=False,
+    help="[Optional] - Delete without asking for confirmation.",
+)
 @click.pass_obj
 def delete_by_ids(
     obj,
     collectionName,
     partitionName,
+    idsFile,
+    chunkSize,
+    workers,
+    retries,
+    yes,
 ):
     """
     Delete entities by IDs.
 
+    With --ids-file the IDs are read from a text file (one per line), a
+    1-D .npy array or a .parquet column, and deleted in chunks of at most
+    --chunk-size IDs, --workers chunks at a time, retrying failed chunks.
+
     Example:
 
         milvus_cli > delete ids -c test_collection
+
+        milvus_cli > delete ids -c test_collection --ids-file stale_ids.npy --yes
     """
+    if idsFile:
+        if not yes:
+            click.echo(
+                f"You are trying to delete every entity listed in {idsFile}. "
+                "This action cannot be undone!\n"
+            )
+            if not click.confirm("Do you want to continue?"):
+                return
+        # The number of IDs is unknown until the file is read, so count up
+        sent = 0
+
+        def showSent(ids):
+            nonlocal sent
+            sent += len(ids)
+            click.echo(f"\rDeleted {sent:,} IDs", nl=False, err=True)
+
+        try:
+            stats = obj.data.delete_id_chunks(
+                collectionName,
+                idChunks(obj, collectionName, idsFile, chunkSize),
+                partitionName,
+                workers=workers,
+                retries=retries,
+                on_commit=showSent,
+            )
+        except Exception as e:
+            click.echo("\nError!\n{}".format(str(e)), err=True)
+            return
+        click.echo("", err=True)
+        click.echo(
+            f"Sent {stats['ids']} IDs in {stats['chunks']} chunks, "
+            f"{stats['delete_count']} deleted, {stats['seconds']}s, "
+            f"{stats['ids_per_sec']:,.0f} IDs/s."
+        )
+        return
     ids_str = click.prompt('The IDs to delete (e.g. [1,2,3])')
     ids = json.loads(ids_str)
 
@@ -559,6 +1267,76 @@ def delete_by_ids(
     except Exception as e:
         click.echo("Error!\n{}".format(str(e)))
 
+def stage_local_files(obj, collectionName, path, storage, fmt, shardBytes, batchSize):
+    """Convert local data files into bulk insert shards under a storage root."""
+    sources = local_sources(path)
+    fields = obj.data.input_fields(collectionName)
+    fieldNames = [f.get("name", "") for f in fields]
+    writer = ShardWriter(storage, staging_prefix(collectionName), fmt, shardBytes, fields)
+    try:
+        for source in sources:
+            click.echo(f"Staging {source}")
+            for batch in readFileInBatches(source, fields, batchSize=batchSize):
+                writer.write(
+                    ColumnBatch(batch.get("fields") or fieldNames, batch["data"])
+                )
+    except BaseException:
+        writer.abort()
+        raise
+    return writer.close()
+
+
+def wait_bulk_insert(obj, tasks, interval):
+    """Poll the staged tasks concurrently, showing their overall progress."""
+    with click.progressbar(
+        length=100 * len(tasks), label="Importing shards...", show_percent=True
+    ) as bar:
+        reported = 0
+
+        def on_progress(states):
+            nonlocal reported
+            done = sum(
+                100 if getattr(state, "state_name", "") == "Completed"
+                else getattr(state, "progress", 0) or 0
+                for state in states.values()
+            )
+            bar.update(max(done - reported, 0))
+            reported = max(done, reported)
+
+        states = obj.data.wait_bulk_insert_tasks(
+            [taskId for taskId, _path, _rows in tasks],
+            interval=interval,
+            on_progress=on_progress,
+        )
+    table = []
+    for taskId, path, rows in tasks:
+        state = states[taskId]
+        table.append(
+            [
+                taskId,
+                path,
+                rows,
+                getattr(state, "state_name", state),
+                getattr(state, "row_count", ""),
+                getattr(state, "failed_reason", ""),
+            ]
+        )
+    click.echo(
+        tabulate(
+            table,
+            headers=["Task ID", "File", "Rows", "State", "Imported", "Reason"],
+            tablefmt="grid",
+        )
+    )
+    failed = [row for row in table if row[3] != "Completed"]
+    imported = sum(row[4] or 0 for row in table if row[3] == "Completed")
+    click.echo(
+        f"{len(table) - len(failed)} of {len(table)} tasks completed, "
+        f"{imported} rows imported."
+    )
+    return not failed
+
+
 @cli.command("bulk_insert")
 @click.option(
     "-c",
@@ -579,20 +1357,95 @@ def delete_by_ids(
     "--files",
     "files",
     help="File paths (comma separated, e.g., 's3://bucket/file1.json,s3://bucket/file2.json').",
-    required=True,
+    default=None,
+)
+@click.option(
+    "--from-local",
+    "fromLocal",
+    help="[Optional] - Local data file or directory to convert into shards, stage under the storage root and import.",
+    default=None,
+)
+@click.option(
+    "--storage-root",
+    "storageRoot",
+    help="[Optional] - Where --from-local shards are staged: a directory Milvus imports from, or s3://bucket/prefix. Default is env `MILVUS_CLI_STORAGE_ROOT`.",
+    default=None,
+)
+@click.option(
+    "--endpoint",
+    "endpoint",
+    help="[Optional] - S3-compatible endpoint URL, e.g. a MinIO server. Default is env `MILVUS_CLI_STORAGE_ENDPOINT`.",
+    default=None,
+)
+@click.option(
+    "--format",
+    "shardFormat",
+    help="[Optional] - Shard file format for --from-local, default is json.",
+    type=click.Choice(["json", "parquet"]),
+    default="json",
+)
+@click.option(
+    "--shard-size",
+    "shardSize",
+    help="[Optional] - Target shard size in MB for --from-local, default is 512.",
+    default=512,
+    type=int,
+)
+@click.option(
+    "--batch-size",
+    "batchSize",
+    help="[Optional] - Rows read from the local files at a time, default is 10000.",
+    default=10000,
+    type=int,
+)
+@click.option(
+    "--no-wait",
+    "noWait",
+    is_flag=True,
+    help="[Optional] - Submit the tasks without waiting for them to finish.",
+)
+@click.option(
+    "--poll-interval",
+    "pollInterval",
+    help="[Optional] - Seconds between task state checks, default is 2.",
+    default=2.0,
+    type=float,
 )
 @click.pass_obj
-def bulk_insert(obj, collectionName, partitionName, files):
+def bulk_insert(
+    obj,
+    collectionName,
+    partitionName,
+    files,
+    fromLocal,
+    storageRoot,
+    endpoint,
+    shardFormat,
+    shardSize,
+    batchSize,
+    noWait,
+    pollInterval,
+):
     """
-    Bulk insert data from remote storage (S3, MinIO, etc.).
+    Bulk insert data from remote storage (S3, MinIO, etc.) or local files.
 
     USAGE:
         milvus_cli > bulk_insert -c <collection> -f <files>
 
+        milvus_cli > bulk_insert -c <collection> --from-local <file or dir> --storage-root <root>
+
     OPTIONS:
         -c, --collection-name    Target collection (required)
         -p, --partition          Target partition (optional)
-        -f, --files              Comma-separated file paths (required)
+        -f, --files              Comma-separated file paths
+        --from-local             Local file or directory to stage and import
+        --storage-root           Staging root: local directory or s3://bucket/prefix
+        --endpoint               S3-compatible endpoint URL (e.g. MinIO)
+        --format                 Shard format: json or parquet (default: json)
+        --shard-size             Target shard size in MB (default: 512)
+        --batch-size             Rows read at a time (default: 10000)
+        --no-wait                Do not wait for the staged tasks
+        --poll-interval          Seconds between state checks (default: 2)
 
     SUPPORTED SOURCES:
         - S3: s3://bucket/path/file.json
@@ -603,6 +1456,19 @@ def bulk_insert(obj, collectionName, partitionName, files):
         - JSON: Array of objects or JSON Lines
         - Parquet: Apache Parquet format
 
+    LOCAL STAGING:
+        --from-local reads .csv, .parquet, .jsonl, .npy and .npz files (a
+        directory is searched recursively) like `insert file`, writes them
+        as shards of about --shard-size MB under
+        <root>/milvus_cli_staging/<collection>/<run>/, submits one task per
+        shard and polls every task concurrently until they finish.
+        - A local root must be the directory Milvus resolves import paths
+          against, e.g. the bucket directory of a filesystem-backed MinIO
+        - s3:// and minio:// roots are uploaded with boto3
+          (pip install boto3); credentials come from the AWS environment
+          variables, the endpoint from --endpoint
+        - Parquet shards need pyarrow (pip install pyarrow)
+
     EXAMPLES:
         # Single file
         milvus_cli > bulk_insert -c products -f 's3://mybucket/data.json'
@@ -610,19 +1476,57 @@ def bulk_insert(obj, collectionName, partitionName, files):
         # Multiple files
         milvus_cli > bulk_insert -c products -f 's3://bucket/part1.json,s3://bucket/part2.json'
 
+        # Stage a directory of csv files through MinIO and wait for the import
+        milvus_cli > bulk_insert -c products --from-local ./exports --storage-root s3://a-bucket --endpoint http://localhost:9000
+
     NOTES:
         - Returns a task ID for tracking progress
         - Use 'show bulk_insert_state -id <task_id>' to check status
         - Use 'list bulk_insert_tasks' to see all tasks
+        - Staged shards are left in place after the import
 
     SEE ALSO:
         show bulk_insert_state, list bulk_insert_tasks, insert file
     """
     try:
-        file_list = [f.strip() for f in files.split(",")]
-        task_id = obj.data.bulk_insert(collectionName, file_list, partitionName)
-        click.echo(f"Bulk insert task submitted successfully!")
-        click.echo(f"Task ID: {task_id}")
+        if bool(files) == bool(fromLocal):
+            raise ParameterException("Pass either --files or --from-local.")
+        if files:
+            file_list = [f.strip() for f in files.split(",")]
+            task_id = obj.data.bulk_insert(collectionName, file_list, partitionName)
+            click.echo(f"Bulk insert task submitted successfully!")
+            click.echo(f"Task ID: {task_id}")
+            return
+        if not shardSize or shardSize <= 0:
+            raise ParameterException("Shard size should be a positive integer.")
+        storage = open_storage(
+            storageRoot or os.getenv("MILVUS_CLI_STORAGE_ROOT"),
+            endpoint or os.getenv("MILVUS_CLI_STORAGE_ENDPOINT"),
+        )
+        shards = stage_local_files(
+            obj,
+            collectionName,
+            fromLocal.replace('"', "").replace("'", ""),
+            storage,
+            shardFormat,
+            shardSize << 20,
+            batchSize,
+        )
+        tasks = [
+            (obj.data.bulk_insert(collectionName, [path], partitionName), path, rows)
+            for path, rows in shards
+        ]
+        click.echo(
+            f"Staged {sum(rows for _, _, rows in tasks)} rows in {len(tasks)} shards, "
+            f"submitted {len(tasks)} bulk insert tasks."
+        )
+        if noWait:
+            click.echo(f"Task IDs: {[taskId for taskId, _, _ in tasks]}")
+            return
+        if wait_bulk_insert(obj, tasks, pollInterval):
+            click.echo("Bulk insert finished successfully!")
+        else:
+            click.echo("Error!\nSome bulk insert tasks did not complete.")
     except Exception as e:
         click.echo("Error!\n{}".format(str(e)))
 
@@ -684,25 +1588,274 @@ def list_bulk_insert_tasks(obj, limit, collectionName):
     except Exception as e:
         click.echo("Error!\n{}".format(str(e)))
 
+def loadHybridSpec(obj, collectionName, specPath):
+    """The checked hybrid search spec and the collection it runs on (-c or the spec's)."""
+    from ..Hybrid import load_hybrid_spec
+
+    spec = load_hybrid_spec(specPath)
+    collectionName = collectionName or spec["collection"]
+    if not collectionName:
+        raise ParameterException("No collection given, pass -c or set it in the spec.")
+    known = obj.collection.list_field_names(collectionName)
+    missing = [r["field"] for r in spec["requests"] if r["field"] not in known]
+    if missing:
+        raise ParameterException(f"Fields {missing} not found in collection {collectionName}.")
+    return spec, collectionName
+
+
+def hybridCandidates(obj, collectionName, spec, queriesPath, nqBatch, workers, candidatesPath):
+    """
+    Candidates of the spec's component searches, read from candidatesPath
+    when it exists, else searched (and saved there when given).
+    """
+    from ..Fusion import CandidateSet, collect_candidates
+
+    fields = [request["field"] for request in spec["requests"]]
+    if candidatesPath and os.path.exists(candidatesPath):
+        candidates = CandidateSet.load(candidatesPath)
+        if candidates.fields != fields:
+            raise ParameterException(
+                f"Candidates {candidatesPath} were searched for fields {candidates.fields}, "
+                f"not {fields}. Delete it to search again."
+            )
+        click.echo(
+            f"Read {len(candidates)} candidates of {len(candidates.query_ids)} queries "
+            f"from {candidatesPath}.",
+            err=True,
+        )
+        return candidates
+    # Distances are normalized by metric, so take any missing one from the index
+    for request in spec["requests"]:
+        if not request["param"].get("metric_type"):
+            metricType = indexSearchParams(obj, collectionName, request["field"])[0]
+            if not metricType:
+                raise ParameterException(
+                    f"No index on {request['field']}, set its param.metric_type in the spec."
+                )
+            request["param"] = {**request["param"], "metric_type": metricType}
+    candidates, stats = collect_candidates(
+        obj.data, collectionName, spec, queriesPath, nqBatch, workers
+    )
+    click.echo(
+        f"Searched {len(candidates.query_ids)} queries x {len(fields)} requests in "
+        f"{stats['batches']} batches, {len(candidates)} candidates, {stats['seconds']}s.",
+        err=True,
+    )
+    if candidatesPath:
+        candidates.save(candidatesPath)
+        click.echo(f"Candidates written to {candidatesPath}", err=True)
+    return candidates
+
+
+def hybridFuseLocal(
+    obj, collectionName, spec, queriesPath, nqBatch, workers, fusions, candidatesPath,
+    output, outputFormat,
+):
+    """Fuse the component search candidates locally with each setting, streaming the hits."""
+    from ..Fusion import parse_fusion, fusion_label
+
+    requests = len(spec["requests"])
+    settings = [parse_fusion(text, requests) for text in fusions] or [dict(spec["ranker"])]
+    candidates = hybridCandidates(
+        obj, collectionName, spec, queriesPath, nqBatch, workers, candidatesPath
+    )
+    rows = candidates.compare(settings, spec["limit"])
+    with ExportWriter(output or "-", outputFormat) as writer:
+        for row in rows:
+            hits = list(search_hits(row["hits"]))
+            for hit in hits:
+                hit["query"] = candidates.query_ids[hit["query"]]
+            writer.write([{"fusion": row["label"], **hit} for hit in hits])
+    click.echo(
+        tabulate(
+            [[row["label"], row["overlap"], row["ms"]] for row in rows],
+            headers=["Fusion", f"Overlap@{spec['limit']} with {fusion_label(settings[0])}", "ms"],
+            tablefmt="grid",
+        ),
+        err=True,
+    )
+
+
+def hybridSearchSpec(
+    obj, collectionName, specPath, queriesPath, nqBatch, workers, output, outputFormat,
+    local=False, fusions=(), candidatesPath=None,
+):
+    """Hybrid search every query of a file as the spec says, streaming the tagged hits."""
+    from ..Hybrid import ann_requests, hybrid_ranker, iter_hybrid_queries
+
+    spec, collectionName = loadHybridSpec(obj, collectionName, specPath)
+    if local or fusions or candidatesPath:
+        hybridFuseLocal(
+            obj, collectionName, spec, queriesPath, nqBatch, workers, fusions, candidatesPath,
+            output, outputFormat,
+        )
+        return
+    fields = list(dict.fromkeys(request["field"] for request in spec["requests"]))
+    batches = (
+        ((offset, ids), ann_requests(spec, vectors))
+        for offset, ids, vectors in iter_hybrid_queries(queriesPath, fields, nqBatch)
+    )
+    with ExportWriter(output or "-", outputFormat) as writer:
+
+        def writeHits(key, results):
+            _, ids = key
+            hits = list(search_hits(results))
+            for hit in hits:
+                hit["query"] = ids[hit["query"]]
+            writer.write(hits)
+
+        stats = obj.data.hybrid_search_batches(
+            collectionName,
+            batches,
+            hybrid_ranker(spec["ranker"]),
+            spec["limit"],
+            spec["output_fields"],
+            workers=workers,
+            on_results=writeHits,
+        )
+    click.echo(
+        f"Searched {stats['queries']} queries in {stats['batches']} batches, "
+        f"wrote {writer.rows} hits, {stats['seconds']}s, "
+        f"{stats['queries_per_sec']:,.1f} queries/s.",
+        err=True,
+    )
+
+
 @cli.command("hybrid_search")
+@click.option(
+    "-c",
+    "--collection-name",
+    "collectionName",
+    default=None,
+    help="[Optional] - Collection name with --spec, default is the spec's collection.",
+)
+@click.option(
+    "--spec",
+    "specPath",
+    default=None,
+    help="JSON file with the ANN request templates, ranker, limit and output fields.",
+)
+@click.option(
+    "--queries",
+    "queriesPath",
+    default=None,
+    help="JSON Lines file with one query per line, a vector for each field of the spec.",
+)
+@click.option(
+    "--nq-batch",
+    "nqBatch",
+    default=100,
+    type=int,
+    help="[Optional] - Queries sent per hybrid search request, default is 100.",
+)
+@click.option(
+    "--workers",
+    "workers",
+    default=1,
+    type=int,
+    help="[Optional] - Concurrent hybrid search requests, default is 1.",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output",
+    default=None,
+    help="[Optional] - File the hits are written to, default is stdout.",
+)
+@click.option(
+    "--output-format",
+    "outputFormat",
+    default="jsonl",
+    type=click.Choice(EXPORT_FORMATS),
+    help="[Optional] - Format of the hits, default is jsonl.",
+)
+@click.option(
+    "--local",
+    "local",
+    is_flag=True,
+    help="[Optional] - Run the component searches once and fuse their candidates locally.",
+)
+@click.option(
+    "--fusion",
+    "fusions",
+    multiple=True,
+    help="[Optional] - Local fusion setting, e.g. 'rrf:60', 'weighted:0.7,0.3' or 'combmnz'; repeatable.",
+)
+@click.option(
+    "--candidates",
+    "candidatesPath",
+    default=None,
+    help="[Optional] - .npz file the local candidates are read from, or saved to when missing.",
+)
 @click.pass_obj
-def hybrid_search(obj):
+def hybrid_search(
+    obj, collectionName, specPath, queriesPath, nqBatch, workers, output, outputFormat,
+    local, fusions, candidatesPath,
+):
     """
     Perform hybrid search (multi-vector search) with reranking.
 
     USAGE:
         milvus_cli > hybrid_search
 
+        milvus_cli > hybrid_search --spec <spec.json> --queries <queries.jsonl> [OPTIONS]
+
     INTERACTIVE PROMPTS:
         1. Collection name
         2. Add search requests (Vector field, Vector data, TopK, Params)
         3. Rerank strategy (Weighted / RRF)
         4. Output fields
 
+    BATCHED HYBRID SEARCH:
+        --spec is a JSON object with the AnnSearchRequest templates and the
+        ranker, e.g.
+            {"collection": "docs",
+             "requests": [
+               {"field": "dense", "param": {"metric_type": "COSINE",
+                "params": {"ef": 64}}, "limit": 50, "expr": "lang == 'en'"},
+               {"field": "sparse", "param": {"metric_type": "IP"}, "limit": 50}],
+             "ranker": {"type": "weighted", "weights": [0.7, 0.3]},
+             "limit": 10, "output_fields": ["title"]}
+        The ranker may also be {"type": "rrf", "k": 60}. Each line of
+        --queries holds a vector for every field of the spec (a list, or an
+        {index: value} object for sparse fields) and optionally an "id".
+        Queries are sent --nq-batch per request, --workers requests at a
+        time, and the hits are streamed in query order, one record per hit
+        with its query id, rank, id, distance and output fields.
+
+    LOCAL FUSION:
+        With --local (or --fusion / --candidates) each request of the spec
+        is searched on its own, once, and the candidate lists are fused on
+        the client with every --fusion setting (default: the spec's ranker):
+            rrf[:k]             sum of 1 / (k + rank), k defaults to 60
+            weighted[:w1,w2]    weighted sum of normalized distances, as
+                                WeightedRanker scores them
+            combmnz[:w1,w2]     weighted sum times the requests that found it
+        Hits carry their fusion setting and fused score, without output
+        fields, and a table compares each setting's top-k with the first.
+        --candidates keeps the candidates in a file, so later runs try
+        other settings without any search.
+
     EXAMPLES:
         milvus_cli > hybrid_search
         # Follow prompts to add multiple requests and choose ranker.
+
+        milvus_cli > hybrid_search --spec hybrid.json --queries eval.jsonl --workers 4 -o hits.jsonl
+
+        milvus_cli > hybrid_search --spec hybrid.json --queries eval.jsonl --candidates eval.npz --fusion rrf:20 --fusion rrf:60 --fusion weighted:0.8,0.2 -o fused.jsonl
     """
+    if specPath or queriesPath:
+        if not (specPath and queriesPath):
+            click.echo("Error!\n--spec and --queries go together.", err=True)
+            return
+        try:
+            hybridSearchSpec(
+                obj, collectionName, specPath, queriesPath, nqBatch, workers, output,
+                outputFormat, local, fusions, candidatesPath,
+            )
+        except Exception as e:
+            click.echo("Error!\n{}".format(str(e)), err=True)
+        return
     try:
         from pymilvus import AnnSearchRequest, WeightedRanker, RRFRanker
 
@@ -852,14 +2005,124 @@ def hybrid_search(obj):
         click.echo("\nExecuting hybrid search...")
         # Use Data.py's wrapper if available, or call collection directly
         # obj.data.hybrid_search signature: (collectionName, requests, rerank, limit, output_fields)
-        results = obj.data.hybrid_search(collectionName, requests, rerank, final_limit, output_fields_list)
-        
+        results = obj.data.hybrid_search(
+            collectionName, requests, rerank, final_limit, output_fields_list, prettierFormat=False
+        )
+
         click.echo(f"Hybrid Search Result:\n")
-        click.echo(results)
+        echoHits(obj, collectionName, results)
 
     except Exception as e:
         click.echo(f"Error executing hybrid search: {str(e)}", err=True)
 
+def echoHits(obj, collectionName, results, roundDecimal=4, pageSize=50):
+    """Show the hits of the first query as a table, through a pager when longer than a page."""
+    from ..Converter import field_type_name
+    from ..Render import HitTable
+
+    try:
+        vectorFields = [
+            f["name"]
+            for f in obj.data.input_fields(collectionName)
+            if field_type_name(f).endswith("_VECTOR")
+        ]
+    except Exception:
+        # Fall back to spotting vectors by their values
+        vectorFields = None
+    table = HitTable(results[0] if results else [], roundDecimal, vectorFields)
+    if len(table) > pageSize:
+        click.echo_via_pager(table.pages(pageSize))
+    else:
+        click.echo(table.render())
+
+
+def vectorIndexDetails(obj, collectionName, annsField):
+    """describe_index output of the index on a field, or None."""
+    indexes = obj.index.list_indexes(collectionName, onlyData=True)
+    return next(
+        (index for index in indexes if index.get("field_name") == annsField), None
+    )
+
+
+def savedSearchParams(obj, collectionName, annsField):
+    """Params saved by `tune search --save` for a field, or None."""
+    connection = getattr(obj, "connection", None)
+    if connection is None:
+        return None
+    return SavedSearchParams().get(
+        connection.uri, connection.get_current_database(), collectionName, annsField
+    )
+
+
+def indexSearchParams(obj, collectionName, annsField):
+    """
+    Metric type and default search params of the index on a vector field.
+
+    Params saved by `tune search --save` take the place of the defaults.
+
+    Returns:
+        (metricType, params as "name:value" strings, hasIndex)
+    """
+    indexDetails = vectorIndexDetails(obj, collectionName, annsField)
+    if not indexDetails:
+        return "", [], False
+    index_type = indexDetails.get("index_type", "AUTOINDEX")
+    search_parameters = IndexTypesMap.get(index_type, {}).get("search_parameters", [])
+    saved = savedSearchParams(obj, collectionName, annsField) or {}
+    params = [
+        f"{parameter}:{saved.get(parameter, SearchParamDefaults.get(parameter, '0'))}"
+        for parameter in search_parameters
+        if parameter != "metric_type"
+    ]
+    return indexDetails.get("metric_type", ""), params, True
+
+
+def searchVectorsFile(
+    obj,
+    collectionName,
+    annsField,
+    vectorsFile,
+    limit,
+    nqBatch,
+    params,
+    expr,
+    outputFields,
+    output,
+    outputFormat,
+):
+    """Search every vector of a file in nq-sized batches, streaming the tagged hits."""
+    fields_info = obj.collection.list_fields_info(collectionName)
+    if not any(field["name"] == annsField for field in fields_info):
+        raise ParameterException(
+            f"Field {annsField} not found in collection {collectionName}."
+        )
+    metricType, defaultParams, hasIndex = indexSearchParams(
+        obj, collectionName, annsField
+    )
+    searchParameters = validateSearchParams(
+        data=[],
+        annsField=annsField,
+        metricType=metricType,
+        params=params or defaultParams,
+        limit=limit,
+        expr=expr,
+        outputFields=outputFields,
+        roundDecimal=-1,
+        hasIndex=hasIndex,
+        guarantee_timestamp=0,
+        partitionNames="",
+    )
+    batches = readVectorsInBatches(vectorsFile, nqBatch, annsField)
+    queries = 0
+    with ExportWriter(output or "-", outputFormat) as writer:
+        for offset, results in obj.data.search_batches(
+            collectionName, searchParameters, batches
+        ):
+            writer.write(list(search_hits(results, offset)))
+            queries = offset + len(results)
+    click.echo(f"Searched {queries} queries, wrote {writer.rows} hits.", err=True)
+
+
 @cli.command("search")
 @click.option(
     "-c",
@@ -890,18 +2153,88 @@ def hybrid_search(obj):
     type=int,
     help="Top K (max results).",
 )
+@click.option(
+    "--vectors-file",
+    "vectorsFile",
+    default=None,
+    help="Search every query vector of a .npy, .csv or .jsonl file (with -c and -f).",
+)
+@click.option(
+    "--nq-batch",
+    "nqBatch",
+    default=100,
+    type=int,
+    help="Query vectors sent per search request with --vectors-file, default is 100.",
+)
+@click.option(
+    "--params",
+    "params_opt",
+    default=None,
+    help="Search params with --vectors-file, e.g. 'nprobe:16', default is the index defaults.",
+)
+@click.option(
+    "--expr",
+    "expr_opt",
+    default="",
+    help="Filter expression with --vectors-file.",
+)
+@click.option(
+    "--output-fields",
+    "outputFields_opt",
+    default="",
+    help="Fields to return with --vectors-file (split by ',').",
+)
+@click.option(
+    "-o",
+    "--output",
+    "output_opt",
+    default=None,
+    help="File the --vectors-file hits are written to, default is stdout.",
+)
+@click.option(
+    "--output-format",
+    "outputFormat_opt",
+    default="jsonl",
+    type=click.Choice(EXPORT_FORMATS),
+    help="Format of the --vectors-file hits, default is jsonl.",
+)
 @click.pass_obj
-def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
+def search(
+    obj,
+    collectionName_opt,
+    annsField_opt,
+    vector_json,
+    limit_opt,
+    vectorsFile,
+    nqBatch,
+    params_opt,
+    expr_opt,
+    outputFields_opt,
+    output_opt,
+    outputFormat_opt,
+):
     """
     Perform vector similarity search.
 
     USAGE:
         milvus_cli > search
         milvus_cli > search -c my_coll -f embedding -v '[0.1,0.2,0.3,0.4]' -l 5
+        milvus_cli > search -c my_coll -f embedding --vectors-file queries.npy -l 10
 
     NON-INTERACTIVE:
         Pass -c, -f, -v, and -l for dense vector search (indexed collection).
 
+    BATCHED SEARCH:
+        Pass -c, -f and --vectors-file to search every vector of a .npy,
+        .csv or .jsonl file, --nq-batch vectors per request (default 100).
+        Hits are streamed as they arrive, one record per hit with its
+        query index, rank, id, distance and output fields, as JSON Lines
+        (default) or csv, to stdout or --output. -l defaults to 10 and
+        --params to the index's default search params.
+        - .npy: 2-D array, one query per row (memory-mapped)
+        - .csv: one JSON array cell or one number per column per row
+        - .jsonl: an array per line, or an object with the vector field
+
     INTERACTIVE PROMPTS:
         Collection name     Target collection
         Vector field        Field containing vectors
@@ -933,9 +2266,32 @@ def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
         Search vectors: [0.1, 0.2, 0.3, ...]
         Top K: 10
 
+        milvus_cli > search -c products -f embedding --vectors-file eval.npy --nq-batch 500 -o hits.jsonl
+
     SEE ALSO:
         query, create index, show index
     """
+    if vectorsFile:
+        if not (collectionName_opt and annsField_opt):
+            click.echo("Error!\n--vectors-file needs -c and -f.", err=True)
+            return
+        try:
+            searchVectorsFile(
+                obj,
+                collectionName_opt,
+                annsField_opt,
+                vectorsFile,
+                limit_opt if limit_opt is not None else 10,
+                nqBatch,
+                [p.strip() for p in params_opt.split(",")] if params_opt else None,
+                expr_opt,
+                outputFields_opt,
+                output_opt,
+                outputFormat_opt,
+            )
+        except Exception as e:
+            click.echo("Error!\n{}".format(str(e)), err=True)
+        return
     if (
         collectionName_opt
         and annsField_opt
@@ -962,38 +2318,9 @@ def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
                 )
                 return
 
-            indexes = obj.index.list_indexes(collectionName, onlyData=True)
-            indexDetails = None
-            for index in indexes:
-                if index.get("field_name") == annsField:
-                    indexDetails = index
-                    break
-
-            hasIndex = bool(indexDetails)
-            if indexDetails:
-                index_type = indexDetails.get("index_type", "AUTOINDEX")
-                metricType = indexDetails.get("metric_type", "")
-                search_parameters = IndexTypesMap.get(index_type, {}).get(
-                    "search_parameters", []
-                )
-                params = []
-                defaults = {
-                    "nprobe": "10",
-                    "ef": "64",
-                    "search_list": "20",
-                    "reorder_k": "10",
-                    "search_length": "10",
-                    "search_k": "100",
-                    "drop_ratio_search": "0.2",
-                }
-                for parameter in search_parameters:
-                    if parameter == "metric_type":
-                        continue
-                    pval = defaults.get(parameter, "0")
-                    params.append(f"{parameter}:{pval}")
-            else:
-                metricType = ""
-                params = []
+            metricType, params, hasIndex = indexSearchParams(
+                obj, collectionName, annsField
+            )
 
             searchParameters = validateSearchParams(
                 data=data,
@@ -1015,9 +2342,9 @@ def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
             click.echo("Error!\n{}".format(str(e)), err=True)
             return
         else:
-            results = obj.data.search(collectionName, searchParameters)
+            results = obj.data.search(collectionName, searchParameters, prettierFormat=False)
             click.echo("Search result: \n")
-            click.echo(results)
+            echoHits(obj, collectionName, results, searchParameters.get("round_decimal", 4))
         return
 
     collectionName = click.prompt(
@@ -1109,9 +2436,12 @@ def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
         click.echo(f"Metric type: {metric_type}")
         metricType = metric_type
         search_parameters = IndexTypesMap[index_type]["search_parameters"]
+        saved = savedSearchParams(obj, collectionName, annsField) or {}
         params = []
         for parameter in search_parameters:
-            paramInput = click.prompt(f"Search parameter {parameter}'s value")
+            paramInput = click.prompt(
+                f"Search parameter {parameter}'s value", default=saved.get(parameter)
+            )
             params += [f"{parameter}:{paramInput}"]
     else:
         metricType = ""
@@ -1169,6 +2499,7 @@ def search(obj, collectionName_opt, annsField_opt, vector_json, limit_opt):
         results = obj.data.search(
             collectionName,
             searchParameters,
+            prettierFormat=False,
         )
         click.echo(f"Search result: \n")
-        click.echo(results)
+        echoHits(obj, collectionName, results, searchParameters.get("round_decimal", 4))
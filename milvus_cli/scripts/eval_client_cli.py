@@ -0,0 +1,796 @@
+from .helper_client_cli import cli
+
+import click
+import json
+import time
+
+from tabulate import tabulate
+
+from ..Bench import LatencyHistogram
+from ..Checkpoint import write_json_atomic
+from ..Export import EXPORT_FORMATS, ExportWriter
+from ..Fusion import fusion_grid, parse_fusion
+from ..Hybrid import RANKERS
+from ..Recall import (
+    ExactTopK,
+    GroundTruthCache,
+    read_qrels,
+    recall_at_k,
+    recall_summary,
+    sample_hash,
+    sample_vectors,
+)
+from ..Tuner import (
+    SavedSearchParams,
+    SearchTuner,
+    cheapest,
+    pareto_frontier,
+    tuning_space,
+)
+from ..Types import IndexTypesMap, ParameterException
+from .bench_client_cli import loadQueryVectors, searchParametersFor
+from .data_client_cli import (
+    hybridCandidates,
+    indexSearchParams,
+    loadHybridSpec,
+    vectorIndexDetails,
+)
+
+
+def sampleQueries(
+    obj, collectionName, annsField, sampleSize, seed, expr, batchSize, cache, entities, refresh=False
+):
+    """Query vectors sampled from the collection, reusing a cached sample."""
+    key = "sample-" + sample_hash(sample=sampleSize, seed=seed, expr=expr)
+    cached = cache.load(collectionName, annsField, key, entities) if cache and not refresh else None
+    if cached is not None:
+        click.echo(f"Using cached sample of {len(cached[0])} query vectors.", err=True)
+        return cached
+    click.echo(f"Sampling {sampleSize} query vectors from {collectionName}...", err=True)
+    ids, queries = sample_vectors(
+        obj.data.iter_vectors(collectionName, annsField, batchSize, expr), sampleSize, seed
+    )
+    if cache:
+        cache.save(collectionName, annsField, key, ids, queries, entities)
+    return ids, queries
+
+
+def exactNeighbours(obj, collectionName, annsField, queries, k, metricType, expr, batchSize, entities):
+    """Exact top-k ids and distances of each query over every vector of the collection."""
+    exact = ExactTopK(queries, k, metricType)
+    with click.progressbar(
+        length=entities, label="Computing ground truth", file=click.get_text_stream("stderr")
+    ) as bar:
+        for ids, vectors in obj.data.iter_vectors(collectionName, annsField, batchSize, expr):
+            exact.add(ids, vectors)
+            bar.update(len(ids))
+    return exact.result()
+
+
+def evalQueries(
+    obj, collectionName, annsField, vectorsFile, sampleSize, seed, expr, batchSize, cache, entities, refresh
+):
+    """Query vectors from a file, or sampled from the collection."""
+    if vectorsFile:
+        return loadQueryVectors(obj, collectionName, annsField, vectorsFile, 0)
+    return sampleQueries(
+        obj, collectionName, annsField, sampleSize, seed, expr, batchSize, cache, entities, refresh
+    )[1]
+
+
+def groundTruth(
+    obj, collectionName, annsField, queries, k, metricType, expr, batchSize, cache, entities, refresh
+):
+    """
+    Exact top-k ids of the queries, from the cache when possible.
+
+    Returns:
+        (ids per query, "cache" or "computed")
+    """
+    key = sample_hash(queries, metric=metricType, k=k, expr=expr)
+    if cache and not refresh:
+        cached = cache.load(collectionName, annsField, key, entities)
+        if cached is not None:
+            return cached[0], "cache"
+    truth, distances = exactNeighbours(
+        obj, collectionName, annsField, queries, k, metricType, expr, batchSize, entities
+    )
+    if cache:
+        cache.save(collectionName, annsField, key, truth, distances, entities)
+    return truth, "computed"
+
+
+@cli.group("eval", no_args_is_help=False)
+@click.pass_obj
+def evaluate(obj):
+    """Evaluate search quality."""
+    pass
+
+
+@evaluate.command("recall")
+@click.option("-c", "--collection-name", "collectionName", help="Collection name.", required=True)
+@click.option("-f", "--field", "annsField", help="Float vector field to search.", required=True)
+@click.option("-k", "--limit", "limit", default=10, type=int, help="[Optional] - k of recall@k, default is 10.")
+@click.option(
+    "--sample",
+    "sampleSize",
+    default=100,
+    type=int,
+    help="[Optional] - Query vectors to sample from the collection, default is 100.",
+)
+@click.option("--seed", "seed", default=0, type=int, help="[Optional] - Sampling seed, default is 0.")
+@click.option(
+    "--vectors-file",
+    "vectorsFile",
+    default=None,
+    help="[Optional] - Query vectors (.npy, .csv or .jsonl) instead of a sample.",
+)
+@click.option(
+    "--params",
+    "params",
+    default=None,
+    help="[Optional] - Search params, e.g. 'ef:128', default is the index defaults.",
+)
+@click.option("--expr", "expr", default="", help="[Optional] - Filter for both the search and the ground truth.")
+@click.option(
+    "--metric",
+    "metricType",
+    default=None,
+    type=click.Choice(["L2", "IP", "COSINE"], case_sensitive=False),
+    help="[Optional] - Metric of the ground truth, default is the index metric.",
+)
+@click.option("--nq-batch", "nqBatch", default=100, type=int, help="[Optional] - Query vectors per search request, default is 100.")
+@click.option("--batch-size", "batchSize", default=1000, type=int, help="[Optional] - Entities per query_iterator page, default is 1000.")
+@click.option(
+    "--cache-dir",
+    "cacheDir",
+    default=None,
+    envvar="MILVUS_CLI_CACHE_DIR",
+    help="[Optional] - Ground truth cache directory, default is ~/.milvus_cli_cache.",
+)
+@click.option("--no-cache", "noCache", is_flag=True, default=False, help="[Optional] - Neither read nor write the cache.")
+@click.option("--refresh", "refresh", is_flag=True, default=False, help="[Optional] - Recompute the ground truth.")
+@click.option("-o", "--output", "output", default=None, help="[Optional] - Write per-query recall to this file.")
+@click.option(
+    "--output-format",
+    "outputFormat",
+    default="jsonl",
+    type=click.Choice(EXPORT_FORMATS),
+    help="[Optional] - Per-query output format, default is jsonl.",
+)
+@click.option(
+    "--format",
+    "reportFormat",
+    default="table",
+    type=click.Choice(["table", "json"]),
+    help="[Optional] - Report format, default is table.",
+)
+@click.option("--report", "reportPath", default=None, help="[Optional] - Also write the JSON report to this file.")
+@click.pass_obj
+def eval_recall(
+    obj,
+    collectionName,
+    annsField,
+    limit,
+    sampleSize,
+    seed,
+    vectorsFile,
+    params,
+    expr,
+    metricType,
+    nqBatch,
+    batchSize,
+    cacheDir,
+    noCache,
+    refresh,
+    output,
+    outputFormat,
+    reportFormat,
+    reportPath,
+):
+    """
+    Measure recall@k of search against exact neighbours computed locally.
+
+    USAGE:
+        milvus_cli > eval recall -c <collection> -f <field> [options]
+
+    OPTIONS:
+        -c, --collection-name    Target collection (required)
+        -f, --field              Float vector field to search (required)
+        -k, --limit              k of recall@k (default: 10)
+        --sample                 Query vectors sampled from the collection (default: 100)
+        --seed                   Sampling seed (default: 0)
+        --vectors-file           Query vectors (.npy, .csv, .jsonl) instead of a sample
+        --params                 Search params, default is the index defaults
+        --expr                   Filter for both the search and the ground truth
+        --metric                 Ground truth metric, default is the index metric
+        --nq-batch               Query vectors per search request (default: 100)
+        --batch-size             Entities per query_iterator page (default: 1000)
+        --cache-dir              Cache directory (env MILVUS_CLI_CACHE_DIR)
+        --no-cache               Do not read or write the cache
+        --refresh                Recompute the cached ground truth
+        -o, --output             Per-query recall file (- for stdout)
+        --output-format          jsonl, csv or parquet (default: jsonl)
+        --format                 Report format: table or json (default: table)
+        --report                 Also write the JSON report to a file
+
+    GROUND TRUTH:
+        Every vector of the collection is read with query_iterator and
+        scored against the queries with blocked matrix products, keeping
+        only the running top k, so memory does not grow with the
+        collection. The result is cached by collection, field and a hash
+        of the queries, metric, k and filter, and is recomputed when the
+        entity count changes, so later runs only pay for the searches.
+
+    EXAMPLES:
+        # Recall@10 of 200 sampled queries with the index defaults
+        milvus_cli > eval recall -c products -f embedding --sample 200
+
+        # Recall@100 at a given ef, per-query results to a file
+        milvus_cli > eval recall -c products -f embedding -k 100 --params ef:256 -o recall.jsonl
+
+    SEE ALSO:
+        search, bench search
+    """
+    try:
+        if nqBatch < 1 or batchSize < 1:
+            raise ParameterException("--nq-batch and --batch-size should be positive.")
+        indexMetric, _, _ = indexSearchParams(obj, collectionName, annsField)
+        metricType = (metricType or indexMetric or "").upper()
+        searchParameters = searchParametersFor(
+            obj,
+            collectionName,
+            annsField,
+            limit,
+            [p.strip() for p in params.split(",")] if params else None,
+            expr,
+        )
+        entities = obj.data.get_entity_count(collectionName)
+        cache = None if noCache else GroundTruthCache(cacheDir)
+        queries = evalQueries(
+            obj, collectionName, annsField, vectorsFile, sampleSize, seed, expr,
+            batchSize, cache, entities, refresh,
+        )
+
+        start = time.perf_counter()
+        truth, groundTruthSource = groundTruth(
+            obj, collectionName, annsField, queries, limit, metricType, expr,
+            batchSize, cache, entities, refresh,
+        )
+        truthSeconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        found = []
+        batches = (
+            (offset, queries[offset:offset + nqBatch])
+            for offset in range(0, len(queries), nqBatch)
+        )
+        for _, results in obj.data.search_batches(collectionName, searchParameters, batches):
+            found.extend([hit.get("id") for hit in hits] for hits in results)
+        searchSeconds = time.perf_counter() - start
+
+        values = recall_at_k(truth, found, limit)
+        if output:
+            rows = []
+            for idx, value in enumerate(values):
+                hits = set(found[idx])
+                rows.append(
+                    {
+                        "query": idx,
+                        "recall": round(value, 4),
+                        "missed": [i for i in truth[idx] if i not in hits],
+                    }
+                )
+            with ExportWriter(output, outputFormat) as writer:
+                writer.write(rows)
+        report = {
+            "collection": collectionName,
+            "field": annsField,
+            "k": limit,
+            "metric": metricType,
+            "search_params": searchParameters["param"],
+            "entities": entities,
+            "ground_truth": groundTruthSource,
+            "ground_truth_seconds": round(truthSeconds, 3),
+            "search_seconds": round(searchSeconds, 3),
+            "recall": recall_summary(values),
+        }
+    except Exception as e:
+        click.echo("Error!\n{}".format(str(e)), err=True)
+        return
+    if reportFormat == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        rows = [[key, value] for key, value in report.items() if key != "recall"]
+        rows += [[f"recall@{limit} {key}", value] for key, value in report["recall"].items()]
+        click.echo(tabulate(rows, headers=["Metric", "Value"], tablefmt="grid"))
+    if reportPath:
+        write_json_atomic(reportPath, report)
+        click.echo(f"Report written to {reportPath}", err=True)
+
+
+def parseRanges(ranges):
+    """``name:low:high`` options as ``{name: (low, high)}``."""
+    space = {}
+    for item in ranges:
+        parts = item.split(":")
+        try:
+            name, low, high = parts[0], int(parts[1]), int(parts[2])
+        except (IndexError, ValueError):
+            raise ParameterException(f"Range {item} should look like ef:16:512.")
+        if low < 1 or high < low:
+            raise ParameterException(f"Range {item} should have 1 <= low <= high.")
+        space[name] = (low, high)
+    return space
+
+
+def searchTrial(obj, collectionName, annsField, queries, truth, limit, expr, nqBatch, values):
+    """Recall and latency of searching every query with the given params."""
+    searchParameters = searchParametersFor(
+        obj, collectionName, annsField, limit,
+        [f"{name}:{value}" for name, value in values.items()], expr,
+    )
+    histogram = LatencyHistogram()
+    found = []
+    start = time.perf_counter()
+    for offset in range(0, len(queries), nqBatch):
+        sent = time.perf_counter()
+        results = obj.data.search_vectors(
+            collectionName, searchParameters, queries[offset:offset + nqBatch]
+        )
+        histogram.record(time.perf_counter() - sent)
+        found.extend([hit.get("id") for hit in hits] for hits in results)
+    elapsed = time.perf_counter() - start
+    values = recall_at_k(truth, found, limit)
+    latency = histogram.summary()
+    return {
+        "recall": round(sum(values) / len(values), 4),
+        "mean_ms": latency["mean_ms"],
+        "p50_ms": latency["p50_ms"],
+        "p99_ms": latency["p99_ms"],
+        "qps": round(histogram.total / elapsed, 2) if elapsed > 0 else 0.0,
+    }
+
+
+@cli.group("tune", no_args_is_help=False)
+@click.pass_obj
+def tune(obj):
+    """Tune search parameters."""
+    pass
+
+
+@tune.command("search")
+@click.option("-c", "--collection-name", "collectionName", help="Collection name.", required=True)
+@click.option("-f", "--field", "annsField", help="Float vector field to tune.", required=True)
+@click.option("-k", "--limit", "limit", default=10, type=int, help="[Optional] - k of recall@k, default is 10.")
+@click.option(
+    "--target-recall",
+    "targetRecall",
+    default=None,
+    type=float,
+    help="[Optional] - Recall@k to reach at the lowest latency, e.g. 0.95.",
+)
+@click.option(
+    "--range",
+    "ranges",
+    multiple=True,
+    help="[Optional] - Range of a parameter as name:low:high, e.g. ef:16:512; repeatable.",
+)
+@click.option("--sample", "sampleSize", default=100, type=int, help="[Optional] - Query vectors to sample, default is 100.")
+@click.option("--seed", "seed", default=0, type=int, help="[Optional] - Sampling seed, default is 0.")
+@click.option(
+    "--vectors-file",
+    "vectorsFile",
+    default=None,
+    help="[Optional] - Query vectors (.npy, .csv or .jsonl) instead of a sample.",
+)
+@click.option("--expr", "expr", default="", help="[Optional] - Filter for both the search and the ground truth.")
+@click.option("--nq-batch", "nqBatch", default=1, type=int, help="[Optional] - Query vectors per timed request, default is 1.")
+@click.option("--batch-size", "batchSize", default=1000, type=int, help="[Optional] - Entities per query_iterator page, default is 1000.")
+@click.option("--max-trials", "maxTrials", default=50, type=int, help="[Optional] - Most settings to try, default is 50.")
+@click.option(
+    "--tolerance",
+    "tolerance",
+    default=0.05,
+    type=float,
+    help="[Optional] - Relative precision of the bisection, default is 0.05.",
+)
+@click.option(
+    "--cache-dir",
+    "cacheDir",
+    default=None,
+    envvar="MILVUS_CLI_CACHE_DIR",
+    help="[Optional] - Ground truth cache directory, default is ~/.milvus_cli_cache.",
+)
+@click.option("--no-cache", "noCache", is_flag=True, default=False, help="[Optional] - Neither read nor write the cache.")
+@click.option("--refresh", "refresh", is_flag=True, default=False, help="[Optional] - Recompute the ground truth.")
+@click.option(
+    "--save",
+    "save",
+    is_flag=True,
+    default=False,
+    help="[Optional] - Save the chosen setting as the field's default search params.",
+)
+@click.option(
+    "--format",
+    "reportFormat",
+    default="table",
+    type=click.Choice(["table", "json"]),
+    help="[Optional] - Report format, default is table.",
+)
+@click.option("--report", "reportPath", default=None, help="[Optional] - Also write the JSON report to this file.")
+@click.pass_obj
+def tune_search(
+    obj,
+    collectionName,
+    annsField,
+    limit,
+    targetRecall,
+    ranges,
+    sampleSize,
+    seed,
+    vectorsFile,
+    expr,
+    nqBatch,
+    batchSize,
+    maxTrials,
+    tolerance,
+    cacheDir,
+    noCache,
+    refresh,
+    save,
+    reportFormat,
+    reportPath,
+):
+    """
+    Find the search params of a field's index that reach a recall target fastest.
+
+    USAGE:
+        milvus_cli > tune search -c <collection> -f <field> [--target-recall 0.95] [options]
+
+    OPTIONS:
+        -c, --collection-name    Target collection (required)
+        -f, --field              Float vector field to tune (required)
+        -k, --limit              k of recall@k (default: 10)
+        --target-recall          Recall@k to reach at the lowest latency
+        --range                  Parameter range name:low:high, repeatable
+        --sample                 Query vectors sampled from the collection (default: 100)
+        --seed                   Sampling seed (default: 0)
+        --vectors-file           Query vectors (.npy, .csv, .jsonl) instead of a sample
+        --expr                   Filter for both the search and the ground truth
+        --nq-batch               Query vectors per timed request (default: 1)
+        --batch-size             Entities per query_iterator page (default: 1000)
+        --max-trials             Most settings to try (default: 50)
+        --tolerance              Relative precision of the bisection (default: 0.05)
+        --cache-dir              Cache directory (env MILVUS_CLI_CACHE_DIR)
+        --no-cache               Do not read or write the cache
+        --refresh                Recompute the cached ground truth
+        --save                   Save the chosen setting as the field's default
+        --format                 Report format: table or json (default: table)
+        --report                 Also write the JSON report to a file
+
+    HOW IT WORKS:
+        The search parameters of the index type (nprobe, ef, search_list,
+        ...) are tuned one at a time against exact neighbours computed and
+        cached as for `eval recall`. Each value doubles until the target is
+        met and the last step is then bisected, so a few trials replace a
+        full grid. Without a target the doubling stops once recall no
+        longer improves. Every trial is listed; * marks the Pareto frontier
+        of recall against mean latency.
+
+    SAVED SETTINGS:
+        With --save the chosen params become the defaults `search`,
+        `bench search` and `eval recall` use for this field on this server
+        and database. They are stored in ~/.milvus_cli_search_params.json.
+
+    EXAMPLES:
+        # Cheapest ef reaching 95% recall@10, saved for later searches
+        milvus_cli > tune search -c products -f embedding --target-recall 0.95 --save
+
+        # Map the nprobe frontier up to 256
+        milvus_cli > tune search -c docs -f vec --range nprobe:1:256
+
+    SEE ALSO:
+        eval recall, bench search, search
+    """
+    try:
+        if nqBatch < 1 or batchSize < 1:
+            raise ParameterException("--nq-batch and --batch-size should be positive.")
+        if save and targetRecall is None:
+            raise ParameterException("--save needs a --target-recall to choose a setting.")
+        indexDetails = vectorIndexDetails(obj, collectionName, annsField)
+        if not indexDetails:
+            raise ParameterException(f"Field {annsField} has no index to tune.")
+        indexType = indexDetails.get("index_type", "AUTOINDEX")
+        metricType = (indexDetails.get("metric_type") or "").upper()
+        searchParameters = IndexTypesMap.get(indexType, {}).get("search_parameters", [])
+        space = tuning_space(indexDetails, searchParameters, limit)
+        space.update(parseRanges(ranges))
+        if not space:
+            raise ParameterException(f"Index type {indexType} has no tunable search parameters.")
+
+        entities = obj.data.get_entity_count(collectionName)
+        cache = None if noCache else GroundTruthCache(cacheDir)
+        queries = evalQueries(
+            obj, collectionName, annsField, vectorsFile, sampleSize, seed, expr,
+            batchSize, cache, entities, refresh,
+        )
+        truth, groundTruthSource = groundTruth(
+            obj, collectionName, annsField, queries, limit, metricType, expr,
+            batchSize, cache, entities, refresh,
+        )
+
+        def evaluate(values):
+            trial = searchTrial(
+                obj, collectionName, annsField, queries, truth, limit, expr, nqBatch, values
+            )
+            click.echo(
+                f"{', '.join(f'{k}={v}' for k, v in values.items())}: "
+                f"recall {trial['recall']:.4f}, mean {trial['mean_ms']:.2f} ms",
+                err=True,
+            )
+            return trial
+
+        tuner = SearchTuner(
+            evaluate,
+            space,
+            target_recall=targetRecall,
+            tolerance=tolerance,
+            max_trials=maxTrials,
+        )
+        # One unmeasured pass so the first trial does not pay for cold caches
+        searchTrial(
+            obj, collectionName, annsField, queries, truth, limit, expr, nqBatch, tuner.current
+        )
+        trials = tuner.run()
+        frontier = pareto_frontier(trials)
+        chosen = cheapest(trials, targetRecall) if targetRecall is not None else None
+        report = {
+            "collection": collectionName,
+            "field": annsField,
+            "index_type": indexType,
+            "metric": metricType,
+            "k": limit,
+            "queries": len(queries),
+            "ground_truth": groundTruthSource,
+            "space": {name: list(bounds) for name, bounds in space.items()},
+            "target_recall": targetRecall,
+            "trials": trials,
+            "frontier": frontier,
+            "chosen": chosen,
+        }
+        if save and chosen:
+            SavedSearchParams().save(
+                obj.connection.uri,
+                obj.connection.get_current_database(),
+                collectionName,
+                annsField,
+                chosen["params"],
+            )
+    except Exception as e:
+        click.echo("Error!\n{}".format(str(e)), err=True)
+        return
+    if reportFormat == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        rows = [
+            [
+                "*" if trial in frontier else "",
+                ", ".join(f"{k}:{v}" for k, v in trial["params"].items()),
+                trial["recall"],
+                trial["mean_ms"],
+                trial["p50_ms"],
+                trial["p99_ms"],
+                trial["qps"],
+            ]
+            for trial in sorted(trials, key=lambda t: t["mean_ms"])
+        ]
+        click.echo(
+            tabulate(
+                rows,
+                headers=["Frontier", "Params", f"Recall@{limit}", "Mean (ms)", "p50 (ms)", "p99 (ms)", "QPS"],
+                tablefmt="grid",
+            )
+        )
+        if targetRecall is not None:
+            if chosen:
+                params = ", ".join(f"{k}:{v}" for k, v in chosen["params"].items())
+                click.echo(
+                    f"Cheapest setting with recall@{limit} >= {targetRecall}: {params} "
+                    f"(recall {chosen['recall']}, mean {chosen['mean_ms']} ms)"
+                )
+            else:
+                click.echo(f"No setting tried reached recall@{limit} >= {targetRecall}.")
+    if save and chosen:
+        click.echo(f"Saved as the default search params of {collectionName}.{annsField}.")
+    if reportPath:
+        write_json_atomic(reportPath, report)
+        click.echo(f"Report written to {reportPath}", err=True)
+
+
+HYBRID_METRICS = ("ndcg", "mrr", "recall")
+
+
+@tune.command("hybrid")
+@click.option("-c", "--collection-name", "collectionName", default=None, help="[Optional] - Collection name, default is the spec's collection.")
+@click.option("--spec", "specPath", required=True, help="Hybrid search spec (JSON), as for `hybrid_search --spec`.")
+@click.option("--queries", "queriesPath", required=True, help="JSON Lines file of queries with an id and a vector per field.")
+@click.option("--qrels", "qrelsPath", required=True, help="Relevance judgments: TREC qrels, .json or .jsonl.")
+@click.option("-k", "--limit", "limit", default=10, type=int, help="[Optional] - k of nDCG@k, MRR@k and recall@k, default is 10.")
+@click.option(
+    "--metric",
+    "metric",
+    default="ndcg",
+    type=click.Choice(HYBRID_METRICS),
+    help="[Optional] - Metric the recommended setting maximizes, default is ndcg.",
+)
+@click.option(
+    "--rrf-k",
+    "rrfKs",
+    default="10,20,40,60,100",
+    help="[Optional] - RRF k values to try (split by ','), default is 10,20,40,60,100.",
+)
+@click.option(
+    "--weight-step",
+    "weightStep",
+    default=0.1,
+    type=float,
+    help="[Optional] - Step of the weights tried for WeightedRanker, default is 0.1.",
+)
+@click.option(
+    "--fusion",
+    "fusions",
+    multiple=True,
+    help="[Optional] - Extra setting to try, e.g. 'combmnz:0.5,0.5'; repeatable.",
+)
+@click.option("--nq-batch", "nqBatch", default=100, type=int, help="[Optional] - Queries per search request, default is 100.")
+@click.option("--workers", "workers", default=1, type=int, help="[Optional] - Concurrent search requests, default is 1.")
+@click.option(
+    "--candidates",
+    "candidatesPath",
+    default=None,
+    help="[Optional] - .npz file the candidates are read from, or saved to when missing.",
+)
+@click.option("--top", "top", default=20, type=int, help="[Optional] - Settings listed in the table, default is 20.")
+@click.option(
+    "--format",
+    "reportFormat",
+    default="table",
+    type=click.Choice(["table", "json"]),
+    help="[Optional] - Report format, default is table.",
+)
+@click.option("--report", "reportPath", default=None, help="[Optional] - Also write the JSON report to this file.")
+@click.pass_obj
+def tune_hybrid(
+    obj,
+    collectionName,
+    specPath,
+    queriesPath,
+    qrelsPath,
+    limit,
+    metric,
+    rrfKs,
+    weightStep,
+    fusions,
+    nqBatch,
+    workers,
+    candidatesPath,
+    top,
+    reportFormat,
+    reportPath,
+):
+    """
+    Find the hybrid search ranker that best matches relevance judgments.
+
+    USAGE:
+        milvus_cli > tune hybrid --spec <spec.json> --queries <queries.jsonl> --qrels <qrels> [options]
+
+    OPTIONS:
+        -c, --collection-name    Collection (default: the spec's)
+        --spec                   Hybrid search spec, as for hybrid_search --spec
+        --queries                Queries with an "id" and a vector per field
+        --qrels                  Relevance judgments of the query ids
+        -k, --limit              k of nDCG@k, MRR@k and recall@k (default: 10)
+        --metric                 ndcg, mrr or recall to maximize (default: ndcg)
+        --rrf-k                  RRF k values to try (default: 10,20,40,60,100)
+        --weight-step            Step of the WeightedRanker weights (default: 0.1)
+        --fusion                 Extra local fusion setting, repeatable
+        --nq-batch               Queries per search request (default: 100)
+        --workers                Concurrent search requests (default: 1)
+        --candidates             Candidates file to reuse across runs
+        --top                    Settings listed in the table (default: 20)
+        --format                 Report format: table or json (default: table)
+        --report                 Also write the JSON report to a file
+
+    QRELS:
+        TREC qrels lines "query 0 key grade" (or "query key [grade]"), a
+        .json object {query: [keys] or {key: grade}}, or .jsonl lines
+        {"id": query, "relevant": [keys] or {key: grade}}. Grades are the
+        nDCG gains; keys without a grade count 1.
+
+    HOW IT WORKS:
+        Each request of the spec is searched once per batch of queries, at
+        the spec's per-request limits, and the candidate lists are kept.
+        Every RRF k and every weighting of the requests (summing to 1, in
+        --weight-step steps) is then applied locally, as hybrid_search
+        --local does, and scored against the judgments, so the sweep costs
+        no further search. The server rankers fuse the same candidate lists
+        the same way, so the recommended ranker can go straight into the
+        spec.
+
+    EXAMPLES:
+        milvus_cli > tune hybrid --spec hybrid.json --queries dev.jsonl --qrels dev.qrels -k 10
+
+        milvus_cli > tune hybrid --spec hybrid.json --queries dev.jsonl --qrels dev.qrels --candidates dev.npz --weight-step 0.05 --metric mrr
+
+    SEE ALSO:
+        hybrid_search, tune search
+    """
+    try:
+        if limit < 1 or nqBatch < 1 or workers < 1:
+            raise ParameterException("-k, --nq-batch and --workers should be positive.")
+        try:
+            ks = [int(k) for k in rrfKs.split(",") if k.strip()]
+        except ValueError:
+            raise ParameterException(f"Invalid RRF k values {rrfKs}.")
+        if any(k < 1 for k in ks):
+            raise ParameterException("RRF k values should be positive.")
+        spec, collectionName = loadHybridSpec(obj, collectionName, specPath)
+        requests = len(spec["requests"])
+        settings = fusion_grid(requests, ks, weightStep)
+        settings += [parse_fusion(text, requests) for text in fusions]
+        qrels = read_qrels(qrelsPath)
+        candidates = hybridCandidates(
+            obj, collectionName, spec, queriesPath, nqBatch, workers, candidatesPath
+        )
+        start = time.perf_counter()
+        rows = candidates.evaluate(settings, qrels, limit)
+        sweepSeconds = round(time.perf_counter() - start, 3)
+        for row, setting in zip(rows, settings):
+            row["ranker"] = setting
+        ranked = sorted(rows, key=lambda row: (-row[metric], -row["ndcg"], -row["mrr"]))
+        best = ranked[0]
+        judged = sum(1 for q in candidates.query_ids if qrels.get(str(q)))
+        report = {
+            "collection": collectionName,
+            "fields": [request["field"] for request in spec["requests"]],
+            "k": limit,
+            "metric": metric,
+            "queries": len(candidates.query_ids),
+            "judged_queries": judged,
+            "candidates": len(candidates),
+            "settings": len(rows),
+            "sweep_seconds": sweepSeconds,
+            "trials": ranked,
+            "best": best,
+        }
+    except Exception as e:
+        click.echo("Error!\n{}".format(str(e)), err=True)
+        return
+    if reportFormat == "json":
+        click.echo(json.dumps(report, indent=2))
+    else:
+        click.echo(
+            f"Scored {len(rows)} settings on {judged} judged queries in {sweepSeconds}s.",
+            err=True,
+        )
+        click.echo(
+            tabulate(
+                [
+                    [row["label"], row["ndcg"], row["mrr"], row["recall"]]
+                    for row in ranked[:top]
+                ],
+                headers=["Ranker", f"nDCG@{limit}", f"MRR@{limit}", f"Recall@{limit}"],
+                tablefmt="grid",
+            )
+        )
+        # CombMNZ has no server ranker, only rrf and weighted go into a spec
+        ranker = (
+            f"Spec ranker: {json.dumps(best['ranker'])}"
+            if best["ranker"]["type"] in RANKERS
+            else "Local fusion only, no server ranker matches it."
+        )
+        click.echo(f"Best {metric}@{limit}: {best['label']} ({best[metric]}). {ranker}")
+    if reportPath:
+        write_json_atomic(reportPath, report)
+        click.echo(f"Report written to {reportPath}", err=True)
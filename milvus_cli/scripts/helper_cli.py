@@ -14,6 +14,7 @@ from .helper_client_cli import (
     search,
     query,
     insert,
+    set_config,
 )
 import sys
 import click
@@ -145,42 +146,6 @@ def show_output_format(obj):
     """
     click.echo(f"Current output format: {obj.formatter.format}")
 
-@cli.group("set", no_args_is_help=False)
-@click.pass_obj
-def set_config(obj):
-    """Set CLI configuration options."""
-    pass
-
-@set_config.command("output")
-@click.argument("format", type=click.Choice(["table", "json", "csv"]))
-@click.pass_obj
-def set_output_format(obj, format):
-    """
-    Set the global output format for CLI results.
-
-    USAGE:
-        milvus_cli > set output <format>
-
-    ARGUMENTS:
-        format    Output format: table, json, or csv
-
-    FORMATS:
-        table    Display results in formatted ASCII tables (default)
-        json     Display results as JSON for scripting/parsing
-        csv      Display results as CSV for spreadsheet import
-
-    EXAMPLES:
-        milvus_cli > set output json
-        milvus_cli > set output table
-        milvus_cli > set output csv
-
-    NOTES:
-        - Setting persists for the current session only
-        - Default format is 'table'
-    """
-    obj.formatter.format = format
-    click.echo(f"Output format set to: {format}")
-
 @cli.group("alter", no_args_is_help=False)
 @click.pass_obj
 def alter(obj):
@@ -171,6 +171,120 @@ def set_output_format(obj, format):
     obj.formatter.format = format
     click.echo(f"Output format set to: {format}")
 
+@set_config.command("cache")
+@click.argument("state", type=click.Choice(["on", "off", "clear"]))
+@click.option(
+    "--max-mb",
+    "maxMb",
+    default=None,
+    type=float,
+    help="[Optional] - Most megabytes of results to hold, default is 64.",
+)
+@click.option(
+    "--ttl",
+    "ttl",
+    default=None,
+    type=float,
+    help="[Optional] - Seconds a result stays valid, default is 300.",
+)
+@click.pass_obj
+def set_cache(obj, state, maxMb, ttl):
+    """
+    Turn the query result cache on or off, or clear it.
+
+    USAGE:
+        milvus_cli > set cache <on|off|clear> [--max-mb <MB>] [--ttl <seconds>]
+
+    ARGUMENTS:
+        state    on, off, or clear to drop every cached result and the statistics
+
+    OPTIONS:
+        --max-mb    Most megabytes of results to hold (default: 64)
+        --ttl       Seconds a result stays valid (default: 300)
+
+    NOTES:
+        - query and get results are cached per collection, filter (or ids),
+          output fields, partitions and consistency level
+        - insert, upsert, delete, bulk_insert, truncate and drop issued from
+          the CLI drop the cached results of their collection; writes from
+          other clients are only seen once results expire
+        - Setting persists for the current session only
+
+    EXAMPLES:
+        milvus_cli > set cache on --max-mb 256 --ttl 600
+        milvus_cli > show cache
+        milvus_cli > set cache off
+    """
+    from ..QueryCache import query_cache
+
+    try:
+        if state == "clear":
+            query_cache.invalidate()
+            query_cache.reset_stats()
+            click.echo("Query cache cleared.")
+            return
+        query_cache.configure(
+            enabled=state == "on",
+            max_bytes=int(maxMb * 1024 * 1024) if maxMb is not None else None,
+            ttl=ttl,
+        )
+    except ParameterException as e:
+        click.echo(f"Error: {e}", err=True)
+        return
+    if query_cache.enabled:
+        click.echo(
+            f"Query cache on: {query_cache.max_bytes / 1024 / 1024:g} MB, "
+            f"results valid for {query_cache.ttl:g}s."
+        )
+    else:
+        click.echo("Query cache off.")
+
+@show.command("cache")
+@click.pass_obj
+def show_cache(obj):
+    """
+    Show query cache settings, size and hit rates per collection.
+
+    USAGE:
+        milvus_cli > show cache
+
+    SEE ALSO:
+        set cache
+    """
+    from tabulate import tabulate
+
+    from ..QueryCache import query_cache
+
+    summary = query_cache.summary()
+    click.echo(
+        f"Query cache {'on' if summary['enabled'] else 'off'}: "
+        f"{summary['entries']} results, {summary['bytes'] / 1024 / 1024:.2f} of "
+        f"{summary['max_bytes'] / 1024 / 1024:g} MB, TTL {summary['ttl']:g}s"
+    )
+    click.echo(
+        f"Hits {summary['hits']}, misses {summary['misses']}, hit rate "
+        f"{summary['hit_rate']:.1%}, evictions {summary['evictions']}, "
+        f"expired {summary['expired']}, invalidated {summary['invalidations']}"
+    )
+    if summary["collections"]:
+        click.echo(
+            tabulate(
+                [
+                    [
+                        row["collection"],
+                        row["entries"],
+                        f"{row['bytes'] / 1024:.1f}",
+                        row["hits"],
+                        row["misses"],
+                        f"{row['hit_rate']:.1%}",
+                    ]
+                    for row in summary["collections"]
+                ],
+                headers=["Collection", "Results", "KB", "Hits", "Misses", "Hit rate"],
+                tablefmt="grid",
+            )
+        )
+
 @cli.group("list", no_args_is_help=False)
 @click.pass_obj
 def getList(obj):
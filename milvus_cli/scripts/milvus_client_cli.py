@@ -16,6 +16,8 @@ from . import partition_client_cli as _partition_client_cli  # noqa: F401
 from . import role_client_cli as _role_client_cli  # noqa: F401
 from . import resource_group_cli as _resource_group_cli  # noqa: F401
 from . import privilege_group_cli as _privilege_group_cli  # noqa: F401
+from . import bench_client_cli as _bench_client_cli  # noqa: F401
+from . import eval_client_cli as _eval_client_cli  # noqa: F401
 
 from .helper_client_cli import cli, runCliPrompt  # noqa: F401
 
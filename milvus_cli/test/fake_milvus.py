@@ -0,0 +1,89 @@
+"""In-memory stand-ins for MilvusClient, for the tests that need no Milvus."""
+
+
+class Pages:
+    """A query_iterator over fixed pages."""
+
+    def __init__(self, pages):
+        self.pages = iter(pages)
+        self.closed = False
+
+    def next(self):
+        return next(self.pages, [])
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClient:
+    """
+    MilvusClient over in-memory entities with an INT64 primary key ``id``.
+
+    Filters are evaluated as Python expressions over each entity, which
+    covers the comparisons, ``in`` lists and ``and``/``or`` the tests use.
+    Like Milvus, queries return entities in primary key order. Every call
+    is recorded in ``calls`` as a (method, keyword arguments) pair.
+    """
+
+    def __init__(self, rows=None, size=0):
+        self.rows = list(rows) if rows is not None else [{"id": i} for i in range(size)]
+        self.calls = []
+
+    def called(self, method):
+        return [kwargs for name, kwargs in self.calls if name == method]
+
+    def describe_collection(self, collection_name, **kwargs):
+        return {
+            "collection_name": collection_name,
+            "fields": [{"name": "id", "type": 5, "is_primary": True}],
+        }
+
+    def matching(self, filter=""):
+        if filter:
+            code = compile(filter, "<filter>", "eval")
+            rows = [row for row in self.rows if eval(code, {}, dict(row))]
+        else:
+            rows = list(self.rows)
+        return sorted(rows, key=lambda row: row["id"])
+
+    def _project(self, rows, output_fields):
+        if not output_fields or "*" in output_fields:
+            return [dict(row) for row in rows]
+        return [{k: row[k] for k in ["id", *output_fields] if k in row} for row in rows]
+
+    def query(self, collection_name, filter="", output_fields=None, limit=None, offset=0, **kwargs):
+        self.calls.append(
+            ("query", dict(kwargs, filter=filter, output_fields=output_fields, limit=limit, offset=offset))
+        )
+        rows = self.matching(filter)
+        if output_fields == ["count(*)"]:
+            return [{"count(*)": len(rows)}]
+        rows = rows[offset:]
+        return self._project(rows[:limit] if limit else rows, output_fields)
+
+    def query_iterator(self, collection_name, batch_size=1000, limit=-1, filter="", output_fields=None, **kwargs):
+        self.calls.append(("query_iterator", dict(kwargs, filter=filter, output_fields=output_fields)))
+        rows = self._project(self.matching(filter), output_fields)
+        if limit is not None and limit >= 0:
+            rows = rows[:limit]
+        self.iterator = Pages(rows[n : n + batch_size] for n in range(0, len(rows), batch_size))
+        return self.iterator
+
+    def insert(self, collection_name, data, **kwargs):
+        self.calls.append(("insert", kwargs))
+        self.rows.extend(data)
+        return {"insert_count": len(data)}
+
+    def delete(self, collection_name, ids=None, filter=None, **kwargs):
+        self.calls.append(("delete", dict(kwargs, ids=ids, filter=filter)))
+        doomed = {row["id"] for row in self.matching(filter)} if ids is None else set(ids)
+        self.rows = [row for row in self.rows if row["id"] not in doomed]
+        return {"delete_count": len(doomed)}
+
+
+class Connection:
+    def __init__(self, client):
+        self.client = client
+
+    def get_client(self):
+        return self.client
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Bench import LatencyHistogram, SearchBench, format_bench_report
+from Types import ParameterException
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles(self):
+        """Test percentiles stay within the histogram precision"""
+        histogram = LatencyHistogram()
+        for ms in range(1, 1001):
+            histogram.record(ms / 1000)
+        self.assertEqual(histogram.total, 1000)
+        for percent, expected in ((50, 0.5), (90, 0.9), (99, 0.99), (99.9, 0.999)):
+            self.assertAlmostEqual(histogram.percentile(percent), expected, delta=expected * 1e-3)
+        self.assertAlmostEqual(histogram.percentile(100), 1.0)
+
+    def test_wide_range(self):
+        """Test small and large values are both kept to three digits"""
+        histogram = LatencyHistogram()
+        histogram.record(0.000123)
+        histogram.record(12.345)
+        self.assertAlmostEqual(histogram.percentile(50), 0.000123, delta=1e-6)
+        self.assertAlmostEqual(histogram.percentile(100), 12.345, delta=12.345e-3)
+
+    def test_merge(self):
+        """Test merged histograms count every value"""
+        first, second = LatencyHistogram(), LatencyHistogram()
+        for ms in range(1, 51):
+            first.record(ms / 1000)
+        for ms in range(51, 101):
+            second.record(ms / 1000)
+        first.merge(second)
+        self.assertEqual(first.total, 100)
+        self.assertAlmostEqual(first.percentile(50), 0.05, delta=5e-5)
+        summary = first.summary()
+        self.assertEqual(summary["min_ms"], 1.0)
+        self.assertEqual(summary["max_ms"], 100.0)
+        self.assertEqual(
+            list(summary),
+            ["min_ms", "mean_ms", "p50_ms", "p90_ms", "p99_ms", "p999_ms", "max_ms"],
+        )
+        with self.assertRaises(ValueError):
+            first.merge(LatencyHistogram(significant_digits=2))
+
+    def test_empty(self):
+        """Test an empty histogram reports zeros"""
+        summary = LatencyHistogram().summary()
+        self.assertEqual(summary["p99_ms"], 0.0)
+        self.assertEqual(summary["mean_ms"], 0.0)
+
+
+class TestSearchBench(unittest.TestCase):
+    def setUp(self):
+        self.queries = np.arange(20, dtype=np.float32).reshape(10, 2)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def search(self, vectors):
+        with self.lock:
+            self.calls.append(len(vectors))
+        time.sleep(0.001)
+        return [[] for _ in vectors]
+
+    def test_count(self):
+        """Test a counted run sends exactly that many requests of nq vectors"""
+        bench = SearchBench(self.search, self.queries, nq=3, concurrency=4)
+        report = bench.run(count=25)
+        self.assertEqual(report["requests"], 25)
+        self.assertEqual(report["queries"], 75)
+        self.assertEqual(self.calls, [3] * 25)
+        self.assertEqual(report["errors"], 0)
+        self.assertGreater(report["latency"]["p50_ms"], 0)
+        self.assertIn("p999", format_bench_report(report))
+
+    def test_batches_wrap_around(self):
+        """Test query batches wrap around the end of the queries"""
+        bench = SearchBench(self.search, self.queries, nq=4)
+        batch = bench._batch(2)
+        self.assertEqual(len(batch), 4)
+        self.assertEqual([float(v[0]) for v in batch], [16.0, 18.0, 0.0, 2.0])
+
+    def test_qps_schedule(self):
+        """Test an open-loop run keeps to the target rate"""
+        bench = SearchBench(self.search, self.queries, concurrency=2, qps=100)
+        report = bench.run(count=20)
+        self.assertEqual(report["requests"], 20)
+        # 20 requests due over 0.19s at 100 requests/s
+        self.assertGreaterEqual(report["seconds"], 0.19)
+        self.assertEqual(report["target_qps"], 100)
+
+    def test_warmup_not_measured(self):
+        """Test warm-up requests are sent but not measured"""
+        bench = SearchBench(self.search, self.queries, concurrency=2)
+        report = bench.run(count=5, warmup=0.05)
+        self.assertEqual(report["requests"], 5)
+        self.assertGreater(len(self.calls), 5)
+
+    def test_errors(self):
+        """Test failed requests are counted and not measured"""
+
+        def failing(vectors):
+            raise RuntimeError("boom")
+
+        report = SearchBench(failing, self.queries).run(count=3)
+        self.assertEqual(report["errors"], 3)
+        self.assertEqual(report["requests"], 0)
+        self.assertEqual(report["first_error"], "boom")
+
+    def test_invalid(self):
+        """Test invalid settings are rejected"""
+        with self.assertRaises(ParameterException):
+            SearchBench(self.search, [])
+        with self.assertRaises(ParameterException):
+            SearchBench(self.search, self.queries, concurrency=0)
+        with self.assertRaises(ParameterException):
+            SearchBench(self.search, self.queries, qps=0)
+        with self.assertRaises(ParameterException):
+            SearchBench(self.search, self.queries).run()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Checkpoint import DeleteCheckpoint, ExportCheckpoint, IngestCheckpoint, write_json_atomic
+from Types import ParameterException
+
+
+class TestIngestCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.tmpdir.name, "rows.csv")
+        with open(self.source, "w") as f:
+            f.write("id\n1\n2\n3\n")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_write_json_atomic(self):
+        """Test the file is replaced whole and no temporary file is left"""
+        path = os.path.join(self.tmpdir.name, "state.json")
+        write_json_atomic(path, {"a": 1})
+        write_json_atomic(path, {"a": 2})
+        with open(path) as f:
+            self.assertEqual(json.load(f), {"a": 2})
+        self.assertEqual(sorted(os.listdir(self.tmpdir.name)), ["rows.csv", "state.json"])
+
+    def test_commit_and_load(self):
+        """Test committed progress is restored by a new checkpoint"""
+        checkpoint = IngestCheckpoint(self.source, "c1")
+        self.assertEqual(checkpoint.load()["rows"], 0)
+        checkpoint.commit({"row_offset": 2, "offset": 7})
+        state = IngestCheckpoint(self.source, "c1").load()
+        self.assertEqual((state["rows"], state["offset"], state["batches"]), (2, 7, 1))
+        self.assertFalse(state["completed"])
+        checkpoint.complete()
+        self.assertTrue(IngestCheckpoint(self.source, "c1").load()["completed"])
+
+    def test_changed_source(self):
+        """Test a checkpoint is rejected once the source file changes"""
+        IngestCheckpoint(self.source, "c1").commit({"row_offset": 1, "offset": 5})
+        with open(self.source, "a") as f:
+            f.write("4\n")
+        with self.assertRaises(ParameterException):
+            IngestCheckpoint(self.source, "c1").load()
+
+    def test_other_target(self):
+        """Test a checkpoint is rejected for another collection or action"""
+        IngestCheckpoint(self.source, "c1").commit({"row_offset": 1, "offset": 5})
+        with self.assertRaises(ParameterException):
+            IngestCheckpoint(self.source, "c2").load()
+        with self.assertRaises(ParameterException):
+            IngestCheckpoint(self.source, "c1", action="upsert").load()
+
+    def test_other_source(self):
+        """Test a checkpoint is rejected for another file of the same size and mtime"""
+        path = os.path.join(self.tmpdir.name, "state.json")
+        IngestCheckpoint(self.source, "c1", path=path).commit({"row_offset": 1, "offset": 5})
+        other = os.path.join(self.tmpdir.name, "copy.csv")
+        with open(other, "w") as f:
+            f.write("id\n7\n8\n9\n")
+        stat = os.stat(self.source)
+        os.utime(other, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with self.assertRaises(ParameterException):
+            IngestCheckpoint(other, "c1", path=path).load()
+
+    def test_missing_source(self):
+        """Test a missing source file is rejected"""
+        with self.assertRaises(ParameterException):
+            IngestCheckpoint(os.path.join(self.tmpdir.name, "missing.csv"), "c1")
+
+
+class TestExportCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.output = os.path.join(self.tmpdir.name, "out.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip(self):
+        """Test committed progress is loaded by the same export"""
+        checkpoint = ExportCheckpoint(self.output, "c1", "id > 0", ["*"], "jsonl")
+        checkpoint.commit(1000, 999, 48000)
+        state = ExportCheckpoint(self.output, "c1", "id > 0", ["*"], "jsonl").load()
+        self.assertEqual((state["rows"], state["last_pk"], state["offset"]), (1000, 999, 48000))
+        self.assertFalse(state["completed"])
+        checkpoint.complete()
+        self.assertTrue(ExportCheckpoint(self.output, "c1", "id > 0", ["*"], "jsonl").load()["completed"])
+
+    def test_other_export_rejected(self):
+        """Test a checkpoint is not resumed by a different export"""
+        ExportCheckpoint(self.output, "c1", "", ["*"], "jsonl").commit(10, "k9", 100)
+        for args in (("c2", "", ["*"], "jsonl"), ("c1", "id > 5", ["*"], "jsonl"), ("c1", "", ["id"], "jsonl")):
+            with self.assertRaises(ParameterException):
+                ExportCheckpoint(self.output, *args).load()
+
+
+class TestDeleteCheckpoint(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "delete.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_other_delete_rejected(self):
+        """Test a checkpoint is not resumed by a different delete"""
+        DeleteCheckpoint("c1", "id > 0", None, self.path).commit([1, 2, 3])
+        state = DeleteCheckpoint("c1", "id > 0", None, self.path).load()
+        self.assertEqual((state["ids"], state["last_pk"], state["batches"]), (3, 3, 1))
+        for args in (("c2", "id > 0", None), ("c1", "id > 5", None), ("c1", "id > 0", "p1")):
+            with self.assertRaises(ParameterException):
+                DeleteCheckpoint(*args, path=self.path).load()
+
+
+if __name__ == "__main__":
+    unittest.main()
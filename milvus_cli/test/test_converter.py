@@ -0,0 +1,170 @@
+import unittest
+import sys
+import os
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Converter import (
+    column_converter,
+    parse_float_vectors,
+    field_type_name,
+    CompiledSchema,
+    ColumnBatch,
+    SchemaCache,
+)
+from Fs import iterCsvBatches
+
+
+class TestColumnConverters(unittest.TestCase):
+    def test_float_vectors(self):
+        """Test vector cells are parsed into one contiguous float32 array"""
+        vectors = parse_float_vectors(["[1, 2.5]", " [-3e-1,4] "], 2)
+        self.assertEqual(vectors.dtype, np.float32)
+        self.assertEqual(vectors.shape, (2, 2))
+        np.testing.assert_allclose(vectors, [[1, 2.5], [-0.3, 4]], rtol=1e-6)
+        with self.assertRaises(ValueError):
+            parse_float_vectors(["[1, 2]", "[3]"], 2)
+        with self.assertRaises(ValueError):
+            parse_float_vectors(["[1, x]"], 2)
+
+    def test_vector_fallback(self):
+        """Test odd vector cells fall back to JSON decoding"""
+        convert = column_converter({"name": "v", "type": 101, "params": {"dim": 2}})
+        column = convert(["[1, 2]", "[3, 4]"])
+        self.assertIsInstance(column[0], np.ndarray)
+        self.assertEqual(column[1].tolist(), [3, 4])
+        self.assertEqual(convert(["[1, 2]", "[3]"]), [[1, 2], [3]])
+
+    def test_scalars(self):
+        """Test typed scalar parsing and its JSON fallback"""
+        ints = column_converter({"type": 5})(["1", "-2"])
+        self.assertEqual(ints.dtype, np.int64)
+        self.assertEqual(ints.tolist(), [1, -2])
+        self.assertEqual(column_converter({"type": 5})(["1", "2.0"]), [1, 2.0])
+        self.assertEqual(column_converter({"type": 2})(["1", "300"]), [1, 300])
+        self.assertEqual(column_converter({"type": 11})(["1.5", "2"]).tolist(), [1.5, 2.0])
+        self.assertEqual(
+            column_converter({"type": 1})(["true", "false"]).tolist(), [True, False]
+        )
+        self.assertEqual(
+            column_converter({"type": 21})(['"a b"', '"c\\"d"']), ["a b", 'c"d']
+        )
+        self.assertIsNone(column_converter({"type": 23}))
+        self.assertIsNone(column_converter({"type": 101, "params": {}}))
+
+    def test_type_names(self):
+        """Test enum and numeric field types are recognised"""
+        from pymilvus import DataType
+
+        self.assertEqual(field_type_name({"type": DataType.FLOAT_VECTOR}), "FLOAT_VECTOR")
+        self.assertEqual(field_type_name({"type": 21}), "VARCHAR")
+        self.assertEqual(field_type_name({}), "UNKNOWN")
+
+    def test_csv_batches(self):
+        """Test the csv reader applies converters per batch column"""
+        lines = [b"id,vec,meta\n", b'1,"[1, 2]","{""a"": 1}"\n', b'2,"[3, 4]",null\n']
+        total = sum(len(line) for line in lines)
+        converters = [
+            column_converter({"type": 5}),
+            column_converter({"type": 101, "params": {"dim": 2}}),
+            None,
+        ]
+        (batch,) = list(iterCsvBatches(iter(lines), total, converters=converters))
+        ids, vectors, meta = batch["data"]
+        self.assertEqual(ids.tolist(), [1, 2])
+        self.assertEqual(vectors.shape, (2, 2))
+        self.assertEqual(vectors[1].tolist(), [3, 4])
+        self.assertEqual(meta, [{"a": 1}, None])
+
+
+class DescribeCounter:
+    """Client stub returning a fixed schema and counting describe calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def describe_collection(self, collection_name):
+        self.calls += 1
+        return {
+            "fields": [
+                {"name": "pk", "type": 5, "auto_id": True},
+                {"name": "title", "type": 21},
+                {"name": "vec", "type": 101, "params": {"dim": 2}},
+            ],
+            "update_timestamp": 7,
+        }
+
+
+class TestCompiledSchema(unittest.TestCase):
+    def test_compiled_fields(self):
+        """Test auto_id fields are excluded and vector dims recorded"""
+        schema = CompiledSchema(DescribeCounter().describe_collection("c"))
+        self.assertEqual(schema.field_names, ["title", "vec"])
+        self.assertEqual(schema.dims, {"vec": 2})
+        self.assertEqual(len(schema.converters), 2)
+        self.assertEqual(schema.version, (None, 7))
+
+    def test_batch(self):
+        """Test column-major data is paired with field names row by row"""
+        schema = CompiledSchema(DescribeCounter().describe_collection("c"))
+        rows = schema.batch([["a", "b"], [[1, 2], [3, 4]]]).to_rows()
+        self.assertEqual(rows, [{"title": "a", "vec": [1, 2]}, {"title": "b", "vec": [3, 4]}])
+        self.assertEqual(schema.batch([["a"]], ["other"]).to_rows(), [{"other": "a"}])
+
+
+class TestColumnBatch(unittest.TestCase):
+    def test_numpy_columns(self):
+        """Test NumPy columns are only turned into Python values per row"""
+        vectors = np.arange(6, dtype=np.float32).reshape(3, 2)
+        batch = ColumnBatch(
+            ["id", "flag", "vec", "meta"],
+            [np.arange(3), np.array([True, False, True]), vectors, [None, {"a": 1}, 2]],
+        )
+        self.assertEqual(len(batch), 3)
+        self.assertEqual(batch.nbytes, 3 * 8 + 3 + vectors.nbytes)
+        rows = batch.to_rows()
+        self.assertEqual(rows[1]["id"], 1)
+        self.assertIs(type(rows[1]["id"]), int)
+        self.assertIs(rows[1]["flag"], False)
+        self.assertEqual(rows[2]["vec"].tolist(), [4, 5])
+        self.assertTrue(np.shares_memory(rows[2]["vec"], vectors))
+        self.assertEqual(rows[1]["meta"], {"a": 1})
+        self.assertEqual(len(ColumnBatch([], [])), 0)
+
+    def test_cache(self):
+        """Test schemas are described once per client until invalidated"""
+        cache = SchemaCache()
+        client, other = DescribeCounter(), DescribeCounter()
+        first = cache.get(client, "c")
+        self.assertIs(cache.get(client, "c"), first)
+        self.assertEqual(client.calls, 1)
+        cache.get(other, "c")
+        self.assertEqual(other.calls, 1)
+        cache.invalidate("c")
+        self.assertIsNot(cache.get(client, "c"), first)
+        self.assertEqual(client.calls, 2)
+        cache.invalidate()
+        cache.get(other, "c")
+        self.assertEqual(other.calls, 2)
+
+    def test_revalidate(self):
+        """Test a revalidated schema is only recompiled once its version changes"""
+        cache = SchemaCache()
+        client = DescribeCounter()
+        first = cache.get(client, "c")
+        self.assertIs(cache.get(client, "c", revalidate=True), first)
+        self.assertEqual(client.calls, 2)
+        describe = client.describe_collection
+        client.describe_collection = lambda collection_name: dict(
+            describe(collection_name), update_timestamp=8
+        )
+        changed = cache.get(client, "c", revalidate=True)
+        self.assertIsNot(changed, first)
+        self.assertIs(cache.get(client, "c"), changed)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 import unittest
 import sys
 import os
+import tempfile
 
 current_dir = os.path.dirname(os.path.realpath(__file__))
 parent_dir = os.path.dirname(current_dir)
@@ -10,6 +11,9 @@ from ConnectionClient import MilvusClientConnection
 from CollectionClient import MilvusClientCollection
 from IndexClient import MilvusClientIndex
 from DataClient import MilvusClientData
+from Checkpoint import DeleteCheckpoint
+from Types import ParameterException
+from fake_milvus import Connection, FakeClient
 from pymilvus import FieldSchema, DataType
 from test_config import test_config
 
@@ -131,6 +135,18 @@ class TestDataClient(unittest.TestCase):
         # Verify insert result
         self.assertIsNotNone(result)
 
+    def test_insert_batches(self):
+        """Test inserting a stream of column-major batches"""
+        batches = [
+            {"data": [["b1", "b2"], ["batch title1", "batch title2"], [[1, 1, 1, 1], [2, 2, 2, 2]]]},
+            {"data": [["b3"], ["batch title3"], [[3, 3, 3, 3]]]},
+        ]
+
+        result = milvusData.insert_batches(collectionName, iter(batches))
+
+        self.assertEqual(result["insert_count"], 3)
+        self.assertEqual(result["batches"], 2)
+
     def test_query(self):
         """Test querying data"""
         queryParameters = {
@@ -318,5 +334,46 @@ class TestDataClient(unittest.TestCase):
         self.assertIn("error", str(context.exception).lower())
 
 
+
+class FailingDeletes(FakeClient):
+    """FakeClient failing its ``fail_at``-th delete."""
+
+    def __init__(self, fail_at=None, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_at = fail_at
+
+    def delete(self, collection_name, ids=None, filter=None, **kwargs):
+        if len(self.called("delete")) + 1 == self.fail_at:
+            self.calls.append(("delete", kwargs))
+            raise ParameterException("stop")
+        return super().delete(collection_name, ids, filter, **kwargs)
+
+
+class TestDeleteMatching(unittest.TestCase):
+    """delete_matching against an in-memory client; no Milvus required."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "delete.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resume_chunked_delete(self):
+        """Test an interrupted chunked delete continues after its last committed chunk"""
+        client = FailingDeletes(fail_at=3, size=100)
+        data = MilvusClientData(Connection(client))
+        checkpoint = DeleteCheckpoint("c1", "id % 2 == 0", None, self.path)
+        with self.assertRaises(ParameterException):
+            data.delete_matching("c1", "id % 2 == 0", batchSize=10, on_commit=checkpoint.commit)
+        state = DeleteCheckpoint("c1", "id % 2 == 0", None, self.path).load()
+        self.assertEqual((state["ids"], state["last_pk"]), (20, 38))
+        stats = data.delete_matching(
+            "c1", "id % 2 == 0", batchSize=10, start_after=state["last_pk"], rate=10000
+        )
+        self.assertEqual((stats["ids"], stats["delete_count"]), (30, 30))
+        self.assertEqual([row["id"] for row in client.rows], list(range(1, 100, 2)))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,351 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import re
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+from Export import (
+    ExportWriter,
+    export_format,
+    export_parallel,
+    export_search,
+    manifest_path,
+    merge_shards,
+    middle_key,
+    pk_ranges,
+    range_filter,
+    resume_filter,
+)
+from DataClient import MilvusClientData
+from Types import ParameterException
+from fake_milvus import Connection, FakeClient
+
+
+def page(start, stop):
+    return [
+        {"id": i, "vec": np.array([i, 0.5], dtype=np.float32), "meta": {"n": i}}
+        for i in range(start, stop)
+    ]
+
+
+class TestExportHelpers(unittest.TestCase):
+    def test_export_format(self):
+        """Test the format comes from the flag, the extension or stdout"""
+        self.assertEqual(export_format("a.parquet"), "parquet")
+        self.assertEqual(export_format("a.CSV"), "csv")
+        self.assertEqual(export_format(None), "jsonl")
+        self.assertEqual(export_format("a.txt", "csv"), "csv")
+        with self.assertRaises(ParameterException):
+            export_format("a.txt")
+
+    def test_resume_filter(self):
+        """Test the resume cursor is added to the filter"""
+        self.assertEqual(resume_filter("", "id", "INT64", 41), "id > 41")
+        self.assertEqual(resume_filter("a == 1", "id", "INT64", 41), "(a == 1) and id > 41")
+        self.assertEqual(resume_filter("", "pk", "VARCHAR", 'x"y'), 'pk > "x\\"y"')
+
+    def test_range_filter(self):
+        """Test a primary-key range is added to the filter"""
+        self.assertEqual(range_filter("", "id", "INT64"), "")
+        self.assertEqual(range_filter("a == 1", "id", "INT64", high=9), "(a == 1) and id <= 9")
+        self.assertEqual(range_filter("", "id", "INT64", 3, 9), "id > 3 and id <= 9")
+
+    def test_pk_ranges(self):
+        """Test boundaries split the keys into disjoint covering ranges"""
+        self.assertEqual(
+            pk_ranges([26, 51, 76]), [(None, 26), (26, 51), (51, 76), (76, None)]
+        )
+        self.assertEqual(pk_ranges([]), [(None, None)])
+
+    def test_middle_key(self):
+        """Test middle keys fall strictly between their ends in key order"""
+        self.assertEqual(middle_key("INT64", 10, 20), 15)
+        self.assertEqual(middle_key("INT64"), -1)
+        for low, high in [("a", "b"), ("doc-1", "doc-2"), (None, "a"), ("z", None), ("ab", "ab\u00e9")]:
+            middle = middle_key("VARCHAR", low, high)
+            self.assertTrue(low is None or low < middle, (low, middle))
+            self.assertTrue(high is None or middle < high, (middle, high))
+            self.assertFalse(0xD800 <= max(map(ord, middle)) < 0xE000)
+
+
+class TestExportWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_jsonl_resume_truncates(self):
+        """Test a resumed JSON Lines export drops rows past the checkpoint"""
+        path = self.path("out.jsonl")
+        with ExportWriter(path, "jsonl") as writer:
+            writer.write(page(0, 3))
+            offset = writer.tell()
+            # Written after the last checkpoint, then interrupted
+            writer.write(page(3, 5))
+        with ExportWriter(path, "jsonl", resume_offset=offset) as writer:
+            writer.write(page(3, 6))
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual([row["id"] for row in rows], list(range(6)))
+        self.assertEqual(rows[1]["vec"], [1.0, 0.5])
+        self.assertEqual(rows[1]["meta"], {"n": 1})
+
+    def test_csv_columns_from_first_row(self):
+        """Test csv keeps the first row's columns, leaving missing ones empty and dropping extras"""
+        path = self.path("hits.csv")
+        with ExportWriter(path, "csv") as writer:
+            writer.write([{"query": 0, "id": 1, "vec": np.array([1.5, 2], dtype=np.float32)}])
+            writer.write([{"query": 1, "vec": [3], "extra": "x"}])
+        self.assertEqual(writer.rows, 2)
+        with open(path, newline="") as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows, [["query", "id", "vec"], ["0", "1", "[1.5, 2.0]"], ["1", "", "[3]"]])
+
+    def test_csv_resume_keeps_header(self):
+        """Test a resumed csv export reuses the header of the file"""
+        path = self.path("out.csv")
+        with ExportWriter(path, "csv") as writer:
+            writer.write(page(0, 2))
+            offset = writer.tell()
+        with ExportWriter(path, "csv", resume_offset=offset) as writer:
+            writer.write([{"meta": {"n": 2}, "id": 2, "vec": [2.0, 0.5]}])
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row["id"] for row in rows], ["0", "1", "2"])
+        self.assertEqual(json.loads(rows[2]["vec"]), [2.0, 0.5])
+
+    def test_parquet_resume_copies_row_groups(self):
+        """Test a resumed Parquet export keeps the rows of the closed file"""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        path = self.path("out.parquet")
+        with ExportWriter(path, "parquet") as writer:
+            writer.write(page(0, 3))
+        with ExportWriter(path, "parquet", resume_offset=0) as writer:
+            writer.write(page(3, 5))
+        table = pq.read_table(path)
+        self.assertEqual(table.column("id").to_pylist(), list(range(5)))
+        self.assertEqual(pq.ParquetFile(path).num_row_groups, 2)
+        self.assertEqual(table.column("meta").to_pylist()[0], '{"n": 0}')
+
+    def test_resume_needs_the_output(self):
+        """Test a missing or shorter output is not resumed in any format"""
+        with self.assertRaises(ParameterException):
+            ExportWriter(self.path("gone.jsonl"), "jsonl", resume_offset=100)
+        path = self.path("short.csv")
+        with ExportWriter(path, "csv") as writer:
+            writer.write(page(0, 2))
+        with self.assertRaises(ParameterException):
+            ExportWriter(path, "csv", resume_offset=os.path.getsize(path) + 1)
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            return
+        with self.assertRaises(ParameterException):
+            ExportWriter(self.path("gone.parquet"), "parquet", resume_offset=0, resume_rows=3)
+        path = self.path("out.parquet")
+        with ExportWriter(path, "parquet") as writer:
+            writer.write(page(0, 3))
+        with self.assertRaises(ParameterException):
+            ExportWriter(path, "parquet", resume_offset=0, resume_rows=5)
+
+    def test_parquet_needs_clean_file(self):
+        """Test an unreadable Parquet file is not resumed"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        path = self.path("broken.parquet")
+        with open(path, "wb") as f:
+            f.write(b"PAR1 not a footer")
+        with self.assertRaises(ParameterException):
+            ExportWriter(path, "parquet", resume_offset=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class FakeData:
+    """query_pages over ids 0..n-1 honouring the range filters of the export."""
+
+    def __init__(self, n, fail_above=None):
+        self.ids = list(range(n))
+        self.fail_above = fail_above
+
+    def primary_key(self, collectionName):
+        return "id", "INT64"
+
+    def split_primary_keys(self, collectionName, expr="", parts=2):
+        return [self.ids[part * len(self.ids) // parts - 1] for part in range(1, parts)]
+
+    def query_pages(self, collectionName, expr, outputFields, batchSize, limit=None):
+        # A resumed range adds a second lower bound
+        lows = [int(v) for v in re.findall(r"id > (\d+)", expr)]
+        highs = [int(v) for v in re.findall(r"id <= (\d+)", expr)]
+        ids = [i for i in self.ids if all(i > v for v in lows) and all(i <= v for v in highs)]
+        for start in range(0, len(ids), batchSize):
+            if self.fail_above is not None and ids[start] > self.fail_above:
+                raise RuntimeError("connection lost")
+            yield page(ids[start], ids[min(start + batchSize, len(ids)) - 1] + 1)
+
+
+class TestParallelExport(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.out = os.path.join(self.tmpdir.name, "out.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def read_ids(self, path):
+        with open(path) as f:
+            return [json.loads(line)["id"] for line in f]
+
+    def test_shards_cover_every_key_once(self):
+        """Test the shards hold disjoint ranges that merge into the whole export"""
+        manifest = export_parallel(FakeData(100), "c", self.out, "jsonl", batchSize=7, parallel=4)
+        self.assertEqual(len(manifest["shards"]), 4)
+        self.assertEqual(manifest["rows"], 100)
+        self.assertTrue(manifest["completed"])
+        with open(manifest_path(self.out)) as f:
+            self.assertEqual(json.load(f)["rows"], 100)
+        self.assertEqual(merge_shards(manifest, self.tmpdir.name, self.out), 100)
+        self.assertEqual(self.read_ids(self.out), list(range(100)))
+
+    def test_resume_reuses_manifest(self):
+        """Test a resumed parallel export only continues the unfinished shards"""
+        with self.assertRaises(RuntimeError):
+            export_parallel(
+                FakeData(100, fail_above=60), "c", self.out, "jsonl", batchSize=5, parallel=4
+            )
+        resumed = []
+        manifest = export_parallel(
+            FakeData(100), "c", self.out, "jsonl", batchSize=5, parallel=4, resume=True,
+            on_rows=lambda count, was_resumed: resumed.append(count) if was_resumed else None,
+        )
+        self.assertEqual(manifest["rows"], 100)
+        self.assertTrue(resumed)
+        merge_shards(manifest, self.tmpdir.name, self.out)
+        self.assertEqual(self.read_ids(self.out), list(range(100)))
+
+    def test_resume_rejects_other_filter(self):
+        """Test a manifest is not resumed with a different filter"""
+        export_parallel(FakeData(10), "c", self.out, "jsonl", parallel=2)
+        with self.assertRaises(ParameterException):
+            export_parallel(FakeData(10), "c", self.out, "jsonl", "id > 3", parallel=2, resume=True)
+
+    def test_resume_rejects_other_fields(self):
+        """Test a manifest is not resumed with different output fields"""
+        export_parallel(FakeData(10), "c", self.out, "jsonl", outputFields=["id"], parallel=2)
+        with self.assertRaises(ParameterException):
+            export_parallel(
+                FakeData(10), "c", self.out, "jsonl", outputFields=["id", "vec"], parallel=2, resume=True
+            )
+
+    def test_merge_csv_keeps_one_header(self):
+        """Test merged csv shards keep the header of the first shard only"""
+        out = os.path.join(self.tmpdir.name, "out.csv")
+        manifest = export_parallel(FakeData(20), "c", out, "csv", batchSize=4, parallel=3)
+        merge_shards(manifest, self.tmpdir.name, out)
+        with open(out, newline="") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([int(row["id"]) for row in rows], list(range(20)))
+
+
+class VarcharKeys(FakeClient):
+    def describe_collection(self, collection_name, **kwargs):
+        return {"collection_name": collection_name, "fields": [{"name": "id", "type": 21, "is_primary": True}]}
+
+
+class TestKeySplit(unittest.TestCase):
+    def split(self, client, parts, expr=""):
+        return MilvusClientData(Connection(client)).split_primary_keys("c", expr, parts, window=10)
+
+    def shard_sizes(self, client, boundaries):
+        ids = [row["id"] for row in client.rows]
+        return [
+            sum(1 for i in ids if (low is None or i > low) and (high is None or i <= high))
+            for low, high in pk_ranges(boundaries)
+        ]
+
+    def test_skewed_int_keys_balanced(self):
+        """Test a few outlying INT64 keys do not pull every row into one range"""
+        keys = list(range(200)) + [2**62 + i for i in range(4)]
+        client = FakeClient(rows=[{"id": i} for i in keys])
+        boundaries = self.split(client, 4)
+        self.assertEqual(boundaries, [50, 101, 152])
+        self.assertEqual(self.shard_sizes(client, boundaries), [51, 51, 51, 51])
+        # Each boundary costs one count(*) per bisection step and one offset query
+        self.assertLessEqual(len(client.called("query")), 3 * 66)
+
+    def test_varchar_keys_balanced(self):
+        """Test VARCHAR keys are split by bisecting strings, not by reading every key"""
+        keys = [f"doc-{i:05d}" for i in range(0, 3000, 7)] + ["zzz", "\u00e9t\u00e9"]
+        client = VarcharKeys(rows=[{"id": k} for k in keys])
+        boundaries = self.split(client, 3, "id >= 'doc-00100'")
+        matching = sorted(k for k in keys if k >= "doc-00100")
+        self.assertEqual(boundaries, [matching[part * len(matching) // 3 - 1] for part in (1, 2)])
+        self.assertEqual(client.called("query_iterator"), [])
+
+    def test_few_keys(self):
+        """Test fewer keys than ranges give fewer, non-empty ranges"""
+        client = FakeClient(size=2)
+        self.assertEqual(self.split(client, 8), [0])
+        self.assertEqual(self.split(FakeClient(), 4), [])
+
+
+class FakeSearch:
+    """search_pages returning ``limit`` hits per query in pages of ``batchSize``."""
+
+    def __init__(self):
+        self.requests = []
+
+    def search_pages(self, collectionName, searchParameters, vector, batchSize, limit=None):
+        self.requests.append((searchParameters["param"], batchSize, limit))
+        hits = [
+            {"id": int(vector[0]) * 100 + i, "distance": float(i), "entity": {"tag": i % 2}}
+            for i in range(limit)
+        ]
+        for start in range(0, len(hits), batchSize):
+            yield hits[start:start + batchSize]
+
+
+class TestSearchExport(unittest.TestCase):
+    def test_hits_are_tagged_with_query_and_rank(self):
+        """Test every page of every query is written with its global rank"""
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            out = os.path.join(tmpdir, "hits.parquet")
+            data = FakeSearch()
+            params = {"param": {"metric_type": "L2", "params": {"ef": 64}}}
+            pages = []
+            rows = export_search(
+                data, "c", params, np.array([[1.0, 0.0], [2.0, 0.0]]), out, "parquet",
+                batchSize=4, limit=10, on_rows=pages.append,
+            )
+            self.assertEqual(rows, 20)
+            self.assertEqual(pages, [4, 4, 2, 4, 4, 2])
+            self.assertEqual(data.requests[0], (params["param"], 4, 10))
+            table = pq.read_table(out).to_pydict()
+            self.assertEqual(table["query"], [0] * 10 + [1] * 10)
+            self.assertEqual(table["rank"], list(range(10)) * 2)
+            self.assertEqual(table["id"][10:12], [200, 201])
+            self.assertEqual(table["tag"][:3], [0, 1, 0])
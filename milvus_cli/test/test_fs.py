@@ -0,0 +1,492 @@
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+import gzip
+import threading
+import tracemalloc
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+import numpy as np
+
+from Fs import (
+    readCsvFileInBatches,
+    iterCsvBatches,
+    readFileInBatches,
+    readVectorsInBatches,
+    readIdsInBatches,
+    HttpLines,
+    isUrl,
+)
+from Types import ParameterException
+
+
+class TestCsvBatches(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """Write a small csv file with a header and ten rows"""
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, "rows.csv")
+        with open(cls.path, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["id", "title", "vec"])
+            for i in range(10):
+                w.writerow([i, json.dumps(f"title {i}"), json.dumps([i, i + 0.5])])
+        cls.size = os.stat(cls.path).st_size
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_batches_by_rows(self):
+        """Test rows are split into column-major batches of batchSize"""
+        batches = list(readCsvFileInBatches(self.path, batchSize=4))
+        self.assertEqual([b["rows"] for b in batches], [4, 4, 2])
+        first = batches[0]
+        self.assertEqual(first["columns"], ["id", "title", "vec"])
+        self.assertEqual(first["data"][0], [0, 1, 2, 3])
+        self.assertEqual(first["data"][2][1], [1, 1.5])
+        self.assertEqual(batches[-1]["offset"], self.size)
+
+    def test_batches_by_bytes(self):
+        """Test a byte budget closes batches before the row limit"""
+        batches = list(readCsvFileInBatches(self.path, batchSize=100, batchBytes=1))
+        self.assertEqual(len(batches), 10)
+        offsets = [b["offset"] for b in batches]
+        self.assertEqual(offsets, sorted(offsets))
+        self.assertEqual(offsets[-1], self.size)
+
+    def test_quoted_multiline_cell(self):
+        """Test offsets stay consistent when a cell spans several lines"""
+        lines = [b"id,doc\n", b'1,"{""a"":\n', b'1}"\n', b"2,3\n"]
+        total = sum(len(line) for line in lines)
+        batches = list(iterCsvBatches(iter(lines), total, batchSize=1))
+        self.assertEqual(batches[0]["data"], [[1], [{"a": 1}]])
+        self.assertEqual(batches[0]["offset"], total - len(lines[-1]))
+        self.assertEqual(batches[1]["offset"], total)
+
+    def test_resume_from_offset(self):
+        """Test resuming seeks past committed rows and keeps counting from them"""
+        batches = list(readCsvFileInBatches(self.path, batchSize=4))
+        resumed = list(
+            readCsvFileInBatches(
+                self.path,
+                batchSize=4,
+                startOffset=batches[0]["offset"],
+                startRow=batches[0]["row_offset"],
+            )
+        )
+        self.assertEqual([b["data"][0] for b in resumed], [[4, 5, 6, 7], [8, 9]])
+        self.assertEqual([b["row_offset"] for b in resumed], [8, 10])
+        self.assertEqual(resumed[-1]["offset"], self.size)
+        with self.assertRaises(ParameterException):
+            list(readCsvFileInBatches(self.path, startOffset=self.size + 1))
+
+    def test_invalid_parameters(self):
+        """Test invalid batch sizes and paths are rejected"""
+        with self.assertRaises(ParameterException):
+            readCsvFileInBatches(self.path, batchSize=0)
+        with self.assertRaises(ParameterException):
+            readCsvFileInBatches("rows.txt")
+        with self.assertRaises(ParameterException):
+            readCsvFileInBatches(os.path.join(self.tmpdir.name, "missing.csv"))
+
+    def test_search_vectors_from_csv(self):
+        """Test search vectors in a csv file are read with the streaming reader"""
+        from Validation import validateSearchParams
+
+        path = os.path.join(self.tmpdir.name, "vectors.csv")
+        with open(path, "w") as f:
+            f.write('"[0.5, 1.0]"\n"[1.5, 2.0]"\n')
+        params = validateSearchParams(path, "vec", "L2", "nprobe:8", 5, "", [], -1)
+        self.assertEqual(params["data"], [[0.5, 1.0], [1.5, 2.0]])
+
+    def test_invalid_cell(self):
+        """Test undecodable cells surface as ParameterException"""
+        lines = [b"id\n", b"not-json\n"]
+        with self.assertRaises(ParameterException):
+            list(iterCsvBatches(iter(lines), 14))
+
+
+class TestColumnarSources(unittest.TestCase):
+    fields = [
+        {"name": "id", "type": 5},
+        {"name": "vec", "type": 101, "params": {"dim": 2}},
+    ]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.vectors = np.arange(20, dtype=np.float32).reshape(10, 2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_jsonl(self):
+        """Test JSON-Lines keys are projected to fields and resumable by byte"""
+        path = self.path("rows.jsonl")
+        with open(path, "w") as f:
+            for i in range(10):
+                f.write(json.dumps({"id": i, "vec": [i, i], "extra": "x"}) + "\n")
+        batches = list(readFileInBatches(path, self.fields, batchSize=4))
+        self.assertEqual(batches[0]["fields"], ["id", "vec"])
+        self.assertEqual(batches[0]["data"][0], [0, 1, 2, 3])
+        self.assertEqual(batches[-1]["offset"], os.stat(path).st_size)
+        resumed = list(
+            readFileInBatches(
+                path, self.fields, batchSize=4, startOffset=batches[0]["offset"], startRow=4
+            )
+        )
+        self.assertEqual(resumed[0]["data"][0], [4, 5, 6, 7])
+        self.assertEqual(resumed[-1]["row_offset"], 10)
+
+    def test_jsonl_keys_from_schema(self):
+        """Test every input field is read, whichever line its key first appears on"""
+        path = self.path("sparse.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"id": 0, "vec": [0, 0]}) + "\n")
+            f.write(json.dumps({"id": 1, "vec": [1, 1], "tag": "a", "other": 1}) + "\n")
+        fields = self.fields + [{"name": "tag", "type": 21, "nullable": True}]
+        batch, = readFileInBatches(path, fields)
+        self.assertEqual(batch["fields"], ["id", "vec", "tag"])
+        self.assertEqual(batch["data"][2], [None, "a"])
+        with self.assertRaisesRegex(ParameterException, "at line 1"):
+            list(readFileInBatches(path, self.fields + [{"name": "tag", "type": 21}]))
+
+    def test_jsonl_line_numbers_after_resume(self):
+        """Test a resumed read reports the line numbers of the file"""
+        path = self.path("blank.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"id": 0, "vec": [0, 0]}) + "\n\n")
+            f.write(json.dumps({"id": 1, "vec": [1, 1]}) + "\n{oops\n")
+        first = next(iter(readFileInBatches(path, self.fields, batchSize=1)))
+        self.assertEqual((first["row_offset"], first["line"]), (1, 1))
+        second = next(iter(readFileInBatches(
+            path, self.fields, batchSize=1, startOffset=first["offset"], startRow=1,
+            startLine=first["line"],
+        )))
+        self.assertEqual((second["row_offset"], second["line"]), (2, 3))
+        with self.assertRaisesRegex(ParameterException, "line 4"):
+            list(readFileInBatches(
+                path, self.fields, startOffset=second["offset"], startRow=2, startLine=3
+            ))
+
+    def test_parquet(self):
+        """Test only field columns are read and vectors become float32 arrays"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        path = self.path("rows.parquet")
+        table = pa.table(
+            {
+                "id": list(range(10)),
+                "vec": self.vectors.tolist(),
+                "extra": ["x"] * 10,
+            }
+        )
+        pq.write_table(table, path, row_group_size=3)
+        batches = list(readFileInBatches(path, self.fields, batchSize=4))
+        self.assertEqual(sum(b["rows"] for b in batches), 10)
+        self.assertEqual(batches[0]["columns"], ["id", "vec"])
+        self.assertEqual(batches[0]["data"][1][1].dtype, np.float32)
+        resumed = list(readFileInBatches(path, self.fields, batchSize=4, startRow=7))
+        ids = [i for b in resumed for i in b["data"][0]]
+        self.assertEqual(ids, [7, 8, 9])
+        self.assertEqual(resumed[-1]["row_offset"], 10)
+
+    def test_npy_is_memory_mapped(self):
+        """Test a .npy file feeds the vector field as views of the mapped file"""
+        path = self.path("vectors.npy")
+        np.save(path, self.vectors)
+        fields = [{"name": "vec", "type": 101, "params": {"dim": 2}}]
+        batches = list(readFileInBatches(path, fields, batchSize=4, startRow=2))
+        self.assertEqual([b["rows"] for b in batches], [4, 4])
+        first = batches[0]["data"][0][0]
+        base = first
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        self.assertEqual(first.tolist(), [4, 5])
+        with self.assertRaises(ParameterException):
+            readFileInBatches(path, self.fields + [dict(fields[0], name="vec2")])
+
+    def test_npz(self):
+        """Test .npz arrays are matched to fields by name"""
+        path = self.path("rows.npz")
+        np.savez(path, id=np.arange(10), vec=self.vectors, extra=np.zeros(10))
+        batches = list(readFileInBatches(path, self.fields, batchSize=6))
+        self.assertEqual(batches[1]["data"][0].tolist(), [6, 7, 8, 9])
+        self.assertEqual(batches[1]["data"][1].shape, (4, 2))
+        self.assertEqual(batches[1]["data"][1][0].tolist(), [12, 13])
+        with self.assertRaises(ParameterException):
+            readFileInBatches(path, [{"name": "other", "type": 5}])
+
+    def test_dotted_local_paths(self):
+        """Test local paths with dots in directory names are not taken for URLs"""
+        folder = self.path("john.doe")
+        os.mkdir(folder)
+        npy = os.path.join(folder, "vectors.npy")
+        np.save(npy, self.vectors)
+        fields = [{"name": "vec", "type": 101, "params": {"dim": 2}}]
+        self.assertEqual(sum(b["rows"] for b in readFileInBatches(npy, fields)), 10)
+        csvPath = os.path.join(folder, "rows.csv")
+        with open(csvPath, "w") as f:
+            f.write("id\n1\n2\n")
+        work = self.path("work")
+        os.mkdir(work)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(work)
+        batches = list(readFileInBatches(os.path.join("..", "john.doe", "rows.csv")))
+        self.assertEqual(batches[0]["data"], [[1, 2]])
+        self.assertFalse(isUrl("../data/x.parquet"))
+        self.assertTrue(isUrl("https://example.com/x.csv"))
+
+    def test_unsupported(self):
+        """Test unknown extensions are rejected"""
+        with self.assertRaises(ParameterException):
+            readFileInBatches(self.path("rows.xlsx"), self.fields)
+
+
+class FileHandler(BaseHTTPRequestHandler):
+    """
+    Serve in-memory files with Range support, optionally dropping a connection,
+    failing Range requests or leaving out the Content-Length.
+    """
+
+    files = {}
+    drops = {}
+    failures = {}
+    unsized = set()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body, encoding = self.files[self.path]
+        start = 0
+        range_header = self.headers.get("Range")
+        if range_header and self.failures.get(self.path):
+            self.failures[self.path] -= 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if range_header:
+            start = int(range_header.split("=")[1].split("-")[0])
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+        else:
+            self.send_response(200)
+        if self.path in self.unsized:
+            self.close_connection = True
+        else:
+            self.send_header("Content-Length", str(len(body) - start))
+        self.send_header("ETag", '"v1"')
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        drop = self.drops.pop(self.path, None)
+        end = drop if drop is not None else len(body)
+        self.wfile.write(memoryview(body)[start:end])
+        if drop is not None:
+            self.close_connection = True
+
+
+class TestHttpLines(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FileHandler)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        cls.csv = b"id,vec\n" + b"".join(
+            b'%d,"[%d, %d]"\n' % (i, i, i) for i in range(1000)
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def serve(self, path, body, encoding=None, drop=None, failures=0, sized=True):
+        FileHandler.files[path] = (body, encoding)
+        if drop is not None:
+            FileHandler.drops[path] = drop
+        FileHandler.failures[path] = failures
+        if not sized:
+            FileHandler.unsized.add(path)
+        return self.base + path
+
+    def read_ids(self, url):
+        batches = list(readCsvFileInBatches(url, batchSize=300))
+        return [i for b in batches for i in b["data"][0]]
+
+    def test_stream_csv(self):
+        """Test a remote csv is parsed from the stream"""
+        url = self.serve("/rows.csv", self.csv)
+        self.assertEqual(self.read_ids(url), list(range(1000)))
+
+    def test_gzip(self):
+        """Test gzip content encoding and .gz files are decompressed"""
+        url = self.serve("/enc.csv", gzip.compress(self.csv), encoding="gzip")
+        self.assertEqual(self.read_ids(url), list(range(1000)))
+        url = self.serve("/rows.csv.gz", gzip.compress(self.csv))
+        lines = HttpLines(url)
+        self.assertEqual(b"".join(lines), self.csv)
+        lines.close()
+
+    def test_resume_after_drop(self):
+        """Test a dropped connection resumes with a Range request"""
+        body = gzip.compress(self.csv)
+        url = self.serve("/drop.csv", body, encoding="gzip", drop=len(body) // 2)
+        self.assertEqual(self.read_ids(url), list(range(1000)))
+
+    def test_failed_reconnects_retried(self):
+        """Test reconnects that fail count against the retries instead of ending the download"""
+        url = self.serve("/flaky.csv", self.csv, drop=len(self.csv) // 2, failures=2)
+        self.assertEqual(self.read_ids(url), list(range(1000)))
+        url = self.serve("/down.csv", self.csv, drop=len(self.csv) // 2, failures=5)
+        with self.assertRaisesRegex(ParameterException, "failed after"):
+            self.read_ids(url)
+
+    def test_truncation_without_length(self):
+        """Test a cut gzip stream without Content-Length resumes, and plain ones are flagged"""
+        body = gzip.compress(self.csv)
+        url = self.serve("/cut.csv.gz", body, drop=len(body) // 2, sized=False)
+        lines = HttpLines(url)
+        self.assertTrue(lines.detectsTruncation)
+        self.assertEqual(b"".join(lines), self.csv)
+        lines.close()
+        lines = HttpLines(self.serve("/plain.csv", self.csv, sized=False))
+        self.assertFalse(lines.detectsTruncation)
+        self.assertEqual(b"".join(lines), self.csv)
+        lines.close()
+
+    def test_bounded_memory(self):
+        """Test memory stays bounded while a large file is downloaded"""
+        body = b"".join(b"%08d,%s\n" % (i, b"x" * 90) for i in range(200000))
+        url = self.serve("/big.csv", body)
+        # Warm up lazy imports so only the download itself is measured
+        HttpLines(self.serve("/warm.csv", b"id\n")).close()
+        tracemalloc.start()
+        lines = HttpLines(url, chunkSize=1 << 16)
+        count = sum(1 for _line in lines)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        lines.close()
+        self.assertEqual(count, 200000)
+        self.assertLess(peak, len(body) // 10)
+
+
+class TestVectorFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.vectors = np.arange(10, dtype=np.float32).reshape(5, 2)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def read(self, path, **kwargs):
+        batches = list(readVectorsInBatches(path, batchSize=2, **kwargs))
+        self.assertEqual([start for start, _ in batches], [0, 2, 4])
+        return np.concatenate([vectors for _, vectors in batches])
+
+    def test_npy(self):
+        """Test .npy query vectors are read in batches"""
+        np.save(self.path("q.npy"), self.vectors)
+        np.testing.assert_array_equal(self.read(self.path("q.npy")), self.vectors)
+
+    def test_csv(self):
+        """Test csv vectors as array cells or numeric columns, header skipped"""
+        with open(self.path("cells.csv"), "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["vec"])
+            w.writerows([[json.dumps(v)] for v in self.vectors.tolist()])
+        np.testing.assert_array_equal(self.read(self.path("cells.csv")), self.vectors)
+        with open(self.path("columns.csv"), "w", newline="") as f:
+            csv.writer(f).writerows(self.vectors.tolist())
+        np.testing.assert_array_equal(self.read(self.path("columns.csv")), self.vectors)
+        # A first row with numbers is a vector, reported when malformed
+        with open(self.path("bad.csv"), "w", newline="") as f:
+            csv.writer(f).writerows([["1.0", "x"], ["2.0", "3.0"]])
+        with self.assertRaisesRegex(ParameterException, "rows 0-1"):
+            list(readVectorsInBatches(self.path("bad.csv"), batchSize=2))
+
+    def test_jsonl(self):
+        """Test JSON-Lines vectors as arrays or objects with the vector field"""
+        with open(self.path("q.jsonl"), "w") as f:
+            for idx, v in enumerate(self.vectors.tolist()):
+                f.write(json.dumps({"id": idx, "vec": v, "other": [1]}) + "\n")
+        np.testing.assert_array_equal(
+            self.read(self.path("q.jsonl"), field="vec"), self.vectors
+        )
+        with open(self.path("bad.jsonl"), "w") as f:
+            f.write("[1, 2]\n[3]\n")
+        with self.assertRaises(ParameterException):
+            list(readVectorsInBatches(self.path("bad.jsonl")))
+        with self.assertRaises(ParameterException):
+            readVectorsInBatches(self.path("q.parquet"))
+
+
+class TestIdFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+    def test_text(self):
+        """Test text IDs are typed and chunked by count"""
+        with open(self.path("ids.txt"), "w") as f:
+            f.write("# reconciliation\n1\n\n2\n3\n4\n5\n")
+        chunks = list(readIdsInBatches(self.path("ids.txt"), maxIds=2))
+        self.assertEqual(chunks, [(0, [1, 2]), (2, [3, 4]), (4, [5])])
+        with open(self.path("bad.txt"), "w") as f:
+            f.write("1\nx\n")
+        with self.assertRaises(ParameterException):
+            list(readIdsInBatches(self.path("bad.txt")))
+
+    def test_chunks_bounded_by_bytes(self):
+        """Test long string keys are split to stay under the byte bound"""
+        with open(self.path("keys.txt"), "w") as f:
+            f.write("\n".join("k" * 96 for _ in range(10)))
+        chunks = list(readIdsInBatches(self.path("keys.txt"), varchar=True, maxBytes=250))
+        self.assertEqual([len(ids) for _, ids in chunks], [2, 2, 2, 2, 2])
+        self.assertEqual(chunks[0][1][0], "k" * 96)
+
+    def test_npy_and_parquet(self):
+        """Test IDs from a 1-D .npy array and a Parquet column"""
+        np.save(self.path("ids.npy"), np.arange(5, dtype=np.int64))
+        chunks = list(readIdsInBatches(self.path("ids.npy"), maxIds=3))
+        self.assertEqual(chunks, [(0, [0, 1, 2]), (3, [3, 4])])
+        self.assertIsInstance(chunks[0][1][0], int)
+        np.save(self.path("floats.npy"), np.array([1.0, 2.0, 1.9]))
+        with self.assertRaises(ParameterException):
+            list(readIdsInBatches(self.path("floats.npy")))
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            self.skipTest("pyarrow not installed")
+        pq.write_table(pa.table({"pk": ["a", "b"], "note": ["x", "y"]}), self.path("ids.parquet"))
+        chunks = list(readIdsInBatches(self.path("ids.parquet"), varchar=True, field="pk"))
+        self.assertEqual(chunks, [(0, ["a", "b"])])
+        with self.assertRaises(ParameterException):
+            list(readIdsInBatches(self.path("ids.parquet"), field="id"))
+
+
+if __name__ == "__main__":
+    unittest.main()
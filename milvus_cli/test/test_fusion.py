@@ -0,0 +1,152 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+from Fusion import (
+    CandidateSet,
+    collect_candidates,
+    fusion_grid,
+    normalize_scores,
+    parse_fusion,
+)
+from DataClient import MilvusClientData
+from Types import ParameterException
+from fake_milvus import Connection, FakeClient
+
+
+class Client(FakeClient):
+    """FakeClient searching: field "a" finds ids q, q+1, ...; field "b" finds them reversed."""
+
+    def __init__(self):
+        super().__init__()
+        self.searches = []
+
+    def search(self, data, collection_name, anns_field, search_params, limit, **kwargs):
+        self.searches.append((anns_field, len(data)))
+        ids = [[int(v[0]) + r for r in range(limit)] for v in data]
+        if anns_field == "b":
+            ids = [row[::-1] for row in ids]
+        return [[{"id": i, "distance": 1.0 - 0.1 * r} for r, i in enumerate(row)] for row in ids]
+
+
+def candidates():
+    """Two queries; "x" is found first by one request and second by the other."""
+    c = CandidateSet(["q1", "q2"], ["a", "b"], ["IP", "L2"])
+    c.add(0, 0, [
+        [{"id": "x", "distance": 0.9}, {"id": "y", "distance": 0.5}],
+        [{"id": "z", "distance": 0.3}],
+    ])
+    c.add(1, 0, [[{"id": "w", "distance": 0.1}, {"id": "x", "distance": 0.2}], []])
+    return c
+
+
+class TestFusion(unittest.TestCase):
+    def test_normalize(self):
+        """Test distances map to (0, 1) with larger better for every metric"""
+        self.assertAlmostEqual(normalize_scores([0.0], "COSINE")[0], 0.5)
+        ip = normalize_scores([0.0, 2.0], "IP")
+        self.assertLess(ip[0], ip[1])
+        l2 = normalize_scores([0.0, 2.0], "L2")
+        self.assertEqual(l2[0], 1.0)
+        self.assertGreater(l2[0], l2[1])
+
+    def test_parse(self):
+        """Test short fusion forms and their defaults"""
+        self.assertEqual(parse_fusion("rrf", 2), {"type": "rrf", "k": 60})
+        self.assertEqual(parse_fusion("RRF:20", 2), {"type": "rrf", "k": 20})
+        self.assertEqual(parse_fusion("combmnz", 2), {"type": "combmnz", "weights": [1.0, 1.0]})
+        for text in ("weighted:1", "borda", "rrf:0"):
+            with self.assertRaises(ParameterException):
+                parse_fusion(text, 2)
+
+    def test_rrf_matches_definition(self):
+        """Test RRF sums 1 / (k + rank) per key and keeps the top k per query"""
+        hits = candidates().fuse({"type": "rrf", "k": 10}, k=2)
+        self.assertEqual([h["id"] for h in hits[0]], ["x", "w"])
+        self.assertAlmostEqual(hits[0][0]["distance"], 1 / 11 + 1 / 12)
+        self.assertEqual(hits[1], [{"id": "z", "distance": 1 / 11}])
+
+    def test_weighted_and_combmnz(self):
+        """Test weights pick a request and CombMNZ favours keys found by both"""
+        c = candidates()
+        self.assertEqual(c.fuse(parse_fusion("weighted:0,1", 2), k=1)[0][0]["id"], "w")
+        self.assertEqual(c.fuse(parse_fusion("weighted:1,0", 2), k=1)[0][0]["id"], "x")
+        best = c.fuse(parse_fusion("combmnz", 2), k=1)[0][0]
+        expected = 2 * (normalize_scores([0.9], "IP")[0] + normalize_scores([0.2], "L2")[0])
+        self.assertEqual(best["id"], "x")
+        self.assertAlmostEqual(best["distance"], expected)
+
+    def test_grid(self):
+        """Test the sweep covers every RRF k and every weighting summing to 1"""
+        grid = fusion_grid(3, rrf_ks=(20, 60), weight_step=0.5)
+        self.assertEqual(grid[:2], [{"type": "rrf", "k": 20}, {"type": "rrf", "k": 60}])
+        weights = [tuple(s["weights"]) for s in grid[2:]]
+        self.assertEqual(len(weights), 6)
+        self.assertIn((0.5, 0.0, 0.5), weights)
+        self.assertTrue(all(abs(sum(w) - 1) < 1e-9 for w in weights))
+        self.assertEqual(len(fusion_grid(2, rrf_ks=(), weight_step=0.1)), 11)
+
+    def test_evaluate(self):
+        """Test nDCG, MRR and recall against judgments, unjudged queries left out"""
+        c = candidates()
+        qrels = {"q1": {"w": 1.0, "y": 2.0}}
+        rrf, weighted = c.evaluate(
+            [{"type": "rrf", "k": 10}, parse_fusion("weighted:1,0", 2)], qrels, k=2
+        )
+        # RRF ranks x, w: only w (grade 1) is relevant, at position 2
+        ideal = 2 + 1 / np.log2(3)
+        self.assertAlmostEqual(rrf["ndcg"], round(1 / np.log2(3) / ideal, 4))
+        self.assertEqual((rrf["mrr"], rrf["recall"]), (0.5, 0.5))
+        # Weighted on the first request ranks x, y
+        self.assertAlmostEqual(weighted["ndcg"], round(2 / np.log2(3) / ideal, 4))
+        self.assertEqual((weighted["label"], weighted["mrr"]), ("weighted:1,0", 0.5))
+        with self.assertRaises(ParameterException):
+            c.evaluate([{"type": "rrf", "k": 60}], {"other": {"x": 1}})
+
+    def test_save_and_load(self):
+        """Test saved candidates fuse the same after loading"""
+        c = candidates()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            loaded = CandidateSet.load(c.save(os.path.join(tmpdir, "c.npz")))
+        self.assertEqual(loaded.query_ids, ["q1", "q2"])
+        for fusion in ("rrf", "weighted:0.3,0.7"):
+            setting = parse_fusion(fusion, 2)
+            self.assertEqual(loaded.fuse(setting), c.fuse(setting))
+
+    def test_collect_searches_each_request_once(self):
+        """Test every request is searched once per batch and RRF is symmetric in them"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "q.jsonl")
+            with open(path, "w") as f:
+                for q in range(5):
+                    f.write(json.dumps({"a": [q * 100.0], "b": [q * 100.0]}) + "\n")
+            spec = {"requests": [
+                {"field": "a", "param": {"metric_type": "IP"}, "limit": 3, "expr": None},
+                {"field": "b", "param": {"metric_type": "IP"}, "limit": 3, "expr": None},
+            ]}
+            client = Client()
+            c, stats = collect_candidates(
+                MilvusClientData(Connection(client)), "docs", spec, path, nqBatch=2, workers=2
+            )
+        self.assertEqual(
+            sorted(client.searches), [("a", 1), ("a", 2), ("a", 2), ("b", 1), ("b", 2), ("b", 2)]
+        )
+        self.assertEqual(stats["batches"], 6)
+        self.assertEqual(c.query_ids, [0, 1, 2, 3, 4])
+        hits = c.fuse({"type": "rrf", "k": 60}, k=3)
+        # Each key is ranked r by one request and 2 - r by the other
+        for q, query_hits in enumerate(hits):
+            self.assertEqual(sorted(h["id"] for h in query_hits), [q * 100, q * 100 + 1, q * 100 + 2])
+            self.assertTrue(np.allclose([h["distance"] for h in query_hits], 1 / 61 + 1 / 63, atol=1e-4))
+
+
+if __name__ == "__main__":
+    unittest.main()
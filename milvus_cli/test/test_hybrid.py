@@ -0,0 +1,107 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+from Hybrid import ann_requests, iter_hybrid_queries, load_hybrid_spec
+from DataClient import MilvusClientData
+from Types import ParameterException
+from fake_milvus import Connection, FakeClient
+
+
+class Client(FakeClient):
+    """FakeClient answering each hybrid query with its own vector's first value."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.most_active = 0
+        self.lock = threading.Lock()
+
+    def hybrid_search(self, collection_name, reqs, ranker, limit, output_fields):
+        with self.lock:
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        # Later batches finish first
+        time.sleep(0.05 if reqs[0].data[0][0] < 2 else 0.01)
+        with self.lock:
+            self.active -= 1
+        return [[{"id": int(vector[0]), "distance": 1.0, "entity": {}}] for vector in reqs[0].data]
+
+
+class TestHybridSpec(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w") as f:
+            f.write(content if isinstance(content, str) else json.dumps(content))
+        return path
+
+    def test_defaults(self):
+        """Test request limits and RRF k default, and weights are checked per request"""
+        spec = load_hybrid_spec(self.write("spec.json", {
+            "requests": [{"field": "dense"}, {"field": "sparse", "limit": 50, "expr": "a > 1"}],
+            "ranker": {"type": "RRF"},
+            "limit": 5,
+        }))
+        self.assertEqual([r["limit"] for r in spec["requests"]], [5, 50])
+        self.assertEqual(spec["ranker"], {"type": "rrf", "k": 60})
+        self.assertEqual(spec["requests"][1]["expr"], "a > 1")
+        with self.assertRaises(ParameterException):
+            load_hybrid_spec(self.write("bad.json", {
+                "requests": [{"field": "dense"}, {"field": "sparse"}],
+                "ranker": {"type": "weighted", "weights": [1.0]},
+            }))
+        with self.assertRaises(ParameterException):
+            load_hybrid_spec(self.write("typo.json", {
+                "requests": [{"field": "dense", "limt": 5}], "ranker": {"type": "rrf"},
+            }))
+
+    def test_queries(self):
+        """Test queries are batched with their ids and sparse keys become ints"""
+        path = self.write("q.jsonl", "\n".join(json.dumps(q) for q in [
+            {"id": "q1", "dense": [0.1, 0.2], "sparse": {"3": 0.5}},
+            {"dense": [0.3, 0.4], "sparse": {"7": 1}},
+            {"id": "q3", "dense": [0.5, 0.6], "sparse": {}},
+        ]))
+        batches = list(iter_hybrid_queries(path, ["dense", "sparse"], batch_size=2))
+        self.assertEqual([(start, ids) for start, ids, _ in batches], [(0, ["q1", 1]), (2, ["q3"])])
+        self.assertEqual(batches[0][2]["sparse"], [{3: 0.5}, {7: 1.0}])
+        with self.assertRaises(ParameterException):
+            list(iter_hybrid_queries(path, ["dense", "title"]))
+
+    def test_batches_searched_concurrently_in_order(self):
+        """Test batches overlap yet their results come back in query order"""
+        spec = load_hybrid_spec(self.write("spec.json", {
+            "requests": [{"field": "dense"}, {"field": "dense", "param": {"params": {"ef": 64}}}],
+            "ranker": {"type": "weighted", "weights": [0.5, 0.5]},
+        }))
+        batches = [
+            (start, ann_requests(spec, {"dense": [[start + i, 0.0] for i in range(2)]}))
+            for start in (0, 2, 4)
+        ]
+        client = Client()
+        seen = []
+        stats = MilvusClientData(Connection(client)).hybrid_search_batches(
+            "docs", batches, None, 10, workers=3,
+            on_results=lambda start, results: seen.append((start, [hits[0]["id"] for hits in results])),
+        )
+        self.assertEqual(seen, [(0, [0, 1]), (2, [2, 3]), (4, [4, 5])])
+        self.assertEqual((stats["queries"], stats["batches"]), (6, 3))
+        self.assertGreater(client.most_active, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
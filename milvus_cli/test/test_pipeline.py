@@ -0,0 +1,166 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Pipeline import BatchPipeline, RateLimiter, retry_call
+from Types import ParameterException
+
+
+class TestBatchPipeline(unittest.TestCase):
+    def test_sends_every_batch(self):
+        """Test all batches are sent and counted"""
+        pipeline = BatchPipeline(len, workers=3)
+        stats = pipeline.run([[1, 2], [3], [4, 5, 6]])
+        self.assertEqual(stats["rows"], 6)
+        self.assertEqual(stats["batches"], 3)
+
+    def test_in_flight_is_bounded(self):
+        """Test the reader is held back once max_in_flight batches are pending"""
+        lock = threading.Lock()
+        state = {"pulled": 0, "sent": 0, "ahead": 0}
+
+        def batches():
+            for i in range(20):
+                with lock:
+                    state["pulled"] += 1
+                    state["ahead"] = max(state["ahead"], state["pulled"] - state["sent"])
+                yield [i]
+
+        def send(batch):
+            time.sleep(0.01)
+            with lock:
+                state["sent"] += 1
+            return len(batch)
+
+        BatchPipeline(send, workers=2, max_in_flight=3).run(batches())
+        self.assertEqual(state["sent"], 20)
+        # max_in_flight batches queued or sending, plus the one being read
+        self.assertLessEqual(state["ahead"], 4)
+
+    def test_workers_overlap(self):
+        """Test sends run concurrently"""
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def send(batch):
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+            return 1
+
+        BatchPipeline(send, workers=4).run([[i] for i in range(12)])
+        self.assertGreater(active["max"], 1)
+
+    def test_error_stops_submission(self):
+        """Test the first send error is raised and later batches are skipped"""
+        sent = []
+
+        def send(batch):
+            if batch == [2]:
+                raise ValueError("boom")
+            sent.append(batch)
+            return 1
+
+        pipeline = BatchPipeline(send, workers=1, max_in_flight=1)
+        with self.assertRaises(ValueError):
+            pipeline.run([[i] for i in range(10)])
+        self.assertEqual(sent, [[0], [1]])
+
+    def test_commit_in_input_order(self):
+        """Test on_commit only sees a contiguous prefix of acknowledged batches"""
+        committed = []
+
+        def send(batch):
+            # Later batches finish first
+            time.sleep(0.03 - batch[0] * 0.005)
+            return 1
+
+        BatchPipeline(send, workers=4, on_commit=committed.append).run(
+            [[i] for i in range(6)]
+        )
+        self.assertEqual(committed, [[i] for i in range(6)])
+
+    def test_commit_stops_at_failed_batch(self):
+        """Test batches after a failed one are never committed"""
+        committed = []
+
+        def send(batch):
+            if batch == [2]:
+                raise ValueError("boom")
+            return 1
+
+        pipeline = BatchPipeline(send, workers=2, on_commit=committed.append)
+        with self.assertRaises(ValueError):
+            pipeline.run([[i] for i in range(6)])
+        self.assertEqual(committed, [[0], [1]])
+
+    def test_invalid_parameters(self):
+        """Test invalid worker counts are rejected"""
+        with self.assertRaises(ParameterException):
+            BatchPipeline(len, workers=0)
+        with self.assertRaises(ParameterException):
+            BatchPipeline(len, workers=1, max_in_flight=0)
+
+
+class TestRetryCall(unittest.TestCase):
+    def test_retries_until_success(self):
+        """Test a failing call is retried with backoff until it succeeds"""
+        attempts = []
+
+        def call():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RuntimeError("unavailable")
+            return "ok"
+
+        retried = []
+        self.assertEqual(
+            retry_call(call, retries=3, backoff=0.001, on_retry=lambda n, e: retried.append(n)),
+            "ok",
+        )
+        self.assertEqual(retried, [1, 2])
+
+    def test_gives_up(self):
+        """Test the last error is raised once the retries are used, parameter errors at once"""
+        attempts = []
+
+        def call():
+            attempts.append(1)
+            raise RuntimeError("down")
+
+        with self.assertRaises(RuntimeError):
+            retry_call(call, retries=2, backoff=0.001)
+        self.assertEqual(len(attempts), 3)
+
+        def invalid():
+            attempts.append(1)
+            raise ParameterException("bad")
+
+        with self.assertRaises(ParameterException):
+            retry_call(invalid, retries=2, backoff=0.001)
+        self.assertEqual(len(attempts), 4)
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_paces_units(self):
+        """Test units are granted no faster than the rate, the first at once"""
+        limiter = RateLimiter(1000)
+        start = time.perf_counter()
+        self.assertEqual(limiter.acquire(50), 0)
+        limiter.acquire(50)
+        limiter.acquire(1)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.09)
+        with self.assertRaises(ParameterException):
+            RateLimiter(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
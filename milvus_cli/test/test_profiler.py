@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Profiler import StageProfiler, current_rss, profile_stage
+from Fs import iterCsvBatches
+from Converter import column_converter
+
+
+class TestStageProfiler(unittest.TestCase):
+    def test_nested_stages(self):
+        """Test a nested stage is not charged to the stage around it"""
+        profiler = StageProfiler()
+        with profiler.stage("read"):
+            time.sleep(0.02)
+            with profiler.stage("parse"):
+                time.sleep(0.05)
+        report = profiler.report()["stages"]
+        self.assertGreaterEqual(report["parse"]["wall_seconds"], 0.05)
+        self.assertLess(report["read"]["wall_seconds"], 0.05)
+        self.assertEqual(report["read"]["calls"], 1)
+        self.assertGreater(report["read"]["peak_rss_bytes"], 0)
+
+    def test_threads_are_separate(self):
+        """Test stages on other threads do not nest into each other"""
+        profiler = StageProfiler()
+
+        def send():
+            with profiler.stage("send"):
+                time.sleep(0.03)
+
+        with profiler.stage("read"):
+            worker = threading.Thread(target=send)
+            worker.start()
+            worker.join()
+        report = profiler.report()["stages"]
+        self.assertGreaterEqual(report["read"]["wall_seconds"], 0.03)
+        self.assertGreaterEqual(report["send"]["wall_seconds"], 0.03)
+
+    def test_read_batches(self):
+        """Test reader batches are counted for the read and parse stages"""
+        lines = [b"id,score\n"] + [f"{i},{i / 2}\n".encode() for i in range(10)]
+        total = sum(len(line) for line in lines)
+        profiler = StageProfiler()
+        converters = [column_converter({"type": 5}), column_converter({"type": 11})]
+        batches = iterCsvBatches(
+            iter(lines), total, batchSize=4, converters=converters, profiler=profiler
+        )
+        self.assertEqual(len(list(profiler.read_batches(batches))), 3)
+        profiler.finish()
+        report = profiler.report()
+        for name in ("read", "parse"):
+            self.assertEqual(report["stages"][name]["rows"], 10)
+            self.assertEqual(report["stages"][name]["bytes"], total - len(lines[0]))
+        self.assertEqual(report["stages"]["parse"]["calls"], 3)
+        self.assertEqual(report["stages"]["send"]["rows"], 0)
+        self.assertIn("parse", profiler.format())
+
+    def test_disabled(self):
+        """Test profile_stage is a no-op without a profiler"""
+        with profile_stage(None, "read"):
+            pass
+        self.assertGreater(current_rss(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
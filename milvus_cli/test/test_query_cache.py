@@ -0,0 +1,164 @@
+import unittest
+import sys
+import os
+import time
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+from QueryCache import QueryCache, query_cache
+from DataClient import MilvusClientData
+from Types import ParameterException
+from fake_milvus import Connection, FakeClient
+
+
+class Client(FakeClient):
+    """FakeClient where "latest" is an alias of "docs"."""
+
+    def __init__(self):
+        super().__init__(rows=[{"id": 1, "tag": "a"}, {"id": 2, "tag": "b"}])
+
+    def describe_collection(self, collection_name, **kwargs):
+        self.calls.append(("describe_collection", {"collection_name": collection_name}))
+        return dict(super().describe_collection(collection_name), collection_name="docs")
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache(max_bytes=10 * 1024, ttl=60)
+        self.cache.configure(enabled=True)
+        self.client = Client()
+
+    def test_disabled_by_default(self):
+        """Test nothing is cached until the cache is turned on"""
+        cache = QueryCache()
+        key = cache.key(self.client, "query", "docs", "id > 0")
+        cache.put(key, [{"id": 1}])
+        self.assertIsNone(cache.get(key))
+
+    def test_hit_returns_copies(self):
+        """Test a hit hands out rows the caller may change freely"""
+        key = self.cache.key(self.client, "query", "docs", "id > 0", ["*"], None, None)
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, [{"id": 1}])
+        rows = self.cache.get(key)
+        rows[0]["id"] = 99
+        self.assertEqual(self.cache.get(key), [{"id": 1}])
+        summary = self.cache.summary()
+        self.assertEqual((summary["hits"], summary["misses"]), (2, 1))
+        self.assertAlmostEqual(summary["collections"][0]["hit_rate"], 2 / 3)
+
+    def test_key_parts(self):
+        """Test requests differing in fields or clients do not share entries"""
+        key = self.cache.key(self.client, "query", "docs", "id > 0", ["id"])
+        self.cache.put(key, [{"id": 1}])
+        self.assertIsNone(self.cache.get(self.cache.key(self.client, "query", "docs", "id > 0", ["*"])))
+        other = Client()
+        self.assertIsNone(self.cache.get(self.cache.key(other, "query", "docs", "id > 0", ["id"])))
+        self.assertIsNotNone(self.cache.get(self.cache.key(self.client, "query", "docs", "id > 0", ("id",))))
+
+    def test_lru_eviction(self):
+        """Test the least recently used results go first once over the size limit"""
+        rows = [{"text": "x" * 4000}]
+        keys = [self.cache.key(self.client, "query", "docs", f"id == {i}") for i in range(3)]
+        self.cache.put(keys[0], rows)
+        self.cache.put(keys[1], rows)
+        self.cache.get(keys[0])
+        self.cache.put(keys[2], rows)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertLessEqual(self.cache.summary()["bytes"], 10 * 1024)
+        self.assertEqual(self.cache.summary()["evictions"], 1)
+
+    def test_ttl(self):
+        """Test results expire after the TTL"""
+        self.cache.configure(ttl=0.01)
+        key = self.cache.key(self.client, "get", "docs", [1, 2])
+        self.cache.put(key, [{"id": 1}])
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(self.cache.summary()["expired"], 1)
+
+    def test_invalidate_by_alias_target(self):
+        """Test results read through an alias are dropped by writes to its collection"""
+        key = self.cache.key(self.client, "query", "latest", "id > 0")
+        self.cache.put(key, [{"id": 1}], ("docs",))
+        self.cache.invalidate("other")
+        self.assertIsNotNone(self.cache.get(key))
+        self.cache.invalidate("docs")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_configure_validates(self):
+        """Test sizes and TTLs must be positive"""
+        with self.assertRaises(ParameterException):
+            self.cache.configure(max_bytes=0)
+        with self.assertRaises(ParameterException):
+            self.cache.configure(ttl=-1)
+
+
+class TestDataClientCache(unittest.TestCase):
+    def setUp(self):
+        query_cache.configure(enabled=True)
+        self.client = Client()
+        self.data = MilvusClientData(Connection(self.client))
+
+    def tearDown(self):
+        query_cache.configure(enabled=False)
+        query_cache.reset_stats()
+
+    def test_write_invalidates(self):
+        """Test repeated queries are served from the cache until an insert"""
+        params = {"expr": "id > 0", "output_fields": None, "partition_names": None}
+        self.data.query("latest", params)
+        self.assertEqual(len(self.data.query("latest", params)), 2)
+        self.assertEqual(len(self.client.called("query")), 1)
+        # Written through the collection name, read through the alias
+        self.data.insert("docs", [{"id": 3, "tag": "c"}])
+        self.assertEqual(len(self.data.query("latest", params)), 3)
+        self.assertEqual(len(self.client.called("query")), 2)
+
+    def test_miss_describes_nothing(self):
+        """Test a miss costs no describe_collection and is dropped by any write"""
+        params = {"expr": "id > 0", "output_fields": None, "partition_names": None}
+        self.data.query("latest", params)
+        self.assertEqual(self.client.called("describe_collection"), [])
+        self.data.insert("other", [{"id": 3, "tag": "c"}])
+        self.data.query("latest", params)
+        self.assertEqual(len(self.client.called("query")), 2)
+
+    def test_no_caching_during_import(self):
+        """Test results are not cached while a bulk insert may still add rows"""
+
+        class State:
+            state_name = "Started"
+
+        state = State()
+        self.client.bulk_insert = lambda **kwargs: 7
+        self.client.get_bulk_insert_state = lambda task_id: state
+        params = {"expr": "id > 0", "output_fields": None, "partition_names": None}
+        self.data.bulk_insert("docs", ["rows.json"])
+        self.data.query("latest", params)
+        self.data.query("latest", params)
+        self.assertEqual(len(self.client.called("query")), 2)
+        state.state_name = "Completed"
+        self.data.query("latest", params)
+        self.data.query("latest", params)
+        self.assertEqual(len(self.client.called("query")), 3)
+        self.assertEqual(query_cache.holding(), [])
+
+    def test_known_alias_target_kept(self):
+        """Test an entry read through a described alias only goes with its collection"""
+        params = {"expr": "id > 0", "output_fields": None, "partition_names": None}
+        self.data.input_fields("latest")
+        self.data.query("latest", params)
+        query_cache.invalidate("other")
+        self.data.query("latest", params)
+        self.assertEqual(len(self.client.called("query")), 1)
+        query_cache.invalidate("docs")
+        self.data.query("latest", params)
+        self.assertEqual(len(self.client.called("query")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import sys
+import os
+import csv
+import io
+import json
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+sys.path.append(current_dir)
+from DataClient import MilvusClientData
+from QueryCache import query_cache
+from OutputFormatter import OutputFormatter
+from fake_milvus import Connection, FakeClient
+
+
+class TestQueryStream(unittest.TestCase):
+    def stream(self, size, client=None, **params):
+        client = client or FakeClient(rows=[{"id": i, "tag": f"t{i}"} for i in range(size)])
+        parameters = {"expr": "id >= 0", "output_fields": ["'tag'"], "partition_names": ["p1"], **params}
+        total, pages = MilvusClientData(Connection(client)).query_stream(
+            "docs", parameters, pageSize=10, window=10
+        )
+        return client, total, list(pages)
+
+    def requests(self, client):
+        return [(name, kwargs["output_fields"], kwargs["partition_names"]) for name, kwargs in client.calls]
+
+    def test_small_result_is_one_query(self):
+        """Test a result within the window comes from a single query"""
+        client, total, pages = self.stream(5)
+        self.assertEqual((total, len(pages), len(pages[0])), (5, 1, 5))
+        self.assertEqual(self.requests(client), [
+            ("query", ["count(*)"], ["p1"]), ("query", ["tag"], ["p1"]),
+        ])
+
+    def test_large_result_is_paged_by_key(self):
+        """Test a result past the window is read in pages with query_iterator"""
+        client, total, pages = self.stream(25)
+        self.assertEqual(total, 25)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([row["id"] for page in pages for row in page], list(range(25)))
+        self.assertEqual(self.requests(client), [
+            ("query", ["count(*)"], ["p1"]), ("query_iterator", ["tag"], ["p1"]),
+        ])
+        self.assertTrue(client.iterator.closed)
+
+    def test_paging_keeps_request_options(self):
+        """Test the timeout and consistency level reach every paged request"""
+        client, _, _ = self.stream(25, timeout=3.0, consistency_level="Strong")
+        count, = client.called("query")
+        iterator, = client.called("query_iterator")
+        self.assertEqual(count["consistency_level"], "Strong")
+        self.assertEqual((iterator["timeout"], iterator["consistency_level"]), (3.0, "Strong"))
+
+    def test_aggregates_and_limits_skip_the_count(self):
+        """Test count(*) and limited queries run as one query whatever their size"""
+        client, total, pages = self.stream(25, output_fields=["count(*)"])
+        self.assertEqual((total, pages), (1, [[{"count(*)": 25}]]))
+        client, total, pages = self.stream(25, limit=5)
+        self.assertEqual((total, [row["id"] for row in pages[0]]), (5, [0, 1, 2, 3, 4]))
+        self.assertEqual(self.requests(client), [("query", ["tag"], ["p1"])])
+
+    def test_cache_hit_sends_nothing(self):
+        """Test a cached result is returned without a count(*) round trip"""
+        query_cache.configure(enabled=True)
+        self.addCleanup(query_cache.configure, enabled=False)
+        self.addCleanup(query_cache.invalidate)
+        client, _, first = self.stream(5)
+        calls = len(client.calls)
+        _, total, pages = self.stream(5, client=client)
+        self.assertEqual((total, pages), (5, first))
+        self.assertEqual(len(client.calls), calls)
+
+
+class TestFormatPages(unittest.TestCase):
+    pages = [[{"id": 1, "tag": "a"}, {"id": 2, "tag": "b"}], [], [{"id": 3, "tag": "c"}]]
+
+    def format(self, fmt, pages):
+        formatter = OutputFormatter()
+        formatter.format = fmt
+        return "".join(formatter.format_pages(iter(pages)))
+
+    def test_json_and_csv_match_whole_output(self):
+        """Test streamed JSON and CSV read back as the whole result"""
+        rows = [row for page in self.pages for row in page]
+        self.assertEqual(json.loads(self.format("json", self.pages)), rows)
+        parsed = list(csv.DictReader(io.StringIO(self.format("csv", self.pages))))
+        self.assertEqual(parsed, [{"id": str(r["id"]), "tag": r["tag"]} for r in rows])
+
+    def test_table_per_page(self):
+        """Test a table is drawn per non-empty page"""
+        self.assertEqual(self.format("table", self.pages).count("| tag "), 2)
+        self.assertEqual(self.format("json", []), "No data to display.\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Recall import (
+    ExactTopK,
+    GroundTruthCache,
+    read_qrels,
+    recall_at_k,
+    recall_summary,
+    sample_hash,
+    sample_vectors,
+)
+from Types import ParameterException
+
+
+def brute_force(queries, base, k, metric):
+    if metric == "L2":
+        scores = ((queries[:, None, :] - base[None, :, :]) ** 2).sum(-1)
+        return np.argsort(scores, axis=1, kind="stable")[:, :k]
+    if metric == "COSINE":
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        base = base / np.linalg.norm(base, axis=1, keepdims=True)
+    return np.argsort(-(queries @ base.T), axis=1, kind="stable")[:, :k]
+
+
+class TestExactTopK(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.base = rng.random((500, 8), dtype=np.float32)
+        self.queries = rng.random((20, 8), dtype=np.float32)
+
+    def test_matches_brute_force(self):
+        """Test blocked top-k matches a full sort for every metric"""
+        for metric in ("L2", "IP", "COSINE"):
+            exact = ExactTopK(self.queries, 5, metric, query_block=7, base_block=64)
+            for start in range(0, 500, 90):
+                exact.add(range(start, min(start + 90, 500)), self.base[start:start + 90])
+            ids, distances = exact.result()
+            self.assertEqual(ids, brute_force(self.queries, self.base, 5, metric).tolist(), metric)
+            self.assertEqual(exact.seen, 500)
+            self.assertEqual(distances.shape, (20, 5))
+
+    def test_l2_distances_are_squared(self):
+        """Test L2 distances are squared, as Milvus reports them"""
+        exact = ExactTopK([[0.0, 0.0]], 2)
+        exact.add(["a", "b", "c"], [[3.0, 4.0], [1.0, 0.0], [0.0, 2.0]])
+        ids, distances = exact.result()
+        self.assertEqual(ids, [["b", "c"]])
+        np.testing.assert_allclose(distances, [[1.0, 4.0]])
+
+    def test_fewer_vectors_than_k(self):
+        """Test a collection smaller than k returns every vector"""
+        exact = ExactTopK(self.queries[:2], 10)
+        exact.add([1, 2, 3], self.base[:3])
+        self.assertEqual([len(row) for row in exact.result()[0]], [3, 3])
+
+    def test_invalid(self):
+        """Test unsupported metrics and mismatched dims are rejected"""
+        with self.assertRaises(ParameterException):
+            ExactTopK(self.queries, 5, "HAMMING")
+        exact = ExactTopK(self.queries, 5)
+        with self.assertRaises(ParameterException):
+            exact.add([1], np.zeros((1, 4)))
+
+
+class TestRecall(unittest.TestCase):
+    def test_recall_at_k(self):
+        """Test recall counts exact ids found in any order"""
+        values = recall_at_k([[1, 2, 3, 4], [5, 6]], [[4, 3, 9, 1], [6, 5]], 4)
+        self.assertEqual(values, [0.75, 1.0])
+        summary = recall_summary(values)
+        self.assertEqual(summary["mean"], 0.875)
+        self.assertEqual(summary["min"], 0.75)
+        self.assertEqual(summary["perfect"], 1)
+
+    def test_sample_vectors(self):
+        """Test sampling is deterministic per seed and takes distinct vectors"""
+        base = np.arange(200, dtype=np.float32).reshape(100, 2)
+        batches = lambda: ((list(range(s, s + 10)), base[s:s + 10]) for s in range(0, 100, 10))
+        ids, vectors = sample_vectors(batches(), 15, seed=3)
+        self.assertEqual(len(set(ids)), 15)
+        np.testing.assert_array_equal(vectors, base[ids])
+        self.assertEqual(sample_vectors(batches(), 15, seed=3)[0], ids)
+        self.assertNotEqual(sample_vectors(batches(), 15, seed=4)[0], ids)
+        self.assertEqual(len(sample_vectors(batches(), 500)[0]), 100)
+
+    def test_sample_hash(self):
+        """Test the hash changes with the queries and the settings"""
+        queries = np.ones((3, 4), dtype=np.float32)
+        key = sample_hash(queries, metric="L2", k=10)
+        self.assertEqual(key, sample_hash(queries.astype(np.float64), k=10, metric="L2"))
+        self.assertNotEqual(key, sample_hash(queries, metric="L2", k=100))
+        self.assertNotEqual(key, sample_hash(queries * 2, metric="L2", k=10))
+
+
+class TestGroundTruthCache(unittest.TestCase):
+    def test_round_trip(self):
+        """Test cached ids come back and stale entries are ignored"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GroundTruthCache(tmp)
+            self.assertIsNone(cache.load("c/1", "vec", "abc"))
+            path = cache.save("c/1", "vec", "abc", [[1, 2], [3, 4]], np.zeros((2, 2)), entities=10)
+            self.assertTrue(path.startswith(tmp))
+            ids, values = cache.load("c/1", "vec", "abc", entities=10)
+            self.assertEqual(ids, [[1, 2], [3, 4]])
+            self.assertEqual(values.shape, (2, 2))
+            self.assertIsNone(cache.load("c/1", "vec", "abc", entities=11))
+
+    def test_string_ids(self):
+        """Test string primary keys are stored without pickling"""
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = GroundTruthCache(tmp)
+            cache.save("c", "vec", "k", np.array([["a", "b"]], dtype=object), [[0.1, 0.2]])
+            self.assertEqual(cache.load("c", "vec", "k")[0], [["a", "b"]])
+
+
+class TestQrels(unittest.TestCase):
+    def test_formats(self):
+        """Test TREC, JSON and JSON Lines judgments read the same"""
+        expected = {"q1": {"7": 2.0, "9": 1.0}, "2": {"5": 1.0}}
+        contents = {
+            "dev.qrels": "# judged\nq1 0 7 2\nq1 0 9 1\n2 5\n",
+            "dev.json": '{"q1": {"7": 2, "9": 1}, "2": [5]}',
+            "dev.jsonl": '{"id": "q1", "relevant": {"7": 2, "9": 1}}\n{"id": 2, "relevant": [5]}\n',
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, content in contents.items():
+                path = os.path.join(tmp, name)
+                with open(path, "w") as f:
+                    f.write(content)
+                self.assertEqual(read_qrels(path), expected, name)
+            path = os.path.join(tmp, "bad.qrels")
+            with open(path, "w") as f:
+                f.write("q1 0 7 high\n")
+            with self.assertRaises(ParameterException):
+                read_qrels(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import time
+
+import numpy as np
+from pymilvus.client.search_result import Hit
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Render import HitTable, abbreviate_vector
+
+
+def hits(n, dim=768):
+    rng = np.random.default_rng(0)
+    return [
+        Hit(
+            {
+                "pk": i,
+                "distance": 0.123456 * i,
+                "entity": {"title": f"doc {i}", "emb": rng.random(dim).tolist()},
+            },
+            pk_name="pk",
+        )
+        for i in range(n)
+    ]
+
+
+class TestAbbreviateVector(unittest.TestCase):
+    def test_kinds(self):
+        """Test dense, binary and sparse vectors are summarised on one line"""
+        self.assertEqual(abbreviate_vector([3.0, 4.0]), "[dim=2, ‖v‖=5]")
+        self.assertEqual(abbreviate_vector(np.zeros(768)), "[dim=768, ‖v‖=0]")
+        self.assertEqual(abbreviate_vector([b"\x00" * 16]), "[binary, dim=128]")
+        self.assertEqual(abbreviate_vector({1: 0.5, 9: 0.1}), "[sparse, nnz=2]")
+
+
+class TestHitTable(unittest.TestCase):
+    def test_columns(self):
+        """Test hits are split into one column per field, vectors abbreviated"""
+        table = HitTable(hits(3))
+        self.assertEqual(table.headers, ["ID", "Distance", "title", "emb"])
+        self.assertEqual(table.ids, [0, 1, 2])
+        self.assertEqual(table.vector_fields, {"emb"})
+        row = table.rows(1, 2)[0]
+        self.assertEqual(row[:3], [1, 0.1235, "doc 1"])
+        self.assertTrue(row[3].startswith("[dim=768, ‖v‖="))
+
+    def test_missing_fields_and_long_text(self):
+        """Test fields absent from some hits stay aligned and long text is cut"""
+        table = HitTable(
+            [
+                {"id": 1, "distance": 0.5, "a": "x" * 100},
+                {"id": 2, "distance": 0.25, "b": [1, 2]},
+            ],
+            round_decimal=-1,
+            max_width=10,
+        )
+        self.assertEqual(table.rows(), [[1, 0.5, "xxxxxxxxx…", ""], [2, 0.25, "", "[1, 2]"]])
+
+    def test_pages_are_lazy(self):
+        """Test a page is only formatted when it is asked for"""
+        table = HitTable(hits(120, dim=32))
+        formatted = []
+        cell = table._cell
+        table._cell = lambda name, value: formatted.append(name) or cell(name, value)
+        pages = table.pages(50)
+        self.assertEqual(formatted, [])
+        self.assertEqual(next(pages), "Hits 1-50 of 120\n")
+        self.assertIn("doc 49", next(pages))
+        self.assertEqual(len(formatted), 100)
+        self.assertEqual(len(list(pages)), 4)
+
+    def test_large_result_is_fast(self):
+        """Test rendering topk=1000 hits of 768-dim vectors stays small and quick"""
+        table = HitTable(hits(1000))
+        start = time.perf_counter()
+        text = table.render()
+        self.assertLess(time.perf_counter() - start, 2.0)
+        self.assertLess(len(text), 200 * 1000)
+
+
+if __name__ == "__main__":
+    unittest.main()
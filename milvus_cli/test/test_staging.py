@@ -0,0 +1,183 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+import numpy as np
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Converter import ColumnBatch
+from DataClient import MilvusClientData, bulk_insert_finished
+from Staging import LocalStorage, S3Storage, ShardWriter, local_sources, open_storage
+from Types import ParameterException
+
+
+def make_batch(start, rows):
+    ids = np.arange(start, start + rows)
+    vectors = np.stack([ids, ids + 0.5], axis=1).astype(np.float32)
+    return ColumnBatch(["id", "vec", "meta"], [ids, vectors, [{"i": int(i)} for i in ids]])
+
+
+class TestShardWriter(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.root = self.tmpdir.name
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_json_shards(self):
+        """Test rows are split into JSON shards of about the shard size"""
+        writer = ShardWriter(LocalStorage(self.root), "run", "json", shard_bytes=200)
+        writer.write(make_batch(0, 6))
+        writer.write(make_batch(6, 4))
+        shards = writer.close()
+        self.assertGreater(len(shards), 1)
+        self.assertEqual(sum(rows for _, rows in shards), 10)
+        self.assertEqual(shards[0][0], "run/shard-00000.json")
+        rows = []
+        for path, count in shards:
+            with open(os.path.join(self.root, path)) as f:
+                shard = json.load(f)["rows"]
+            self.assertEqual(len(shard), count)
+            rows.extend(shard)
+        self.assertEqual([row["id"] for row in rows], list(range(10)))
+        self.assertEqual(rows[3], {"id": 3, "vec": [3.0, 3.5], "meta": {"i": 3}})
+
+    def test_json_shards_count_utf8_bytes(self):
+        """Test JSON shards stay within the shard size for non-ASCII text"""
+        batch = ColumnBatch(["id", "title"], [np.arange(12), ["向量数据库" * 4] * 12])
+        writer = ShardWriter(LocalStorage(self.root), "run", "json", shard_bytes=400)
+        writer.write(batch)
+        shards = writer.close()
+        self.assertGreater(len(shards), 1)
+        for path, count in shards:
+            full = os.path.join(self.root, path)
+            self.assertLessEqual(os.path.getsize(full), 400)
+            with open(full, encoding="utf-8") as f:
+                self.assertEqual(len(json.load(f)["rows"]), count)
+
+    def test_s3_temp_dir_removed(self):
+        """Test the S3 staging directory is removed on close and on abort"""
+
+        class Uploads:
+            def upload_file(self, path, bucket, key):
+                pass
+
+        for finish in ("close", "abort"):
+            storage = S3Storage.__new__(S3Storage)
+            storage.bucket, storage.prefix, storage.client = "bucket", "", Uploads()
+            storage.tmpdir = tempfile.mkdtemp(prefix="milvus_cli_staging_")
+            writer = ShardWriter(storage, "run", "json", shard_bytes=200)
+            writer.write(make_batch(0, 6))
+            getattr(writer, finish)()
+            self.assertFalse(os.path.exists(storage.tmpdir))
+
+    def test_parquet_shards(self):
+        """Test Parquet shards keep vectors as float lists"""
+        import pyarrow.parquet as pq
+
+        writer = ShardWriter(LocalStorage(self.root), "run", "parquet", shard_bytes=1 << 20)
+        writer.write(make_batch(0, 3))
+        writer.write(make_batch(3, 2))
+        ((path, rows),) = writer.close()
+        table = pq.read_table(os.path.join(self.root, path))
+        self.assertEqual(rows, 5)
+        self.assertEqual(table.column("vec").to_pylist()[4], [4.0, 4.5])
+        self.assertEqual(json.loads(table.column("meta").to_pylist()[1]), {"i": 1})
+
+    def test_parquet_types_from_fields(self):
+        """Test Parquet columns take the field types whatever a batch holds"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        fields = [
+            {"name": "id", "type": 5},
+            {"name": "vec", "type": 101, "params": {"dim": 2}},
+            {"name": "meta", "type": 23},
+            {"name": "tags", "type": 22, "element_type": 21},
+        ]
+        writer = ShardWriter(
+            LocalStorage(self.root), "run", "parquet", shard_bytes=1 << 20, fields=fields
+        )
+        writer.write(ColumnBatch(
+            ["id", "vec", "meta", "tags"],
+            [np.arange(2, dtype=np.int32), [[0.5, 1], [2, 3]], [{"a": 1}, None], [["x"], []]],
+        ))
+        writer.write(ColumnBatch(
+            ["id", "vec", "meta", "tags"],
+            [np.arange(2, 4), np.ones((2, 2), np.float64), [[1, 2], "s"], [["y", "z"], None]],
+        ))
+        ((path, rows),) = writer.close()
+        table = pq.read_table(os.path.join(self.root, path))
+        self.assertEqual(rows, 4)
+        self.assertEqual(table.schema.field("id").type, pa.int64())
+        self.assertEqual(table.schema.field("vec").type, pa.list_(pa.float32()))
+        self.assertEqual(table.schema.field("tags").type, pa.list_(pa.string()))
+        meta = [json.loads(v) if v else v for v in table.column("meta").to_pylist()]
+        self.assertEqual(meta, [{"a": 1}, None, [1, 2], "s"])
+        writer = ShardWriter(
+            LocalStorage(self.root), "bad", "parquet", shard_bytes=1 << 20, fields=fields
+        )
+        with self.assertRaises(ParameterException):
+            writer.write(ColumnBatch(["id"], [["not a number"]]))
+        writer.abort()
+
+    def test_invalid(self):
+        """Test bad formats, sizes and roots are rejected"""
+        storage = LocalStorage(self.root)
+        with self.assertRaises(ParameterException):
+            ShardWriter(storage, "run", "csv")
+        with self.assertRaises(ParameterException):
+            ShardWriter(storage, "run", "json", shard_bytes=0)
+        with self.assertRaises(ParameterException):
+            open_storage(None)
+        with self.assertRaises(ParameterException):
+            open_storage(os.path.join(self.root, "missing"))
+
+    def test_local_sources(self):
+        """Test directories are searched for supported files in order"""
+        os.makedirs(os.path.join(self.root, "sub"))
+        for name in ("b.csv", "a.jsonl", "notes.txt", os.path.join("sub", "c.npy")):
+            open(os.path.join(self.root, name), "w").close()
+        names = [os.path.relpath(p, self.root) for p in local_sources(self.root)]
+        self.assertEqual(names, ["a.jsonl", "b.csv", os.path.join("sub", "c.npy")])
+        with self.assertRaises(ParameterException):
+            local_sources(os.path.join(self.root, "notes.txt"))
+
+
+class State:
+    def __init__(self, name, progress=0):
+        self.state_name = name
+        self.progress = progress
+
+
+class TestWaitBulkInsert(unittest.TestCase):
+    def test_polls_until_final(self):
+        """Test every task is polled until it completes or fails"""
+        polls = {}
+        final = {1: "Completed", 2: "Failed", 3: "Completed"}
+
+        def get_state(task_id):
+            polls[task_id] = polls.get(task_id, 0) + 1
+            if polls[task_id] < task_id:
+                return State("Started", 50)
+            return State(final[task_id], 100)
+
+        data = MilvusClientData.__new__(MilvusClientData)
+        data.get_bulk_insert_state = get_state
+        rounds = []
+        states = data.wait_bulk_insert_tasks(
+            [1, 2, 3], interval=0, on_progress=lambda s: rounds.append(len(s))
+        )
+        self.assertEqual({k: v.state_name for k, v in states.items()}, final)
+        self.assertEqual(polls, {1: 1, 2: 2, 3: 3})
+        self.assertEqual(len(rounds), 3)
+        self.assertFalse(bulk_insert_finished(State("Persisted")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+import sys
+import os
+import tempfile
+
+current_dir = os.path.dirname(os.path.realpath(__file__))
+parent_dir = os.path.dirname(current_dir)
+sys.path.append(parent_dir)
+from Tuner import (
+    SavedSearchParams,
+    SearchTuner,
+    cheapest,
+    pareto_frontier,
+    tuning_space,
+)
+from Types import ParameterException
+
+
+def fake_search(params):
+    """Recall grows with ef up to 1.0 at ef=200; latency grows linearly."""
+    ef = params["ef"]
+    return {"recall": min(1.0, ef / 200), "mean_ms": ef / 10}
+
+
+class TestSearchTuner(unittest.TestCase):
+    def test_meets_target_with_few_trials(self):
+        """Test the tuner finds a value near the smallest meeting the target"""
+        tuner = SearchTuner(fake_search, {"ef": (10, 4096)}, target_recall=0.9, tolerance=0.01)
+        trials = tuner.run()
+        # 180 is the smallest ef with recall 0.9
+        self.assertGreaterEqual(tuner.current["ef"], 180)
+        self.assertLessEqual(tuner.current["ef"], 182)
+        self.assertLess(len(trials), 15)
+        self.assertEqual(cheapest(trials, 0.9)["params"]["ef"], tuner.current["ef"])
+
+    def test_no_target_stops_at_plateau(self):
+        """Test a sweep without a target stops once recall stops improving"""
+        tuner = SearchTuner(fake_search, {"ef": (10, 4096)})
+        trials = tuner.run()
+        self.assertEqual([t["params"]["ef"] for t in trials], [10, 20, 40, 80, 160, 320])
+
+    def test_unreachable_target(self):
+        """Test an unreachable target keeps the best value in range"""
+        tuner = SearchTuner(fake_search, {"ef": (10, 100)}, target_recall=0.99)
+        trials = tuner.run()
+        self.assertEqual(tuner.current["ef"], 100)
+        self.assertIsNone(cheapest(trials, 0.99))
+
+    def test_max_trials(self):
+        """Test the tuner stops at the trial budget"""
+        tuner = SearchTuner(fake_search, {"ef": (1, 4096)}, target_recall=0.95, max_trials=3)
+        self.assertEqual(len(tuner.run()), 3)
+
+    def test_several_params(self):
+        """Test parameters are tuned one at a time with the others held"""
+
+        def search(params):
+            recall = min(1.0, params["nprobe"] / 32) * min(1.0, params["reorder_k"] / 40)
+            return {"recall": recall, "mean_ms": params["nprobe"] + params["reorder_k"]}
+
+        tuner = SearchTuner(
+            search,
+            {"nprobe": (1, 128), "reorder_k": (10, 512)},
+            target_recall=1.0,
+            fixed={"reorder_k": 64},
+        )
+        tuner.run()
+        self.assertEqual(tuner.current, {"nprobe": 32, "reorder_k": 40})
+
+    def test_invalid(self):
+        """Test empty spaces and bad targets are rejected"""
+        with self.assertRaises(ParameterException):
+            SearchTuner(fake_search, {})
+        with self.assertRaises(ParameterException):
+            SearchTuner(fake_search, {"ef": (10, 20)}, target_recall=1.5)
+
+
+class TestFrontier(unittest.TestCase):
+    def test_pareto_frontier(self):
+        """Test dominated trials are left off the frontier"""
+        trials = [
+            {"recall": 0.5, "mean_ms": 1.0},
+            {"recall": 0.4, "mean_ms": 2.0},
+            {"recall": 0.9, "mean_ms": 3.0},
+            {"recall": 0.9, "mean_ms": 4.0},
+            {"recall": 0.95, "mean_ms": 5.0},
+        ]
+        frontier = pareto_frontier(trials)
+        self.assertEqual([t["mean_ms"] for t in frontier], [1.0, 3.0, 5.0])
+        self.assertEqual(cheapest(trials, 0.9)["mean_ms"], 3.0)
+
+    def test_tuning_space(self):
+        """Test ranges follow the index nlist and the limit"""
+        space = tuning_space({"index_type": "IVF_FLAT", "nlist": "128"}, ["nprobe"], 10)
+        self.assertEqual(space, {"nprobe": (1, 128)})
+        space = tuning_space({"params": {"nlist": 64}}, ["nprobe", "reorder_k"], 50)
+        self.assertEqual(space, {"nprobe": (1, 64), "reorder_k": (50, 4096)})
+        self.assertEqual(tuning_space({}, ["metric_type", "ef"], 10), {"ef": (10, 4096)})
+
+
+class TestSavedSearchParams(unittest.TestCase):
+    def test_round_trip(self):
+        """Test saved params are kept per server, database, collection and field"""
+        with tempfile.TemporaryDirectory() as tmp:
+            saved = SavedSearchParams(os.path.join(tmp, "params.json"))
+            self.assertIsNone(saved.get("uri", "default", "c", "vec"))
+            saved.save("uri", "default", "c", "vec", {"ef": 96})
+            self.assertEqual(saved.get("uri", None, "c", "vec"), {"ef": 96})
+            self.assertIsNone(saved.get("uri", "other", "c", "vec"))
+            saved.remove("uri", "default", "c", "vec")
+            self.assertIsNone(saved.get("uri", "default", "c", "vec"))
+
+
+if __name__ == "__main__":
+    unittest.main()
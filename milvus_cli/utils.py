@@ -133,6 +133,7 @@ class Completer(object):
             "partition",
             "index",
             "output",
+            "cache",
             "bulk_insert_state",
             "replicas",
             "load_state",
@@ -147,7 +148,7 @@ class Completer(object):
         ],
         "rename": ["collection"],
         "use": ["database"],
-        "set": ["output"],
+        "set": ["output", "cache"],
         "version": [],
         "server_version": [],
         "flush": [],
@@ -167,6 +168,7 @@ class Completer(object):
     ARGUMENT_COMPLETIONS = {
         "set": {
             "output": ["table", "json", "csv"],
+            "cache": ["on", "off", "clear"],
         },
     }
 